@@ -39,16 +39,20 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import collections
 import glob
 import os
 import re
+import sqlite3
+import threading
+import time
 import warnings
 from datetime import timedelta
 
 import numpy as np
 
-from obspy import Stream, read, UTCDateTime
-from obspy.core.stream import _headonly_warning_msg
+from obspy import Stream, Trace, read, UTCDateTime
+from obspy.core.stream import _headonly_warning_msg, _slide_chunks
 from obspy.core.util.misc import BAND_CODE
 
 
@@ -56,6 +60,21 @@ SDS_FMTSTR = os.path.join(
     "{year}", "{network}", "{station}", "{channel}.{sds_type}",
     "{network}.{station}.{location}.{channel}.{sds_type}.{year}.{doy:03d}")
 FORMAT_STR_PLACEHOLDER_REGEX = r"{(\w+?)?([!:].*?)?}"
+_SDS_INDEX_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS files ("
+    "id INTEGER PRIMARY KEY, path TEXT UNIQUE, directory TEXT, "
+    "network TEXT, station TEXT, location TEXT, channel TEXT, "
+    "sds_type TEXT, year INTEGER, doy INTEGER, mtime REAL, size INTEGER)",
+    "CREATE TABLE IF NOT EXISTS spans ("
+    "file_id INTEGER, network TEXT, station TEXT, location TEXT, "
+    "channel TEXT, starttime INTEGER, endtime INTEGER, sampling_rate REAL, "
+    "npts INTEGER)",
+    "CREATE INDEX IF NOT EXISTS spans_time ON spans (starttime, endtime)",
+    "CREATE INDEX IF NOT EXISTS spans_file ON spans (file_id)",
+    "CREATE INDEX IF NOT EXISTS files_directory ON files (directory)",
+    "CREATE TABLE IF NOT EXISTS directories ("
+    "path TEXT PRIMARY KEY, mtime REAL)",
+)
 
 
 class Client(object):
@@ -68,7 +87,8 @@ class Client(object):
     FMTSTR = SDS_FMTSTR
 
     def __init__(self, sds_root, sds_type="D", format="MSEED",
-                 fileborder_seconds=30, fileborder_samples=5000):
+                 fileborder_seconds=30, fileborder_samples=5000, index=None,
+                 index_refresh=None, cache_size=None):
         """
         Initialize a SDS local filesystem client.
 
@@ -105,6 +125,37 @@ class Client(object):
             code of the requested channel to sampling frequency. The maximum of
             both ``fileborder_seconds`` and ``fileborder_samples`` is used when
             determining if previous/next day should be checked for data.
+        :type index: str
+        :param index: Filename of a persistent SQLite index of all files and
+            the time spans of data they contain (e.g. outside of the archive,
+            as archives are often read-only or shared). If set, the index is
+            used to look up files in :meth:`get_waveforms`,
+            :meth:`get_waveforms_bulk`, :meth:`get_all_nslc`,
+            :meth:`get_availability_percentage` and related methods instead
+            of searching the directory tree and reading file headers on every
+            call. The index is built when it does not exist yet. Use
+            :meth:`update_index` to pick up changes of the archive. Only
+            lookups finding no data (or files removed in the meantime) in the
+            index search the files (or for :meth:`has_data`,
+            :meth:`get_all_nslc` and :meth:`get_latency` the directories)
+            concerned for changes, see also ``index_refresh``. The database
+            connection is opened on first use in every thread and process,
+            so that the client can be pickled and used with
+            :mod:`multiprocessing`.
+        :type index_refresh: float
+        :param index_refresh: Interval in seconds after which lookups in the
+            index check the files or directories concerned for changes in
+            modification time and size and index them again if necessary,
+            e.g. for archives that are written to continuously. ``0`` checks
+            on every lookup. By default they are only checked if nothing is
+            found in the index.
+        :type cache_size: int
+        :param cache_size: Maximum size in bytes of decoded data kept in
+            memory. If set, files are decoded completely on first access and
+            kept in a least recently used cache, so that repeated requests for
+            (overlapping) time windows of the same files do not decode them
+            again. Files changed on disk are decoded again. See
+            :attr:`cache_statistics` for hits, misses and evictions.
         """
         if not os.path.isdir(sds_root):
             msg = ("SDS root is not a local directory: " + sds_root)
@@ -114,6 +165,59 @@ class Client(object):
         self.format = format
         self.fileborder_seconds = fileborder_seconds
         self.fileborder_samples = fileborder_samples
+        self.cache_size = cache_size
+        self._init_cache()
+        self.index_refresh = index_refresh
+        self._index_filename = None
+        # time of the last check for changes of parts of the archive in the
+        # index, see _lookup_index()
+        self._index_checked = {}
+        self._local = threading.local()
+        if index:
+            self._index_filename = index
+            if not self._get_index().execute(
+                    "SELECT COUNT(*) FROM files").fetchone()[0]:
+                self.update_index()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # database connections can not be pickled and can only be used in
+        # the thread that opened them
+        state.pop("_local", None)
+        # decoded data is not worth transferring to other processes
+        for key in ("_cache", "_cache_statistics", "_cache_lock"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._local = threading.local()
+        self._init_cache()
+
+    def _init_cache(self):
+        """
+        Set up an empty cache of decoded data.
+        """
+        self._cache = collections.OrderedDict()
+        self._cache_statistics = {"hits": 0, "misses": 0, "evictions": 0,
+                                  "bytes": 0}
+        # the cache is shared by all threads using the client
+        self._cache_lock = threading.Lock()
+
+    def _get_index(self):
+        """
+        Get the connection to the archive index of the current thread and
+        process, opening it on first use.
+
+        :rtype: :class:`sqlite3.Connection`
+        """
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            local.connection = sqlite3.connect(self._index_filename)
+            local.pid = os.getpid()
+            for statement in _SDS_INDEX_SCHEMA:
+                local.connection.execute(statement)
+        return local.connection
 
     def get_waveforms(self, network, station, location, channel, starttime,
                       endtime, merge=-1, sds_type=None, **kwargs):
@@ -170,8 +274,8 @@ class Client(object):
             channel=channel, starttime=starttime, endtime=endtime,
             sds_type=sds_type)
         for full_path in full_paths:
-            st += read(full_path, format=self.format, starttime=starttime,
-                       endtime=endtime, sourcename=seed_pattern, **kwargs)
+            st += self._read(full_path, starttime=starttime, endtime=endtime,
+                             sourcename=seed_pattern, **kwargs)
 
         # make sure we only have the desired data, just in case the file
         # contents do not match the expected SEED id
@@ -190,6 +294,233 @@ class Client(object):
             st.merge(merge)
         return st
 
+    def get_waveforms_bulk(self, bulk, merge=-1, sds_type=None, **kwargs):
+        """
+        Read data for multiple requests from a local SeisComP Data Structure
+        (SDS) directory tree.
+
+        Requests are grouped by the files they need, so that every file is
+        read only once, no matter how many requests it serves. This is much
+        faster than calling :meth:`get_waveforms` repeatedly, e.g. when
+        cutting many short event windows out of the same day files.
+
+        >>> from obspy import UTCDateTime
+        >>> t = UTCDateTime("2015-10-12T12")
+        >>> bulk = [("IU", "ANMO", "*", "HH?", t, t + 30),
+        ...         ("IU", "ANMO", "*", "HH?", t + 600, t + 630)]
+        >>> st = client.get_waveforms_bulk(bulk)  # doctest: +SKIP
+
+        :type bulk: list of tuple
+        :param bulk: List of requests, each a 6-tuple of network, station,
+            location, channel (wildcards '*' and '?' are supported), start
+            and end time, see :meth:`get_waveforms`.
+        :type merge: int or None
+        :param merge: Merge operation performed on the data of every single
+            request, see :meth:`get_waveforms`.
+        :type sds_type: str
+        :param sds_type: Override SDS data type identifier that was specified
+            during client initialization.
+        :param kwargs: Additional kwargs that get passed on to
+            :func:`~obspy.core.stream.read` internally.
+        :rtype: :class:`~obspy.core.stream.Stream`
+        :returns: Stream with the data of all requests, in order of the
+            requests.
+        """
+        sds_type = sds_type or self.sds_type
+        requests_per_file = collections.defaultdict(list)
+        for i, (network, station, location, channel, starttime,
+                endtime) in enumerate(bulk):
+            if starttime >= endtime:
+                msg = ("'endtime' must be after 'starttime'.")
+                raise ValueError(msg)
+            full_paths = self._get_filenames(
+                network=network, station=station, location=location,
+                channel=channel, starttime=starttime, endtime=endtime,
+                sds_type=sds_type)
+            for full_path in full_paths:
+                requests_per_file[full_path].append(i)
+
+        traces = [[] for _ in bulk]
+        for full_path in sorted(requests_per_file):
+            indices = requests_per_file[full_path]
+            # read the time span needed by all requests at once
+            st = self._read(full_path,
+                            starttime=min(bulk[i][4] for i in indices),
+                            endtime=max(bulk[i][5] for i in indices),
+                            **kwargs)
+            for i in indices:
+                network, station, location, channel, starttime, endtime = \
+                    bulk[i]
+                st_ = st.select(network=network, station=station,
+                                location=location, channel=channel)
+                # copy, data of overlapping requests must not be shared
+                traces[i].extend(
+                    tr.copy() for tr in st_.slice(starttime, endtime))
+
+        result = Stream()
+        for (_, _, _, _, starttime, endtime), traces_ in zip(bulk, traces):
+            st = Stream(traces=traces_)
+            st.trim(starttime, endtime)
+            if merge is None or merge is False:
+                pass
+            else:
+                st.merge(merge)
+            result += st
+        return result
+
+    def iter_waveforms(self, network, station, location, channel, starttime,
+                       endtime, window_length, step=None, offset=0,
+                       include_partial_windows=False, nearest_sample=True,
+                       merge=-1, sds_type=None, **kwargs):
+        """
+        Iterate over time windows of data from a local SeisComP Data
+        Structure (SDS) directory tree.
+
+        Works like :meth:`Stream.slide() <obspy.core.stream.Stream.slide>`
+        on the result of :meth:`get_waveforms`, but data is read one day at a
+        time while iterating and discarded once it is not needed anymore, so
+        that memory usage does not depend on the length of the requested time
+        span.
+
+        >>> from obspy import UTCDateTime
+        >>> t = UTCDateTime("2015-10-12")
+        >>> for st in client.iter_waveforms(
+        ...         "IU", "ANMO", "*", "HH?", t, t + 30 * 86400,
+        ...         window_length=3600, step=1800):  # doctest: +SKIP
+        ...     st.detrend()
+
+        :type network: str
+        :param network: Network code of requested data (e.g. "IU").
+            Wildcards '*' and '?' are supported.
+        :type station: str
+        :param station: Station code of requested data (e.g. "ANMO").
+            Wildcards '*' and '?' are supported.
+        :type location: str
+        :param location: Location code of requested data (e.g. "").
+            Wildcards '*' and '?' are supported.
+        :type channel: str
+        :param channel: Channel code of requested data (e.g. "HHZ").
+            Wildcards '*' and '?' are supported.
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: Start of requested time span.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: End of requested time span.
+        :type window_length: float
+        :param window_length: The length of each window in seconds.
+        :type step: float
+        :param step: The step between the start times of two successive
+            windows in seconds, defaults to ``window_length``. Has to be
+            positive, successive windows overlap if it is smaller than
+            ``window_length``.
+        :type offset: float
+        :param offset: The offset of the first window in seconds relative to
+            ``starttime``.
+        :type include_partial_windows: bool
+        :param include_partial_windows: Determines if windows that are
+            shorter than 99.9 % of the desired length are returned.
+        :type nearest_sample: bool, optional
+        :param nearest_sample: See :meth:`Stream.slice()
+            <obspy.core.stream.Stream.slice>`.
+        :type merge: int or None
+        :param merge: Merge operation performed on every window, see
+            :meth:`get_waveforms`.
+        :type sds_type: str
+        :param sds_type: Override SDS data type identifier that was specified
+            during client initialization.
+        :param kwargs: Additional kwargs that get passed on to
+            :func:`~obspy.core.stream.read` internally.
+        :rtype: generator of :class:`~obspy.core.stream.Stream`
+        :returns: Generator yielding a new Stream for every window with data.
+        """
+        if starttime >= endtime:
+            msg = ("'endtime' must be after 'starttime'.")
+            raise ValueError(msg)
+        if step is None:
+            step = window_length
+
+        def _chunks():
+            t = starttime
+            while t < endtime:
+                # read up to the next day boundary
+                t2 = min(UTCDateTime(t.date) + 86400, endtime)
+                st = self.get_waveforms(
+                    network, station, location, channel, t, t2, merge=-1,
+                    sds_type=sds_type, **kwargs)
+                yield t2, st
+                t = t2
+
+        return _slide_chunks(
+            _chunks(), starttime, endtime, window_length, step, offset=offset,
+            include_partial_windows=include_partial_windows,
+            nearest_sample=nearest_sample, merge=merge)
+
+    def _read(self, full_path, starttime, endtime, sourcename=None,
+              **kwargs):
+        """
+        Read data of a single file in the given time span, from the cache of
+        decoded data if enabled.
+
+        :rtype: :class:`~obspy.core.stream.Stream`
+        """
+        # any other low-level read options bypass the cache
+        if not self.cache_size or kwargs:
+            if sourcename is not None:
+                kwargs["sourcename"] = sourcename
+            return read(full_path, format=self.format, starttime=starttime,
+                        endtime=endtime, **kwargs)
+        stat = os.stat(full_path)
+        key = (full_path, stat.st_mtime, stat.st_size)
+        with self._cache_lock:
+            # move to the end to get LRU cache behaviour
+            cached = self._cache.pop(key, None)
+            if cached is not None:
+                self._cache[key] = cached
+                self._cache_statistics["hits"] += 1
+        if cached is None:
+            # decode outside of the lock, other threads may use the cache
+            # in the meantime
+            st = read(full_path, format=self.format)
+            cached = (st, sum(tr.data.nbytes for tr in st))
+            with self._cache_lock:
+                self._cache_statistics["misses"] += 1
+                # another thread might have decoded the same file
+                previous = self._cache.pop(key, None)
+                if previous is not None:
+                    self._cache_statistics["bytes"] -= previous[1]
+                self._cache[key] = cached
+                self._cache_statistics["bytes"] += cached[1]
+                while self._cache_statistics["bytes"] > self.cache_size:
+                    _, (_, nbytes) = self._cache.popitem(last=False)
+                    self._cache_statistics["bytes"] -= nbytes
+                    self._cache_statistics["evictions"] += 1
+        # callers may modify the returned data
+        return cached[0].slice(starttime, endtime).copy()
+
+    @property
+    def cache_statistics(self):
+        """
+        Statistics of the cache of decoded data (see ``cache_size`` in
+        :meth:`__init__`).
+
+        :rtype: dict
+        :returns: Number of cache ``hits``, ``misses`` and ``evictions``,
+            number of currently cached files (``files``) and size of the
+            currently cached data in ``bytes``.
+        """
+        with self._cache_lock:
+            statistics = dict(self._cache_statistics)
+            statistics["files"] = len(self._cache)
+        return statistics
+
+    def clear_cache(self):
+        """
+        Remove all decoded data from the cache and reset its statistics.
+        """
+        with self._cache_lock:
+            self._cache.clear()
+            for key in self._cache_statistics:
+                self._cache_statistics[key] = 0
+
     def _get_filenames(self, network, station, location, channel, starttime,
                        endtime, sds_type=None):
         """
@@ -213,6 +544,106 @@ class Client(object):
         :rtype: list of str
         """
         sds_type = sds_type or self.sds_type
+        if self._index_filename is None:
+            full_paths, _ = self._glob_filenames(
+                network, station, location, channel, starttime, endtime,
+                sds_type)
+            return full_paths
+
+        def _lookup():
+            rows = self._get_index().execute(
+                "SELECT DISTINCT files.path FROM spans JOIN files "
+                "ON spans.file_id = files.id WHERE " + _INDEX_NSLC_CONDITION +
+                " AND files.sds_type GLOB ? AND spans.starttime <= ? AND "
+                "spans.endtime >= ?",
+                (network, station, location, channel, sds_type,
+                 endtime._ns, starttime._ns))
+            full_paths = set(os.path.join(self.sds_root, row[0])
+                             for row in rows)
+            # files removed in the meantime
+            if not full_paths or not all(
+                    os.path.isfile(full_path) for full_path in full_paths):
+                return None
+            return full_paths
+
+        return self._lookup_index_files(
+            _lookup, network, station, location, channel, starttime,
+            endtime, sds_type) or set()
+
+    def _lookup_index_files(self, lookup, network, station, location,
+                            channel, starttime, endtime, sds_type):
+        """
+        Look up data in the archive index with the given function, checking
+        the files of the given streams and time span for changes if
+        necessary, see :meth:`_lookup_index`.
+        """
+        year_doy = self._get_year_doy(channel, starttime, endtime)
+
+        def _refresh():
+            full_paths, _ = self._glob_filenames(
+                network, station, location, channel, starttime, endtime,
+                sds_type)
+            self._refresh_index_files(full_paths, network, station, location,
+                                      channel, sds_type, year_doy)
+
+        keys = [("files", network, station, location, channel, sds_type,
+                 year, doy) for year, doy in sorted(year_doy)]
+        return self._lookup_index(keys, _refresh, lookup)
+
+    def _lookup_index(self, keys, refresh, lookup):
+        """
+        Look up data in the archive index.
+
+        The parts of the archive given by ``keys`` are checked for changes
+        with ``refresh()`` before the lookup if they were not checked within
+        ``index_refresh`` seconds (see :meth:`__init__`), and after the
+        lookup if it found nothing, i.e. ``lookup()`` returned ``None``.
+        """
+        now = time.time()
+        refreshed = self.index_refresh is not None and any(
+            now - self._index_checked.get(key, -np.inf) >= self.index_refresh
+            for key in keys)
+        if refreshed:
+            refresh()
+        result = lookup()
+        if result is None and not refreshed:
+            refreshed = True
+            refresh()
+            result = lookup()
+        if refreshed:
+            for key in keys:
+                self._index_checked[key] = now
+        return result
+
+    def _glob_filenames(self, network, station, location, channel,
+                        starttime, endtime, sds_type):
+        """
+        Search the directory tree for files for certain waveform and time
+        span, see :meth:`_get_filenames`.
+
+        :rtype: tuple
+        :returns: Set of full paths of all matching files and set of all
+            ``(year, doy)`` tuples that were searched.
+        """
+        year_doy = self._get_year_doy(channel, starttime, endtime)
+        full_paths = set()
+        for year, doy in year_doy:
+            filename = self.FMTSTR.format(
+                network=network, station=station, location=location,
+                channel=channel, year=year, doy=doy, sds_type=sds_type)
+            full_path = os.path.join(self.sds_root, filename)
+            full_paths = full_paths.union(glob.glob(full_path))
+
+        return full_paths, year_doy
+
+    def _get_year_doy(self, channel, starttime, endtime):
+        """
+        Get all days of files that might contain data of the given channel
+        in the given time span.
+
+        :rtype: set
+        :returns: Set of ``(year, doy)`` tuples.
+        """
         # SDS has data sometimes in adjacent days, so also try to read the
         # requested data from those files. Usually this is only a few seconds
         # of data after midnight, but for now we play safe here to catch all
@@ -231,16 +662,7 @@ class Client(object):
             year_doy.add((t.year, t.julday))
             t += timedelta(days=1)
         year_doy.add((t_max.year, t_max.julday))
-
-        full_paths = set()
-        for year, doy in year_doy:
-            filename = self.FMTSTR.format(
-                network=network, station=station, location=location,
-                channel=channel, year=year, doy=doy, sds_type=sds_type)
-            full_path = os.path.join(self.sds_root, filename)
-            full_paths = full_paths.union(glob.glob(full_path))
-
-        return full_paths
+        return year_doy
 
     def _get_filename(self, network, station, location, channel, time,
                       sds_type=None):
@@ -297,6 +719,45 @@ class Client(object):
             msg = ("'endtime' must be after 'starttime'.")
             raise ValueError(msg)
         sds_type = sds_type or self.sds_type
+        if self._index_filename is not None:
+            st = self._get_index_stream(network, station, location, channel,
+                                        starttime, endtime, sds_type=sds_type)
+        else:
+            st = self._get_headonly_stream(network, station, location,
+                                           channel, starttime, endtime,
+                                           sds_type=sds_type)
+        st.sort(keys=['starttime', 'endtime'])
+        st.traces = [tr for tr in st
+                     if not (tr.stats.endtime < starttime or
+                             tr.stats.starttime > endtime)]
+
+        if not st:
+            return (0, 1)
+
+        total_duration = endtime - starttime
+        # sum up gaps in the middle
+        gaps = [gap[6] for gap in st.get_gaps()]
+        gap_sum = np.sum(gaps)
+        gap_count = len(gaps)
+        # check if we have a gap at start or end
+        earliest = min([tr.stats.starttime for tr in st])
+        latest = max([tr.stats.endtime for tr in st])
+        if earliest > starttime:
+            gap_sum += earliest - starttime
+            gap_count += 1
+        if latest < endtime:
+            gap_sum += endtime - latest
+            gap_count += 1
+
+        return (1 - (gap_sum / total_duration), gap_count)
+
+    def _get_headonly_stream(self, network, station, location, channel,
+                             starttime, endtime, sds_type):
+        """
+        Read headers of all data in the given time span from the archive.
+
+        :rtype: :class:`~obspy.core.stream.Stream`
+        """
         with warnings.catch_warnings():
             warnings.filterwarnings(
                 "ignore", _headonly_warning_msg, UserWarning,
@@ -320,30 +781,213 @@ class Client(object):
             for key in list(stream_warningregistry.keys()):
                 if key[0] == _headonly_warning_msg:
                     stream_warningregistry.pop(key)
-        st.sort(keys=['starttime', 'endtime'])
-        st.traces = [tr for tr in st
-                     if not (tr.stats.endtime < starttime or
-                             tr.stats.starttime > endtime)]
+        return st
 
-        if not st:
-            return (0, 1)
+    def _get_index_stream(self, network, station, location, channel,
+                          starttime, endtime, sds_type):
+        """
+        Get header-only traces for all data spans in the given time span from
+        the archive index.
 
-        total_duration = endtime - starttime
-        # sum up gaps in the middle
-        gaps = [gap[6] for gap in st.get_gaps()]
-        gap_sum = np.sum(gaps)
-        gap_count = len(gaps)
-        # check if we have a gap at start or end
-        earliest = min([tr.stats.starttime for tr in st])
-        latest = max([tr.stats.endtime for tr in st])
-        if earliest > starttime:
-            gap_sum += earliest - starttime
-            gap_count += 1
-        if latest < endtime:
-            gap_sum += endtime - latest
-            gap_count += 1
+        :rtype: :class:`~obspy.core.stream.Stream`
+        """
+        def _lookup():
+            rows = self._get_index().execute(
+                "SELECT spans.network, spans.station, spans.location, "
+                "spans.channel, spans.starttime, spans.sampling_rate, "
+                "spans.npts FROM spans JOIN files "
+                "ON spans.file_id = files.id WHERE " + _INDEX_NSLC_CONDITION +
+                " AND files.sds_type GLOB ? AND spans.starttime <= ? AND "
+                "spans.endtime >= ?",
+                (network, station, location, channel, sds_type, endtime._ns,
+                 starttime._ns)).fetchall()
+            return rows or None
+
+        rows = self._lookup_index_files(
+            _lookup, network, station, location, channel, starttime,
+            endtime, sds_type) or []
+        st = Stream()
+        for net, sta, loc, cha, t, sampling_rate, npts in rows:
+            header = {'network': net, 'station': sta, 'location': loc,
+                      'channel': cha, 'starttime': UTCDateTime(ns=t),
+                      'sampling_rate': sampling_rate, 'npts': npts}
+            st.append(Trace(header=header))
+        return st
 
-        return (1 - (gap_sum / total_duration), gap_count)
+    def update_index(self):
+        """
+        Create or update the persistent index of the archive.
+
+        Only files that are new or changed in size or modification time since
+        the last update are scanned, entries of files that no longer exist
+        are removed.
+
+        :rtype: int
+        :returns: Number of (re)scanned files.
+        """
+        if self._index_filename is None:
+            msg = "Client was initialized without an index."
+            raise ValueError(msg)
+        return self._refresh_index_directories(
+            self._get_directory_pattern(), force=True)
+
+    def _get_directory_pattern(self, **kwargs):
+        """
+        Get glob pattern of archive directories relative to the SDS root,
+        with all fields not given as keyword arguments wildcarded.
+        """
+        pattern = re.sub(FORMAT_STR_PLACEHOLDER_REGEX,
+                         _wildcarded_except(list(kwargs.keys())),
+                         os.path.dirname(self.FMTSTR))
+        return pattern.format(**kwargs)
+
+    def _refresh_index_directories(self, pattern, force=False):
+        """
+        Update the archive index for all directories matching the given glob
+        pattern (relative to the SDS root).
+
+        Only directories that are new or changed in modification time since
+        the last update (i.e. files were added, removed or replaced) are
+        searched for changed files, unless ``force`` is set. Entries of
+        directories that no longer exist are removed.
+
+        :rtype: int
+        :returns: Number of (re)scanned files.
+        """
+        index = self._get_index()
+        known = dict(index.execute(
+            "SELECT path, mtime FROM directories WHERE path GLOB ?",
+            (pattern,)))
+        file_pattern = re.sub(FORMAT_STR_PLACEHOLDER_REGEX,
+                              _wildcarded_except(),
+                              os.path.basename(self.FMTSTR))
+        count = 0
+        for directory in glob.glob(os.path.join(self.sds_root, pattern)):
+            if not os.path.isdir(directory):
+                continue
+            path = os.path.relpath(directory, self.sds_root)
+            mtime = os.stat(directory).st_mtime
+            if known.pop(path, None) == mtime and not force:
+                continue
+            known_files = self._get_indexed_files("directory = ?", (path,))
+            count += self._index_files(
+                glob.glob(os.path.join(directory, file_pattern)), known_files)
+            with index:
+                index.execute(
+                    "INSERT OR REPLACE INTO directories VALUES (?, ?)",
+                    (path, mtime))
+        # directories that disappeared
+        for path in known:
+            self._index_files(
+                [], self._get_indexed_files("directory = ?", (path,)))
+            with index:
+                index.execute("DELETE FROM directories WHERE path = ?",
+                              (path,))
+        return count
+
+    def _refresh_index_files(self, full_paths, network, station, location,
+                             channel, sds_type, year_doy):
+        """
+        Update the archive index for the given files, removing entries of
+        files of the given streams and days that no longer exist.
+        """
+        years = [year for year, _ in year_doy]
+        rows = self._get_index().execute(
+            "SELECT path, id, mtime, size, year, doy FROM files WHERE " +
+            _INDEX_FILES_NSLC_CONDITION + " AND sds_type GLOB ? AND "
+            "year BETWEEN ? AND ?",
+            (network, station, location, channel, sds_type, min(years),
+             max(years)))
+        known = dict((path, (file_id, mtime, size))
+                     for path, file_id, mtime, size, year, doy in rows
+                     if (year, doy) in year_doy)
+        self._index_files(full_paths, known)
+
+    def _get_indexed_files(self, condition, parameters):
+        """
+        Get files in the archive index matching the given SQL condition.
+
+        :rtype: dict
+        :returns: Dictionary mapping paths relative to the SDS root to
+            ``(id, mtime, size)`` tuples.
+        """
+        return dict(
+            (path, (file_id, mtime, size))
+            for file_id, path, mtime, size in self._get_index().execute(
+                "SELECT id, path, mtime, size FROM files WHERE " + condition,
+                parameters))
+
+    def _index_files(self, full_paths, known):
+        """
+        Update the archive index for the given files.
+
+        Files that are new or changed in size or modification time are
+        (re)scanned, entries of files in ``known`` (see
+        :meth:`_get_indexed_files`) that are not among the given files are
+        removed.
+
+        :rtype: int
+        :returns: Number of (re)scanned files.
+        """
+        index = self._get_index()
+        known = known.copy()
+        pattern_ = os.path.join(self.sds_root, self.FMTSTR)
+        group_map = {i: groups[0] for i, groups in
+                     enumerate(re.findall(FORMAT_STR_PLACEHOLDER_REGEX,
+                                          pattern_))}
+        count = 0
+        with index:
+            for file_ in full_paths:
+                path = os.path.relpath(file_, self.sds_root)
+                try:
+                    stat = os.stat(file_)
+                except OSError:
+                    # removed in the meantime
+                    continue
+                file_id, mtime, size = known.pop(path, None) or \
+                    index.execute(
+                        "SELECT id, mtime, size FROM files WHERE path = ?",
+                        (path,)).fetchone() or (None, None, None)
+                if mtime == stat.st_mtime and size == stat.st_size:
+                    continue
+                if file_id is not None:
+                    self._remove_from_index(file_id)
+                dict_ = _parse_path_to_dict(file_, pattern_, group_map)
+                if dict_ is None:
+                    continue
+                try:
+                    st = read(file_, format=self.format, headonly=True)
+                except Exception as e:
+                    msg = "Failed to index file '{}': {}".format(file_, e)
+                    warnings.warn(msg)
+                    continue
+                cursor = index.execute(
+                    "INSERT INTO files (path, directory, network, station, "
+                    "location, channel, sds_type, year, doy, mtime, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (path, os.path.dirname(path), dict_["network"],
+                     dict_["station"], dict_["location"], dict_["channel"],
+                     dict_["sds_type"], int(dict_["year"]),
+                     int(dict_["doy"]), stat.st_mtime, stat.st_size))
+                index.executemany(
+                    "INSERT INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(cursor.lastrowid, tr.stats.network, tr.stats.station,
+                      tr.stats.location, tr.stats.channel,
+                      tr.stats.starttime._ns, tr.stats.endtime._ns,
+                      tr.stats.sampling_rate, tr.stats.npts) for tr in st])
+                count += 1
+            # files that disappeared
+            for file_id, _, _ in known.values():
+                self._remove_from_index(file_id)
+        return count
+
+    def _remove_from_index(self, file_id):
+        """
+        Remove a file and its data spans from the archive index.
+        """
+        index = self._get_index()
+        index.execute("DELETE FROM spans WHERE file_id = ?", (file_id,))
+        index.execute("DELETE FROM files WHERE id = ?", (file_id,))
 
     def _get_current_endtime(self, network, station, location, channel,
                              sds_type=None, stop_time=None):
@@ -373,6 +1017,48 @@ class Client(object):
 
         seed_pattern = ".".join((network, station, location, channel))
 
+        if self._index_filename is not None:
+            stop_time = stop_time or UTCDateTime(1950, 1, 1)
+            index = self._get_index()
+            pattern = self._get_directory_pattern(
+                network=network, station=station, channel=channel,
+                sds_type=sds_type)
+
+            def _refresh():
+                self._refresh_index_directories(pattern)
+                # data might have been appended to the most recent files
+                row = index.execute(
+                    "SELECT year, doy FROM files WHERE " +
+                    _INDEX_FILES_NSLC_CONDITION + " AND sds_type GLOB ? "
+                    "ORDER BY year DESC, doy DESC LIMIT 1",
+                    (network, station, location, channel,
+                     sds_type)).fetchone()
+                if row is not None:
+                    known = self._get_indexed_files(
+                        _INDEX_FILES_NSLC_CONDITION + " AND sds_type GLOB ? "
+                        "AND year = ? AND doy = ?",
+                        (network, station, location, channel, sds_type) +
+                        row)
+                    self._index_files(
+                        [os.path.join(self.sds_root, path) for path in known],
+                        known)
+
+            def _lookup():
+                return index.execute(
+                    "SELECT MAX(spans.endtime) FROM spans JOIN files "
+                    "ON spans.file_id = files.id WHERE " +
+                    _INDEX_NSLC_CONDITION + " AND files.sds_type GLOB ? AND "
+                    "spans.endtime >= ?",
+                    (network, station, location, channel, sds_type,
+                     stop_time._ns)).fetchone()[0]
+
+            endtime = self._lookup_index(
+                [("latest", network, station, location, channel, sds_type)],
+                _refresh, _lookup)
+            if endtime is None:
+                return None
+            return UTCDateTime(ns=endtime)
+
         if not self.has_data(
                 network=network, station=station, location=location,
                 channel=channel, sds_type=sds_type):
@@ -456,6 +1142,20 @@ class Client(object):
         """
         sds_type = sds_type or self.sds_type
 
+        if self._index_filename is not None:
+            pattern = self._get_directory_pattern(
+                network=network, station=station, channel=channel,
+                sds_type=sds_type)
+            row = self._lookup_index(
+                [("directories", pattern)],
+                lambda: self._refresh_index_directories(pattern),
+                lambda: self._get_index().execute(
+                    "SELECT 1 FROM files WHERE " +
+                    _INDEX_FILES_NSLC_CONDITION + " AND sds_type GLOB ? "
+                    "LIMIT 1", (network, station, location, channel,
+                                sds_type)).fetchone())
+            return row is not None
+
         pattern = re.sub(
             FORMAT_STR_PLACEHOLDER_REGEX,
             _wildcarded_except(["network", "station", "location", "channel",
@@ -491,6 +1191,24 @@ class Client(object):
             available streams in archive.
         """
         sds_type = sds_type or self.sds_type
+        if self._index_filename is not None:
+            if datetime is None:
+                pattern = self._get_directory_pattern(sds_type=sds_type)
+            else:
+                pattern = self._get_directory_pattern(
+                    sds_type=sds_type, year=datetime.year)
+            query = ("SELECT DISTINCT network, station, location, channel "
+                     "FROM files WHERE sds_type GLOB ?")
+            parameters = [sds_type]
+            if datetime is not None:
+                query += " AND year = ? AND doy = ?"
+                parameters += [datetime.year, datetime.julday]
+            result = self._lookup_index(
+                [("directories", pattern)],
+                lambda: self._refresh_index_directories(pattern),
+                lambda: self._get_index().execute(
+                    query, parameters).fetchall() or None)
+            return sorted(result or [])
         result = set()
         # wildcarded pattern to match all files of interest
         if datetime is None:
@@ -567,6 +1285,17 @@ class Client(object):
         return sorted(result)
 
 
+# SQL condition matching SEED codes of data spans against (wildcarded)
+# network, station, location and channel parameters
+_INDEX_NSLC_CONDITION = (
+    "spans.network GLOB ? AND spans.station GLOB ? AND "
+    "spans.location GLOB ? AND spans.channel GLOB ?")
+# same for files, matching the SEED codes in the file names
+_INDEX_FILES_NSLC_CONDITION = (
+    "files.network GLOB ? AND files.station GLOB ? AND "
+    "files.location GLOB ? AND files.channel GLOB ?")
+
+
 def _wildcarded_except(exclude=[]):
     """
     Function factory for :mod:`re` ``repl`` functions used in :func:`re.sub``,
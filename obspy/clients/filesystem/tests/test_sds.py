@@ -6,14 +6,18 @@ from future.builtins import *  # NOQA
 import imghdr
 import inspect
 import os
+import pickle
 import re
 import shutil
 import tempfile
+import threading
 import unittest
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
-from obspy import UTCDateTime, Trace, Stream
+from obspy import UTCDateTime, Trace, Stream, read
+from obspy.core.compatibility import mock
 from obspy.core.util.misc import TemporaryWorkingDirectory
 from obspy.clients.filesystem.sds import SDS_FMTSTR, Client
 from obspy.scripts.sds_html_report import main as sds_report
@@ -256,6 +260,346 @@ class SDSTestCase(unittest.TestCase):
             got_nslc = client.get_all_nslc(datetime=t - 2 * 24 * 3600)
             self.assertEqual([], got_nslc)
 
+    def test_index(self):
+        """
+        Test that a client using the persistent archive index gives the same
+        results as a client searching the directory tree.
+        """
+        t = UTCDateTime(2015, 1, 1)
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            index_file = os.path.join(temp_sds.tempdir, "index.sqlite")
+            client_index = Client(temp_sds.tempdir, index=index_file)
+            self.assertTrue(os.path.isfile(index_file))
+            for seed_id in ("AB.XYZ..HHZ", "AB.ZZZ3..HH?", "*.*.*.HHZ"):
+                net, sta, loc, cha = seed_id.split(".")
+                for t1, t2 in ((t - 20, t + 20), (t - 200, t + 200),
+                               (t + 20, t + 40), (t + 1000, t + 2000)):
+                    self.assertEqual(
+                        client_index.get_waveforms(net, sta, loc, cha, t1, t2),
+                        client.get_waveforms(net, sta, loc, cha, t1, t2))
+                    self.assertEqual(
+                        client_index.get_availability_percentage(
+                            net, sta, loc, cha, t1, t2),
+                        client.get_availability_percentage(
+                            net, sta, loc, cha, t1, t2))
+                self.assertTrue(client_index.has_data(net, sta, loc, cha))
+            self.assertEqual(
+                client_index._get_current_endtime("AB", "XYZ", "", "HHZ"),
+                client._get_current_endtime("AB", "XYZ", "", "HHZ"))
+            self.assertFalse(client_index.has_data("XX", "*", "*", "*"))
+            self.assertEqual(client_index.get_all_nslc(),
+                             client.get_all_nslc())
+            self.assertEqual(client_index.get_all_nslc(datetime=t),
+                             client.get_all_nslc(datetime=t))
+            # nothing changed, nothing to update
+            self.assertEqual(client_index.update_index(), 0)
+            # reopening an existing index does not rescan the archive
+            client_index._get_index().close()
+            with mock.patch("obspy.clients.filesystem.sds.read") as p:
+                client_index = Client(temp_sds.tempdir, index=index_file)
+                self.assertEqual(p.call_count, 0)
+            # new, changed and removed files are picked up by an update
+            tr = Trace(data=np.arange(10, dtype=np.int32),
+                       header=dict(network="EF", station="NEW",
+                                   channel="HHZ", starttime=t))
+            path = os.path.join(temp_sds.tempdir, SDS_FMTSTR.format(
+                year=t.year, doy=t.julday, sds_type="D", **tr.stats))
+            os.makedirs(os.path.dirname(path))
+            tr.write(path, format="MSEED")
+            removed = client._get_filename("AB", "XYZ", "", "HHZ", t)
+            os.remove(removed)
+            self.assertEqual(client_index.update_index(), 1)
+            self.assertEqual(client_index.get_all_nslc(),
+                             client.get_all_nslc())
+            self.assertEqual(
+                client_index.get_waveforms("EF", "NEW", "", "HHZ", t, t + 5),
+                client.get_waveforms("EF", "NEW", "", "HHZ", t, t + 5))
+            client_index._get_index().close()
+
+    def test_index_refresh(self):
+        """
+        Test that changes to the archive are picked up by lookups in the
+        archive index without updating it explicitly if checking for changes
+        on every lookup.
+        """
+        t = UTCDateTime(2015, 1, 1)
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            client_index = Client(
+                temp_sds.tempdir, index_refresh=0,
+                index=os.path.join(temp_sds.tempdir, "index.sqlite"))
+            # data appended to an existing file
+            path = client._get_filename("AB", "XYZ", "", "HHZ", t)
+            st = read(path)
+            tr = st[0].copy()
+            tr.stats.starttime = st[0].stats.endtime + 1000
+            st.append(tr)
+            # make sure the modification time changes
+            mtime = os.stat(path).st_mtime
+            st.write(path, format="MSEED")
+            os.utime(path, (mtime + 10, mtime + 10))
+            t1, t2 = tr.stats.starttime, tr.stats.endtime
+            for client_ in (client_index, pickle.loads(pickle.dumps(
+                    client_index))):
+                self.assertEqual(
+                    client_.get_waveforms("AB", "XYZ", "", "HHZ", t1, t2),
+                    client.get_waveforms("AB", "XYZ", "", "HHZ", t1, t2))
+                self.assertEqual(
+                    client_.get_availability_percentage(
+                        "AB", "XYZ", "", "HHZ", t1, t2),
+                    client.get_availability_percentage(
+                        "AB", "XYZ", "", "HHZ", t1, t2))
+                self.assertEqual(
+                    client_._get_current_endtime("AB", "XYZ", "", "HHZ"),
+                    client._get_current_endtime("AB", "XYZ", "", "HHZ"))
+            # new stream in a new directory and removed stream
+            tr = Trace(data=np.arange(10, dtype=np.int32),
+                       header=dict(network="EF", station="NEW",
+                                   channel="HHZ", starttime=t))
+            path = os.path.join(temp_sds.tempdir, SDS_FMTSTR.format(
+                year=t.year, doy=t.julday, sds_type="D", **tr.stats))
+            os.makedirs(os.path.dirname(path))
+            tr.write(path, format="MSEED")
+            for t_ in (t - 24 * 3600, t):
+                shutil.rmtree(os.path.dirname(client._get_filename(
+                    "CD", "ZZZ3", "", "BHE", t_, sds_type="D")))
+            self.assertTrue(client_index.has_data("EF", "NEW", "", "HHZ"))
+            self.assertFalse(client.has_data("CD", "ZZZ3", "*", "BHE"))
+            self.assertFalse(client_index.has_data("CD", "ZZZ3", "*", "BHE"))
+            self.assertEqual(client_index.get_all_nslc(),
+                             client.get_all_nslc())
+            self.assertEqual(client_index.get_all_nslc(datetime=t),
+                             client.get_all_nslc(datetime=t))
+            self.assertEqual(
+                client_index.get_waveforms("EF", "NEW", "", "HHZ", t, t + 5),
+                client.get_waveforms("EF", "NEW", "", "HHZ", t, t + 5))
+            self.assertEqual(client_index.update_index(), 0)
+            # the connection is opened in every thread
+            results = []
+            thread = threading.Thread(target=lambda: results.append(
+                client_index.get_all_nslc()))
+            thread.start()
+            thread.join()
+            self.assertEqual(results, [client.get_all_nslc()])
+            client_index._get_index().close()
+
+    def test_index_lookup_policy(self):
+        """
+        Test that lookups in the archive index only search the archive for
+        changes if nothing was found or after the refresh interval.
+        """
+        t = UTCDateTime(2015, 1, 1)
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            index_file = os.path.join(temp_sds.tempdir, "index.sqlite")
+            client_index = Client(temp_sds.tempdir, index=index_file)
+            path = client._get_filename("AB", "XYZ", "", "HHZ", t)
+            st = read(path)
+            tr = st[0].copy()
+            tr.stats.starttime = st[0].stats.endtime + 1000
+            t1, t2 = tr.stats.starttime, tr.stats.endtime
+            # data found in the index is returned without searching the
+            # archive
+            with mock.patch.object(
+                    client_index, "_glob_filenames") as p, \
+                    mock.patch.object(
+                        client_index, "_refresh_index_directories") as p_dir:
+                for _ in range(3):
+                    self.assertTrue(client_index.get_waveforms(
+                        "AB", "XYZ", "", "HHZ", t, t + 5))
+                    self.assertTrue(client_index.has_data(
+                        "AB", "XYZ", "", "HHZ"))
+                self.assertEqual(p.call_count, 0)
+                self.assertEqual(p_dir.call_count, 0)
+            # data appended to an existing file is not found before updating
+            # the index, but the time span is searched as nothing was found
+            st.append(tr)
+            mtime = os.stat(path).st_mtime
+            st.write(path, format="MSEED")
+            os.utime(path, (mtime + 10, mtime + 10))
+            with mock.patch.object(client_index, "_glob_filenames",
+                                   wraps=client_index._glob_filenames) as p:
+                self.assertEqual(
+                    client_index.get_waveforms("AB", "XYZ", "", "HHZ", t1,
+                                               t2),
+                    client.get_waveforms("AB", "XYZ", "", "HHZ", t1, t2))
+                self.assertGreater(p.call_count, 0)
+            self.assertEqual(client_index.update_index(), 0)
+            # new streams are searched on a miss
+            tr = Trace(data=np.arange(10, dtype=np.int32),
+                       header=dict(network="EF", station="NEW",
+                                   channel="HHZ", starttime=t))
+            new_path = os.path.join(temp_sds.tempdir, SDS_FMTSTR.format(
+                year=t.year, doy=t.julday, sds_type="D", **tr.stats))
+            os.makedirs(os.path.dirname(new_path))
+            tr.write(new_path, format="MSEED")
+            self.assertTrue(client_index.has_data("EF", "NEW", "", "HHZ"))
+            # removed files are searched again instead of read
+            os.remove(path)
+            self.assertEqual(
+                client_index.get_waveforms("AB", "XYZ", "", "HHZ", t, t + 5),
+                client.get_waveforms("AB", "XYZ", "", "HHZ", t, t + 5))
+            # with a refresh interval, files are checked for changes once in
+            # the interval
+            client_index = Client(temp_sds.tempdir, index=index_file,
+                                  index_refresh=3600)
+            with mock.patch.object(client_index, "_glob_filenames",
+                                   wraps=client_index._glob_filenames) as p:
+                for _ in range(3):
+                    client_index.get_waveforms("EF", "NEW", "", "HHZ", t,
+                                               t + 5)
+                self.assertEqual(p.call_count, 1)
+            client_index._get_index().close()
+
+    def test_get_waveforms_bulk(self):
+        """
+        Test that bulk requests give the same data as single requests and
+        read every file only once.
+        """
+        t = UTCDateTime(2015, 1, 1)
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            bulk = [("AB", "XYZ", "", "HHZ", t - 20, t + 20),
+                    ("AB", "XYZ", "", "HHZ", t - 200, t - 100),
+                    ("AB", "XYZ", "", "HHZ", t - 30, t + 10),
+                    ("CD", "ZZZ3", "*", "BH?", t - 50, t + 50),
+                    ("CD", "ZZZ3", "00", "BHZ", t + 5000, t + 6000)]
+            for merge in (-1, None):
+                expected = Stream()
+                for args in bulk:
+                    expected += client.get_waveforms(*args, merge=merge)
+                got = client.get_waveforms_bulk(bulk, merge=merge)
+                # processing history differs as data is read in one go
+                for tr in got + expected:
+                    tr.stats.pop("processing", None)
+                self.assertEqual(got, expected)
+            # every file is only read once
+            with mock.patch("obspy.clients.filesystem.sds.read",
+                            wraps=read) as p:
+                client.get_waveforms_bulk(bulk[:3])
+                self.assertEqual(p.call_count, 2)
+                read_files = [call[0][0] for call in p.call_args_list]
+                self.assertEqual(len(set(read_files)), 2)
+            self.assertRaises(ValueError, client.get_waveforms_bulk,
+                              [("AB", "XYZ", "", "HHZ", t, t - 1)])
+
+    def test_iter_waveforms(self):
+        """
+        Test iterating over windows of data, windows have to be the same as
+        when sliding over the full data.
+        """
+        t = UTCDateTime(2015, 1, 1)
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            t1, t2 = t - 300, t + 690
+            for window_length, step in ((100, 50), (100, 100), (30, 70)):
+                st = client.get_waveforms("AB", "XYZ", "*", "HH?", t1, t2)
+                expected = list(st.slide(window_length, step))
+                got = list(client.iter_waveforms(
+                    "AB", "XYZ", "*", "HH?", t1, t2,
+                    window_length=window_length, step=step))
+                self.assertEqual(len(got), len(expected))
+                for st1, st2 in zip(got, expected):
+                    for tr in st1 + st2:
+                        tr.stats.pop("processing", None)
+                    self.assertEqual(st1.sort(), st2.sort())
+            # data of the second day is only read when needed
+            with mock.patch("obspy.clients.filesystem.sds.read",
+                            wraps=read) as p:
+                windows = client.iter_waveforms(
+                    "AB", "XYZ", "", "HHZ", t1, t2, window_length=100)
+                next(windows)
+                call_count = p.call_count
+                self.assertEqual(len(list(windows)), 8)
+                self.assertGreater(p.call_count, call_count)
+
+    def test_decoded_data_cache(self):
+        """
+        Test the LRU cache of decoded data.
+        """
+        t = UTCDateTime(2015, 1, 1)
+        with TemporarySDSDirectory(year=None, doy=None, time=t) as temp_sds:
+            client = Client(temp_sds.tempdir)
+            # both files of a channel hold 100 samples of 4 bytes in total
+            client_cache = Client(temp_sds.tempdir, cache_size=400)
+            args = ("AB", "XYZ", "", "HHZ")
+            for t1, t2 in ((t - 20, t + 20), (t - 200, t + 200),
+                           (t - 10, t + 30)):
+                got = client_cache.get_waveforms(*args, starttime=t1,
+                                                 endtime=t2)
+                expected = client.get_waveforms(*args, starttime=t1,
+                                                endtime=t2)
+                for tr in got + expected:
+                    tr.stats.pop("processing", None)
+                self.assertEqual(got, expected)
+            stats = client_cache.cache_statistics
+            self.assertEqual(stats["misses"], 2)
+            self.assertEqual(stats["hits"], 4)
+            self.assertEqual(stats["evictions"], 0)
+            self.assertEqual(stats["files"], 2)
+            self.assertEqual(stats["bytes"], 400)
+            # returned data can be modified without changing cached data
+            st = client_cache.get_waveforms(*args, starttime=t - 20,
+                                            endtime=t + 20)
+            st[0].data[:] = 0
+            st = client_cache.get_waveforms(*args, starttime=t - 20,
+                                            endtime=t + 20)
+            self.assertTrue(st[0].data.any())
+            # least recently used files get evicted
+            client_cache.get_waveforms("AB", "XYZ", "", "HHN", t - 20,
+                                       t + 20)
+            stats = client_cache.cache_statistics
+            self.assertEqual(stats["files"], 2)
+            self.assertEqual(stats["evictions"], 2)
+            self.assertEqual(stats["bytes"], 400)
+            client_cache.clear_cache()
+            self.assertEqual(client_cache.cache_statistics,
+                             {"hits": 0, "misses": 0, "evictions": 0,
+                              "bytes": 0, "files": 0})
+            # changed files are decoded again
+            client_cache.get_waveforms(*args, starttime=t - 20,
+                                       endtime=t + 20)
+            filename = client._get_filename(*args, time=t)
+            tr = read(filename)[0]
+            tr.data += 1
+            tr.write(filename, format="MSEED")
+            os.utime(filename, (0, 0))
+            st = client_cache.get_waveforms(*args, starttime=t + 60,
+                                            endtime=t + 80)
+            self.assertEqual(client_cache.cache_statistics["misses"], 3)
+            self.assertEqual(st[0].data[0], tr.data[0])
+            # decoded data is not pickled
+            self.assertEqual(client_cache.cache_statistics["files"], 2)
+            client_copy = pickle.loads(pickle.dumps(client_cache))
+            self.assertEqual(client_copy.cache_statistics,
+                             {"hits": 0, "misses": 0, "evictions": 0,
+                              "bytes": 0, "files": 0})
+            # concurrent use from several threads
+            client_copy.cache_size = 800
+            requests = [(cha, t1) for cha in ("HHZ", "HHN", "HHE")
+                        for t1 in (t - 20, t + 20, t - 60)] * 4
+            pool = ThreadPool(4)
+            try:
+                results = pool.map(
+                    lambda x: client_copy.get_waveforms(
+                        "AB", "XYZ", "", x[0], x[1], x[1] + 30), requests)
+            finally:
+                pool.close()
+                pool.join()
+            for (cha, t1), got in zip(requests, results):
+                expected = client.get_waveforms("AB", "XYZ", "", cha, t1,
+                                                t1 + 30)
+                for tr in got + expected:
+                    tr.stats.pop("processing", None)
+                self.assertEqual(got, expected)
+            stats = client_copy.cache_statistics
+            self.assertEqual(stats["hits"] + stats["misses"],
+                             2 * len(requests))
+            self.assertEqual(stats["bytes"], sum(
+                nbytes for _, nbytes in client_copy._cache.values()))
+            self.assertLessEqual(stats["bytes"], 800)
+
 
 def suite():
     return unittest.makeSuite(SDSTestCase, 'test')
@@ -114,10 +114,10 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 # don't change order
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.trace import Stats, Trace
-from obspy.core.stream import Stream, read
+from obspy.core.stream import Stream, read, read_iter
 from obspy.scripts.runtests import run_tests
 
 
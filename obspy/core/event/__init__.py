@@ -34,6 +34,7 @@ from .origin import Origin, OriginQuality, OriginUncertainty, Pick, Arrival
 from .source import (
     Axis, FocalMechanism, MomentTensor, NodalPlane, NodalPlanes, PrincipalAxes,
     SourceTimeFunction, Tensor)
+from .table import EventTable
 
 if __name__ == '__main__':
     import doctest
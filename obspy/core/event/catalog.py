@@ -31,7 +31,7 @@ import warnings
 import numpy as np
 from pkg_resources import load_entry_point
 
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
 from obspy.core.util import NamedTemporaryFile, _read_from_plugin
 from obspy.core.util.base import ENTRY_POINTS, download_to_file
 from obspy.core.util.decorator import (map_example_filename, rlock,
@@ -398,6 +398,66 @@ class Catalog(object):
             events = [ev for ev in self.events if ev not in events]
         return Catalog(events=events)
 
+    def origin_times(self):
+        """
+        Return the origin times of all events as one array.
+
+        Uses the preferred origin of each event, or its first origin if
+        none is preferred. Events without an origin time get a missing value
+        (``NaT``). Allows selecting events with vectorized comparisons
+        instead of looping over the events.
+
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+        :return: Origin times (nanosecond resolution) in order of the events,
+            convertible to a ``datetime64[ns]`` array with
+            :func:`numpy.asarray`.
+
+        .. rubric:: Example
+
+        >>> from obspy.core.event import read_events
+        >>> cat = read_events()
+        >>> times = cat.origin_times()
+        >>> mask = times < UTCDateTime("2012-04-04T14:20")
+        >>> print(Catalog([event for event, m in zip(cat, mask) if m]))
+        2 Event(s) in Catalog:
+        2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML | manual
+        2012-04-04T14:08:46.000000Z | +38.017,  +37.736 | 3.0 ML | manual
+        """
+        times = []
+        for event in self.events:
+            origin = event.preferred_origin()
+            if origin is None and event.origins:
+                origin = event.origins[0]
+            times.append(origin.time if origin is not None else None)
+        return UTCDateTimeArray(times)
+
+    def to_table(self, keep_events=True):
+        """
+        Returns a columnar representation of the catalog.
+
+        The table holds the parameters of the preferred (or first) origin and
+        magnitude of all events in numpy arrays which allows fast filtering,
+        sorting and spatial selection of large catalogs.
+
+        :type keep_events: bool, optional
+        :param keep_events: Keep references to the events in the table so
+            that :meth:`EventTable.to_catalog()
+            <obspy.core.event.table.EventTable.to_catalog>` returns the
+            original events.
+        :rtype: :class:`~obspy.core.event.table.EventTable`
+
+        .. rubric:: Example
+
+        >>> from obspy.core.event import read_events
+        >>> cat = read_events()
+        >>> table = cat.to_table()
+        >>> print(table.filter("magnitude > 4.3").to_catalog())
+        1 Event(s) in Catalog:
+        2012-04-04T14:21:42.300000Z | +41.818,  +79.689 | 4.4 mb | manual
+        """
+        from .table import EventTable
+        return EventTable.from_catalog(self, keep_events=keep_events)
+
     def copy(self):
         """
         Returns a deepcopy of the Catalog object.
@@ -0,0 +1,512 @@
+# -*- coding: utf-8 -*-
+"""
+obspy.core.event.table - Columnar representation of event catalogs
+=================================================================
+This module provides the :class:`EventTable` class holding the most
+important parameters of many events (those of the preferred origin and
+magnitude) in numpy arrays. Selecting, filtering and sorting large event sets
+works on whole arrays at once instead of looping over
+:class:`~obspy.core.event.event.Event` objects.
+
+:copyright:
+    The ObsPy Development Team (devs@obspy.org)
+:license:
+    GNU Lesser General Public License, Version 3
+    (http://www.gnu.org/copyleft/lesser.html)
+"""
+from __future__ import (absolute_import, division, print_function,
+                        unicode_literals)
+from future.builtins import *  # NOQA
+
+from operator import ge, gt, le, lt
+
+import numpy as np
+
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
+
+from .catalog import Catalog
+from .event import Event
+from .magnitude import Magnitude
+from .origin import Origin, OriginQuality
+
+
+_OPERATORS = {"<": lt, "<=": le, ">": gt, ">=": ge}
+
+
+def _locations2degrees(lat1, long1, lat2, long2):
+    """
+    Vectorized version of :func:`obspy.geodetics.base.locations2degrees`.
+    """
+    lat1 = np.radians(lat1)
+    lat2 = np.radians(lat2)
+    long_diff = np.radians(long2) - np.radians(long1)
+    return np.degrees(np.arctan2(
+        np.sqrt((np.cos(lat2) * np.sin(long_diff)) ** 2 +
+                (np.cos(lat1) * np.sin(lat2) - np.sin(lat1) *
+                 np.cos(lat2) * np.cos(long_diff)) ** 2),
+        np.sin(lat1) * np.sin(lat2) + np.cos(lat1) * np.cos(lat2) *
+        np.cos(long_diff)))
+
+
+def _float(value):
+    return np.nan if value is None else float(value)
+
+
+class EventTable(object):
+    """
+    Columnar representation of the preferred origins and magnitudes of many
+    events.
+
+    Every column is a numpy array with one entry per event. Missing values
+    are ``NaN`` (``NaT`` for the origin times). Tables are usually created
+    with :meth:`Catalog.to_table() <obspy.core.event.Catalog.to_table>` but
+    can also be built directly from arrays, e.g. when reading a large
+    catalog from a text file, which needs only a small fraction of the
+    memory of the full event objects.
+
+    :type time: :class:`~obspy.core.utcdatetime.UTCDateTimeArray` or
+        iterable
+    :param time: Origin times, anything
+        :class:`~obspy.core.utcdatetime.UTCDateTimeArray` accepts.
+    :type latitude: array-like of float, optional
+    :param latitude: Origin latitudes in degrees.
+    :type longitude: array-like of float, optional
+    :param longitude: Origin longitudes in degrees.
+    :type depth: array-like of float, optional
+    :param depth: Origin depths in meters.
+    :type magnitude: array-like of float, optional
+    :param magnitude: Magnitude values.
+    :type magnitude_type: array-like of str, optional
+    :param magnitude_type: Magnitude types, e.g. ``"MW"``.
+    :type standard_error: array-like of float, optional
+    :param standard_error: RMS of the travel time residuals of the origins.
+    :type azimuthal_gap: array-like of float, optional
+    :param azimuthal_gap: Azimuthal gaps of the origins in degrees.
+    :type used_station_count: array-like of float, optional
+    :param used_station_count: Number of stations used for the origins.
+    :type used_phase_count: array-like of float, optional
+    :param used_phase_count: Number of phases used for the origins.
+    :type events: list of :class:`~obspy.core.event.event.Event`, optional
+    :param events: The events the rows were extracted from. If given, they
+        are returned again by :meth:`to_catalog` and when indexing single
+        rows, otherwise new minimal events are created from the columns.
+
+    .. rubric:: Example
+
+    >>> from obspy import read_events
+    >>> table = read_events().to_table()
+    >>> print(table)
+    3 Event(s) in EventTable:
+    2012-04-04T14:21:42.300000Z | +41.818,  +79.689 | 4.4 mb
+    2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML
+    2012-04-04T14:08:46.000000Z | +38.017,  +37.736 | 3.0 ML
+    >>> print(table.magnitude.tolist())
+    [4.4, 4.3, 3.0]
+    >>> print(table.filter("magnitude >= 4.0", "latitude < 40.0"))
+    1 Event(s) in EventTable:
+    2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML
+    >>> print(table.sort(["magnitude"]).to_catalog())
+    3 Event(s) in Catalog:
+    2012-04-04T14:08:46.000000Z | +38.017,  +37.736 | 3.0 ML | manual
+    2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML | manual
+    2012-04-04T14:21:42.300000Z | +41.818,  +79.689 | 4.4 mb | manual
+    """
+    float_columns = ("latitude", "longitude", "depth", "magnitude",
+                     "standard_error", "azimuthal_gap", "used_station_count",
+                     "used_phase_count")
+    quality_columns = ("standard_error", "azimuthal_gap",
+                       "used_station_count", "used_phase_count")
+    filter_keys = ("time",) + float_columns
+
+    def __init__(self, time=(), latitude=None, longitude=None, depth=None,
+                 magnitude=None, magnitude_type=None, standard_error=None,
+                 azimuthal_gap=None, used_station_count=None,
+                 used_phase_count=None, events=None):
+        if not isinstance(time, UTCDateTimeArray):
+            time = UTCDateTimeArray(time)
+        self.time = time
+        length = len(time)
+        columns = {
+            "latitude": latitude, "longitude": longitude, "depth": depth,
+            "magnitude": magnitude, "standard_error": standard_error,
+            "azimuthal_gap": azimuthal_gap,
+            "used_station_count": used_station_count,
+            "used_phase_count": used_phase_count}
+        for name, values in columns.items():
+            if values is None:
+                values = np.full(length, np.nan)
+            else:
+                values = np.array(values, dtype=np.float64).ravel()
+            self._check_length(name, values, length)
+            setattr(self, name, values)
+        if magnitude_type is None:
+            magnitude_type = np.empty(length, dtype=object)
+        else:
+            magnitude_type = np.array(magnitude_type, dtype=object).ravel()
+        self._check_length("magnitude_type", magnitude_type, length)
+        self.magnitude_type = magnitude_type
+        if events is not None:
+            events = list(events)
+            self._check_length("events", events, length)
+        self.events = events
+
+    @staticmethod
+    def _check_length(name, values, length):
+        if len(values) != length:
+            msg = "Column '%s' has %i entries but there are %i origin " \
+                  "times." % (name, len(values), length)
+            raise ValueError(msg)
+
+    @classmethod
+    def from_catalog(cls, catalog, keep_events=True):
+        """
+        Creates a table from the preferred (or first) origins and magnitudes
+        of all events of a catalog.
+
+        :type catalog: :class:`~obspy.core.event.Catalog` or list of
+            :class:`~obspy.core.event.event.Event`
+        :param catalog: Events to put in the table.
+        :type keep_events: bool, optional
+        :param keep_events: Keep references to the events so that
+            :meth:`to_catalog` returns the original (complete) events. Set to
+            ``False`` to allow the events to be garbage collected.
+        :rtype: :class:`EventTable`
+        """
+        events = list(catalog)
+        length = len(events)
+        time = np.empty(length, dtype=np.int64)
+        columns = dict((name, np.full(length, np.nan))
+                       for name in cls.float_columns)
+        magnitude_type = np.empty(length, dtype=object)
+        nat = UTCDateTimeArray.NAT
+        for i, event in enumerate(events):
+            origin = event.preferred_origin()
+            if origin is None and event.origins:
+                origin = event.origins[0]
+            if origin is None or origin.time is None:
+                time[i] = nat
+            else:
+                time[i] = origin.time._ns
+            if origin is not None:
+                columns["latitude"][i] = _float(origin.latitude)
+                columns["longitude"][i] = _float(origin.longitude)
+                columns["depth"][i] = _float(origin.depth)
+                quality = origin.quality
+                if quality is not None:
+                    for key in cls.quality_columns:
+                        columns[key][i] = _float(quality.get(key))
+            magnitude = event.preferred_magnitude()
+            if magnitude is None and event.magnitudes:
+                magnitude = event.magnitudes[0]
+            if magnitude is not None:
+                columns["magnitude"][i] = _float(magnitude.mag)
+                magnitude_type[i] = magnitude.magnitude_type
+        return cls(time=UTCDateTimeArray.from_ns(time),
+                   magnitude_type=magnitude_type,
+                   events=events if keep_events else None, **columns)
+
+    def __len__(self):
+        return len(self.time)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        """
+        Returns the event of a single row for an integer index, or a new
+        table with the selected rows for slices, boolean masks and index
+        arrays.
+        """
+        if isinstance(index, (int, np.integer)):
+            if self.events is not None:
+                return self.events[index]
+            return self._create_event(index)
+        rows = np.arange(len(self))[index]
+        kwargs = dict((name, getattr(self, name)[rows])
+                      for name in self.float_columns)
+        events = None
+        if self.events is not None:
+            events = [self.events[i] for i in rows]
+        return self.__class__(
+            time=self.time[rows], magnitude_type=self.magnitude_type[rows],
+            events=events, **kwargs)
+
+    def _create_event(self, index):
+        """
+        Creates a minimal event from the values of one row.
+        """
+        event = Event()
+        time = self.time[index]
+        latitude, longitude, depth = [
+            getattr(self, key)[index]
+            for key in ("latitude", "longitude", "depth")]
+        if time is not None or not np.isnan(latitude) or \
+                not np.isnan(longitude):
+            origin = Origin(time=time)
+            for key, value in (("latitude", latitude),
+                               ("longitude", longitude), ("depth", depth)):
+                if not np.isnan(value):
+                    setattr(origin, key, value)
+            quality = {}
+            for key in self.quality_columns:
+                value = getattr(self, key)[index]
+                if not np.isnan(value):
+                    if key.endswith("count"):
+                        value = int(value)
+                    quality[key] = value
+            if quality:
+                origin.quality = OriginQuality(**quality)
+            event.origins.append(origin)
+            event.preferred_origin_id = origin.resource_id
+        if not np.isnan(self.magnitude[index]):
+            magnitude = Magnitude(
+                mag=self.magnitude[index],
+                magnitude_type=self.magnitude_type[index])
+            if event.origins:
+                magnitude.origin_id = event.origins[0].resource_id
+            event.magnitudes.append(magnitude)
+            event.preferred_magnitude_id = magnitude.resource_id
+        return event
+
+    def _row_str(self, index):
+        out = "%s | %+7.3f, %+8.3f" % (
+            self.time[index], self.latitude[index], self.longitude[index])
+        if not np.isnan(self.magnitude[index]):
+            out += " | %s %-2s" % (self.magnitude[index],
+                                   self.magnitude_type[index])
+        return out
+
+    def __str__(self, print_all=False):
+        """
+        Returns short summary string of the current table.
+
+        :type print_all: bool, optional
+        :param print_all: If True, all rows will be printed, otherwise a
+            maximum of ten rows will be printed.
+            Defaults to False.
+        """
+        out = str(len(self)) + ' Event(s) in EventTable:\n'
+        if len(self) <= 10 or print_all is True:
+            out += "\n".join([self._row_str(i) for i in range(len(self))])
+        else:
+            out += "\n".join([self._row_str(i) for i in range(2)])
+            out += "\n...\n"
+            out += "\n".join([self._row_str(i) for i in (-2, -1)])
+            out += "\nTo see all events call " + \
+                   "'print(EventTableObject.__str__(print_all=True))'"
+        return out
+
+    def _repr_pretty_(self, p, cycle):
+        p.text(self.__str__(print_all=p.verbose))
+
+    def filter(self, *args, **kwargs):
+        """
+        Returns a new table only containing the rows whose preferred origin
+        and magnitude match the specified filter rules.
+
+        Filter rules are written like for :meth:`Catalog.filter()
+        <obspy.core.event.Catalog.filter>`, valid filter keys are:
+
+        * magnitude;
+        * longitude;
+        * latitude;
+        * depth;
+        * time;
+        * standard_error;
+        * azimuthal_gap;
+        * used_station_count;
+        * used_phase_count.
+
+        Unlike :meth:`Catalog.filter() <obspy.core.event.Catalog.filter>`,
+        which looks at the first origin and magnitude of every event, the
+        rules are applied to the values in the table, i.e. to the preferred
+        origin and magnitude (see :meth:`from_catalog`), and a magnitude of
+        ``0.0`` is not treated as missing. Rows without a magnitude never
+        match rules on the magnitude, missing origin (origin quality) values
+        match ``<`` and ``<=`` rules if the row has an origin (origin
+        quality) at all (see :meth:`to_catalog`) and never match ``>`` and
+        ``>=`` rules. Use ``inverse=True`` to return the rows that *do not*
+        match the specified filter rules.
+
+        :rtype: :class:`EventTable`
+
+        .. rubric:: Example
+
+        >>> from obspy import read_events
+        >>> table = read_events().to_table()
+        >>> print(table.filter("time > 2012-04-04T14:10",
+        ...                    "time < 2012-04-04T14:20"))
+        1 Event(s) in EventTable:
+        2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML
+        """
+        inverse = kwargs.get("inverse", False)
+        mask = np.ones(len(self), dtype=np.bool_)
+        # rows with origin and origin quality, same as in _create_event()
+        has_origin = ~self.time.isnat() | ~np.isnan(self.latitude) | \
+            ~np.isnan(self.longitude)
+        has_quality = has_origin.copy()
+        if len(self):
+            has_quality &= np.any([~np.isnan(getattr(self, key))
+                                   for key in self.quality_columns], axis=0)
+        for arg in args:
+            try:
+                key, operator, value = arg.split(" ", 2)
+                compare = _OPERATORS[operator]
+            except (ValueError, KeyError):
+                msg = "%s is not a valid filter rule." % arg
+                raise ValueError(msg)
+            if key not in self.filter_keys:
+                msg = "%s is not a valid filter key" % key
+                raise ValueError(msg)
+            if key == "time":
+                missing = self.time.isnat()
+                matches = compare(self.time, UTCDateTime(value))
+            else:
+                values = getattr(self, key)
+                missing = np.isnan(values)
+                with np.errstate(invalid="ignore"):
+                    matches = compare(values, float(value))
+            if key != "magnitude" and operator in ("<", "<="):
+                if key in self.quality_columns:
+                    matches |= missing & has_quality
+                else:
+                    matches |= missing & has_origin
+            mask &= matches
+        if inverse:
+            mask = ~mask
+        return self[mask]
+
+    def select(self, starttime=None, endtime=None, minlatitude=None,
+               maxlatitude=None, minlongitude=None, maxlongitude=None,
+               latitude=None, longitude=None, minradius=None, maxradius=None,
+               minmagnitude=None, maxmagnitude=None):
+        """
+        Returns a new table with the rows in the given time span, region and
+        magnitude range.
+
+        The parameters have the same meaning as for FDSN event web services
+        (all limits are inclusive). Rows with a missing value never match a
+        given limit on that value.
+
+        :type starttime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param starttime: Earliest origin time.
+        :type endtime: :class:`~obspy.core.utcdatetime.UTCDateTime`
+        :param endtime: Latest origin time.
+        :type minlatitude: float
+        :param minlatitude: Southern boundary in degrees.
+        :type maxlatitude: float
+        :param maxlatitude: Northern boundary in degrees.
+        :type minlongitude: float
+        :param minlongitude: Western boundary in degrees. The region crosses
+            the antimeridian if it is larger than ``maxlongitude``.
+        :type maxlongitude: float
+        :param maxlongitude: Eastern boundary in degrees.
+        :type latitude: float
+        :param latitude: Latitude of the center for a radial selection.
+        :type longitude: float
+        :param longitude: Longitude of the center for a radial selection.
+        :type minradius: float
+        :param minradius: Minimum distance from the center in degrees.
+        :type maxradius: float
+        :param maxradius: Maximum distance from the center in degrees.
+        :type minmagnitude: float
+        :param minmagnitude: Minimum magnitude.
+        :type maxmagnitude: float
+        :param maxmagnitude: Maximum magnitude.
+        :rtype: :class:`EventTable`
+
+        .. rubric:: Example
+
+        >>> from obspy import read_events
+        >>> table = read_events().to_table()
+        >>> print(table.select(latitude=40.0, longitude=40.0, maxradius=3.0))
+        2 Event(s) in EventTable:
+        2012-04-04T14:18:37.000000Z | +39.342,  +41.044 | 4.3 ML
+        2012-04-04T14:08:46.000000Z | +38.017,  +37.736 | 3.0 ML
+        """
+        mask = np.ones(len(self), dtype=np.bool_)
+        if starttime is not None:
+            mask &= self.time >= starttime
+        if endtime is not None:
+            mask &= self.time <= endtime
+        with np.errstate(invalid="ignore"):
+            if minlatitude is not None:
+                mask &= self.latitude >= minlatitude
+            if maxlatitude is not None:
+                mask &= self.latitude <= maxlatitude
+            if minlongitude is not None and maxlongitude is not None and \
+                    minlongitude > maxlongitude:
+                mask &= (self.longitude >= minlongitude) | \
+                    (self.longitude <= maxlongitude)
+            else:
+                if minlongitude is not None:
+                    mask &= self.longitude >= minlongitude
+                if maxlongitude is not None:
+                    mask &= self.longitude <= maxlongitude
+            if minradius is not None or maxradius is not None:
+                if latitude is None or longitude is None:
+                    msg = "Radial selection needs latitude and longitude."
+                    raise ValueError(msg)
+                distance = _locations2degrees(
+                    latitude, longitude, self.latitude, self.longitude)
+                if minradius is not None:
+                    mask &= distance >= minradius
+                if maxradius is not None:
+                    mask &= distance <= maxradius
+            if minmagnitude is not None:
+                mask &= self.magnitude >= minmagnitude
+            if maxmagnitude is not None:
+                mask &= self.magnitude <= maxmagnitude
+        return self[mask]
+
+    def sort(self, keys=("time",), reverse=False):
+        """
+        Returns a new table sorted by the given columns.
+
+        :type keys: list of str, optional
+        :param keys: Columns to sort by, the first one has the highest
+            priority. Valid keys are ``"time"`` and all numerical columns.
+        :type reverse: bool, optional
+        :param reverse: Sort in descending order.
+        :rtype: :class:`EventTable`
+
+        Missing values are sorted to the end (to the start if ``reverse`` is
+        ``True``).
+        """
+        if isinstance(keys, (str, bytes)):
+            keys = [keys]
+        columns = []
+        for key in keys:
+            if key not in self.filter_keys:
+                msg = "%s is not a valid sort key" % key
+                raise ValueError(msg)
+            if key == "time":
+                column = np.where(self.time.isnat(),
+                                  np.iinfo(np.int64).max, self.time.ns)
+            else:
+                column = getattr(self, key)
+            columns.append(column)
+        if not columns:
+            return self[:]
+        rows = np.lexsort(columns[::-1])
+        if reverse:
+            rows = rows[::-1]
+        return self[rows]
+
+    def to_catalog(self):
+        """
+        Returns a catalog with the events of all rows.
+
+        If the table was created from events these are returned (not copies),
+        otherwise minimal events with one origin and magnitude are created
+        from the columns.
+
+        :rtype: :class:`~obspy.core.event.Catalog`
+        """
+        return Catalog(events=list(self))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod(exclude_empty=True)
@@ -211,7 +211,7 @@ from .response import (CoefficientsTypeResponseStage,
                        CoefficientWithUncertainties, FilterCoefficient,
                        FIRResponseStage, InstrumentPolynomial,
                        InstrumentSensitivity, PolesZerosResponseStage,
-                       PolynomialResponseStage, Response,
+                       PolynomialResponseStage, Response, ResponseCache,
                        ResponseListResponseStage, ResponseStage)
 from .station import Station
 
@@ -198,6 +198,53 @@ class Channel(BaseNode):
     def _repr_pretty_(self, p, cycle):
         p.text(str(self))
 
+    def __eq__(self, other):
+        # responses that are read lazily have to be compared after reading
+        if isinstance(other, Channel):
+            self._load_response()
+            other._load_response()
+        return super(Channel, self).__eq__(other)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    # defaults for channels unpickled from before the response could be read
+    # lazily, see __setstate__()
+    _response = None
+    _response_loader = None
+
+    def __setstate__(self, state):
+        # the response used to be stored as plain attribute
+        if "response" in state:
+            state = dict(state)
+            state["_response"] = state.pop("response")
+            state["_response_loader"] = None
+        self.__dict__.update(state)
+
+    def _set_response_loader(self, loader):
+        """
+        Sets a function returning the response of the channel, it will only
+        be called when the response is accessed for the first time.
+        """
+        self._response = None
+        self._response_loader = loader
+
+    def _load_response(self):
+        if self._response_loader is not None:
+            loader = self._response_loader
+            self._response_loader = None
+            self._response = loader()
+
+    @property
+    def response(self):
+        self._load_response()
+        return self._response
+
+    @response.setter
+    def response(self, value):
+        self._response_loader = None
+        self._response = value
+
     @property
     def location_code(self):
         return self._location_code
@@ -14,6 +14,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 from future.utils import python_2_unicode_compatible, native_str
 
+import bisect
 import copy
 import fnmatch
 import os
@@ -47,7 +48,7 @@ def _create_example_inventory():
 
 
 @map_example_filename("path_or_file_object")
-def read_inventory(path_or_file_object=None, format=None):
+def read_inventory(path_or_file_object=None, format=None, **kwargs):
     """
     Function to read inventory files.
 
@@ -56,6 +57,20 @@ def read_inventory(path_or_file_object=None, format=None):
         object will be returned.
     :type format: str, optional
     :param format: Format of the file to read (e.g. ``"STATIONXML"``).
+    :param kwargs: Additional keyword arguments passed to the underlying
+        plugin, e.g. ``level`` and ``lazy`` for StationXML files (see
+        :func:`obspy.io.stationxml.core._read_stationxml`).
+
+    .. rubric:: Example
+
+    Read only the coordinates of all stations, skipping channels and
+    responses:
+
+    >>> from obspy import read_inventory
+    >>> inv = read_inventory("/path/to/BW_GR_misc.xml", level="station")
+    >>> contents = inv.get_contents()
+    >>> print(len(contents["stations"]), len(contents["channels"]))
+    5 0
 
     .. note::
 
@@ -74,9 +89,9 @@ def read_inventory(path_or_file_object=None, format=None):
             os.path.basename(path_or_file_object).partition('.')[2] or '.tmp'
         with NamedTemporaryFile(suffix=suffix) as fh:
             download_to_file(url=path_or_file_object, filename_or_buffer=fh)
-            return read_inventory(fh.name, format=format)
+            return read_inventory(fh.name, format=format, **kwargs)
     return _read_from_plugin("inventory", path_or_file_object,
-                             format=format)[0]
+                             format=format, **kwargs)[0]
 
 
 @python_2_unicode_compatible
@@ -86,6 +101,10 @@ class Inventory(ComparingObject):
 
     In essence just a container for one or more networks.
     """
+    # lookup index of all channels by SEED ID, built on demand, see
+    # Inventory._rebuild_index()
+    _index = None
+
     def __init__(self, networks, source, sender=None, created=None,
                  module=SOFTWARE_MODULE, module_uri=SOFTWARE_URI):
         """
@@ -124,6 +143,17 @@ class Inventory(ComparingObject):
         else:
             self.created = created
 
+    def __eq__(self, other):
+        # the lookup index is no part of the inventory information
+        if not isinstance(other, Inventory):
+            return False
+        return self.__getstate__() == other.__getstate__()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_index", None)
+        return state
+
     def __add__(self, other):
         new = copy.deepcopy(self)
         new += other
@@ -140,6 +170,7 @@ class Inventory(ComparingObject):
             msg = ("Only Inventory and Network objects can be added to "
                    "an Inventory.")
             raise TypeError(msg)
+        self._index = None
         return self
 
     def __len__(self):
@@ -289,6 +320,89 @@ class Inventory(ComparingObject):
             msg = "networks can only contain Network objects."
             raise ValueError(msg)
         self._networks = value
+        self._index = None
+
+    def _get_index(self):
+        """
+        Lookup index of all channels in the inventory by SEED ID, built on
+        first use (see :meth:`_rebuild_index`).
+
+        :rtype: dict
+        :returns: Dictionary mapping SEED IDs to a tuple of a sorted list of
+            channel start times (as POSIX timestamps, ``-inf`` if not set)
+            and a list of ``(position, network, station, channel)`` tuples in
+            the same order, ``position`` being the position of the channel in
+            the inventory.
+        """
+        if self._index is None:
+            self._rebuild_index()
+        return self._index
+
+    def _rebuild_index(self):
+        """
+        Rebuild the lookup index of all channels by SEED ID used by
+        :meth:`get_response` and :meth:`get_coordinates`.
+
+        The index is dropped automatically when ``networks`` is replaced or
+        networks are added with ``+=``. It has to be rebuilt explicitly after
+        modifying the networks, stations or channels of the inventory in
+        place, e.g. after changing codes or start dates or adding channels to
+        a station.
+        """
+        index = {}
+        position = 0
+        for net in self._networks:
+            for sta in net.stations:
+                for cha in sta.channels:
+                    seed_id = "%s.%s.%s.%s" % (
+                        net.code, sta.code, cha.location_code, cha.code)
+                    if cha.start_date is None:
+                        start = -float("inf")
+                    else:
+                        start = cha.start_date.timestamp
+                    index.setdefault(seed_id, []).append(
+                        (start, position, net, sta, cha))
+                    position += 1
+        for seed_id, entries in index.items():
+            entries.sort(key=lambda x: x[:2])
+            index[seed_id] = ([entry[0] for entry in entries],
+                              [entry[1:] for entry in entries])
+        self._index = index
+
+    def _get_candidate_networks(self, seed_id, datetime=None):
+        """
+        Look up candidate channels with given SEED ID using the lookup index.
+
+        Channels that started after the given time (if any) are skipped, all
+        other checks are left to the
+        :class:`~obspy.core.inventory.network.Network` methods.
+
+        :rtype: list of :class:`~obspy.core.inventory.network.Network`
+        :returns: Shallow copies of all networks with candidate channels in
+            order of the inventory, only containing shallow copies of the
+            stations with candidate channels (see :meth:`select`).
+        """
+        starts, entries = self._get_index().get(seed_id, ([], []))
+        if isinstance(datetime, obspy.UTCDateTime):
+            entries = entries[:bisect.bisect_right(starts, datetime.timestamp)]
+        networks = []
+        for _, net, sta, cha in sorted(entries, key=lambda x: x[0]):
+            if not networks or networks[-1][0] is not net:
+                networks.append((net, []))
+            stations = networks[-1][1]
+            if not stations or stations[-1][0] is not sta:
+                stations.append((sta, []))
+            stations[-1][1].append(cha)
+        candidates = []
+        for net, stations in networks:
+            net = copy.copy(net)
+            net.stations = []
+            for sta, channels in stations:
+                sta = copy.copy(sta)
+                sta.channels = channels
+                net.stations.append(sta)
+            candidates.append(net)
+        return candidates
 
     def get_response(self, seed_id, datetime):
         """
@@ -307,6 +421,11 @@ class Inventory(ComparingObject):
             Stage 2: CoefficientsTypeResponseStage from V to COUNTS, gain: ...
             Stage 3: CoefficientsTypeResponseStage from COUNTS to COUNTS, ...
 
+        .. note::
+            Channels are looked up in an index that is built on first use.
+            After modifying the networks, stations or channels of the
+            inventory in place, :meth:`_rebuild_index` has to be called.
+
         :type seed_id: str
         :param seed_id: SEED ID string of channel to get response for.
         :type datetime: :class:`~obspy.core.utcdatetime.UTCDateTime`
@@ -314,12 +433,8 @@ class Inventory(ComparingObject):
         :rtype: :class:`~obspy.core.inventory.response.Response`
         :returns: Response for time series specified by input arguments.
         """
-        network, _, _, _ = seed_id.split(".")
-
         responses = []
-        for net in self.networks:
-            if net.code != network:
-                continue
+        for net in self._get_candidate_networks(seed_id, datetime):
             try:
                 responses.append(net.get_response(seed_id, datetime))
             except Exception:
@@ -336,6 +451,11 @@ class Inventory(ComparingObject):
         """
         Return coordinates for a given channel.
 
+        .. note::
+            Channels are looked up in an index that is built on first use.
+            After modifying the networks, stations or channels of the
+            inventory in place, :meth:`_rebuild_index` has to be called.
+
         :type seed_id: str
         :param seed_id: SEED ID string of channel to get coordinates for.
         :type datetime: :class:`~obspy.core.utcdatetime.UTCDateTime`, optional
@@ -344,12 +464,8 @@ class Inventory(ComparingObject):
         :return: Dictionary containing coordinates (latitude, longitude,
             elevation)
         """
-        network, _, _, _ = seed_id.split(".")
-
         coordinates = []
-        for net in self.networks:
-            if net.code != network:
-                continue
+        for net in self._get_candidate_networks(seed_id, datetime):
             try:
                 coordinates.append(net.get_coordinates(seed_id, datetime))
             except Exception:
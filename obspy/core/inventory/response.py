@@ -14,8 +14,10 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import ctypes as C
+import hashlib
+import pickle
 import warnings
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from copy import deepcopy
 from math import pi
 
@@ -32,6 +34,68 @@ from obspy.core.util.obspy_types import (ComplexWithUncertainties, CustomFloat,
 from .util import Angle, Frequency
 
 
+# mapping of units to the unit types used by evalresp
+_EVALRESP_UNITS = {
+    "M": "DIS",
+    "NM": "DIS",
+    "CM": "DIS",
+    "MM": "DIS",
+    "M/S": "VEL",
+    "M/SEC": "VEL",
+    "NM/S": "VEL",
+    "NM/SEC": "VEL",
+    "CM/S": "VEL",
+    "CM/SEC": "VEL",
+    "MM/S": "VEL",
+    "MM/SEC": "VEL",
+    "M/S**2": "ACC",
+    "M/(S**2)": "ACC",
+    "M/SEC**2": "ACC",
+    "M/(SEC**2)": "ACC",
+    "NM/S**2": "ACC",
+    "NM/(S**2)": "ACC",
+    "NM/SEC**2": "ACC",
+    "NM/(SEC**2)": "ACC",
+    "CM/S**2": "ACC",
+    "CM/(S**2)": "ACC",
+    "CM/SEC**2": "ACC",
+    "CM/(SEC**2)": "ACC",
+    "MM/S**2": "ACC",
+    "MM/(S**2)": "ACC",
+    "MM/SEC**2": "ACC",
+    "MM/(SEC**2)": "ACC",
+    "V": "VOLTS",
+    "VOLT": "VOLTS",
+    "VOLTS": "VOLTS",
+    # This is weird, but evalresp appears to do the same.
+    "V/M": "VOLTS",
+    "COUNT": "COUNTS",
+    "COUNTS": "COUNTS",
+    "T": "TESLA",
+    "PA": "PRESSURE",
+    "MBAR": "PRESSURE"}
+
+
+def _get_evalresp_units(key):
+    """
+    Returns the evalresp unit type (e.g. ``"VEL"``) for the given units.
+
+    Warns and returns ``"UNDEF_UNITS"`` for units unknown to evalresp.
+    """
+    try:
+        key = key.upper()
+    except Exception:
+        pass
+    if key not in _EVALRESP_UNITS:
+        if key is not None:
+            msg = ("The unit '%s' is not known to ObsPy. Raw evalresp "
+                   "would refuse to calculate a response for this "
+                   "channel. Proceed with caution.") % key
+            warnings.warn(msg)
+        return "UNDEF_UNITS"
+    return _EVALRESP_UNITS[key]
+
+
 class ResponseStage(ComparingObject):
     """
     From the StationXML Definition:
@@ -478,6 +542,59 @@ class ResponseListResponseStage(ResponseStage):
             decimation_delay=decimation_delay,
             decimation_correction=decimation_correction)
 
+    def _interpolate(self, frequencies):
+        """
+        Interpolates amplitudes and phases of the response list at the given
+        frequencies.
+
+        :type frequencies: :class:`numpy.ndarray`
+        :param frequencies: Discrete frequencies to interpolate at.
+        :rtype: tuple of two arrays
+        :returns: Amplitudes and phases (in degrees) at the given frequencies.
+        """
+        # Get values as numpy arrays.
+        f = np.array([float(_i.frequency)
+                      for _i in self.response_list_elements],
+                     dtype=np.float64)
+        amp = np.array([float(_i.amplitude)
+                        for _i in self.response_list_elements],
+                       dtype=np.float64)
+        phase = np.array([float(_i.phase)
+                          for _i in self.response_list_elements],
+                         dtype=np.float64)
+
+        # Sanity check.
+        min_f = frequencies[frequencies > 0].min()
+        max_f = frequencies.max()
+
+        min_f_avail = min(f)
+        max_f_avail = max(f)
+
+        # Allow interpolation for at most two samples.
+        _d = np.abs(np.diff(f))
+        _d = _d[_d > 0].min() * 2
+        min_f_avail -= _d
+        max_f_avail += _d
+
+        if min_f < min_f_avail or max_f > max_f_avail:
+            msg = (
+                "Cannot calculate the response as it contains a "
+                "response list stage with frequencies only from "
+                "%.4f - %.4f Hz. You are requesting a response from "
+                "%.4f - %.4f Hz.")
+            raise ValueError(msg % (min_f_avail, max_f_avail, min_f,
+                                    max_f))
+
+        amp = scipy.interpolate.InterpolatedUnivariateSpline(
+            f, amp, k=3)(frequencies)
+        phase = scipy.interpolate.InterpolatedUnivariateSpline(
+            f, phase, k=3)(frequencies)
+
+        # Set static offset to zero.
+        amp[amp == 0] = 0
+        phase[phase == 0] = 0
+        return amp, phase
+
 
 class ResponseListElement(ComparingObject):
     """
@@ -735,8 +852,41 @@ class Response(ComparingObject):
             msg = "response_stages must be an iterable."
             raise ValueError(msg)
 
+    def _get_stages_to_evaluate(self, start_stage=None, end_stage=None):
+        """
+        Returns the response stages to evaluate, sorted by stage sequence
+        number.
+
+        :type start_stage: int, optional
+        :param start_stage: Stage sequence number of first stage that will be
+            used (disregarding all earlier stages).
+        :type end_stage: int, optional
+        :param end_stage: Stage sequence number of last stage that will be
+            used (disregarding all later stages).
+        :rtype: list
+        """
+        all_stages = defaultdict(list)
+
+        for stage in self.response_stages:
+            # optionally select only stages as requested by user
+            if start_stage is not None:
+                if stage.stage_sequence_number < start_stage:
+                    continue
+            if end_stage is not None:
+                if stage.stage_sequence_number > end_stage:
+                    continue
+            all_stages[stage.stage_sequence_number].append(stage)
+
+        stage_lengths = set(map(len, all_stages.values()))
+        if len(stage_lengths) != 1 or stage_lengths.pop() != 1:
+            msg = "Each stage can only appear once."
+            raise ValueError(msg)
+
+        return [all_stages[i][0] for i in sorted(all_stages.keys())]
+
     def get_evalresp_response_for_frequencies(
-            self, frequencies, output="VEL", start_stage=None, end_stage=None):
+            self, frequencies, output="VEL", start_stage=None, end_stage=None,
+            engine="evalresp"):
         """
         Returns frequency response for given frequencies using evalresp.
 
@@ -758,6 +908,17 @@ class Response(ComparingObject):
         :type end_stage: int, optional
         :param end_stage: Stage sequence number of last stage that will be
             used (disregarding all later stages).
+        :type engine: str, optional
+        :param engine: Implementation used to evaluate the response. One of:
+
+            ``"evalresp"``
+                the bundled evalresp C library
+            ``"numpy"``
+                pure numpy implementation following the conventions of
+                evalresp, evaluating all frequencies at once. Unlike
+                evalresp it does not use any global state and can safely be
+                used from multiple threads.
+
         :rtype: :class:`numpy.ndarray`
         :returns: frequency response at requested frequencies
         """
@@ -766,6 +927,15 @@ class Response(ComparingObject):
                    "stages.")
             raise ObsPyException(msg)
 
+        if engine == "numpy":
+            return self._get_numpy_response_for_frequencies(
+                frequencies, output=output, start_stage=start_stage,
+                end_stage=end_stage)
+        elif engine != "evalresp":
+            msg = ("engine is '%s' but must be one of 'evalresp' or "
+                   "'numpy'") % engine
+            raise ValueError(msg)
+
         import obspy.signal.evrespwrapper as ew
         from obspy.signal.headers import clibevresp
 
@@ -786,54 +956,7 @@ class Response(ComparingObject):
                 key = key.upper()
             except Exception:
                 pass
-            units_mapping = {
-                "M": ew.ENUM_UNITS["DIS"],
-                "NM": ew.ENUM_UNITS["DIS"],
-                "CM": ew.ENUM_UNITS["DIS"],
-                "MM": ew.ENUM_UNITS["DIS"],
-                "M/S": ew.ENUM_UNITS["VEL"],
-                "M/SEC": ew.ENUM_UNITS["VEL"],
-                "NM/S": ew.ENUM_UNITS["VEL"],
-                "NM/SEC": ew.ENUM_UNITS["VEL"],
-                "CM/S": ew.ENUM_UNITS["VEL"],
-                "CM/SEC": ew.ENUM_UNITS["VEL"],
-                "MM/S": ew.ENUM_UNITS["VEL"],
-                "MM/SEC": ew.ENUM_UNITS["VEL"],
-                "M/S**2": ew.ENUM_UNITS["ACC"],
-                "M/(S**2)": ew.ENUM_UNITS["ACC"],
-                "M/SEC**2": ew.ENUM_UNITS["ACC"],
-                "M/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "NM/S**2": ew.ENUM_UNITS["ACC"],
-                "NM/(S**2)": ew.ENUM_UNITS["ACC"],
-                "NM/SEC**2": ew.ENUM_UNITS["ACC"],
-                "NM/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "CM/S**2": ew.ENUM_UNITS["ACC"],
-                "CM/(S**2)": ew.ENUM_UNITS["ACC"],
-                "CM/SEC**2": ew.ENUM_UNITS["ACC"],
-                "CM/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "MM/S**2": ew.ENUM_UNITS["ACC"],
-                "MM/(S**2)": ew.ENUM_UNITS["ACC"],
-                "MM/SEC**2": ew.ENUM_UNITS["ACC"],
-                "MM/(SEC**2)": ew.ENUM_UNITS["ACC"],
-                "V": ew.ENUM_UNITS["VOLTS"],
-                "VOLT": ew.ENUM_UNITS["VOLTS"],
-                "VOLTS": ew.ENUM_UNITS["VOLTS"],
-                # This is weird, but evalresp appears to do the same.
-                "V/M": ew.ENUM_UNITS["VOLTS"],
-                "COUNT": ew.ENUM_UNITS["COUNTS"],
-                "COUNTS": ew.ENUM_UNITS["COUNTS"],
-                "T": ew.ENUM_UNITS["TESLA"],
-                "PA": ew.ENUM_UNITS["PRESSURE"],
-                "MBAR": ew.ENUM_UNITS["PRESSURE"]}
-            if key not in units_mapping:
-                if key is not None:
-                    msg = ("The unit '%s' is not known to ObsPy. Raw evalresp "
-                           "would refuse to calculate a response for this "
-                           "channel. Proceed with caution.") % key
-                    warnings.warn(msg)
-                value = ew.ENUM_UNITS["UNDEF_UNITS"]
-            else:
-                value = units_mapping[key]
+            value = ew.ENUM_UNITS[_get_evalresp_units(key)]
 
             # Scale factor with the same logic as evalresp.
             if key in ["CM/S**2", "CM/S", "CM/SEC", "CM"]:
@@ -845,35 +968,15 @@ class Response(ComparingObject):
 
             return value
 
-        all_stages = defaultdict(list)
-
-        for stage in self.response_stages:
-            # optionally select only stages as requested by user
-            if start_stage is not None:
-                if stage.stage_sequence_number < start_stage:
-                    continue
-            if end_stage is not None:
-                if stage.stage_sequence_number > end_stage:
-                    continue
-            all_stages[stage.stage_sequence_number].append(stage)
-
-        stage_lengths = set(map(len, all_stages.values()))
-        if len(stage_lengths) != 1 or stage_lengths.pop() != 1:
-            msg = "Each stage can only appear once."
-            raise ValueError(msg)
-
-        stage_list = sorted(all_stages.keys())
-
         stage_objects = []
 
-        for stage_number in stage_list:
+        stages = self._get_stages_to_evaluate(start_stage, end_stage)
+        for blockette in stages:
             st = ew.Stage()
-            st.sequence_no = stage_number
+            st.sequence_no = blockette.stage_sequence_number
 
             stage_blkts = []
 
-            blockette = all_stages[stage_number][0]
-
             # Write the input and output units.
             st.input_units = get_unit_mapping(blockette.input_units)
             st.output_units = get_unit_mapping(blockette.output_units)
@@ -959,48 +1062,7 @@ class Response(ComparingObject):
                 blkt = ew.Blkt()
                 blkt.type = ew.ENUM_FILT_TYPES["LIST"]
 
-                # Get values as numpy arrays.
-                f = np.array([float(_i.frequency)
-                              for _i in blockette.response_list_elements],
-                             dtype=np.float64)
-                amp = np.array([float(_i.amplitude)
-                                for _i in blockette.response_list_elements],
-                               dtype=np.float64)
-                phase = np.array([
-                    float(_i.phase)
-                    for _i in blockette.response_list_elements],
-                    dtype=np.float64)
-
-                # Sanity check.
-                min_f = frequencies[frequencies > 0].min()
-                max_f = frequencies.max()
-
-                min_f_avail = min(f)
-                max_f_avail = max(f)
-
-                # Allow interpolation for at most two samples.
-                _d = np.abs(np.diff(f))
-                _d = _d[_d > 0].min() * 2
-                min_f_avail -= _d
-                max_f_avail += _d
-
-                if min_f < min_f_avail or max_f > max_f_avail:
-                    msg = (
-                        "Cannot calculate the response as it contains a "
-                        "response list stage with frequencies only from "
-                        "%.4f - %.4f Hz. You are requesting a response from "
-                        "%.4f - %.4f Hz.")
-                    raise ValueError(msg % (min_f_avail, max_f_avail, min_f,
-                                            max_f))
-
-                amp = scipy.interpolate.InterpolatedUnivariateSpline(
-                    f, amp, k=3)(frequencies)
-                phase = scipy.interpolate.InterpolatedUnivariateSpline(
-                    f, phase, k=3)(frequencies)
-
-                # Set static offset to zero.
-                amp[amp == 0] = 0
-                phase[phase == 0] = 0
+                amp, phase = blockette._interpolate(frequencies)
 
                 rl = blkt.blkt_info.list
                 rl.nresp = len(frequencies)
@@ -1172,8 +1234,100 @@ class Response(ComparingObject):
 
         return output
 
+    def _get_numpy_response_for_frequencies(
+            self, frequencies, output="VEL", start_stage=None,
+            end_stage=None):
+        """
+        Numpy implementation of :meth:`get_evalresp_response_for_frequencies`.
+
+        Follows the conventions of evalresp, including the checks of the
+        stage sequence, normalization of the stages to the frequency of the
+        instrument sensitivity, conversion of asymmetric FIR filters with
+        symmetric coefficients to zero phase filters and correcting the
+        delay of asymmetric FIR filters by the applied decimation correction.
+        """
+        out_units = output.upper()
+        if out_units not in ("DISP", "VEL", "ACC"):
+            msg = ("requested output is '%s' but must be one of 'DISP', 'VEL' "
+                   "or 'ACC'") % output
+            raise ValueError(msg)
+
+        frequencies = np.asarray(frequencies, dtype=np.float64)
+
+        stages = self._get_stages_to_evaluate(start_stage, end_stage)
+        sensitivity = float(self.instrument_sensitivity.value)
+        sensitivity_frequency = float(self.instrument_sensitivity.frequency)
+
+        filters = []
+        first_units = None
+        previous_units = None
+        for stage in stages:
+            input_units = _get_evalresp_units(stage.input_units)
+            output_units = _get_evalresp_units(stage.output_units)
+            if first_units is None:
+                first_units = input_units
+            filter_type, transfer, norm, norm_frequency, delay = \
+                _get_numpy_stage_filter(stage)
+            if filter_type is not None:
+                if previous_units is not None and \
+                        previous_units != input_units:
+                    msg = "Units mismatch between stages."
+                    raise ValueError(msg)
+                previous_units = output_units
+            if stage.stage_gain is not None and \
+                    stage.stage_gain_frequency is not None:
+                gain = float(stage.stage_gain)
+                gain_frequency = float(stage.stage_gain_frequency)
+            elif len(stages) == 1 and sensitivity != 0:
+                # evalresp uses the sensitivity for a single stage
+                gain = sensitivity
+                gain_frequency = sensitivity_frequency
+            else:
+                gain = None
+            if gain == 0 or sensitivity == 0:
+                msg = "Zero stage gain."
+                raise ValueError(msg)
+
+            # normalize filter and gain to the sensitivity frequency
+            if gain is not None and transfer is not None and \
+                    filter_type != "LIST" and (
+                    gain_frequency != sensitivity_frequency or
+                    (filter_type in ("ANALOG_PZ", "IIR_PZ") and
+                     norm_frequency != sensitivity_frequency)):
+                df = transfer(np.array([gain_frequency]))[0]
+                of = transfer(np.array([sensitivity_frequency]))[0]
+                if filter_type == "ANALOG_PZ" and (df == 0 or of == 0):
+                    msg = ("Gain or sensitivity frequency found in "
+                           "bandpass analog filter.")
+                    raise ValueError(msg)
+                gain = gain / abs(df) * abs(of)
+                norm = 1.0 / abs(of)
+            filters.append((transfer, norm, gain, delay))
+
+        # only stages with a filter and gain are normalized
+        response = np.ones(len(frequencies), dtype=np.complex128)
+        w = 2 * pi * frequencies
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for transfer, norm, gain, delay in filters:
+                if transfer is not None:
+                    response *= norm * transfer(frequencies)
+                if delay:
+                    response *= np.exp(1j * w * delay)
+                if gain is not None:
+                    response *= gain
+
+            # convert from input units of the first stage to requested output
+            exponent = {"DIS": 0, "ACC": 2}.get(first_units, 1)
+            exponent -= {"DISP": 0, "VEL": 1, "ACC": 2}[out_units]
+            if exponent:
+                response *= (1j * w) ** exponent
+                if exponent < 0:
+                    response[w == 0] = 0
+        return response
+
     def get_evalresp_response(self, t_samp, nfft, output="VEL",
-                              start_stage=None, end_stage=None):
+                              start_stage=None, end_stage=None,
+                              engine="evalresp"):
         """
         Returns frequency response and corresponding frequencies using
         evalresp.
@@ -1198,6 +1352,9 @@ class Response(ComparingObject):
         :type end_stage: int, optional
         :param end_stage: Stage sequence number of last stage that will be
             used (disregarding all later stages).
+        :type engine: str, optional
+        :param engine: Implementation used to evaluate the response, see
+            :meth:`get_evalresp_response_for_frequencies`.
         :rtype: tuple of two arrays
         :returns: frequency response and corresponding frequencies
         """
@@ -1207,7 +1364,8 @@ class Response(ComparingObject):
         freqs = np.linspace(0, fy, nfft // 2 + 1).astype(np.float64)
 
         response = self.get_evalresp_response_for_frequencies(
-            freqs, output=output, start_stage=start_stage, end_stage=end_stage)
+            freqs, output=output, start_stage=start_stage, end_stage=end_stage,
+            engine=engine)
         return response, freqs
 
     def __str__(self):
@@ -1440,6 +1598,175 @@ class Response(ComparingObject):
         return paz_to_sacpz_string(paz, self.instrument_sensitivity)
 
 
+def _get_numpy_stage_filter(stage):
+    """
+    Returns the filter of a response stage for the numpy response
+    evaluation, following the conventions of evalresp.
+
+    :rtype: tuple
+    :returns: Filter type (``None`` for gain only stages), function
+        returning the transfer function of the filter (without normalization
+        factor) for an array of frequencies (``None`` if the filter has no
+        effect), normalization factor, normalization frequency and delay
+        to correct for after the filter.
+    """
+    decimation = [stage.decimation_correction, stage.decimation_delay,
+                  stage.decimation_factor, stage.decimation_input_sample_rate,
+                  stage.decimation_offset]
+    if None in decimation:
+        if len(set(decimation)) != 1:
+            msg = ("If a decimation is given, all values must "
+                   "be specified.")
+            raise ValueError(msg)
+        sample_int = None
+    # Evalresp does the same!
+    elif stage.decimation_input_sample_rate == 0:
+        sample_int = 0.0
+    else:
+        sample_int = 1.0 / stage.decimation_input_sample_rate
+
+    filter_type, transfer, norm, norm_frequency, delay = \
+        None, None, 1.0, None, 0.0
+    coefficients = None
+    if isinstance(stage, PolesZerosResponseStage):
+        # Map the transfer function type.
+        filter_type = {
+            "LAPLACE (RADIANS/SECOND)": "ANALOG_PZ",
+            "LAPLACE (HERTZ)": "ANALOG_PZ",
+            "DIGITAL (Z-TRANSFORM)": "IIR_PZ"}[
+                stage.pz_transfer_function_type]
+        zeros = np.array(stage.zeros, dtype=np.complex128)
+        poles = np.array(stage.poles, dtype=np.complex128)
+        norm = float(stage.normalization_factor)
+        norm_frequency = float(stage.normalization_frequency)
+        if stage.pz_transfer_function_type == "LAPLACE (RADIANS/SECOND)":
+            def variable(frequencies):
+                return 2j * pi * frequencies
+        elif stage.pz_transfer_function_type == "LAPLACE (HERTZ)":
+            def variable(frequencies):
+                return 1j * frequencies
+        else:
+            def variable(frequencies):
+                return np.exp(2j * pi * frequencies * sample_int)
+
+        def _pz_transfer(frequencies):
+            x = variable(frequencies)
+            numerator = np.ones(len(x), dtype=np.complex128)
+            denominator = np.ones(len(x), dtype=np.complex128)
+            for zero in zeros:
+                numerator *= x - zero
+            for pole in poles:
+                denominator *= x - pole
+            return numerator / denominator
+        transfer = _pz_transfer
+
+        # digital filters without poles and zeros are not evaluated
+        if filter_type == "IIR_PZ" and not len(zeros) and not len(poles):
+            transfer, norm = None, 1.0
+    elif isinstance(stage, CoefficientsTypeResponseStage):
+        # This type can have either an FIR or an IIR response. If the number
+        # of denominators is 0, it is a FIR. Otherwise an IIR.
+        if len(stage.denominator) == 0:
+            if stage.cf_transfer_function_type.lower() != "digital":
+                msg = ("When no denominators are given it must "
+                       "be a digital FIR filter.")
+                raise ValueError(msg)
+            filter_type = "FIR_ASYM"
+            coefficients = np.array(stage.numerator, dtype=np.float64)
+        else:
+            filter_type = "IIR_COEFFS"
+            numerator = np.array(stage.numerator, dtype=np.float64)
+            denominator = np.array(stage.denominator, dtype=np.float64)
+
+            def _iir_transfer(frequencies):
+                z = np.exp(-2j * pi * frequencies * sample_int)
+                return (np.polynomial.polynomial.polyval(z, numerator) /
+                        np.polynomial.polynomial.polyval(z, denominator))
+            transfer = _iir_transfer
+    elif isinstance(stage, ResponseListResponseStage):
+        filter_type = "LIST"
+
+        def _list_transfer(frequencies):
+            amp, phase = stage._interpolate(frequencies)
+            return amp * np.exp(1j * np.deg2rad(phase))
+        transfer = _list_transfer
+    elif isinstance(stage, FIRResponseStage):
+        try:
+            filter_type = {"NONE": "FIR_ASYM", "ODD": "FIR_SYM_1",
+                           "EVEN": "FIR_SYM_2"}[stage.symmetry]
+        except KeyError:
+            msg = "Unsupported FIR symmetry: %s." % stage.symmetry
+            raise NotImplementedError(msg)
+        coefficients = np.array(stage.coefficients, dtype=np.float64)
+    elif isinstance(stage, PolynomialResponseStage):
+        msg = ("PolynomialResponseStage not yet implemented. "
+               "Please contact the developers.")
+        raise NotImplementedError(msg)
+    else:
+        # Otherwise it could be a gain only stage.
+        if stage.stage_gain is None or stage.stage_gain_frequency is None:
+            msg = "Type: %s." % str(type(stage))
+            raise NotImplementedError(msg)
+        if sample_int is not None:
+            msg = "Decimation given for stage without filter."
+            raise ValueError(msg)
+
+    if coefficients is not None and filter_type == "FIR_ASYM":
+        # normalize to one at zero frequency and make the filter symmetric if
+        # possible, like evalresp does
+        nc = len(coefficients)
+        total = coefficients.sum()
+        if nc and abs(total - 1.0) > 0.02:
+            coefficients /= total
+        if nc % 2 == 0:
+            n0 = nc // 2
+            if np.array_equal(coefficients[n0:], coefficients[n0 - 1::-1]
+                              if n0 else coefficients[:0]):
+                filter_type = "FIR_SYM_2"
+                coefficients = coefficients[:n0]
+        else:
+            n0 = (nc - 1) // 2
+            if np.array_equal(coefficients[n0 + 1:],
+                              coefficients[n0 - 1::-1] if n0 else
+                              coefficients[:0]):
+                filter_type = "FIR_SYM_1"
+                coefficients = coefficients[:nc - n0]
+    if coefficients is not None and len(coefficients):
+        if filter_type == "FIR_SYM_1":
+            # zero phase filter of 2 * n - 1 coefficients
+            powers = 2.0 * coefficients[::-1]
+            powers[0] /= 2.0
+
+            def _sym_1_transfer(frequencies):
+                z = np.exp(2j * pi * frequencies * sample_int)
+                return np.polynomial.polynomial.polyval(z, powers).real
+            transfer = _sym_1_transfer
+        elif filter_type == "FIR_SYM_2":
+            # zero phase filter of 2 * n coefficients
+            powers = 2.0 * coefficients[::-1]
+
+            def _sym_2_transfer(frequencies):
+                z = np.exp(1j * pi * frequencies * sample_int)
+                return (z * np.polynomial.polynomial.polyval(
+                    z ** 2, powers)).real
+            transfer = _sym_2_transfer
+        else:
+            def _asym_transfer(frequencies):
+                z = np.exp(-2j * pi * frequencies * sample_int)
+                return np.polynomial.polynomial.polyval(z, coefficients)
+            transfer = _asym_transfer
+
+            if sample_int is not None:
+                delay = float(stage.decimation_correction)
+
+    if filter_type in ("IIR_PZ", "IIR_COEFFS", "FIR_ASYM", "FIR_SYM_1",
+                       "FIR_SYM_2") and sample_int is None:
+        msg = ("Required decimation for IIR or FIR filter missing in "
+               "stage %i.") % stage.stage_sequence_number
+        raise ValueError(msg)
+    return filter_type, transfer, norm, norm_frequency, delay
+
+
 def paz_to_sacpz_string(paz, instrument_sensitivity):
     """
     Returns SACPZ ASCII text representation of Response.
@@ -1709,6 +2036,107 @@ class CoefficientWithUncertainties(FloatWithUncertainties):
         self._number = value
 
 
+class ResponseCache(object):
+    """
+    Size limited cache of evaluated instrument response spectra.
+
+    Evaluating the response with evalresp is expensive for long traces, but
+    when processing many traces of the same channel epoch with the same
+    sampling rate and number of samples (e.g. day files) the very same
+    response spectrum is needed over and over again. A cache can be passed
+    to :meth:`Trace.remove_response() <obspy.core.trace.Trace.remove_response>`
+    and :meth:`Stream.remove_response()
+    <obspy.core.stream.Stream.remove_response>` (``response_cache``) or to
+    :class:`~obspy.signal.spectral_estimation.PPSD` to reuse the response
+    spectra.
+
+    Responses are identified by their content, so equal responses of
+    different objects (e.g. read from different files) share cache entries
+    and responses modified in place are evaluated again. The least recently
+    used spectra are removed from the cache when it grows larger than
+    ``max_size``.
+
+    >>> from obspy import read, read_inventory
+    >>> from obspy.core.inventory import ResponseCache
+    >>> cache = ResponseCache()
+    >>> st = read()
+    >>> st += st.copy()
+    >>> st.remove_response(read_inventory(), response_cache=cache)
+    ... # doctest: +ELLIPSIS
+    <...Stream object at 0x...>
+    >>> print(cache.statistics["misses"], cache.statistics["hits"])
+    1 5
+    """
+    def __init__(self, max_size=100 * 1024 ** 2):
+        """
+        :type max_size: int
+        :param max_size: Maximum size in bytes of the cached spectra.
+        """
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self._statistics = {"hits": 0, "misses": 0, "evictions": 0,
+                            "bytes": 0}
+
+    def get_evalresp_response(self, response, t_samp, nfft, output="VEL",
+                              start_stage=None, end_stage=None,
+                              engine="evalresp"):
+        """
+        Returns frequency response and corresponding frequencies, from the
+        cache if possible.
+
+        See :meth:`Response.get_evalresp_response` for a description of the
+        parameters. The returned arrays are copies and can be modified by
+        the caller.
+
+        :type response: :class:`Response`
+        :param response: Response to evaluate.
+        :rtype: tuple of two arrays
+        :returns: frequency response and corresponding frequencies
+        """
+        digest = hashlib.sha1(pickle.dumps(response, protocol=2)).digest()
+        key = (digest, float(t_samp), int(nfft), output.upper(), start_stage,
+               end_stage, engine)
+        try:
+            # retrieve and later insert again to get LRU cache behaviour
+            resp, freqs = self._cache.pop(key)
+            self._statistics["hits"] += 1
+        except KeyError:
+            resp, freqs = response.get_evalresp_response(
+                t_samp, nfft, output=output, start_stage=start_stage,
+                end_stage=end_stage, engine=engine)
+            self._statistics["misses"] += 1
+            self._statistics["bytes"] += resp.nbytes + freqs.nbytes
+        self._cache[key] = (resp, freqs)
+        while self._statistics["bytes"] > self.max_size and self._cache:
+            _, (resp_, freqs_) = self._cache.popitem(last=False)
+            self._statistics["bytes"] -= resp_.nbytes + freqs_.nbytes
+            self._statistics["evictions"] += 1
+        # callers may modify the returned spectra
+        return resp.copy(), freqs.copy()
+
+    @property
+    def statistics(self):
+        """
+        Statistics of the cache.
+
+        :rtype: dict
+        :returns: Number of cache ``hits``, ``misses`` and ``evictions``,
+            number of currently cached spectra (``spectra``) and their size
+            in ``bytes``.
+        """
+        statistics = dict(self._statistics)
+        statistics["spectra"] = len(self._cache)
+        return statistics
+
+    def clear(self):
+        """
+        Remove all spectra from the cache and reset its statistics.
+        """
+        self._cache.clear()
+        for key in self._statistics:
+            self._statistics[key] = 0
+
+
 def _adjust_bode_plot_figure(fig, grid=True, show=True):
     """
     Helper function to do final adjustments to Bode plot figure.
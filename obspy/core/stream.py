@@ -26,24 +26,32 @@ from pkg_resources import load_entry_point
 import numpy as np
 
 from obspy.core import compatibility
-from obspy.core.trace import Trace
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.trace import Trace, _get_processing_info, _get_taper
+from obspy.core.utcdatetime import UTCDateTime, UTCDateTimeArray
 from obspy.core.util import NamedTemporaryFile
 from obspy.core.util.base import (ENTRY_POINTS, _get_function_from_entry_point,
-                                  _read_from_plugin, download_to_file)
+                                  _read_from_plugin, create_empty_data_chunk,
+                                  download_to_file)
 from obspy.core.util.decorator import (map_example_filename,
                                        raise_if_masked, uncompress_file)
-from obspy.core.util.misc import get_window_times
+from obspy.core.util.misc import (_iter_window_times, _parallel_map,
+                                  get_window_times)
 
 
 _headonly_warning_msg = (
     "Keyword headonly cannot be combined with starttime, endtime or dtype.")
+_skipped_file_msg = "Skipping file '%s' as it could not be read (%s)."
+
+# filters that can be applied to all rows of a 2-D array in one go
+_BATCH_FILTER_TYPES = ('bandpass', 'bandstop', 'highpass', 'lowpass')
+# detrend methods that can be applied to all rows of a 2-D array in one go
+_BATCH_DETREND_TYPES = ('constant', 'demean', 'linear', 'simple')
 
 
 @map_example_filename("pathname_or_url")
 def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
          endtime=None, nearest_sample=True, dtype=None, apply_calib=False,
-         **kwargs):
+         workers=None, executor=None, raise_errors=True, **kwargs):
     """
     Read waveform files into an ObsPy Stream object.
 
@@ -85,6 +93,25 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     :type apply_calib: bool, optional
     :param apply_calib: Automatically applies the calibration factor
         ``trace.stats.calib`` for each trace, if set. Defaults to ``False``.
+    :type workers: int, optional
+    :param workers: Number of worker processes used to read multiple files
+        matched by a wildcard pattern in parallel. Traces are always returned
+        in (sorted) file name order and errors raised while reading any of
+        the files are raised again, just like when reading the files one by
+        one. Defaults to reading all files one after another in the current
+        process.
+    :type executor: object, optional
+    :param executor: Alternatively to ``workers``, an already running
+        :class:`concurrent.futures.Executor` or
+        :class:`multiprocessing.pool.Pool` (or any other object with a
+        ``map()`` method) to read the files with. It is left running after
+        reading.
+    :type raise_errors: bool, optional
+    :param raise_errors: If set to ``False``, files matched by a wildcard
+        pattern that can not be read are skipped and a warning naming the
+        file and the error is shown for each of them, instead of raising the
+        first error. Useful for reading large archives (in parallel) that
+        contain a few corrupt files.
     :param kwargs: Additional keyword arguments passed to the underlying
         waveform reader method.
     :return: An ObsPy :class:`~obspy.core.stream.Stream` object.
@@ -192,6 +219,16 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
         >>> print(st)  # doctest: +ELLIPSIS
         1 Trace(s) in Stream:
         .RJOB..Z | 2005-08-31T02:34:00.000000Z - ... | 200.0 Hz, 2001 samples
+
+    (7) Reading many local files in parallel.
+
+        The ``workers`` parameter distributes the files matched by a wildcard
+        pattern to a pool of worker processes. The resulting
+        :class:`~obspy.core.stream.Stream` is identical to reading all files
+        one by one.
+
+        >>> from obspy import read  # doctest: +SKIP
+        >>> st = read("/path/to/archive/*.mseed", workers=4)  # doctest: +SKIP
     """
     # add default parameters to kwargs so sub-modules may handle them
     kwargs['starttime'] = starttime
@@ -227,8 +264,22 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     else:
         # some file name
         pathname = pathname_or_url
-        for file in sorted(glob(pathname)):
-            st.extend(_read(file, format, headonly, **kwargs).traces)
+        filenames = sorted(glob(pathname))
+        if len(filenames) > 1 and (executor is not None or
+                                   (workers is not None and workers > 1)):
+            st.extend(_read_parallel(filenames, format, headonly,
+                                     workers=workers, executor=executor,
+                                     raise_errors=raise_errors, **kwargs))
+        else:
+            for file in filenames:
+                if raise_errors:
+                    st.extend(_read(file, format, headonly, **kwargs).traces)
+                    continue
+                stream, error = _try_read(file, format, headonly, **kwargs)
+                if error is not None:
+                    warnings.warn(_skipped_file_msg % (file, error))
+                    continue
+                st.extend(stream.traces)
         if len(st) == 0:
             # try to give more specific information why the stream is empty
             if has_magic(pathname) and not glob(pathname):
@@ -264,6 +315,101 @@ def read(pathname_or_url=None, format=None, headonly=False, starttime=None,
     return st
 
 
+@map_example_filename("pathname_or_url")
+def read_iter(pathname_or_url, window_length, step=None, offset=0,
+              include_partial_windows=False, nearest_sample=True, merge=-1,
+              format=None, **kwargs):
+    """
+    Iterate over time windows of waveform data read piece by piece from
+    local files.
+
+    Works like :meth:`Stream.slide() <obspy.core.stream.Stream.slide>` but
+    without reading all data into memory first. Only the headers of all
+    files are read up front, the data of the files is read in order of their
+    start times while iterating, and data no longer needed for the following
+    windows is discarded. Memory usage is hence limited to the data of a few
+    files, making it possible to process long time series, e.g. a year of
+    day files.
+
+    :type pathname_or_url: str
+    :param pathname_or_url: File name or wildcard pattern of local files,
+        see :func:`~obspy.core.stream.read`.
+    :type window_length: float
+    :param window_length: The length of each window in seconds.
+    :type step: float
+    :param step: The step between the start times of two successive windows
+        in seconds, defaults to ``window_length``. Has to be positive,
+        successive windows overlap if it is smaller than ``window_length``.
+    :type offset: float
+    :param offset: The offset of the first window in seconds relative to the
+        start time of the data.
+    :type include_partial_windows: bool
+    :param include_partial_windows: Determines if windows that are shorter
+        than 99.9 % of the desired length are returned.
+    :type nearest_sample: bool, optional
+    :param nearest_sample: See :meth:`Stream.slice()
+        <obspy.core.stream.Stream.slice>`.
+    :type merge: int or None
+    :param merge: Merge operation performed on every window, see
+        :meth:`Stream.merge() <obspy.core.stream.Stream.merge>`. Data read
+        from the files is always cleanup merged (``-1``) to join traces
+        across file boundaries. If set to ``None`` (or ``False``) no further
+        merge operation is performed.
+    :type format: str
+    :param format: Format of the files, see :func:`~obspy.core.stream.read`.
+    :param kwargs: Additional keyword arguments passed on to
+        :func:`~obspy.core.stream.read` when reading the data of every file.
+    :rtype: generator of :class:`~obspy.core.stream.Stream`
+    :returns: Generator yielding a new Stream for every window with data.
+
+    .. rubric:: Example
+
+    >>> from obspy import read_iter
+    >>> for st in read_iter("/path/to/test.mseed", window_length=10):
+    ...     print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    NL.HGN.00.BHZ | 2003-05-29T02:13:22.043400Z - ... | 40.0 Hz, 401 samples
+    1 Trace(s) in Stream:
+    NL.HGN.00.BHZ | 2003-05-29T02:13:32.043400Z - ... | 40.0 Hz, 401 samples
+    ...
+    """
+    if step is None:
+        step = window_length
+    pathname = pathname_or_url
+    filenames = sorted(glob(pathname))
+    if not filenames:
+        if has_magic(pathname):
+            raise Exception("No file matching file pattern: %s" % pathname)
+        raise IOError(2, "No such file or directory", pathname)
+    # time span of every file
+    spans = []
+    for filename in filenames:
+        st = _read(filename, format, headonly=True)
+        if not st:
+            continue
+        spans.append((min(tr.stats.starttime for tr in st),
+                      max(tr.stats.endtime for tr in st), filename))
+    if not spans:
+        return iter([])
+    spans.sort()
+    starttime = spans[0][0]
+    endtime = max(span[1] for span in spans)
+
+    def _chunks():
+        for i, (_, _, filename) in enumerate(spans):
+            st = _read(filename, format, **kwargs)
+            # all data up to the start of the next file is read now
+            if i + 1 < len(spans):
+                yield spans[i + 1][0], st
+            else:
+                yield endtime, st
+
+    return _slide_chunks(
+        _chunks(), starttime, endtime, window_length, step, offset=offset,
+        include_partial_windows=include_partial_windows,
+        nearest_sample=nearest_sample, merge=merge)
+
+
 @uncompress_file
 def _read(filename, format=None, headonly=False, **kwargs):
     """
@@ -277,6 +423,123 @@ def _read(filename, format=None, headonly=False, **kwargs):
     return stream
 
 
+def _try_read(filename, format=None, headonly=False, **kwargs):
+    """
+    Same as :func:`_read` but returns errors instead of raising them.
+
+    :rtype: tuple
+    :returns: The :class:`~obspy.core.stream.Stream` read from the file (or
+        ``None``) and a message describing the error (or ``None``).
+    """
+    try:
+        return _read(filename, format, headonly, **kwargs), None
+    except Exception as e:
+        return None, "%s: %s" % (e.__class__.__name__, e)
+
+
+def _read_parallel(filenames, format=None, headonly=False, workers=None,
+                   executor=None, raise_errors=True, **kwargs):
+    """
+    Read multiple files in parallel and return all traces in file order,
+    see :func:`~obspy.core.util.misc._parallel_map`. An error raised while
+    reading any of the files in a worker is raised again here, as when
+    reading the files one after the other, unless ``raise_errors`` is
+    ``False``. In that case files that fail to be read are skipped and a
+    warning is shown for each of them.
+
+    :rtype: list of :class:`~obspy.core.trace.Trace`
+    """
+    arguments = [(filename, format, headonly) for filename in filenames]
+    if raise_errors:
+        streams = _parallel_map(_read, arguments, workers=workers,
+                                executor=executor, kwargs=kwargs)
+        return [tr for stream in streams for tr in stream]
+    results = _parallel_map(_try_read, arguments, workers=workers,
+                            executor=executor, kwargs=kwargs)
+    traces = []
+    for filename, (stream, error) in zip(filenames, results):
+        if error is not None:
+            warnings.warn(_skipped_file_msg % (filename, error))
+            continue
+        traces.extend(stream)
+    return traces
+
+
+def _slide_chunks(chunks, starttime, endtime, window_length, step, offset=0,
+                  include_partial_windows=False, nearest_sample=True,
+                  merge=-1):
+    """
+    Generator yielding windows of data like :meth:`Stream.slide`, from data
+    that is read piece by piece.
+
+    :param chunks: Iterator yielding tuples of a
+        :class:`~obspy.core.utcdatetime.UTCDateTime` and a
+        :class:`~obspy.core.stream.Stream`, in order of time. All data before
+        the given time has to be contained in the streams yielded so far.
+        Chunks are only requested when data is needed for the next window.
+
+    See :func:`read_iter` for the other parameters.
+    """
+    buffer = Stream()
+    # all data before this time has been read
+    read_until = starttime
+    exhausted = False
+    for start, stop in _iter_window_times(
+            starttime, endtime, window_length, step, offset,
+            include_partial_windows):
+        while not exhausted and read_until <= stop:
+            try:
+                read_until, st = next(chunks)
+            except StopIteration:
+                exhausted = True
+                break
+            buffer += st
+            buffer.merge(-1)
+        # discard data not needed anymore, keeping one sample before the
+        # window start for nearest sample selection
+        if buffer:
+            margin = max(tr.stats.delta for tr in buffer)
+            buffer.trim(starttime=start - margin, nearest_sample=False)
+        # copy, data of overlapping windows must not be shared
+        window = buffer.slice(start, stop,
+                              nearest_sample=nearest_sample).copy()
+        if not window:
+            continue
+        if merge is not None and merge is not False:
+            window.merge(merge)
+        yield window
+
+
+def _aligned_trace_groups(traces):
+    """
+    Group traces that can be processed together as one 2-D array.
+
+    Traces with the same sampling rate, number of samples and data type end
+    up in the same group. Empty traces and traces with masked data always
+    form a group of their own.
+    """
+    groups = {}
+    singles = []
+    for tr in traces:
+        data = tr.data
+        if not len(data) or isinstance(data, np.ma.masked_array):
+            singles.append([tr])
+            continue
+        key = (tr.stats.sampling_rate, len(data), data.dtype)
+        groups.setdefault(key, []).append(tr)
+    return list(groups.values()) + singles
+
+
+def _set_stacked_data(traces, data, info):
+    """
+    Set the rows of a 2-D array as data of the given traces and attach the
+    processing information.
+    """
+    for tr, row in zip(traces, data):
+        tr.data = row
+        tr._internal_add_processing_info(info)
+
+
 def _create_example_stream(headonly=False):
     """
     Create an example stream.
@@ -320,6 +583,197 @@ def _create_example_stream(headonly=False):
     return st
 
 
+class _TraceMerger(object):
+    """
+    Helper for merging consecutive traces with the same id.
+
+    Adding traces only keeps references to the data chunks that make up the
+    merged trace, the data array of the merged trace is allocated once when
+    :meth:`get_trace` is called. The result is identical to adding up the
+    traces one by one with :meth:`~obspy.core.trace.Trace.__add__`, which
+    is used as fallback for the rare cases not handled here (contained
+    traces, overlaps involving masked data, ...).
+
+    Traces have to be added in order of increasing start time.
+    """
+    def __init__(self, trace):
+        self._set_trace(trace)
+
+    def _set_trace(self, trace):
+        self._trace = trace
+        self._chunks = [trace.data]
+        self._npts = len(trace.data)
+        self._modified = False
+
+    @property
+    def starttime(self):
+        return self._trace.stats.starttime
+
+    @property
+    def endtime(self):
+        # same computation as done in Stats to get identical rounding
+        stats = self._trace.stats
+        if self._npts == 0:
+            return stats.starttime
+        return stats.starttime + (self._npts - 1) * stats.delta
+
+    def _tail(self, npts):
+        """
+        Return the last ``npts`` samples or ``None`` if they contain masked
+        data.
+        """
+        chunks = []
+        for chunk in reversed(self._chunks):
+            if npts <= 0:
+                break
+            if isinstance(chunk, np.ma.masked_array):
+                return None
+            chunks.append(chunk[-npts:])
+            npts -= len(chunk)
+        return np.concatenate(chunks[::-1])
+
+    def _tail_trace(self, starttime):
+        """
+        Return a trace with the merged data from (shortly before) the given
+        time to the end or ``None`` if it contains masked data.
+
+        Only the last chunks are concatenated, so this is cheap for times
+        close to the end of the merged trace.
+        """
+        stats = self._trace.stats
+        if not self._npts:
+            return None
+        # two samples margin to be safe from rounding issues
+        offset = int(math.floor(
+            (starttime - stats.starttime) * stats.sampling_rate)) - 2
+        offset = min(max(offset, 0), self._npts - 1)
+        data = self._tail(self._npts - offset)
+        if data is None:
+            return None
+        header = {'sampling_rate': stats.sampling_rate,
+                  'starttime': stats.starttime + offset * stats.delta}
+        return Trace(data=data, header=header)
+
+    def _trim(self, npts):
+        """
+        Remove the last ``npts`` samples.
+        """
+        self._npts -= npts
+        while npts > 0:
+            chunk = self._chunks.pop()
+            if len(chunk) > npts:
+                self._chunks.append(chunk[:-npts])
+                break
+            npts -= len(chunk)
+
+    def _append(self, data):
+        if len(data):
+            self._chunks.append(data)
+            self._npts += len(data)
+        self._modified = True
+
+    def add(self, trace, method=0, fill_value=None, interpolation_samples=0):
+        """
+        Add trace, see :meth:`~obspy.core.trace.Trace.__add__` for details.
+        """
+        stats = self._trace.stats
+        data = trace.data
+        if trace.stats.starttime < stats.starttime or not self._npts or \
+                isinstance(data, np.ma.masked_array):
+            self._add_pairwise(trace, method, fill_value,
+                               interpolation_samples)
+            return
+        dtype = self._chunks[0].dtype
+        latest = self._chunks[-1][-1]
+        if fill_value == "latest":
+            fill_value_ = latest
+        elif fill_value == "interpolate":
+            fill_value_ = (latest, data[0])
+        else:
+            fill_value_ = fill_value
+        endtime = self.endtime
+        delta = (trace.stats.starttime - endtime) * stats.sampling_rate
+        delta = int(compatibility.round_away(delta)) - 1
+        if delta == 0:
+            # exact fit
+            self._append(data)
+            return
+        elif delta > 0:
+            # gap
+            self._append(create_empty_data_chunk(delta, dtype, fill_value_))
+            self._append(data)
+            return
+        # overlap, contained traces are left to Trace.__add__
+        delta = abs(delta)
+        tail = None
+        if endtime < trace.stats.endtime and method in (0, 1):
+            tail = self._tail(min(delta + 1, self._npts))
+        if tail is None:
+            self._add_pairwise(trace, method, fill_value,
+                               interpolation_samples)
+            return
+        if np.all(np.equal(tail[-delta:], data[:delta])):
+            # same data in overlap
+            self._trim(delta)
+            self._append(data)
+        elif method == 0:
+            overlap = create_empty_data_chunk(delta, dtype, fill_value_)
+            self._trim(delta)
+            self._append(overlap)
+            self._append(data[delta:])
+        else:
+            if interpolation_samples == -1:
+                interpolation_samples = delta
+            elif interpolation_samples < -1 or \
+                    interpolation_samples >= len(data):
+                self._add_pairwise(trace, method, fill_value,
+                                   interpolation_samples)
+                return
+            interpolation_samples = min(interpolation_samples, delta)
+            # Trace.__add__ uses the first sample if the left trace is
+            # completely overlapped
+            if len(tail) > delta:
+                ls = tail[0]
+            else:
+                ls = self._chunks[0][0]
+            rs = data[interpolation_samples]
+            # include left and right sample (delta + 2)
+            interpolation = np.linspace(ls, rs, interpolation_samples + 2)
+            # cut ls and rs and ensure correct data type
+            interpolation = np.require(interpolation[1:-1], dtype)
+            self._trim(delta)
+            self._append(interpolation)
+            self._append(data[interpolation_samples:])
+
+    def _add_pairwise(self, trace, method, fill_value, interpolation_samples):
+        out = self.get_trace().__add__(
+            trace, method, fill_value=fill_value, sanity_checks=False,
+            interpolation_samples=interpolation_samples)
+        self._set_trace(out)
+
+    def get_trace(self):
+        """
+        Return the merged trace.
+
+        If nothing was added, the original trace is returned.
+        """
+        if not self._modified:
+            return self._trace
+        chunks = self._chunks
+        dtype = chunks[0].dtype
+        if any(isinstance(_i, np.ma.masked_array) for _i in chunks):
+            data = np.ma.concatenate(chunks)
+            # Check if we can downgrade to normal ndarray
+            if np.ma.count_masked(data) == 0:
+                data = data.compressed()
+        else:
+            data = np.require(np.concatenate(chunks), dtype=dtype)
+        out = self._trace.__class__(header=copy.deepcopy(self._trace.stats))
+        out.data = data
+        self._set_trace(out)
+        return out
+
+
 class Stream(object):
     """
     List like object of multiple ObsPy Trace objects.
@@ -1813,6 +2267,45 @@ class Stream(object):
             traces.append(trace)
         return self.__class__(traces=traces)
 
+    def starttimes_ns(self):
+        """
+        Return the start times of all traces as one array.
+
+        Allows selecting or windowing traces with vectorized comparisons
+        instead of looping over the traces.
+
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+        :return: Start times (nanosecond resolution) in order of the traces,
+            convertible to a ``datetime64[ns]`` array with
+            :func:`numpy.asarray`.
+
+        .. rubric:: Example
+
+        >>> from obspy import read, UTCDateTime
+        >>> st = read()
+        >>> st[1].stats.starttime += 10
+        >>> starttimes = st.starttimes_ns()
+        >>> mask = starttimes > UTCDateTime(2009, 8, 24, 0, 20, 5)
+        >>> print([tr.id for tr, m in zip(st, mask) if m])
+        ['BW.RJOB..EHN']
+        """
+        return UTCDateTimeArray.from_ns(np.fromiter(
+            (tr.stats.starttime._ns for tr in self.traces), dtype=np.int64,
+            count=len(self.traces)))
+
+    def endtimes_ns(self):
+        """
+        Return the end times of all traces as one array.
+
+        See :meth:`Stream.starttimes_ns`.
+
+        :rtype: :class:`~obspy.core.utcdatetime.UTCDateTimeArray`
+        :return: End times (nanosecond resolution) in order of the traces.
+        """
+        return UTCDateTimeArray.from_ns(np.fromiter(
+            (tr.stats.endtime._ns for tr in self.traces), dtype=np.int64,
+            count=len(self.traces)))
+
     def verify(self):
         """
         Verify all traces of current Stream against available meta data.
@@ -1897,58 +2390,37 @@ class Stream(object):
         The ``method`` argument controls the handling of overlapping data
         values.
         """
-        def listsort(order, current):
-            """
-            Helper method for keeping trace's ordering
-            """
-            try:
-                return order.index(current)
-            except ValueError:
-                return -1
-
         self._cleanup(**kwargs)
         if method == -1:
             return
         # check sampling rates and dtypes
         self._merge_checks()
         # remember order of traces
-        order = [id(i) for i in self.traces]
+        order = dict((id(tr), i) for i, tr in enumerate(self.traces))
         # order matters!
         self.sort(keys=['network', 'station', 'location', 'channel',
                         'starttime', 'endtime'])
         # build up dictionary with with lists of traces with same ids
         traces_dict = {}
-        # using pop() and try-except saves memory
-        try:
-            while True:
-                trace = self.traces.pop(0)
-                # skip empty traces
-                if len(trace) == 0:
-                    continue
-                _id = trace.get_id()
-                if _id not in traces_dict:
-                    traces_dict[_id] = [trace]
-                else:
-                    traces_dict[_id].append(trace)
-        except IndexError:
-            pass
+        for trace in self.traces:
+            # skip empty traces
+            if len(trace) == 0:
+                continue
+            traces_dict.setdefault(trace.get_id(), []).append(trace)
         # clear traces of current stream
         self.traces = []
-        # loop through ids
-        for _id in traces_dict.keys():
-            cur_trace = traces_dict[_id].pop(0)
-            # loop through traces of same id
-            for _i in range(len(traces_dict[_id])):
-                trace = traces_dict[_id].pop(0)
-                # disable sanity checks because there are already done
-                cur_trace = cur_trace.__add__(
-                    trace, method, fill_value=fill_value, sanity_checks=False,
-                    interpolation_samples=interpolation_samples)
-            self.traces.append(cur_trace)
+        # loop through ids, the data of all traces with the same id is
+        # collected first and the merged data array is allocated only once
+        for trace_list in traces_dict.values():
+            merger = _TraceMerger(trace_list[0])
+            for trace in trace_list[1:]:
+                merger.add(trace, method, fill_value=fill_value,
+                           interpolation_samples=interpolation_samples)
+            self.traces.append(merger.get_trace())
 
         # trying to restore order, newly created traces are placed at
         # start
-        self.traces.sort(key=lambda x: listsort(order, id(x)))
+        self.traces.sort(key=lambda x: order.get(id(x), -1))
         return self
 
     def simulate(self, paz_remove=None, paz_simulate=None,
@@ -2114,9 +2586,25 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             st = read()
             st.filter("highpass", freq=1.0)
             st.plot()
-        """
-        for tr in self:
-            tr.filter(type, **options)
+
+        .. note::
+
+            Traces with the same sampling rate, number of samples and data
+            type are filtered together as one 2-D array for the Butterworth
+            filters (``'bandpass'``, ``'bandstop'``, ``'lowpass'`` and
+            ``'highpass'``), which is much faster for streams with many
+            traces.
+        """
+        for traces in _aligned_trace_groups(self):
+            if len(traces) > 1 and type.lower() in _BATCH_FILTER_TYPES:
+                info = _get_processing_info(traces[0].filter, type, **options)
+                func = _get_function_from_entry_point('filter', type.lower())
+                data = func(np.array([tr.data for tr in traces]),
+                            df=traces[0].stats.sampling_rate, **options)
+                _set_stacked_data(traces, data, info)
+                continue
+            for tr in traces:
+                tr.filter(type, **options)
         return self
 
     def trigger(self, type, **options):
@@ -2364,8 +2852,23 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             hence has the same shape as the input array. (uses
             :func:`numpy.gradient`)
         """
-        for tr in self:
-            tr.differentiate(method=method)
+        for traces in _aligned_trace_groups(self):
+            if len(traces) > 1 and method.lower() == 'gradient':
+                info = _get_processing_info(traces[0].differentiate,
+                                            method=method)
+                func = _get_function_from_entry_point('differentiate',
+                                                      method.lower())
+                try:
+                    data = func(np.array([tr.data for tr in traces]),
+                                traces[0].stats.delta, axis=-1)
+                except TypeError:
+                    # old NumPy versions have no axis keyword
+                    pass
+                else:
+                    _set_stacked_data(traces, data, info)
+                    continue
+            for tr in traces:
+                tr.differentiate(method=method)
         return self
 
     def integrate(self, method='cumtrapz', **options):
@@ -2403,8 +2906,26 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :meth:`~obspy.core.trace.Trace.detrend` method of
         :class:`~obspy.core.trace.Trace`.
         """
-        for tr in self:
-            tr.detrend(type=type, **options)
+        for traces in _aligned_trace_groups(self):
+            if len(traces) > 1 and type.lower() in _BATCH_DETREND_TYPES and \
+                    not options:
+                info = _get_processing_info(traces[0].detrend, type=type)
+                func = _get_function_from_entry_point('detrend', type.lower())
+                data = np.array([tr.data for tr in traces])
+                if func.__module__.startswith('scipy'):
+                    original_dtype = data.dtype
+                    data = func(data, type='constant' if type.lower() ==
+                                'demean' else type.lower())
+                    # see Trace.detrend()
+                    if original_dtype == np.float32 and \
+                            data.dtype != np.float32:
+                        data = np.require(data, dtype=np.float32)
+                else:
+                    data = func(data)
+                _set_stacked_data(traces, data, info)
+                continue
+            for tr in traces:
+                tr.detrend(type=type, **options)
         return self
 
     def taper(self, *args, **kwargs):
@@ -2421,8 +2942,21 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             original data, use :meth:`~obspy.core.stream.Stream.copy` to create
             a copy of your stream object.
         """
-        for tr in self:
-            tr.taper(*args, **kwargs)
+        for traces in _aligned_trace_groups(self):
+            if len(traces) > 1:
+                info = _get_processing_info(traces[0].taper, *args, **kwargs)
+                taper = _get_taper(len(traces[0]),
+                                   traces[0].stats.sampling_rate, *args,
+                                   **kwargs)
+                data = np.array([tr.data for tr in traces])
+                # Convert data if it's not a floating point type.
+                if not np.issubdtype(data.dtype, float):
+                    data = np.require(data, dtype=np.float64)
+                data *= taper
+                _set_stacked_data(traces, data, info)
+                continue
+            for tr in traces:
+                tr.taper(*args, **kwargs)
         return self
 
     def interpolate(self, *args, **kwargs):
@@ -2560,8 +3094,31 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         else:
             norm = None
         # normalize all traces
-        for tr in self:
-            tr.normalize(norm=norm)
+        for traces in _aligned_trace_groups(self):
+            if len(traces) > 1 and (norm is None or norm):
+                info = _get_processing_info(traces[0].normalize, norm=norm)
+                data = np.array([tr.data for tr in traces])
+                if norm is None:
+                    # absolute maximum of every trace, see Trace.max()
+                    norms = data.max(axis=1)
+                    _min = data.min(axis=1)
+                    norms = abs(np.where(abs(_min) > abs(norms), _min, norms))
+                    # traces with zero norm are left to Trace.normalize()
+                    for tr in [tr for tr, _n in zip(traces, norms) if not _n]:
+                        tr.normalize(norm=norm)
+                    traces = [tr for tr, _n in zip(traces, norms) if _n]
+                    data = data[norms != 0]
+                    norms = norms[norms != 0][:, np.newaxis]
+                else:
+                    norms = abs(norm)
+                # Convert data if it's not a floating point type.
+                if not np.issubdtype(data.dtype, float):
+                    data = np.require(data, dtype=np.float64)
+                data /= norms
+                _set_stacked_data(traces, data, info)
+                continue
+            for tr in traces:
+                tr.normalize(norm=norm)
         return self
 
     def rotate(self, method, back_azimuth=None, inclination=None):
@@ -2837,30 +3394,26 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                         'starttime', 'endtime'])
         # build up dictionary with lists of traces with same ids
         traces_dict = {}
-        # using pop() and try-except saves memory
-        try:
-            while True:
-                trace = self.traces.pop(0)
-                # add trace to respective list or create that list
-                traces_dict.setdefault(trace.id, []).append(trace)
-        except IndexError:
-            pass
+        for trace in self.traces:
+            # add trace to respective list or create that list
+            traces_dict.setdefault(trace.id, []).append(trace)
         # clear traces of current stream
         self.traces = []
         # loop through ids
         for id_ in traces_dict.keys():
             trace_list = traces_dict[id_]
-            cur_trace = trace_list.pop(0)
-            delta = cur_trace.stats.delta
+            # data of directly adjacent traces is collected and merged in
+            # one go
+            cur_trace = _TraceMerger(trace_list[0])
+            delta = trace_list[0].stats.delta
             allowed_micro_shift = misalignment_threshold * delta
             # work through all traces of same id
-            while trace_list:
-                trace = trace_list.pop(0)
+            for trace in trace_list[1:]:
                 # `gap` is the deviation (in seconds) of the actual start
                 # time of the second trace from the expected start time
                 # (for the ideal case of directly adjacent and perfectly
                 # aligned traces).
-                gap = trace.stats.starttime - (cur_trace.stats.endtime + delta)
+                gap = trace.stats.starttime - (cur_trace.endtime + delta)
                 # if `gap` is larger than the designated allowed shift,
                 # we treat it as a real gap and leave as is.
                 if misalignment_threshold > 0 and gap <= allowed_micro_shift:
@@ -2896,9 +3449,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                                 1 - misalignment_threshold):
                             # now we align the sampling points of both traces
                             trace.stats.starttime = (
-                                cur_trace.stats.starttime +
+                                cur_trace.starttime +
                                 round((trace.stats.starttime -
-                                       cur_trace.stats.starttime) / delta) *
+                                       cur_trace.starttime) / delta) *
                                 delta)
                 # we have some common parts: check if consistent
                 # (but only if sampling points are matching to specified
@@ -2906,32 +3459,36 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                 #  previous code block)
                 subsample_shift_percentage = (
                     trace.stats.starttime.timestamp -
-                    cur_trace.stats.starttime.timestamp) % delta / delta
+                    cur_trace.starttime.timestamp) % delta / delta
                 subsample_shift_percentage = min(
                     subsample_shift_percentage, 1 - subsample_shift_percentage)
-                if (trace.stats.starttime <= cur_trace.stats.endtime and
+                if (trace.stats.starttime <= cur_trace.endtime and
                         subsample_shift_percentage < misalignment_threshold):
                     # check if common time slice [t1 --> t2] is equal:
                     t1 = trace.stats.starttime
-                    t2 = min(cur_trace.stats.endtime, trace.stats.endtime)
+                    t2 = min(cur_trace.endtime, trace.stats.endtime)
+                    # only look at the end of the merged trace, concatenating
+                    # all data again for every trace would be quadratic
+                    tail = cur_trace._tail_trace(t1)
+                    if tail is None:
+                        tail = cur_trace.get_trace()
                     # if consistent: add them together
-                    if np.array_equal(cur_trace.slice(t1, t2).data,
+                    if np.array_equal(tail.slice(t1, t2).data,
                                       trace.slice(t1, t2).data):
-                        cur_trace += trace
+                        cur_trace.add(trace)
                     # if not consistent: leave them alone
                     else:
-                        self.traces.append(cur_trace)
-                        cur_trace = trace
+                        self.traces.append(cur_trace.get_trace())
+                        cur_trace = _TraceMerger(trace)
                 # traces are perfectly adjacent: add them together
-                elif trace.stats.starttime == cur_trace.stats.endtime + \
-                        cur_trace.stats.delta:
-                    cur_trace += trace
+                elif trace.stats.starttime == cur_trace.endtime + delta:
+                    cur_trace.add(trace)
                 # no common parts (gap):
                 # leave traces alone and add current to list
                 else:
-                    self.traces.append(cur_trace)
-                    cur_trace = trace
-            self.traces.append(cur_trace)
+                    self.traces.append(cur_trace.get_trace())
+                    cur_trace = _TraceMerger(trace)
+            self.traces.append(cur_trace.get_trace())
         self.traces = [tr for tr in self.traces if tr.stats.npts]
         return self
 
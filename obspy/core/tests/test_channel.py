@@ -15,6 +15,7 @@ from future.builtins import *  # NOQA
 
 import inspect
 import os
+import pickle
 import unittest
 import warnings
 
@@ -23,7 +24,7 @@ from matplotlib import rcParams
 
 from obspy.core.util.testing import ImageComparison, get_matplotlib_version
 from obspy import read_inventory
-from obspy.core.inventory import Channel, Equipment
+from obspy.core.inventory import Channel, Equipment, Response
 
 
 MATPLOTLIB_VERSION = get_matplotlib_version()
@@ -173,6 +174,32 @@ class ChannelTestCase(unittest.TestCase):
             "\tResponse information available"
         )
 
+    def test_unpickle_legacy_channel(self):
+        """
+        Channels pickled while the response was still a plain attribute can
+        be unpickled.
+        """
+        channel = read_inventory()[0][0][0]
+        response = channel.response
+        self.assertTrue(isinstance(response, Response))
+
+        # instance dictionary of a channel from before lazy responses
+        legacy = read_inventory()[0][0][0]
+        legacy.__dict__["response"] = legacy.__dict__.pop("_response")
+        del legacy.__dict__["_response_loader"]
+        data = pickle.dumps(legacy, protocol=2)
+        self.assertNotIn(b"_response", data)
+        unpickled = pickle.loads(data)
+        self.assertEqual(unpickled.response, response)
+        self.assertEqual(unpickled, channel)
+        # channels with a response that was not read yet can be pickled too
+        filename = os.path.join(self.data_dir, "IU_ANMO_00_BHZ.xml")
+        channel = read_inventory(filename, lazy=True)[0][0][0]
+        self.assertIsNotNone(channel._response_loader)
+        unpickled = pickle.loads(pickle.dumps(channel, protocol=2))
+        self.assertEqual(unpickled.response,
+                         read_inventory(filename)[0][0][0].response)
+
 
 def suite():
     return unittest.makeSuite(ChannelTestCase, 'test')
@@ -16,7 +16,8 @@ import numpy as np
 
 from obspy.core.event import (Catalog, Comment, CreationInfo, Event, Origin,
                               Pick, ResourceIdentifier, WaveformStreamID,
-                              read_events, Magnitude, FocalMechanism, Arrival)
+                              read_events, Magnitude, FocalMechanism, Arrival,
+                              EventTable, OriginQuality)
 from obspy.core.event.source import farfield
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util.base import get_basemap_version, get_cartopy_version
@@ -261,6 +262,199 @@ class CatalogTestCase(unittest.TestCase):
         self.assertTrue(isinstance(cat.creation_info, CreationInfo))
         self.assertEqual(cat.creation_info.author, 'test2')
 
+    def test_origin_times(self):
+        """
+        Tests getting the origin times of all events as one array.
+        """
+        cat = read_events()
+        times = cat.origin_times()
+        self.assertEqual(times.tolist(),
+                         [event.origins[0].time for event in cat])
+        # preferred origin is used if set, events without origins are NaT
+        origin = Origin(time=UTCDateTime(2000, 1, 1))
+        cat[0].origins.append(origin)
+        cat[0].preferred_origin_id = origin.resource_id
+        cat.append(Event())
+        times = cat.origin_times()
+        self.assertEqual(len(times), 4)
+        self.assertEqual(times[0], UTCDateTime(2000, 1, 1))
+        self.assertIsNone(times[3])
+        np.testing.assert_array_equal(times.isnat(),
+                                      [False, False, False, True])
+        np.testing.assert_array_equal(
+            times < UTCDateTime(2012, 4, 4, 14, 10),
+            [True, False, True, False])
+        self.assertEqual(len(Catalog().origin_times()), 0)
+
+    def test_to_table(self):
+        """
+        Tests the columnar EventTable representation of catalogs.
+        """
+        cat = read_events(self.iris_xml)
+        cat.extend(read_events(self.neries_xml))
+        table = cat.to_table()
+        self.assertIsInstance(table, EventTable)
+        self.assertEqual(len(table), len(cat))
+        for i, event in enumerate(cat):
+            origin = event.preferred_origin() or event.origins[0]
+            magnitude = event.preferred_magnitude() or event.magnitudes[0]
+            self.assertEqual(table.time[i], origin.time)
+            self.assertEqual(table.latitude[i], origin.latitude)
+            self.assertEqual(table.longitude[i], origin.longitude)
+            self.assertEqual(table.depth[i], origin.depth)
+            self.assertEqual(table.magnitude[i], magnitude.mag)
+            self.assertEqual(table.magnitude_type[i],
+                             magnitude.magnitude_type)
+            self.assertIs(table[i], event)
+        # filtering gives the same events as Catalog.filter
+        for rules in (["magnitude >= 5.5"],
+                      ["latitude > 0", "longitude <= 100"],
+                      ["depth < 10000"],
+                      ["time > 2011-03-11T06:00", "magnitude < 6"]):
+            expected = cat.filter(*rules)
+            self.assertEqual(table.filter(*rules).to_catalog().events,
+                             expected.events)
+            self.assertEqual(
+                table.filter(*rules, inverse=True).to_catalog().events,
+                cat.filter(*rules, inverse=True).events)
+        self.assertRaises(ValueError, table.filter, "foo > 1")
+        self.assertRaises(ValueError, table.filter, "magnitude == 1")
+        self.assertRaises(ValueError, table.filter, "magnitude")
+        # indexing with slices and masks
+        self.assertEqual(table[1:3].to_catalog().events, cat[1:3].events)
+        mask = table.magnitude > 6
+        self.assertEqual(table[mask].to_catalog().events,
+                         [ev for ev, m in zip(cat, mask) if m])
+        # sorting
+        sorted_table = table.sort(["magnitude", "time"], reverse=True)
+        self.assertEqual(sorted_table.magnitude.tolist(),
+                         sorted(table.magnitude.tolist(), reverse=True))
+        self.assertTrue((np.diff(table.sort().time.ns) >= 0).all())
+        self.assertRaises(ValueError, table.sort, ["magnitude_type"])
+
+    def test_event_table_filter(self):
+        """
+        Tests that EventTable.filter() gives the same results as
+        Catalog.filter() with the preferred origins and magnitudes first,
+        also for missing values.
+        """
+        t = UTCDateTime(2000, 1, 1)
+        quality = OriginQuality(standard_error=0.5, azimuthal_gap=100.0)
+        specs = [
+            # preferred origin and magnitude are not the first ones
+            ([dict(time=t, latitude=50.0, longitude=5.0, depth=1000.0),
+              dict(time=t + 10, latitude=10.0, longitude=20.0,
+                   depth=5000.0, quality=quality)],
+             [3.0, 6.0]),
+            # missing origin and origin quality values
+            ([dict(time=t + 20, longitude=30.0,
+                   quality=OriginQuality(azimuthal_gap=200.0))], [None]),
+            # no origin
+            ([], [4.0]),
+            # no origin quality
+            ([dict(time=t + 30, latitude=-10.0, longitude=-20.0,
+                   depth=2000.0)], [5.0]),
+            # origin time only, no magnitude
+            ([dict(time=t + 40)], [])]
+
+        def _catalog(preferred_first):
+            cat = Catalog()
+            for origins, magnitudes in specs:
+                event = Event()
+                event.origins = [Origin(**kwargs) for kwargs in origins]
+                event.magnitudes = [Magnitude(mag=mag) for mag in magnitudes]
+                if event.origins:
+                    event.preferred_origin_id = event.origins[-1].resource_id
+                if event.magnitudes:
+                    event.preferred_magnitude_id = \
+                        event.magnitudes[-1].resource_id
+                if preferred_first:
+                    event.origins.reverse()
+                    event.magnitudes.reverse()
+                cat.append(event)
+            return cat
+
+        def rows(cat, result):
+            return [i for i, event in enumerate(cat)
+                    if any(event is event_ for event_ in result)]
+
+        cat = _catalog(preferred_first=False)
+        table = cat.to_table()
+        expected_cat = _catalog(preferred_first=True)
+        for key, value in (("time", str(t + 15)), ("latitude", "0"),
+                           ("longitude", "10"), ("depth", "3000"),
+                           ("magnitude", "4.5"), ("standard_error", "1"),
+                           ("azimuthal_gap", "150"),
+                           ("used_station_count", "10")):
+            for operator in ("<", "<=", ">", ">="):
+                rule = " ".join((key, operator, value))
+                for inverse in (False, True):
+                    self.assertEqual(
+                        rows(cat, table.filter(rule, inverse=inverse)),
+                        rows(expected_cat,
+                             expected_cat.filter(rule, inverse=inverse)),
+                        msg=rule)
+        # first origin and magnitude of the first event are not used
+        self.assertEqual(rows(cat, table.filter("magnitude > 5")), [0])
+        self.assertEqual(rows(cat, cat.filter("magnitude > 5")), [])
+        # magnitudes of 0.0 are no missing values
+        cat[0].magnitudes[-1].mag = 0.0
+        table = cat.to_table()
+        self.assertEqual(rows(cat, table.filter("magnitude < 1")), [0])
+        self.assertEqual(rows(cat, cat.filter("magnitude < 1")), [])
+
+    def test_event_table_select(self):
+        """
+        Tests selecting rows of an EventTable by time, region and magnitude.
+        """
+        table = EventTable(
+            time=[UTCDateTime(2000, 1, 1) + i * 3600 for i in range(5)],
+            latitude=[0.0, 10.0, -10.0, 45.0, None],
+            longitude=[0.0, 179.0, -179.0, 90.0, None],
+            depth=[1000, 2000, 3000, 4000, 5000],
+            magnitude=[1.0, 2.0, 3.0, None, 5.0],
+            magnitude_type=["ML", "ML", "Mw", None, "mb"])
+        self.assertIsNone(table.events)
+
+        def rows(**kwargs):
+            selected = table.select(**kwargs)
+            return [table.time.ns.tolist().index(t)
+                    for t in selected.time.ns.tolist()]
+
+        self.assertEqual(rows(), [0, 1, 2, 3, 4])
+        self.assertEqual(rows(starttime=UTCDateTime(2000, 1, 1, 1),
+                              endtime=UTCDateTime(2000, 1, 1, 3)), [1, 2, 3])
+        self.assertEqual(rows(minlatitude=0), [0, 1, 3])
+        self.assertEqual(rows(minlongitude=-10, maxlongitude=100), [0, 3])
+        # region crossing the antimeridian
+        self.assertEqual(rows(minlongitude=170, maxlongitude=-170), [1, 2])
+        self.assertEqual(rows(latitude=0, longitude=180, maxradius=15),
+                         [1, 2])
+        self.assertEqual(rows(latitude=0, longitude=180, minradius=15),
+                         [0, 3])
+        self.assertEqual(rows(minmagnitude=2, maxmagnitude=5), [1, 2, 4])
+        self.assertRaises(ValueError, table.select, maxradius=10)
+        # without stored events minimal events are created
+        cat = table.to_catalog()
+        self.assertEqual(len(cat), 5)
+        event = cat[2]
+        self.assertEqual(event.preferred_origin().time,
+                         UTCDateTime(2000, 1, 1, 2))
+        self.assertEqual(event.preferred_origin().latitude, -10.0)
+        self.assertEqual(event.preferred_origin().depth, 3000.0)
+        self.assertEqual(event.preferred_magnitude().mag, 3.0)
+        self.assertEqual(event.preferred_magnitude().magnitude_type, "Mw")
+        self.assertEqual(cat[3].magnitudes, [])
+        self.assertIsNone(cat[4].preferred_origin().latitude)
+        # round trip gives the same columns again
+        table2 = cat.to_table()
+        np.testing.assert_array_equal(table2.time.ns, table.time.ns)
+        for key in EventTable.float_columns:
+            np.testing.assert_array_equal(getattr(table2, key),
+                                          getattr(table, key))
+        self.assertRaises(ValueError, EventTable, time=[UTCDateTime()],
+                          latitude=[1.0, 2.0])
+
     def test_read_events_without_parameters(self):
         """
         Calling read_events w/o any parameter will create an example catalog.
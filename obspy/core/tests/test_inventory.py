@@ -13,7 +13,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import copy
 import os
+import pickle
 import unittest
 import warnings
 
@@ -144,6 +146,108 @@ class InventoryTestCase(unittest.TestCase):
         # 3 - unknown SEED ID should raise exception
         self.assertRaises(Exception, inv.get_coordinates, 'BW.RJOB..XXX')
 
+    def test_get_response_and_coordinates_with_index(self):
+        """
+        Test lookup of responses and coordinates with multiple epochs per
+        channel and that the lookup index is updated when networks are added
+        or it is rebuilt after modifying the inventory in place.
+        """
+        def _channel(start, end, latitude):
+            return Channel(code='BHZ', location_code='00',
+                           start_date=UTCDateTime(start),
+                           end_date=end and UTCDateTime(end),
+                           latitude=latitude, longitude=0.0, elevation=0.0,
+                           depth=0.0, response=Response(str(latitude)))
+
+        channels = [_channel('2012-01-01', None, 3.0),
+                    _channel('2010-01-01', '2011-01-01', 1.0),
+                    _channel('2011-01-01', '2012-01-01', 2.0)]
+        station = Station(code='STA', latitude=0.0, longitude=0.0,
+                          elevation=0.0, channels=channels)
+        inv = Inventory(networks=[Network('XX', stations=[station])],
+                        source='TEST')
+        for time, i in (('2010-06-01', 1), ('2011-06-01', 2),
+                        ('2015-06-01', 0)):
+            time = UTCDateTime(time)
+            response = inv.get_response('XX.STA.00.BHZ', time)
+            self.assertIs(response, channels[i].response)
+            coordinates = inv.get_coordinates('XX.STA.00.BHZ', time)
+            self.assertEqual(coordinates['latitude'], channels[i].latitude)
+        self.assertRaises(Exception, inv.get_response, 'XX.STA.00.BHZ',
+                          UTCDateTime('2009-01-01'))
+        self.assertRaises(Exception, inv.get_response, 'XX.STA.00.BHN',
+                          UTCDateTime('2010-06-01'))
+        # overlapping epochs, first channel in inventory is returned
+        channels.append(_channel('2010-01-01', None, 4.0))
+        inv._rebuild_index()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            response = inv.get_response('XX.STA.00.BHZ',
+                                        UTCDateTime('2015-06-01'))
+        self.assertEqual(len(w), 1)
+        self.assertIs(response, channels[0].response)
+        # index is updated when adding networks
+        inv += Network('YY', stations=[Station(
+            code='STA', latitude=0.0, longitude=0.0, elevation=0.0,
+            channels=[_channel('2010-01-01', None, 5.0)])])
+        coordinates = inv.get_coordinates('YY.STA.00.BHZ')
+        self.assertEqual(coordinates['latitude'], 5.0)
+        # in place changes are picked up after rebuilding the index
+        inv[1][0][0].code = 'BHN'
+        self.assertRaises(Exception, inv.get_coordinates, 'YY.STA.00.BHN')
+        inv._rebuild_index()
+        coordinates = inv.get_coordinates('YY.STA.00.BHN')
+        self.assertEqual(coordinates['latitude'], 5.0)
+        self.assertRaises(Exception, inv.get_coordinates, 'YY.STA.00.BHZ')
+        inv[1][0][0].code = 'BHZ'
+        inv[1][0][0].location_code = '10'
+        inv._rebuild_index()
+        coordinates = inv.get_coordinates('YY.STA.10.BHZ')
+        self.assertEqual(coordinates['latitude'], 5.0)
+        self.assertRaises(Exception, inv.get_coordinates, 'YY.STA.00.BHZ')
+        inv[1].code = 'XX'
+        inv[1][0][0].location_code = '00'
+        inv._rebuild_index()
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            response = inv.get_response('XX.STA.00.BHZ',
+                                        UTCDateTime('2015-06-01'))
+        # one warning for each of the two networks with matching channels
+        self.assertEqual(len(w), 2)
+        self.assertIs(response, channels[0].response)
+        # channels replaced in place and changed start dates
+        inv[1][0].channels[0] = _channel('2010-01-01', None, 7.0)
+        inv[1][0].channels.append(_channel('2010-01-01', None, 6.0))
+        inv[1][0][1].code = 'BHE'
+        inv[1][0][1].start_date = UTCDateTime('2008-01-01')
+        inv._rebuild_index()
+        coordinates = inv.get_coordinates('XX.STA.00.BHE',
+                                          UTCDateTime('2009-01-01'))
+        self.assertEqual(coordinates['latitude'], 6.0)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            response = inv.get_response('XX.STA.00.BHZ',
+                                        UTCDateTime('2010-06-01'))
+        self.assertIs(response, channels[1].response)
+        self.assertIs(inv._get_index(), inv._get_index())
+        # same results as the lookup of the individual networks
+        for seed_id in ('XX.STA.00.BHZ', 'XX.STA.00.BHE'):
+            for time in (None, UTCDateTime('2009-01-01'),
+                         UTCDateTime('2010-06-01')):
+                expected = [net.get_coordinates(seed_id, time)
+                            for net in inv if net.select(
+                                station='STA', location='00',
+                                channel=seed_id[-3:], time=time)]
+                if expected:
+                    self.assertEqual(inv.get_coordinates(seed_id, time),
+                                     expected[0])
+                else:
+                    self.assertRaises(Exception, inv.get_coordinates,
+                                      seed_id, time)
+        # index is no part of the inventory information
+        self.assertEqual(inv, copy.deepcopy(inv))
+        self.assertEqual(inv, pickle.loads(pickle.dumps(inv)))
+
     def test_response_plot(self):
         """
         Tests the response plot.
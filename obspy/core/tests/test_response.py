@@ -13,6 +13,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import copy
 import inspect
 import os
 import unittest
@@ -25,7 +26,7 @@ from matplotlib import rcParams
 
 from obspy import UTCDateTime, read_inventory
 from obspy.core.inventory.response import (
-    _pitick2latex, PolesZerosResponseStage)
+    _pitick2latex, PolesZerosResponseStage, ResponseCache)
 from obspy.core.util.misc import CatchOutput
 from obspy.core.util.obspy_types import ComplexWithUncertainties
 from obspy.core.util.testing import ImageComparison, get_matplotlib_version
@@ -249,6 +250,73 @@ class ResponseTestCase(unittest.TestCase):
             "stage with frequencies only from -0.0096 - 20.0096 Hz. You are "
             "requesting a response from 0.4500 - 22.5000 Hz.")
 
+    def test_numpy_engine(self):
+        """
+        Tests the numpy response evaluation against evalresp, for responses
+        with poles and zeros, FIR, IIR and response list stages.
+        """
+        filenames = ["AU.MEEK.xml", "XM.05.xml", "IM_IL31__BHZ.xml",
+                     "IU_ULN_00_LH1.xml", "IU_ANMO_BH.xml"]
+        for filename in filenames:
+            inv = read_inventory(os.path.join(self.data_dir, filename))
+            for cha in inv.get_contents()["channels"]:
+                channel = inv.select(channel=cha.split(".")[-1])[0][0][0]
+                response = channel.response
+                frequencies = np.linspace(0, channel.sample_rate / 2.0, 257)
+                for output in ("DISP", "VEL", "ACC"):
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        with CatchOutput():
+                            expected = response.\
+                                get_evalresp_response_for_frequencies(
+                                    frequencies, output=output)
+                        got = response.get_evalresp_response_for_frequencies(
+                            frequencies, output=output, engine="numpy")
+                    np.testing.assert_allclose(
+                        got, expected, rtol=1e-6,
+                        atol=1e-9 * np.abs(expected).max())
+        self.assertRaises(ValueError, response.get_evalresp_response,
+                          t_samp=0.01, nfft=16, engine="unknown")
+
+    def test_response_cache(self):
+        """
+        Tests the cache of evaluated response spectra.
+        """
+        inv = read_inventory()
+        response = inv[0][0][0].response
+        expected_resp, expected_freqs = response.get_evalresp_response(
+            t_samp=0.01, nfft=1024, output="DISP")
+        nbytes = expected_resp.nbytes + expected_freqs.nbytes
+        cache = ResponseCache(max_size=2 * nbytes)
+        for _ in range(2):
+            resp, freqs = cache.get_evalresp_response(
+                response, t_samp=0.01, nfft=1024, output="DISP")
+            np.testing.assert_array_equal(resp, expected_resp)
+            np.testing.assert_array_equal(freqs, expected_freqs)
+            # returned spectra are copies
+            resp[:] = 0
+        self.assertEqual(cache.statistics, {
+            "hits": 1, "misses": 1, "evictions": 0, "bytes": nbytes,
+            "spectra": 1})
+        # equal responses of other objects share the cache entries
+        cache.get_evalresp_response(copy.deepcopy(response),
+                                    t_samp=0.01, nfft=1024, output="DISP")
+        self.assertEqual(cache.statistics["hits"], 2)
+        # other parameters or modified responses are evaluated again and
+        # the least recently used spectra are evicted
+        cache.get_evalresp_response(response, t_samp=0.01, nfft=1024,
+                                    output="VEL")
+        response.instrument_sensitivity.value *= 2
+        cache.get_evalresp_response(response, t_samp=0.01, nfft=1024,
+                                    output="DISP")
+        self.assertEqual(cache.statistics, {
+            "hits": 2, "misses": 3, "evictions": 1, "bytes": 2 * nbytes,
+            "spectra": 2})
+        cache.clear()
+        self.assertEqual(cache.statistics, {
+            "hits": 0, "misses": 0, "evictions": 0, "bytes": 0,
+            "spectra": 0})
+
 
 def suite():
     return unittest.makeSuite(ResponseTestCase, 'test')
@@ -228,6 +228,75 @@ class StatsTestCase(unittest.TestCase):
         self.assertEqual(ad, adict)
         self.assertEqual(adict, ad)
 
+    def test_core_attributes_in_slots(self):
+        """
+        Core attributes are kept out of the instance dictionary but still
+        behave like dictionary entries.
+        """
+        stats = Stats({'network': 'BW', 'npts': 10, 'mseed': {'a': 1}})
+        self.assertNotIn('network', stats.__dict__)
+        self.assertNotIn('endtime', stats.__dict__)
+        self.assertIn('mseed', stats.__dict__)
+        self.assertIn('network', stats)
+        self.assertIn('endtime', stats)
+        self.assertEqual(len(stats), 11)
+        self.assertEqual(sorted(stats.keys()), sorted(
+            ['network', 'station', 'location', 'channel', 'starttime',
+             'endtime', 'sampling_rate', 'delta', 'npts', 'calib', 'mseed']))
+        self.assertEqual(stats['network'], 'BW')
+        self.assertEqual(stats.get('npts'), 10)
+        # deleting a core attribute restores its default value
+        del stats.network
+        self.assertEqual(stats.network, '')
+        del stats['mseed']
+        self.assertNotIn('mseed', stats)
+
+    def test_endtime_derived_lazily(self):
+        """
+        Tests that endtime follows changes of starttime, npts, delta and
+        sampling_rate.
+        """
+        stats = Stats()
+        self.assertEqual(stats.endtime, UTCDateTime(0))
+        stats.npts = 11
+        self.assertEqual(stats.endtime, UTCDateTime(10))
+        stats.starttime = UTCDateTime(100)
+        self.assertEqual(stats['endtime'], UTCDateTime(110))
+        stats.sampling_rate = 2.0
+        self.assertEqual(stats.delta, 0.5)
+        self.assertEqual(stats.endtime, UTCDateTime(105))
+        stats.delta = 2.0
+        self.assertEqual(stats.sampling_rate, 0.5)
+        self.assertEqual(stats.endtime, UTCDateTime(120))
+        stats.update({'npts': 0})
+        self.assertEqual(stats.endtime, UTCDateTime(100))
+        stats.sampling_rate = 0
+        self.assertEqual(stats.delta, 0)
+        # copies keep their own start time
+        stats2 = copy.deepcopy(stats)
+        stats2.starttime += 10
+        self.assertEqual(stats.starttime, UTCDateTime(100))
+        self.assertEqual(stats2.endtime, UTCDateTime(110))
+
+    def test_unpickle_old_state(self):
+        """
+        Tests restoring Stats from a state that stores all attributes in the
+        instance dictionary.
+        """
+        state = {
+            'network': 'BW', 'station': 'RJOB', 'location': '',
+            'channel': 'EHZ', 'starttime': UTCDateTime(10),
+            'endtime': UTCDateTime(19), 'sampling_rate': 1.0, 'delta': 1.0,
+            'npts': 10, 'calib': 1.0, 'test': {'a': 1}}
+        stats = Stats.__new__(Stats)
+        stats.__setstate__(state)
+        self.assertEqual(stats, state)
+        self.assertEqual(stats.test.__class__, AttribDict)
+        for protocol in range(3):
+            stats2 = pickle.loads(pickle.dumps(stats, protocol=protocol))
+            self.assertEqual(stats, stats2)
+            self.assertEqual(stats2.endtime, UTCDateTime(19))
+
 
 def suite():
     return unittest.makeSuite(StatsTestCase, 'test')
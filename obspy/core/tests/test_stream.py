@@ -8,14 +8,17 @@ import pickle
 import unittest
 import warnings
 from copy import deepcopy
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
-from obspy import Stream, Trace, UTCDateTime, read
+from obspy import Stream, Trace, UTCDateTime, read, read_iter
 from obspy.core.compatibility import mock
-from obspy.core.stream import _is_pickle, _read_pickle, _write_pickle
+from obspy.core.stream import (_is_pickle, _read, _read_pickle,
+                               _write_pickle, _TraceMerger)
 from obspy.core.util.attribdict import AttribDict
 from obspy.core.util.base import NamedTemporaryFile, get_scipy_version
+from obspy.core.util.misc import TemporaryWorkingDirectory
 from obspy.io.xseed import Parser
 
 
@@ -1676,6 +1679,33 @@ class StreamTestCase(unittest.TestCase):
                 st._cleanup()
             self.assertEqual(st, Stream([tr_a, tr_b]))
 
+    def test_cleanup_many_overlaps(self):
+        """
+        Test cleanup of many overlapping traces, only the end of the merged
+        trace must be compared to every following trace.
+        """
+        np.random.seed(42)
+        data = np.random.randint(-100, 100, 10000).astype(np.int32)
+        traces = []
+        for start in range(0, 9900, 90):
+            tr = Trace(data=data[start:start + 100].copy())
+            tr.stats.starttime += start
+            traces.append(tr)
+        # one trace with inconsistent data in overlap
+        traces[50].data[:5] += 1
+        st = Stream([tr.copy() for tr in traces])
+        with mock.patch('obspy.core.stream._TraceMerger.get_trace',
+                        autospec=True,
+                        side_effect=_TraceMerger.get_trace) as p:
+            st._cleanup()
+        self.assertEqual(p.call_count, 2)
+        self.assertEqual(len(st), 2)
+        np.testing.assert_array_equal(st[0].data, data[:4510])
+        self.assertEqual(st[0].stats.starttime, traces[0].stats.starttime)
+        np.testing.assert_array_equal(st[1].data, traces[50].data.tolist() +
+                                      data[4600:9910].tolist())
+        self.assertEqual(st[1].stats.starttime, traces[50].stats.starttime)
+
     def test_integrate_and_differentiate(self):
         """
         Test integration and differentiation methods of stream
@@ -1763,6 +1793,103 @@ class StreamTestCase(unittest.TestCase):
             self.assertRaises(UserWarning, read, '/path/to/slist_float.ascii',
                               headonly=True, starttime=0, endtime=1)
 
+    def test_read_parallel(self):
+        """
+        Reading multiple files with a worker pool or a given executor gives
+        the same result as reading them one by one, also for faulty files.
+        """
+        path = os.path.dirname(__file__)
+        ascii_path = os.path.join(path, "..", "..", "io", "ascii", "tests",
+                                  "data")
+        filename = os.path.join(ascii_path, 'slist.*')
+        expected = read(filename)
+        self.assertEqual(len(expected), 2)
+        # process pool
+        st = read(filename, workers=2)
+        self.assertEqual(st, expected)
+        # any executor with a map() method
+        pool = ThreadPool(2)
+        try:
+            st = read(filename, executor=pool)
+        finally:
+            pool.close()
+        self.assertEqual(st, expected)
+        # a faulty file in between raises the same error as when reading
+        # the files one by one
+        with TemporaryWorkingDirectory():
+            for i, tr in enumerate(expected):
+                tr.write("%d.ascii" % (i * 2), format="SLIST")
+            with open("1.ascii", "wb") as fh:
+                fh.write(b"garbage" * 100)
+            with self.assertRaises(TypeError) as e:
+                read("*.ascii")
+            for kwargs in ({"workers": 2}, {"executor": ThreadPool(2)}):
+                with self.assertRaises(TypeError) as e_parallel:
+                    read("*.ascii", **kwargs)
+                self.assertEqual(str(e_parallel.exception), str(e.exception))
+                if "executor" in kwargs:
+                    kwargs["executor"].close()
+
+    def test_read_skip_errors(self):
+        """
+        With ``raise_errors=False`` corrupt files are skipped with a warning,
+        serially and in parallel.
+        """
+        with TemporaryWorkingDirectory():
+            for i, tr in enumerate(read()):
+                tr.write("%d.mseed" % (i * 2), format="MSEED")
+            expected = read("*.mseed")
+            with open("3.mseed", "wb") as fh:
+                fh.write(b"garbage" * 100)
+            pool = ThreadPool(2)
+            try:
+                for kwargs in ({}, {"workers": 2}, {"executor": pool}):
+                    with warnings.catch_warnings(record=True) as w:
+                        warnings.simplefilter("always")
+                        st = read("*.mseed", raise_errors=False, **kwargs)
+                    self.assertEqual(st, expected)
+                    self.assertEqual(len(w), 1)
+                    self.assertIn("Skipping file '3.mseed'", str(w[0].message))
+                    self.assertIn("TypeError: Unknown format",
+                                  str(w[0].message))
+                    # raising errors is the default
+                    self.assertRaises(TypeError, read, "*.mseed", **kwargs)
+            finally:
+                pool.close()
+
+    def test_read_iter(self):
+        """
+        Iterating over windows of data read piece by piece from files gives
+        the same windows as sliding over all data.
+        """
+        st = read()
+        # split the example data into files of two seconds, shuffled names
+        with TemporaryWorkingDirectory():
+            for i, st_ in enumerate(st.slide(2, 2)):
+                st_.write("%d.mseed" % ((i * 5) % 14), format="MSEED")
+            full = read("*.mseed")
+            full.merge(-1)
+            for window_length, step, kwargs in (
+                    (5, 5, {}), (5, 2.5, {}), (3, 4, dict(offset=1)),
+                    (4, 5, dict(include_partial_windows=True))):
+                expected = list(full.slide(window_length, step, **kwargs))
+                with mock.patch("obspy.core.stream._read",
+                                wraps=_read) as p:
+                    got = read_iter("*.mseed", window_length, step, **kwargs)
+                    # only headers were read so far
+                    self.assertEqual(p.call_count, 14)
+                    # files are read in order of their start times
+                    got = [next(got)] + list(got)
+                    self.assertLessEqual(p.call_count, 28)
+                    self.assertEqual(p.call_args_list[14][0][0], "0.mseed")
+                    self.assertEqual(p.call_args_list[15][0][0], "5.mseed")
+                self.assertEqual(len(got), len(expected))
+                for st1, st2 in zip(got, expected):
+                    for tr in st1 + st2:
+                        tr.stats.pop("processing", None)
+                    self.assertEqual(st1.sort(), st2.sort())
+        self.assertRaises(IOError, read_iter, "/some/missing/file", 10)
+
     def test_copy(self):
         """
         Testing the copy method of the Stream object.
@@ -1791,6 +1918,97 @@ class StreamTestCase(unittest.TestCase):
         st.merge(fill_value='interpolate')
         self.assertEqual(len(st), 1)
 
+    def test_merge_many_fragments(self):
+        """
+        Merging many fragmented traces has to give the same results as
+        adding up the traces one by one with Trace.__add__ after the cleanup
+        merge.
+        """
+        np.random.seed(815)
+        traces = []
+        t = UTCDateTime(2016, 1, 1)
+        for _i in range(300):
+            npts = np.random.randint(1, 50)
+            # mostly adjacent fragments, some gaps, overlaps with equal and
+            # differing data and contained traces
+            shift = np.random.choice([0, 0, 0, 3, -2, -20])
+            data = np.random.randint(-100, 100, npts).astype(np.int32)
+            tr = Trace(data=data, header={'starttime': t + shift})
+            if shift < 0 and traces and np.random.rand() < 0.5:
+                common = traces[-1].data[shift:][:npts]
+                tr.data[:len(common)] = common
+            traces.append(tr)
+            t = tr.stats.endtime + tr.stats.delta
+        for method, fill_value, interpolation_samples in [
+                (0, None, 0), (0, 0, 0), (0, 'latest', 0),
+                (0, 'interpolate', 0), (1, None, 0), (1, 'latest', 5),
+                (1, 'interpolate', -1)]:
+            st = Stream([tr.copy() for tr in traces])
+            st.merge(method=method, fill_value=fill_value,
+                     interpolation_samples=interpolation_samples)
+            self.assertEqual(len(st), 1)
+            # reference: cleanup merge followed by adding up the traces
+            expected = Stream([tr.copy() for tr in traces])._cleanup()
+            expected.sort(keys=['starttime', 'endtime'])
+            expected, others = expected[0], expected[1:]
+            for tr in others:
+                expected = expected.__add__(
+                    tr, method=method, fill_value=fill_value,
+                    interpolation_samples=interpolation_samples)
+            self.assertEqual(st[0].stats, expected.stats)
+            self.assertEqual(st[0].data.dtype, expected.data.dtype)
+            self.assertEqual(isinstance(st[0].data, np.ma.masked_array),
+                             isinstance(expected.data, np.ma.masked_array))
+            np.testing.assert_array_equal(np.ma.getmaskarray(st[0].data),
+                                          np.ma.getmaskarray(expected.data))
+            np.testing.assert_array_equal(np.ma.filled(st[0].data, 0),
+                                          np.ma.filled(expected.data, 0))
+
+    def test_processing_of_aligned_traces(self):
+        """
+        Traces with same sampling rate, length and dtype are processed
+        together as 2-D array, results have to match processing of the
+        single traces.
+        """
+        np.random.seed(815)
+        st = Stream()
+        for i in range(6):
+            st.append(Trace(data=np.random.randint(-1000, 1000, 500)))
+        st.append(Trace(data=np.random.randn(500).astype(np.float32)))
+        st.append(Trace(data=np.random.randn(400)))
+        st.append(Trace(data=np.zeros(500, dtype=np.int64)))
+        for method, args, kwargs in [
+                ('filter', ('bandpass', ), dict(freqmin=0.05, freqmax=0.2)),
+                ('filter', ('lowpass', ), dict(freq=0.1, zerophase=True)),
+                ('filter', ('highpass', ), dict(freq=0.1, corners=2)),
+                ('filter', ('bandstop', ), dict(freqmin=0.1, freqmax=0.2)),
+                ('detrend', (), dict(type='simple')),
+                ('detrend', (), dict(type='linear')),
+                ('detrend', (), dict(type='demean')),
+                ('taper', (0.05, ), dict()),
+                ('taper', (), dict(max_percentage=0.1, type='cosine')),
+                ('normalize', (), dict()),
+                ('normalize', (), dict(global_max=True)),
+                ('differentiate', (), dict())]:
+            st2 = st.copy()
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter("always")
+                getattr(st2, method)(*args, **kwargs)
+            if method == 'normalize':
+                norm = None
+                if kwargs:
+                    norm = max([abs(value) for value in st.max()])
+                args, kwargs = (), dict(norm=norm)
+            for tr, tr2 in zip(st, st2):
+                tr = tr.copy()
+                with warnings.catch_warnings(record=True):
+                    warnings.simplefilter("always")
+                    getattr(tr, method)(*args, **kwargs)
+                self.assertEqual(tr.stats, tr2.stats)
+                self.assertEqual(tr.data.dtype, tr2.data.dtype)
+                np.testing.assert_allclose(tr.data, tr2.data, rtol=1e-6,
+                                           atol=1e-8)
+
     def test_rotate(self):
         """
         Testing the rotate method.
@@ -2426,6 +2644,25 @@ class StreamTestCase(unittest.TestCase):
             self.assertEqual(arg[1]["order"], 2)
             self.assertEqual(arg[1]["plot"], True)
 
+    def test_starttimes_endtimes_ns(self):
+        """
+        Tests getting start and end times of all traces as one array.
+        """
+        st = read()
+        st[1].stats.starttime += 1.5
+        st[2].stats.npts = 10
+        starttimes = st.starttimes_ns()
+        endtimes = st.endtimes_ns()
+        self.assertEqual(starttimes.tolist(),
+                         [tr.stats.starttime for tr in st])
+        self.assertEqual(endtimes.tolist(), [tr.stats.endtime for tr in st])
+        self.assertEqual(np.asarray(starttimes).dtype,
+                         np.dtype("datetime64[ns]"))
+        np.testing.assert_allclose(endtimes - starttimes, [29.99, 29.99, 0.09])
+        np.testing.assert_array_equal(
+            starttimes > UTCDateTime(2009, 8, 24, 0, 20, 3), [0, 1, 0])
+        self.assertEqual(len(Stream().starttimes_ns()), 0)
+
 
 def suite():
     return unittest.makeSuite(StreamTestCase, 'test')
@@ -1411,6 +1411,12 @@ class TraceTestCase(unittest.TestCase):
         got = tr.times("timestamp")
         expected = np.arange(0, 4.5 * delta, delta) + 946684800.0
         np.testing.assert_allclose(got[:5], expected, rtol=1e-17)
+        got = tr.times("datetime64")
+        self.assertEqual(got.dtype, np.dtype("datetime64[ns]"))
+        np.testing.assert_array_equal(
+            got.view(np.int64),
+            [t_._ns for t_ in tr.times("utcdatetime")])
+        self.assertEqual(got[1], np.datetime64("2000-01-01T00:00:00.05"))
         got = tr.times("matplotlib")
         expected = np.array([
             730120.00000000000000000000, 730120.00000057870056480169,
@@ -1692,6 +1698,24 @@ class TraceTestCase(unittest.TestCase):
         tr2.remove_response(pre_filt=(0.1, 0.5, 30, 50))
         np.testing.assert_array_almost_equal(tr1.data, tr2.data)
 
+    def test_remove_response_with_cache(self):
+        """
+        Test remove_response() with a cache of response spectra gives the
+        same results as without.
+        """
+        from obspy.core.inventory import ResponseCache
+        tr = read()[0]
+        expected = tr.copy().remove_response(output="DISP", pre_filt=(
+            0.1, 0.5, 30, 50))
+        cache = ResponseCache()
+        for _ in range(3):
+            tr_ = tr.copy().remove_response(
+                output="DISP", pre_filt=(0.1, 0.5, 30, 50),
+                response_cache=cache)
+            np.testing.assert_array_equal(tr_.data, expected.data)
+        self.assertEqual(cache.statistics["misses"], 1)
+        self.assertEqual(cache.statistics["hits"], 2)
+
     def test_remove_polynomial_response(self):
         """
         """
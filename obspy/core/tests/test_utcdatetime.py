@@ -10,6 +10,8 @@ import unittest
 import numpy as np
 
 from obspy import UTCDateTime
+from obspy.core.utcdatetime import (UTCDateTimeArray, ns_to_utcdatetimes,
+                                    utcdatetimes_to_ns)
 
 
 class UTCDateTimeTestCase(unittest.TestCase):
@@ -1104,6 +1106,123 @@ class UTCDateTimeTestCase(unittest.TestCase):
         self.assertEqual(str(UTCDateTime("9999-12-31T23:59:59.999999")),
                          "9999-12-31T23:59:59.999999Z")
 
+    def test_integer_nanosecond_arithmetic(self):
+        """
+        Adding, subtracting and comparing is exact on the nanosecond level,
+        also for timestamps where floats lose precision.
+        """
+        t1 = UTCDateTime(ns=253370764800500000001)
+        t2 = t1 + 1
+        self.assertEqual(t2._ns, 253370764801500000001)
+        self.assertEqual((t2 - 1)._ns, t1._ns)
+        self.assertEqual((t1 + 0.000000001)._ns, 253370764800500000002)
+        self.assertEqual(t2 - t1, 1.0)
+        t3 = UTCDateTime(ns=t1._ns + 1)
+        self.assertTrue(t1 == t3)
+        t1.precision = 9
+        self.assertFalse(t1 == t3)
+        self.assertTrue(t1 < t3)
+        self.assertTrue(t1 <= t3)
+        self.assertFalse(t1 > t3)
+        self.assertFalse(t1 >= t3)
+        # differences up to half of the precision are considered equal
+        t4 = UTCDateTime(ns=t3._ns + 499)
+        t5 = UTCDateTime(ns=t3._ns + 501)
+        self.assertTrue(t3 == t4)
+        self.assertTrue(t3 < t5)
+        self.assertTrue(t5 > t3)
+
+    def test_iso8601_fast_path(self):
+        """
+        The fast parser for the common ISO8601 representation gives the same
+        results as the general parser.
+        """
+        for fast, general in (
+                ("2010-01-02T03:04:05.123456Z", "20100102T030405.123456"),
+                ("2010-01-02T03:04:05.1234565", "20100102T030405.1234565"),
+                ("2010-01-02T03:04:05", "2010-01-02T03:04:05+00:00"),
+                ("2010-01-02T03:04:05.Z", "2010002T030405")):
+            self.assertEqual(UTCDateTime(fast)._ns, UTCDateTime(general)._ns)
+        self.assertRaises(ValueError, UTCDateTime, "2010-02-30T03:04:05",
+                          iso8601=True)
+
+    def test_ns_array_conversion(self):
+        """
+        Tests converting between nanosecond arrays and UTCDateTime lists.
+        """
+        times = [UTCDateTime(2010, 1, 1), UTCDateTime(ns=1),
+                 UTCDateTime(-1.5)]
+        ns = utcdatetimes_to_ns(times)
+        self.assertEqual(ns.dtype, np.int64)
+        np.testing.assert_array_equal(
+            ns, [1262304000000000000, 1, -1500000000])
+        got = ns_to_utcdatetimes(ns)
+        self.assertEqual([t._ns for t in got], [t._ns for t in times])
+        self.assertEqual(got[0].precision, 6)
+        got = ns_to_utcdatetimes(ns.astype("datetime64[ns]"), precision=3)
+        self.assertEqual([t._ns for t in got], [t._ns for t in times])
+        self.assertEqual(got[0].precision, 3)
+        self.assertEqual(ns_to_utcdatetimes([]), [])
+        self.assertEqual(len(utcdatetimes_to_ns([])), 0)
+
+    def test_utcdatetime_array(self):
+        """
+        Tests creation, comparison and arithmetic of UTCDateTimeArray.
+        """
+        t = UTCDateTime(2010, 1, 1)
+        times = UTCDateTimeArray([t, None, "2010-01-01T00:00:10", 1e9])
+        self.assertEqual(len(times), 4)
+        np.testing.assert_array_equal(
+            times.ns, [t._ns, UTCDateTimeArray.NAT, t._ns + 10 ** 10,
+                       10 ** 18])
+        self.assertEqual(times.tolist(),
+                         [t, None, t + 10, UTCDateTime(1e9)])
+        self.assertEqual(list(times), times.tolist())
+        self.assertEqual(times[2], t + 10)
+        self.assertIsNone(times[1])
+        self.assertTrue(isinstance(times[1:], UTCDateTimeArray))
+        self.assertEqual(times[[0, 2]].tolist(), [t, t + 10])
+        # other sources
+        for other in (np.asarray(times), times.datetime64,
+                      UTCDateTimeArray(times)):
+            np.testing.assert_array_equal(UTCDateTimeArray(other).ns,
+                                          times.ns)
+        np.testing.assert_array_equal(
+            UTCDateTimeArray(np.array([1.5, np.nan])).ns,
+            [1500000000, UTCDateTimeArray.NAT])
+        np.testing.assert_array_equal(
+            UTCDateTimeArray(np.array([2])).ns, [2000000000])
+        # comparisons, missing times never compare equal
+        np.testing.assert_array_equal(times == t, [1, 0, 0, 0])
+        np.testing.assert_array_equal(times != t, [0, 1, 1, 1])
+        np.testing.assert_array_equal(times < t + 5, [1, 0, 0, 1])
+        np.testing.assert_array_equal(times <= t, [1, 0, 0, 1])
+        np.testing.assert_array_equal(times > t, [0, 0, 1, 0])
+        np.testing.assert_array_equal(times >= "2010-01-01", [1, 0, 1, 0])
+        np.testing.assert_array_equal(t + 5 > times, [1, 0, 0, 1])
+        np.testing.assert_array_equal(t == times, [1, 0, 0, 0])
+        np.testing.assert_array_equal(t != times, [0, 1, 1, 1])
+        np.testing.assert_array_equal(times == times, [1, 0, 1, 1])
+        # comparisons use the precision like UTCDateTime
+        close = UTCDateTimeArray.from_ns([t._ns + 400, t._ns + 600])
+        np.testing.assert_array_equal(close == t, [True, False])
+        close.precision = 9
+        np.testing.assert_array_equal(close > t, [True, True])
+        # arithmetic
+        self.assertEqual((times + 1.5)[0], t + 1.5)
+        self.assertIsNone((times + 1.5)[1])
+        self.assertEqual((times - 1)[2], t + 9)
+        self.assertEqual((times + np.arange(4))[2], t + 12)
+        np.testing.assert_array_equal(times - t,
+                                      [0, np.nan, 10, 1e9 - t.timestamp])
+        # reductions
+        self.assertEqual(times.min(), UTCDateTime(1e9))
+        self.assertEqual(times.max(), t + 10)
+        np.testing.assert_array_equal(times.argsort(), [1, 3, 0, 2])
+        np.testing.assert_array_equal(times.isnat(), [0, 1, 0, 0])
+        self.assertIsNone(UTCDateTimeArray().min())
+        self.assertIsNone(UTCDateTimeArray([None]).max())
+
 
 def suite():
     return unittest.makeSuite(UTCDateTimeTestCase, 'test')
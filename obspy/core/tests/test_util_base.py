@@ -7,8 +7,14 @@ import os
 import shutil
 import unittest
 
+from obspy import read
 from obspy.core.compatibility import mock
-from obspy.core.util.base import NamedTemporaryFile, get_matplotlib_version
+from obspy.core.util import base
+from obspy.core.util.base import (NamedTemporaryFile, _get_format_candidates,
+                                  _read_from_plugin,
+                                  clear_format_detection_cache,
+                                  get_matplotlib_version)
+from obspy.core.util.misc import TemporaryWorkingDirectory
 from obspy.core.util.testing import ImageComparison, ImageComparisonException
 
 # checking for matplotlib
@@ -120,6 +126,169 @@ class UtilBaseTestCase(unittest.TestCase):
         # check that temp file is deleted
         self.assertFalse(os.path.exists(ic.name))
 
+    def test_format_detection_candidates(self):
+        """
+        Formats hinted at by the format last detected in the same directory,
+        the file extension or magic bytes are checked first, followed by all
+        other formats in default order. Formats with a signature not matching
+        the file are left out.
+        """
+        clear_format_detection_cache()
+        default = list(base.ENTRY_POINTS['waveform'].keys())
+        signature_formats = ['SEG2', 'WAV', 'GSE1', 'SLIST', 'TSPAIR']
+        with TemporaryWorkingDirectory():
+            st = read()
+            st[:1].write("test.sac", format="SAC")
+            st[:1].write("test.ascii", format="SLIST")
+            candidates = [ep.name for ep in
+                          _get_format_candidates('waveform', 'test.sac')]
+            self.assertEqual(candidates, ['SAC'] + [
+                name for name in default
+                if name not in signature_formats + ['SAC']])
+            expected = ['SLIST', 'TSPAIR'] + [
+                name for name in default
+                if name not in signature_formats]
+            candidates = [ep.name for ep in
+                          _get_format_candidates('waveform', 'test.ascii')]
+            self.assertEqual(candidates, expected)
+            with open('test.ascii', 'rb') as fh:
+                candidates = [ep.name for ep in
+                              _get_format_candidates('waveform', fh)]
+                self.assertEqual(candidates, expected)
+                self.assertEqual(fh.tell(), 0)
+            # format last detected in the same directory comes first
+            _read_from_plugin('waveform', 'test.sac')
+            candidates = [ep.name for ep in
+                          _get_format_candidates('waveform', 'test.ascii')]
+            self.assertEqual(candidates, ['SAC'] + [
+                name for name in expected if name != 'SAC'])
+            clear_format_detection_cache()
+            candidates = [ep.name for ep in
+                          _get_format_candidates('waveform', 'test.ascii')]
+            self.assertEqual(candidates, expected)
+        # unreadable files are checked for all formats
+        candidates = [ep.name for ep in
+                      _get_format_candidates('waveform', 'does_not_exist')]
+        self.assertEqual(candidates, default)
+
+    def _detect_format_in_default_order(self, plugin_type, filename):
+        for format_ep in base.ENTRY_POINTS[plugin_type].values():
+            is_format = base._get_plugin_function(plugin_type, format_ep,
+                                                  'isFormat')
+            if is_format(filename):
+                return format_ep.name
+        return None
+
+    def test_format_detection_ambiguous_file(self):
+        """
+        Files accepted by several formats are detected as the first of them
+        in default order, regardless of any hints.
+        """
+        clear_format_detection_cache()
+        with TemporaryWorkingDirectory():
+            st = read()
+            st[:1].write("tspair.ascii", format="TSPAIR")
+            st[:1].write("slist.ascii", format="SLIST")
+            with open("slist.ascii", "rb") as fh:
+                data = fh.read()
+            # header line naming both formats
+            first_line, rest = data.split(b"\n", 1)
+            with open("ambiguous.tspair", "wb") as fh:
+                fh.write(first_line.replace(b"SLIST", b"TSPAIR SLIST") +
+                         b"\n" + rest)
+            for name in ('SLIST', 'TSPAIR'):
+                is_format = base._get_plugin_function(
+                    'waveform', base.ENTRY_POINTS['waveform'][name],
+                    'isFormat')
+                self.assertTrue(is_format("ambiguous.tspair"))
+            self.assertEqual(self._detect_format_in_default_order(
+                'waveform', "ambiguous.tspair"), 'SLIST')
+            # without hints
+            self.assertEqual(
+                base._detect_format('waveform', "ambiguous.tspair").name,
+                'SLIST')
+            # TSPAIR last detected in the same directory
+            _, format = _read_from_plugin('waveform', "tspair.ascii")
+            self.assertEqual(format, 'TSPAIR')
+            candidates = [ep.name for ep in _get_format_candidates(
+                'waveform', "ambiguous.tspair")]
+            self.assertEqual(candidates[0], 'TSPAIR')
+            self.assertEqual(
+                base._detect_format('waveform', "ambiguous.tspair").name,
+                'SLIST')
+
+    def test_format_detection_hints_match_default_order(self):
+        """
+        Detected formats of all waveform test files do not depend on the
+        format last detected in the same directory.
+        """
+        clear_format_detection_cache()
+        io_dir = os.path.join(os.path.dirname(base.__file__), os.pardir,
+                              os.pardir, 'io')
+        filenames = {}
+        for module in sorted(os.listdir(io_dir)):
+            data_dir = os.path.join(io_dir, module, 'tests', 'data')
+            if not os.path.isdir(data_dir):
+                continue
+            for name in sorted(os.listdir(data_dir)):
+                filename = os.path.join(data_dir, name)
+                if not os.path.isfile(filename):
+                    continue
+                format = self._detect_format_in_default_order(
+                    'waveform', filename)
+                # one file per detected format
+                if format is not None:
+                    filenames.setdefault(format, filename)
+        self.assertGreater(len(filenames), 15)
+        try:
+            for expected, filename in filenames.items():
+                directory = os.path.dirname(os.path.abspath(filename))
+                for hint in base.ENTRY_POINTS['waveform']:
+                    base._DETECTED_FORMAT_CACHE[('waveform', directory)] = \
+                        hint
+                    self.assertEqual(
+                        base._detect_format('waveform', filename).name,
+                        expected)
+        finally:
+            clear_format_detection_cache()
+
+    def test_format_detection_hints_reduce_checks(self):
+        """
+        Files of formats late in default order are detected without checking
+        all earlier formats if hinted at.
+        """
+        clear_format_detection_cache()
+        filename = os.path.join(os.path.dirname(base.__file__), os.pardir,
+                                os.pardir, 'io', 'gcf', 'tests', 'data',
+                                '20160603_1910n.gcf')
+        with mock.patch('obspy.core.util.base._get_plugin_function',
+                        wraps=base._get_plugin_function) as p:
+            self.assertEqual(base._detect_format('waveform', filename).name,
+                             'GCF')
+            self.assertEqual(p.call_count, 1)
+        clear_format_detection_cache()
+
+    def test_format_detection_cache(self):
+        """
+        Plug-in functions are resolved only once.
+        """
+        clear_format_detection_cache()
+        with TemporaryWorkingDirectory():
+            st = read()
+            for i, tr in enumerate(st):
+                tr.write("%d.dat" % i, format='SLIST')
+            with mock.patch('obspy.core.util.base.load_entry_point',
+                            wraps=base.load_entry_point) as p:
+                for i in range(len(st)):
+                    _, format = _read_from_plugin('waveform', "%d.dat" % i)
+                    self.assertEqual(format, 'SLIST')
+                first_count = p.call_count
+                _read_from_plugin('waveform', "0.dat")
+                self.assertEqual(p.call_count, first_count)
+                clear_format_detection_cache()
+                _read_from_plugin('waveform', "0.dat")
+                self.assertGreater(p.call_count, first_count)
+
 
 def suite():
     return unittest.makeSuite(UtilBaseTestCase, 'test')
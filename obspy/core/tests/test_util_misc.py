@@ -3,6 +3,7 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import operator
 import os
 import platform
 import sys
@@ -10,9 +11,11 @@ import tempfile
 import unittest
 from ctypes import CDLL
 from ctypes.util import find_library
+from multiprocessing.pool import ThreadPool
 
 from obspy import UTCDateTime
-from obspy.core.util.misc import CatchOutput, get_window_times
+from obspy.core.util.misc import (CatchOutput, _parallel_map,
+                                  get_window_times)
 
 
 class UtilMiscTestCase(unittest.TestCase):
@@ -234,6 +237,45 @@ class UtilMiscTestCase(unittest.TestCase):
             ]
         )
 
+    def test_parallel_map(self):
+        """
+        Results of _parallel_map() are returned in order for all kinds of
+        executors, errors are raised again and the arguments are consumed
+        only as far as needed.
+        """
+        class MapOnly(object):
+            def map(self, func, iterable):
+                return [func(args) for args in iterable]
+
+        arguments = [(i, 3) for i in range(10)]
+        expected = [i * 3 for i in range(10)]
+        pool = ThreadPool(2)
+        try:
+            for kwargs in ({}, {"workers": 2}, {"executor": pool},
+                           {"executor": MapOnly()}):
+                self.assertEqual(
+                    list(_parallel_map(operator.mul, arguments,
+                                       max_pending=3, **kwargs)),
+                    expected)
+                with self.assertRaises(ZeroDivisionError):
+                    list(_parallel_map(operator.truediv, [(1, 1), (1, 0)],
+                                       **kwargs))
+            consumed = []
+
+            def arguments_():
+                for args in arguments:
+                    consumed.append(args)
+                    yield args
+
+            results = _parallel_map(operator.mul, arguments_(),
+                                    executor=pool, max_pending=3)
+            self.assertEqual(next(results), 0)
+            self.assertEqual(len(consumed), 4)
+            self.assertEqual(list(results), expected[1:])
+        finally:
+            pool.close()
+            pool.join()
+
 
 def suite():
     return unittest.makeSuite(UtilMiscTestCase, 'test')
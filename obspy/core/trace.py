@@ -22,7 +22,7 @@ import numpy as np
 from decorator import decorator
 
 from obspy.core import compatibility
-from obspy.core.utcdatetime import UTCDateTime
+from obspy.core.utcdatetime import UTCDateTime, ns_to_utcdatetimes
 from obspy.core.util import AttribDict, create_empty_data_chunk
 from obspy.core.util.base import _get_function_from_entry_point
 from obspy.core.util.decorator import raise_if_masked, skip_if_no_data
@@ -131,6 +131,9 @@ class Stats(AttribDict):
         >>> trace.stats.npts
         4
     """
+    # core attributes are stored in slots, everything else in __dict__
+    __slots__ = ['sampling_rate', 'delta', 'starttime', 'npts', 'calib',
+                 'network', 'station', 'location', 'channel', '_endtime']
     readonly = ['endtime']
     defaults = {
         'sampling_rate': 1.0,
@@ -144,17 +147,49 @@ class Stats(AttribDict):
         'location': '',
         'channel': '',
     }
+    # order of the core attributes when iterating over a Stats object
+    _core_keys = ('network', 'station', 'location', 'channel', 'starttime',
+                  'endtime', 'sampling_rate', 'delta', 'npts', 'calib')
+    _core_key_set = frozenset(_core_keys)
+    _refresh_keys = frozenset(['delta', 'sampling_rate', 'starttime', 'npts'])
+    _slot_defaults = tuple(zip(__slots__[:-1],
+                               map(defaults.get, __slots__[:-1])))
 
     def __init__(self, header={}):
         """
         """
-        super(Stats, self).__init__(header)
+        # set default values of the core attributes directly
+        for key, value in self._slot_defaults:
+            object.__setattr__(self, key, value)
+        object.__setattr__(self, '_endtime', None)
+        self.update(header)
+
+    @property
+    def endtime(self):
+        """
+        Time of the last data sample, derived from ``starttime``, ``npts``
+        and ``delta`` on first access after any of them changed.
+        """
+        endtime = self._endtime
+        if endtime is None:
+            if self.npts == 0:
+                timediff = 0
+            else:
+                timediff = (self.npts - 1) * self.delta
+            endtime = self.starttime + timediff
+            object.__setattr__(self, '_endtime', endtime)
+        return endtime
+
+    def __getitem__(self, name, default=None):
+        if name in self._core_key_set:
+            return getattr(self, name)
+        return super(Stats, self).__getitem__(name, default)
 
     def __setitem__(self, key, value):
         """
         """
         # keys which need to refresh derived values
-        if key in ['delta', 'sampling_rate', 'starttime', 'npts']:
+        if key in self._refresh_keys:
             # ensure correct data type
             if key == 'delta':
                 key = 'sampling_rate'
@@ -166,32 +201,75 @@ class Stats(AttribDict):
             elif key == 'npts':
                 value = int(value)
             # set current key
-            super(Stats, self).__setitem__(key, value)
+            object.__setattr__(self, key, value)
             # set derived value: delta
-            try:
-                delta = 1.0 / float(self.sampling_rate)
-            except ZeroDivisionError:
-                delta = 0
-            self.__dict__['delta'] = delta
-            # set derived value: endtime
-            if self.npts == 0:
-                timediff = 0
-            else:
-                timediff = (self.npts - 1) * delta
-            self.__dict__['endtime'] = self.starttime + timediff
+            if key == 'sampling_rate':
+                try:
+                    delta = 1.0 / value
+                except ZeroDivisionError:
+                    delta = 0
+                object.__setattr__(self, 'delta', delta)
+            # derived value endtime is recalculated on next access
+            object.__setattr__(self, '_endtime', None)
             return
-        # prevent a calibration factor of 0
-        if key == 'calib' and value == 0:
-            msg = 'Calibration factor set to 0.0!'
-            warnings.warn(msg, UserWarning)
+        if key in self.readonly:
+            msg = 'Attribute "%s" in %s object is read only!'
+            raise AttributeError(msg % (key, self.__class__.__name__))
+        if key in self._core_key_set:
+            # prevent a calibration factor of 0
+            if key == 'calib' and value == 0:
+                msg = 'Calibration factor set to 0.0!'
+                warnings.warn(msg, UserWarning)
+            object.__setattr__(self, key, value)
         # all other keys
-        if isinstance(value, dict):
+        elif isinstance(value, dict):
             super(Stats, self).__setitem__(key, AttribDict(value))
         else:
             super(Stats, self).__setitem__(key, value)
 
     __setattr__ = __setitem__
 
+    def __delitem__(self, name):
+        # core attributes can not be removed, they fall back to defaults
+        if name in self._core_key_set:
+            if name not in self.readonly:
+                self.__setitem__(name, self.defaults[name])
+            return
+        super(Stats, self).__delitem__(name)
+
+    __delattr__ = __delitem__
+
+    def __iter__(self):
+        for key in self._core_keys:
+            yield key
+        for key in self.__dict__:
+            yield key
+
+    def __len__(self):
+        return len(self._core_keys) + len(self.__dict__)
+
+    def __contains__(self, key):
+        return key in self._core_key_set or key in self.__dict__
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, dict(self))
+
+    def __getstate__(self):
+        return dict(self)
+
+    def __setstate__(self, adict):
+        self.__init__(adict)
+
+    def __deepcopy__(self, *args, **kwargs):  # @UnusedVariable
+        stats = self.__class__.__new__(self.__class__)
+        for key in self.__slots__:
+            object.__setattr__(stats, key, getattr(self, key))
+        object.__setattr__(stats, 'starttime', UTCDateTime(self.starttime))
+        object.__setattr__(stats, '_endtime', None)
+        for key, value in self.__dict__.items():
+            stats.__dict__[key] = deepcopy(value)
+        return stats
+
     def __str__(self):
         """
         Return better readable string representation of Stats object.
@@ -205,11 +283,13 @@ class Stats(AttribDict):
         p.text(str(self))
 
 
-@decorator
-def _add_processing_info(func, *args, **kwargs):
+def _get_processing_info(func, *args, **kwargs):
     """
-    This is a decorator that attaches information about a processing call as a
-    string to the Trace.stats.processing list.
+    Return the information string about a processing call of a Trace method
+    that is attached to the Trace.stats.processing list.
+
+    ``func`` can either be a bound Trace method or the unbound function with
+    the Trace as first positional argument.
     """
     callargs = inspect.getcallargs(func, *args, **kwargs)
     callargs.pop("self")
@@ -226,7 +306,16 @@ def _add_processing_info(func, *args, **kwargs):
         ["%s=%s" % (k, repr(v)) if not isinstance(v, native_str) else
          "%s='%s'" % (k, v) for k, v in kwargs_.items()]
     arguments.sort()
-    info = info % "::".join(arguments)
+    return info % "::".join(arguments)
+
+
+@decorator
+def _add_processing_info(func, *args, **kwargs):
+    """
+    This is a decorator that attaches information about a processing call as a
+    string to the Trace.stats.processing list.
+    """
+    info = _get_processing_info(func, *args, **kwargs)
     self = args[0]
     result = func(*args, **kwargs)
     # Attach after executing the function to avoid having it attached
@@ -2045,48 +2134,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         ``'triang'``
             Triangular window. (uses: :func:`scipy.signal.triang`)
         """
-        type = type.lower()
-        side = side.lower()
-        side_valid = ['both', 'left', 'right']
-        npts = self.stats.npts
-        if side not in side_valid:
-            raise ValueError("'side' has to be one of: %s" % side_valid)
-        # retrieve function call from entry points
-        func = _get_function_from_entry_point('taper', type)
-        # store all constraints for maximum taper length
-        max_half_lenghts = []
-        if max_percentage is not None:
-            max_half_lenghts.append(int(max_percentage * npts))
-        if max_length is not None:
-            max_half_lenghts.append(int(max_length * self.stats.sampling_rate))
-        if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
-            msg = "The requested taper is longer than the trace. " \
-                  "The taper will be shortened to trace length."
-            warnings.warn(msg)
-        # add full trace length to constraints
-        max_half_lenghts.append(int(npts / 2))
-        # select shortest acceptable window half-length
-        wlen = min(max_half_lenghts)
-        # obspy.signal.cosine_taper has a default value for taper percentage,
-        # we need to override is as we control percentage completely via npts
-        # of taper function and insert ones in the middle afterwards
-        if type == "cosine":
-            kwargs['p'] = 1.0
-        # tapering. tapering functions are expected to accept the number of
-        # samples as first argument and return an array of values between 0 and
-        # 1 with the same length as the data
-        if 2 * wlen == npts:
-            taper_sides = func(2 * wlen, **kwargs)
-        else:
-            taper_sides = func(2 * wlen + 1, **kwargs)
-        if side == 'left':
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
-        elif side == 'right':
-            taper = np.hstack((np.ones(npts - wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
-        else:
-            taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
-                               taper_sides[len(taper_sides) - wlen:]))
+        taper = _get_taper(self.stats.npts, self.stats.sampling_rate,
+                           max_percentage, type=type, max_length=max_length,
+                           side=side, **kwargs)
 
         # Convert data if it's not a floating point type.
         if not np.issubdtype(self.data.dtype, float):
@@ -2414,6 +2464,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
           * absolute time as
             :class:`~obspy.core.utcdatetime.UTCDateTime` objects
             (``type="utcdatetime"``)
+          * absolute time as numpy ``datetime64[ns]`` values
+            (``type="datetime64"``)
           * absolute time as POSIX timestamps (
             :class:`UTCDateTime.timestamp <obspy.core.utcdatetime.UTCDateTime>`
             ``type="timestamp"``)
@@ -2440,6 +2492,9 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                UTCDateTime(2009, 8, 24, 0, 20, 32, 980000),
                UTCDateTime(2009, 8, 24, 0, 20, 32, 990000)], dtype=object)
 
+        >>> print(tr.times("datetime64")[:2])
+        ['2009-08-24T00:20:03.000000000' '2009-08-24T00:20:03.010000000']
+
         >>> tr.times("timestamp")
         array([  1.25107320e+09,   1.25107320e+09,   1.25107320e+09, ...,
                  1.25107323e+09,   1.25107323e+09,   1.25107323e+09])
@@ -2458,7 +2513,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         :rtype: :class:`~numpy.ndarray` or :class:`~numpy.ma.MaskedArray`
         :returns: An array of time samples in an :class:`~numpy.ndarray` if
             the trace doesn't have any gaps or a :class:`~numpy.ma.MaskedArray`
-            otherwise (``dtype`` of array is either ``float`` or
+            otherwise (``dtype`` of array is either ``float``,
+            ``datetime64[ns]`` or
             :class:`~obspy.core.utcdatetime.UTCDateTime`).
         """
         type = type.lower()
@@ -2469,9 +2525,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
                 time_array += (self.stats.starttime - reftime)
         elif type == "timestamp":
             time_array = time_array + self.stats.starttime.timestamp
-        elif type == "utcdatetime":
-            time_array = np.array(
-                [self.stats.starttime + t_ for t_ in time_array])
+        elif type in ("utcdatetime", "datetime64"):
+            ns = self.stats.starttime._ns + \
+                np.round(time_array * 1e9).astype(np.int64)
+            if type == "utcdatetime":
+                time_array = np.array(ns_to_utcdatetimes(ns))
+            else:
+                time_array = ns.view("datetime64[ns]")
         elif type == "matplotlib":
             from matplotlib.dates import date2num
             time_array = date2num([(self.stats.starttime + t_).datetime
@@ -2566,7 +2626,8 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
     @_add_processing_info
     def remove_response(self, inventory=None, output="VEL", water_level=60,
                         pre_filt=None, zero_mean=True, taper=True,
-                        taper_fraction=0.05, plot=False, fig=None, **kwargs):
+                        taper_fraction=0.05, plot=False, fig=None,
+                        response_cache=None, **kwargs):
         """
         Deconvolve instrument response.
 
@@ -2687,6 +2748,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
             raw/corrected data in time domain. If a `str` is provided then the
             plot is saved to file (filename must have a valid image suffix
             recognizable by matplotlib e.g. '.png').
+        :type response_cache:
+            :class:`~obspy.core.inventory.response.ResponseCache`
+        :param response_cache: Cache of evaluated response spectra. If
+            given, the response spectrum is taken from the cache if the same
+            response was already evaluated for the same sampling rate and
+            number of samples, e.g. when processing many day files of the
+            same channel.
         """
         limit_numpy_fft_cache()
 
@@ -2797,9 +2865,13 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         data = np.fft.rfft(data, n=nfft)
         # calculate and apply frequency response,
         # optionally prefilter in frequency domain and/or apply water level
-        freq_response, freqs = \
-            response.get_evalresp_response(self.stats.delta, nfft,
-                                           output=output, **kwargs)
+        if response_cache is not None:
+            freq_response, freqs = response_cache.get_evalresp_response(
+                response, self.stats.delta, nfft, output=output, **kwargs)
+        else:
+            freq_response, freqs = \
+                response.get_evalresp_response(self.stats.delta, nfft,
+                                               output=output, **kwargs)
 
         if plot:
             ax1.loglog(freqs, np.abs(data), color=color1, zorder=9)
@@ -2882,6 +2954,56 @@ seismometer_correction_simulation.html#using-a-resp-file>`_.
         return self
 
 
+def _get_taper(npts, sampling_rate, max_percentage, type='hann',
+               max_length=None, side='both', **kwargs):
+    """
+    Return the taper array used by :meth:`Trace.taper` for traces with
+    ``npts`` samples and the given sampling rate.
+    """
+    type = type.lower()
+    side = side.lower()
+    side_valid = ['both', 'left', 'right']
+    if side not in side_valid:
+        raise ValueError("'side' has to be one of: %s" % side_valid)
+    # retrieve function call from entry points
+    func = _get_function_from_entry_point('taper', type)
+    # store all constraints for maximum taper length
+    max_half_lenghts = []
+    if max_percentage is not None:
+        max_half_lenghts.append(int(max_percentage * npts))
+    if max_length is not None:
+        max_half_lenghts.append(int(max_length * sampling_rate))
+    if np.all([2 * mhl > npts for mhl in max_half_lenghts]):
+        msg = "The requested taper is longer than the trace. " \
+              "The taper will be shortened to trace length."
+        warnings.warn(msg)
+    # add full trace length to constraints
+    max_half_lenghts.append(int(npts / 2))
+    # select shortest acceptable window half-length
+    wlen = min(max_half_lenghts)
+    # obspy.signal.cosine_taper has a default value for taper percentage,
+    # we need to override is as we control percentage completely via npts
+    # of taper function and insert ones in the middle afterwards
+    if type == "cosine":
+        kwargs['p'] = 1.0
+    # tapering. tapering functions are expected to accept the number of
+    # samples as first argument and return an array of values between 0 and
+    # 1 with the same length as the data
+    if 2 * wlen == npts:
+        taper_sides = func(2 * wlen, **kwargs)
+    else:
+        taper_sides = func(2 * wlen + 1, **kwargs)
+    if side == 'left':
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - wlen)))
+    elif side == 'right':
+        taper = np.hstack((np.ones(npts - wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    else:
+        taper = np.hstack((taper_sides[:wlen], np.ones(npts - 2 * wlen),
+                           taper_sides[len(taper_sides) - wlen:]))
+    return taper
+
+
 def _data_sanity_checks(value):
     """
     Check if a given input is suitable to be used for Trace.data. Raises the
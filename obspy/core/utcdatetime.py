@@ -15,10 +15,16 @@ from future.utils import native_str
 
 import datetime
 import math
+import re
 import time
 
+import numpy as np
+
 
 TIMESTAMP0 = datetime.datetime(1970, 1, 1, 0, 0)
+# the most common ISO8601 representation, e.g. 2009-12-31T12:23:34.5Z
+_ISO8601_CALENDAR_DATE_TIME = re.compile(
+    r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.(\d*))?Z?$")
 
 
 class UTCDateTime(object):
@@ -231,12 +237,13 @@ class UTCDateTime(object):
                 self._ns = value._ns
                 return
             # check types
-            try:
-                # got a timestamp
-                self._from_timestamp(value.__float__())
-                return
-            except Exception:
-                pass
+            if not isinstance(value, (bytes, str)):
+                try:
+                    # got a timestamp
+                    self._from_timestamp(value.__float__())
+                    return
+                except Exception:
+                    pass
             if isinstance(value, datetime.datetime):
                 # got a Python datetime.datetime object
                 self._from_datetime(value)
@@ -356,6 +363,21 @@ class UTCDateTime(object):
             self._ns = UTCDateTime(year, month, day, hour, minute,
                                    second, microsecond)._ns
 
+    @classmethod
+    def _from_ns(cls, ns, precision=None):
+        """
+        Creates a new UTCDateTime object directly from integer nanoseconds.
+
+        Internal fast path which skips all argument checks of
+        :meth:`~UTCDateTime.__init__`.
+        """
+        obj = cls.__new__(cls)
+        obj.__ns = ns
+        if precision is None:
+            precision = cls.DEFAULT_PRECISION
+        obj.__precision = precision
+        return obj
+
     def _get_ns(self):
         return self.__ns
 
@@ -394,6 +416,21 @@ class UTCDateTime(object):
         """
         Parses an ISO8601:2004 date time string.
         """
+        # fast path for the most common calendar date time representation
+        match = _ISO8601_CALENDAR_DATE_TIME.match(value)
+        if match is not None:
+            year, month, day, hour, minute, second, fraction = match.groups()
+            try:
+                dt = datetime.datetime(int(year), int(month), int(day),
+                                       int(hour), int(minute), int(second))
+            except ValueError:
+                pass
+            else:
+                if fraction:
+                    # round to microseconds like the general parser does
+                    dt += datetime.timedelta(seconds=float('0.' + fraction))
+                self._from_datetime(dt)
+                return
         # remove trailing 'Z'
         value = value.replace('Z', '')
         # split between date and time
@@ -487,7 +524,7 @@ class UTCDateTime(object):
         >>> dt.timestamp
         1222864235.123456
         """
-        return self._ns / 1e9
+        return self.__ns / 1e9
 
     timestamp = property(_get_timestamp)
 
@@ -882,7 +919,11 @@ class UTCDateTime(object):
         >>> UTCDateTime(1970, 1, 1, 0, 0) + 1.123456
         UTCDateTime(1970, 1, 1, 0, 0, 1, 123456)
         """
-        if isinstance(value, datetime.timedelta):
+        if isinstance(value, float):
+            return UTCDateTime._from_ns(self.__ns + int(round(value * 1e9)))
+        elif isinstance(value, int):
+            return UTCDateTime._from_ns(self.__ns + value * 10**9)
+        elif isinstance(value, datetime.timedelta):
             # see datetime.timedelta.total_seconds
             value = (value.microseconds + (value.seconds + value.days *
                      86400) * 10**6) / 1e6
@@ -890,7 +931,7 @@ class UTCDateTime(object):
             msg = ("unsupported operand type(s) for +: 'UTCDateTime' and "
                    "'UTCDateTime'")
             raise TypeError(msg)
-        return UTCDateTime(ns=self._ns + int(round(value * 1e9)))
+        return UTCDateTime._from_ns(self.__ns + int(round(value * 1e9)))
 
     def __sub__(self, value):
         """
@@ -915,12 +956,16 @@ class UTCDateTime(object):
         86400.0
         """
         if isinstance(value, UTCDateTime):
-            return round((self._ns - value._ns) / 1e9, self.__precision)
+            return round((self.__ns - value._ns) / 1e9, self.__precision)
+        elif isinstance(value, float):
+            pass
+        elif isinstance(value, int):
+            return UTCDateTime._from_ns(self.__ns - value * 10**9)
         elif isinstance(value, datetime.timedelta):
             # see datetime.timedelta.total_seconds
             value = (value.microseconds + (value.seconds + value.days *
                      86400) * 10**6) / 1e6
-        return UTCDateTime(ns=self._ns - int(round(value * 1e9)))
+        return UTCDateTime._from_ns(self.__ns - int(round(value * 1e9)))
 
     def __str__(self):
         """
@@ -983,11 +1028,30 @@ class UTCDateTime(object):
         >>> t1 == t2
         False
         """
+        if isinstance(other, UTCDateTime):
+            return self._compare_ns(other) == 0
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         try:
             return round(self.timestamp - float(other), self.__precision) == 0
         except (TypeError, ValueError):
             return False
 
+    def _compare_ns(self, other):
+        """
+        Compares with another UTCDateTime object using integer arithmetic.
+
+        Returns the sign (``-1``, ``0`` or ``1``) of the time difference in
+        seconds rounded to the precision of the current object (rounding half
+        to even like :func:`round`).
+        """
+        diff = self.__ns - other._ns
+        # anything up to half a unit of the precision rounds to zero
+        if self.__precision < 9 and \
+                2 * abs(diff) <= 10 ** (9 - self.__precision):
+            return 0
+        return (diff > 0) - (diff < 0)
+
     def __ne__(self, other):
         """
         Rich comparison operator '!='.
@@ -1013,6 +1077,8 @@ class UTCDateTime(object):
         >>> t1 != t2
         True
         """
+        if isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         return not self.__eq__(other)
 
     def __lt__(self, other):
@@ -1040,6 +1106,10 @@ class UTCDateTime(object):
         >>> t1 < t2
         True
         """
+        if isinstance(other, UTCDateTime):
+            return self._compare_ns(other) < 0
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         try:
             return round(self.timestamp - float(other), self.__precision) < 0
         except (TypeError, ValueError):
@@ -1070,6 +1140,10 @@ class UTCDateTime(object):
         >>> t1 <= t2
         False
         """
+        if isinstance(other, UTCDateTime):
+            return self._compare_ns(other) <= 0
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         try:
             return round(self.timestamp - float(other), self.__precision) <= 0
         except (TypeError, ValueError):
@@ -1100,6 +1174,10 @@ class UTCDateTime(object):
         >>> t1 > t2
         True
         """
+        if isinstance(other, UTCDateTime):
+            return self._compare_ns(other) > 0
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         try:
             return round(self.timestamp - float(other), self.__precision) > 0
         except (TypeError, ValueError):
@@ -1130,6 +1208,10 @@ class UTCDateTime(object):
         >>> t1 >= t2
         False
         """
+        if isinstance(other, UTCDateTime):
+            return self._compare_ns(other) >= 0
+        elif isinstance(other, UTCDateTimeArray):
+            return NotImplemented
         try:
             return round(self.timestamp - float(other), self.__precision) >= 0
         except (TypeError, ValueError):
@@ -1514,6 +1596,296 @@ class UTCDateTime(object):
         return date2num(self.datetime)
 
 
+def utcdatetimes_to_ns(times):
+    """
+    Converts a sequence of UTCDateTime objects to an array of nanoseconds.
+
+    :type times: iterable of :class:`~obspy.core.utcdatetime.UTCDateTime`
+    :param times: Times to convert.
+    :rtype: :class:`numpy.ndarray` of ``int64``
+    :return: Nanoseconds since 1970-01-01T00:00:00 for every given time.
+
+    .. rubric:: Example
+
+    >>> times = [UTCDateTime(0), UTCDateTime(1.5)]
+    >>> print(utcdatetimes_to_ns(times))
+    [         0 1500000000]
+    """
+    return np.fromiter((t._ns for t in times), dtype=np.int64)
+
+
+def ns_to_utcdatetimes(ns, precision=None):
+    """
+    Converts an array of nanoseconds to a list of UTCDateTime objects.
+
+    :type ns: array-like of int or :class:`numpy.datetime64`
+    :param ns: Nanoseconds since 1970-01-01T00:00:00 or an array of numpy
+        datetime64 values (of any unit).
+    :type precision: int, optional
+    :param precision: Precision of the created UTCDateTime objects, defaults
+        to :attr:`UTCDateTime.DEFAULT_PRECISION`.
+    :rtype: list of :class:`~obspy.core.utcdatetime.UTCDateTime`
+
+    .. rubric:: Example
+
+    >>> ns_to_utcdatetimes(np.array([0, 1500000000]))
+    [UTCDateTime(1970, 1, 1, 0, 0), UTCDateTime(1970, 1, 1, 0, 0, 1, 500000)]
+    >>> ns_to_utcdatetimes(np.array(['2010-01-01'], dtype='datetime64[D]'))
+    [UTCDateTime(2010, 1, 1, 0, 0)]
+    """
+    ns = np.asarray(ns)
+    if ns.dtype.kind == 'M':
+        ns = ns.astype('datetime64[ns]').view(np.int64)
+    else:
+        ns = ns.astype(np.int64)
+    from_ns = UTCDateTime._from_ns
+    return [from_ns(value, precision) for value in ns.ravel().tolist()]
+
+
+class UTCDateTimeArray(object):
+    """
+    A one-dimensional array of points in time with nanosecond resolution.
+
+    Column-oriented counterpart of
+    :class:`~obspy.core.utcdatetime.UTCDateTime` which stores all times in a
+    single :class:`numpy.ndarray` of integer nanoseconds. Comparisons and
+    arithmetic work on the whole array at once and missing times are kept as
+    ``NaT`` (not a time) like in numpy's ``datetime64`` arrays.
+
+    :type times: iterable or :class:`numpy.ndarray`
+    :param times: Anything a :class:`~obspy.core.utcdatetime.UTCDateTime`
+        can be created from (``None`` for missing times), a numpy
+        ``datetime64`` array or a numeric array of POSIX timestamps in
+        seconds. Use :meth:`UTCDateTimeArray.from_ns` for nanoseconds.
+    :type precision: int, optional
+    :param precision: Precision used by the comparison operators, see
+        :attr:`UTCDateTime.precision`. Defaults to
+        :attr:`UTCDateTime.DEFAULT_PRECISION`.
+
+    .. rubric:: Example
+
+    >>> times = UTCDateTimeArray(["2010-01-01T00:00:00", None,
+    ...                           "2010-01-01T00:00:05"])
+    >>> print(times)  # doctest: +NORMALIZE_WHITESPACE
+    ['2010-01-01T00:00:00.000000000' 'NaT' '2010-01-01T00:00:05.000000000']
+    >>> (times > UTCDateTime("2010-01-01T00:00:02")).tolist()
+    [False, False, True]
+    >>> (times - UTCDateTime("2010-01-01T00:00:00")).tolist()
+    [0.0, nan, 5.0]
+    >>> times[2]
+    UTCDateTime(2010, 1, 1, 0, 0, 5)
+    >>> print(times.max())
+    2010-01-01T00:00:05.000000Z
+    >>> np.asarray(times).dtype
+    dtype('<M8[ns]')
+    """
+    NAT = np.iinfo(np.int64).min
+
+    def __init__(self, times=(), precision=None):
+        if precision is None:
+            precision = UTCDateTime.DEFAULT_PRECISION
+        self.precision = precision
+        if isinstance(times, UTCDateTimeArray):
+            self.ns = times.ns.copy()
+            return
+        if isinstance(times, np.ndarray) and times.dtype.kind in "Mfiub":
+            if times.dtype.kind == "M":
+                ns = times.astype("datetime64[ns]").view(np.int64)
+            elif times.dtype.kind == "f":
+                ns = np.where(np.isnan(times), self.NAT,
+                              np.round(times * 1e9)).astype(np.int64)
+            else:
+                ns = times.astype(np.int64) * 10**9
+            self.ns = ns.ravel().copy()
+            return
+        nat = self.NAT
+        self.ns = np.fromiter(
+            (nat if t is None else
+             t._ns if isinstance(t, UTCDateTime) else UTCDateTime(t)._ns
+             for t in times), dtype=np.int64)
+
+    @classmethod
+    def from_ns(cls, ns, precision=None):
+        """
+        Creates a new array from integer nanoseconds.
+
+        :type ns: array-like of int
+        :param ns: Nanoseconds since 1970-01-01T00:00:00, the smallest
+            ``int64`` value stands for a missing time.
+        :type precision: int, optional
+        :param precision: Precision used by the comparison operators.
+        :rtype: :class:`UTCDateTimeArray`
+        """
+        obj = cls.__new__(cls)
+        if precision is None:
+            precision = UTCDateTime.DEFAULT_PRECISION
+        obj.precision = precision
+        obj.ns = np.asarray(ns, dtype=np.int64).ravel()
+        return obj
+
+    @property
+    def datetime64(self):
+        """
+        Times as a numpy ``datetime64[ns]`` array (sharing memory).
+        """
+        return self.ns.view("datetime64[ns]")
+
+    def __array__(self, dtype=None):
+        if dtype is None:
+            return self.datetime64
+        return self.datetime64.astype(dtype)
+
+    def __len__(self):
+        return len(self.ns)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __getitem__(self, index):
+        value = self.ns[index]
+        if isinstance(value, np.integer):
+            if value == self.NAT:
+                return None
+            return UTCDateTime._from_ns(int(value), self.precision)
+        return UTCDateTimeArray.from_ns(value, self.precision)
+
+    def __str__(self):
+        return str(self.datetime64)
+
+    def __repr__(self):
+        return "UTCDateTimeArray(%s)" % (
+            np.array2string(self.datetime64, separator=", "))
+
+    def _ns_of(self, other):
+        """
+        Nanoseconds of an object to compare with or to subtract.
+        """
+        if isinstance(other, UTCDateTime):
+            return other._ns
+        elif isinstance(other, UTCDateTimeArray):
+            return other.ns
+        elif isinstance(other, np.datetime64):
+            return np.datetime64(other, "ns").astype(np.int64)
+        elif isinstance(other, (list, tuple, np.ndarray)):
+            return UTCDateTimeArray(other).ns
+        return UTCDateTime(other)._ns
+
+    def _compare(self, other):
+        """
+        Returns the sign of the time differences rounded to the precision
+        (like :meth:`UTCDateTime._compare_ns`) and the mask of missing
+        values.
+        """
+        other_ns = self._ns_of(other)
+        diff = self.ns - other_ns
+        sign = np.sign(diff)
+        if self.precision < 9:
+            # anything up to half a unit of the precision rounds to zero
+            threshold = min(10 ** (9 - self.precision) // 2,
+                            np.iinfo(np.int64).max)
+            sign[np.abs(diff) <= threshold] = 0
+        missing = (self.ns == self.NAT) | (other_ns == self.NAT)
+        return sign, missing
+
+    def __eq__(self, other):
+        sign, missing = self._compare(other)
+        return (sign == 0) & ~missing
+
+    def __ne__(self, other):
+        return ~self.__eq__(other)
+
+    def __lt__(self, other):
+        sign, missing = self._compare(other)
+        return (sign < 0) & ~missing
+
+    def __le__(self, other):
+        sign, missing = self._compare(other)
+        return (sign <= 0) & ~missing
+
+    def __gt__(self, other):
+        sign, missing = self._compare(other)
+        return (sign > 0) & ~missing
+
+    def __ge__(self, other):
+        sign, missing = self._compare(other)
+        return (sign >= 0) & ~missing
+
+    __hash__ = None
+
+    def __add__(self, seconds):
+        """
+        Shifts all times by the given seconds (scalar or array).
+        """
+        shift = np.round(np.asarray(seconds, dtype=np.float64) * 1e9)
+        ns = np.where(self.ns == self.NAT, self.NAT,
+                      self.ns + shift.astype(np.int64))
+        return UTCDateTimeArray.from_ns(ns, self.precision)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        """
+        Returns the time differences in seconds if a time or times are
+        subtracted, or the shifted times if seconds are subtracted.
+        """
+        if isinstance(other, (int, float, np.number)) or (
+                isinstance(other, np.ndarray) and
+                other.dtype.kind in "fiu"):
+            return self.__add__(-np.asarray(other, dtype=np.float64))
+        other_ns = self._ns_of(other)
+        diff = (self.ns - other_ns) / 1e9
+        diff[(self.ns == self.NAT) | (other_ns == self.NAT)] = np.nan
+        return diff
+
+    def isnat(self):
+        """
+        Returns a boolean array flagging missing times.
+        """
+        return self.ns == self.NAT
+
+    def min(self):
+        """
+        Returns the earliest time, ignoring missing times.
+
+        :rtype: :class:`UTCDateTime` or ``None`` if no time is set
+        """
+        ns = self.ns[self.ns != self.NAT]
+        if not len(ns):
+            return None
+        return UTCDateTime._from_ns(int(ns.min()), self.precision)
+
+    def max(self):
+        """
+        Returns the latest time, ignoring missing times.
+
+        :rtype: :class:`UTCDateTime` or ``None`` if no time is set
+        """
+        ns = self.ns[self.ns != self.NAT]
+        if not len(ns):
+            return None
+        return UTCDateTime._from_ns(int(ns.max()), self.precision)
+
+    def argsort(self):
+        """
+        Returns the indices that would sort the times (missing times first).
+        """
+        return np.argsort(self.ns, kind="mergesort")
+
+    def copy(self):
+        return UTCDateTimeArray.from_ns(self.ns.copy(), self.precision)
+
+    def tolist(self):
+        """
+        Returns a list of :class:`UTCDateTime` objects (``None`` for missing
+        times).
+        """
+        nat = self.NAT
+        from_ns = UTCDateTime._from_ns
+        precision = self.precision
+        return [None if value == nat else from_ns(value, precision)
+                for value in self.ns.tolist()]
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -56,6 +56,52 @@ WAVEFORM_PREFERRED_ORDER = ['MSEED', 'SAC', 'GSE2', 'SEISAN', 'SACXY', 'GSE1',
 EVENT_PREFERRED_ORDER = ['QUAKEML', 'NLLOC_HYP']
 # waveform plugins accepting a byteorder keyword
 WAVEFORM_ACCEPT_BYTEORDER = ['MSEED', 'Q', 'SAC', 'SEGY', 'SU']
+# file extensions (lower case, without leading dot) hinting at the format of
+# a file, these formats are checked first during automatic format detection
+FORMAT_EXTENSION_HINTS = {
+    'waveform': {
+        'mseed': ['MSEED'], 'miniseed': ['MSEED'], 'ms': ['MSEED'],
+        'seed': ['MSEED'], 'sac': ['SAC'], 'sacxy': ['SACXY'],
+        'gse': ['GSE2', 'GSE1'], 'gse2': ['GSE2'], 'gse1': ['GSE1'],
+        'ascii': ['SLIST', 'TSPAIR'], 'asc': ['SH_ASC', 'SLIST', 'TSPAIR'],
+        'qhd': ['Q'], 'qbn': ['Q'], 'pickle': ['PICKLE'], 'pkl': ['PICKLE'],
+        'segy': ['SEGY'], 'sgy': ['SEGY'], 'su': ['SU'], 'sg2': ['SEG2'],
+        'seg2': ['SEG2'], 'wav': ['WAV'], 'gcf': ['GCF'], 'ah': ['AH'],
+        'evt': ['KINEMETRICS_EVT'], 'rt130': ['REFTEK130']},
+    'event': {
+        'xml': ['QUAKEML', 'SC3ML'], 'qml': ['QUAKEML'],
+        'quakeml': ['QUAKEML'], 'hyp': ['NLLOC_HYP'], 'ndk': ['NDK'],
+        'zmap': ['ZMAP'], 'json': ['JSON']},
+    'inventory': {
+        'xml': ['STATIONXML', 'SC3ML', 'XSEED'],
+        'stationxml': ['STATIONXML'], 'seed': ['SEED'],
+        'dataless': ['SEED'], 'resp': ['RESP'], 'txt': ['STATIONTXT']},
+}
+# leading bytes required by the isFormat functions of some formats, files
+# starting with none of them are not checked for these formats during
+# automatic format detection
+FORMAT_SIGNATURES = {
+    'waveform': {
+        'SEG2': (b'\x55\x3a', b'\x3a\x55'),
+        'WAV': (b'RIFF',),
+        'GSE1': (b'WID1', b'XW01'),
+        'SLIST': (b'TIMESERIES',),
+        'TSPAIR': (b'TIMESERIES',)},
+}
+# groups of formats whose isFormat functions accept some of the same files
+# (e.g. a TIMESERIES header line naming both SLIST and TSPAIR). A format
+# checked first because of a hint is only detected if no format of its group
+# coming earlier in the default order accepts the file, too, so that the
+# result is always the same as when checking all formats in default order.
+FORMAT_OVERLAPS = {
+    'waveform': [('SLIST', 'TSPAIR')],
+}
+
+# resolved plug-in functions, keyed by plug-in type, format and method name
+_PLUGIN_FUNCTION_CACHE = {}
+# format last detected per plug-in type and directory
+_DETECTED_FORMAT_CACHE = OrderedDict()
+_DETECTED_FORMAT_CACHE_SIZE = 1000
 
 _sys_is_le = sys.byteorder == 'little'
 NATIVE_BYTEORDER = _sys_is_le and '<' or '>'
@@ -414,21 +460,140 @@ def get_scipy_version():
     return version
 
 
-def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
+def _get_plugin_function(plugin_type, format_ep, method):
     """
-    Reads a single file from a plug-in's readFormat function.
+    Returns the given method (e.g. ``'isFormat'``) of a plug-in entry point.
+
+    Resolved functions are cached, so the entry point machinery is only
+    queried once per plug-in and method.
+    """
+    key = (plugin_type, format_ep.name, method)
+    try:
+        return _PLUGIN_FUNCTION_CACHE[key]
+    except KeyError:
+        pass
+    func = load_entry_point(
+        format_ep.dist.key,
+        'obspy.plugin.%s.%s' % (plugin_type, format_ep.name), method)
+    _PLUGIN_FUNCTION_CACHE[key] = func
+    return func
+
+
+def _read_header(filename, size=64):
+    """
+    Returns the first bytes of a file or file-like object without moving the
+    file pointer or ``None`` if they can not be read.
+    """
+    if isinstance(filename, (str, native_str)):
+        try:
+            with io.open(filename, 'rb') as fh:
+                return fh.read(size)
+        except (IOError, OSError):
+            return None
+    if hasattr(filename, 'read') and hasattr(filename, 'seek') and \
+            hasattr(filename, 'tell'):
+        position = filename.tell()
+        try:
+            header = filename.read(size)
+        finally:
+            filename.seek(position, 0)
+        if not isinstance(header, bytes):
+            return None
+        return header
+    return None
+
+
+def _get_format_hints(plugin_type, filename, header):
+    """
+    Returns a list of likely format names for a file based on the format last
+    detected in the same directory, the file extension and the first few
+    bytes of the file.
+    """
+    hints = []
+    if isinstance(filename, (str, native_str)):
+        directory = os.path.dirname(os.path.abspath(filename))
+        last_format = _DETECTED_FORMAT_CACHE.get((plugin_type, directory))
+        if last_format is not None:
+            hints.append(last_format)
+        extension = os.path.splitext(filename)[1].lstrip('.').lower()
+        hints.extend(FORMAT_EXTENSION_HINTS.get(plugin_type, {}).get(
+            extension, []))
+    if header is not None:
+        hints.extend(_get_magic_byte_hints(plugin_type, header))
+    return hints
+
+
+def _get_magic_byte_hints(plugin_type, header):
+    """
+    Returns a list of likely format names based on the leading bytes of a
+    file.
+    """
+    stripped = header.lstrip()
+    if stripped.startswith(b'<'):
+        return FORMAT_EXTENSION_HINTS.get(plugin_type, {}).get('xml', [])
+    if plugin_type != 'waveform':
+        return []
+    # fixed section of data header of a (Mini)SEED record: six digit
+    # sequence number (spaces or zeros allowed) followed by quality indicator
+    if len(header) >= 48 and header[6:7] in (b'D', b'R', b'Q', b'M') and \
+            all(c in bytearray(b'0123456789 \x00')
+                for c in bytearray(header[:6])):
+        return ['MSEED']
+    if header.startswith(b'RIFF'):
+        return ['WAV']
+    if header[:2] in (b'\x55\x3a', b'\x3a\x55'):
+        return ['SEG2']
+    if stripped.startswith(b'WID2') or stripped.startswith(b'DATA_TYPE'):
+        return ['GSE2', 'GSE1']
+    if stripped.startswith(b'TIMESERIES'):
+        return ['SLIST', 'TSPAIR']
+    return []
+
+
+def _get_format_candidates(plugin_type, filename):
+    """
+    Returns the entry points of all formats of a plug-in type in the order
+    they are checked during automatic format detection.
+
+    Formats hinted at by the format last detected in the same directory, the
+    file extension or magic bytes come first, followed by all remaining
+    formats in default order. Formats with a known signature (see
+    ``FORMAT_SIGNATURES``) that does not match the first bytes of the file
+    are left out.
     """
     eps = ENTRY_POINTS[plugin_type]
-    # get format entry point
-    format_ep = None
-    if not format:
-        # auto detect format - go through all known formats in given sort order
-        for format_ep in eps.values():
+    header = _read_header(filename)
+    signatures = FORMAT_SIGNATURES.get(plugin_type, {})
+    candidates = OrderedDict()
+    for name in _get_format_hints(plugin_type, filename, header) + list(eps):
+        if name not in eps or name in candidates:
+            continue
+        if header is not None and name in signatures and \
+                not any(header.startswith(sig) for sig in signatures[name]):
+            continue
+        candidates[name] = eps[name]
+    return list(candidates.values())
+
+
+def _detect_format(plugin_type, filename):
+    """
+    Returns the entry point of the format of a file.
+
+    The result is the same as checking the ``isFormat`` functions of all
+    formats in default order, but likely formats are checked first (see
+    :func:`_get_format_candidates`). If a format accepts the file, formats
+    known to accept some of the same files (see ``FORMAT_OVERLAPS``) coming
+    earlier in default order are checked, too.
+    """
+    eps = ENTRY_POINTS[plugin_type]
+    order = dict((name, i) for i, name in enumerate(eps))
+    results = {}
+
+    def _is_format(format_ep):
+        if format_ep.name not in results:
             # search isFormat for given entry point
-            is_format = load_entry_point(
-                format_ep.dist.key,
-                'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
-                'isFormat')
+            is_format = _get_plugin_function(plugin_type, format_ep,
+                                             'isFormat')
             # If it is a file-like object, store the position and restore it
             # later to avoid that the isFormat() functions move the file
             # pointer.
@@ -436,14 +601,70 @@ def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
                 position = filename.tell()
             else:
                 position = None
-            # check format
-            is_format = is_format(filename)
+            results[format_ep.name] = is_format(filename)
             if position is not None:
                 filename.seek(0, 0)
-            if is_format:
+        return results[format_ep.name]
+
+    candidates = _get_format_candidates(plugin_type, filename)
+    names = set(ep.name for ep in candidates)
+    for format_ep in candidates:
+        if not _is_format(format_ep):
+            continue
+        overlapping = set()
+        for group in FORMAT_OVERLAPS.get(plugin_type, []):
+            if format_ep.name in group:
+                overlapping.update(group)
+        for name in sorted(overlapping & names, key=order.get):
+            if order[name] >= order[format_ep.name]:
                 break
-        else:
-            raise TypeError('Unknown format for file %s' % filename)
+            if _is_format(eps[name]):
+                format_ep = eps[name]
+                break
+        break
+    else:
+        raise TypeError('Unknown format for file %s' % filename)
+    if isinstance(filename, (str, native_str)):
+        _remember_detected_format(plugin_type, filename, format_ep.name)
+    return format_ep
+
+
+def _remember_detected_format(plugin_type, filename, format_name):
+    """
+    Stores the automatically detected format of a file so that other files
+    in the same directory check that format first.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    key = (plugin_type, directory)
+    _DETECTED_FORMAT_CACHE.pop(key, None)
+    _DETECTED_FORMAT_CACHE[key] = format_name
+    # limit the number of remembered directories
+    while len(_DETECTED_FORMAT_CACHE) > _DETECTED_FORMAT_CACHE_SIZE:
+        _DETECTED_FORMAT_CACHE.popitem(last=False)
+
+
+def clear_format_detection_cache():
+    """
+    Clears all cached plug-in functions and remembered per directory formats
+    used during automatic format detection.
+
+    Should only be needed if plug-ins are installed or removed at runtime.
+    """
+    _PLUGIN_FUNCTION_CACHE.clear()
+    _DETECTED_FORMAT_CACHE.clear()
+
+
+def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
+    """
+    Reads a single file from a plug-in's readFormat function.
+    """
+    eps = ENTRY_POINTS[plugin_type]
+    # get format entry point
+    format_ep = None
+    if not format:
+        # auto detect format - most likely formats first, with the same
+        # result as going through all known formats in given sort order
+        format_ep = _detect_format(plugin_type, filename)
     else:
         # format given via argument
         format = format.upper()
@@ -455,10 +676,8 @@ def _read_from_plugin(plugin_type, filename, format=None, **kwargs):
     # file format should be known by now
     try:
         # search readFormat for given entry point
-        read_format = load_entry_point(
-            format_ep.dist.key,
-            'obspy.plugin.%s.%s' % (plugin_type, format_ep.name),
-            'readFormat')
+        read_format = _get_plugin_function(plugin_type, format_ep,
+                                           'readFormat')
     except ImportError:
         msg = "Format \"%s\" is not supported. Supported types: %s"
         raise TypeError(msg % (format_ep.name, ', '.join(eps)))
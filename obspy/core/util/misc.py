@@ -12,9 +12,11 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
+import collections
 import inspect
 import itertools
 import math
+import multiprocessing
 import os
 import platform
 import shutil
@@ -424,6 +426,131 @@ def get_window_times(starttime, endtime, window_length, step, offset,
     return [(t(_i[0]), t(_i[1])) for _i in windows]
 
 
+def _iter_window_times(starttime, endtime, window_length, step, offset,
+                       include_partial_windows):
+    """
+    Generator version of :func:`get_window_times` for positive ``step``,
+    yielding the same windows one after the other without building the full
+    list up front.
+    """
+    if step <= 0:
+        raise ValueError("'step' must be positive.")
+    end = endtime.timestamp - 0.001 * step
+    t = type(starttime)
+    start = starttime.timestamp + offset
+    i = 0
+    while True:
+        # same as the window start times generated by np.arange()
+        left = start + i * step
+        if left >= end:
+            break
+        right = min(left + window_length, endtime.timestamp)
+        i += 1
+        if not include_partial_windows and \
+                abs(right - left) <= 0.999 * window_length:
+            continue
+        yield t(left), t(right)
+
+
+def _call_star(args):
+    """
+    Call a function with arguments and keyword arguments given as a tuple of
+    ``(func, args, kwargs)``, see :func:`_parallel_map`.
+    """
+    func, args, kwargs = args
+    return func(*args, **kwargs)
+
+
+def _parallel_map(func, arguments, workers=None, executor=None, kwargs=None,
+                  max_pending=None):
+    """
+    Call ``func(*args, **kwargs)`` for all tuples of positional arguments in
+    ``arguments`` and yield the results in the same order.
+
+    Either uses the given ``executor`` or creates a temporary process pool
+    with ``workers`` processes. Without an executor and with at most one
+    worker everything is done in the current process. The executor can be
+    any already running pool providing ``submit()``, ``apply_async()`` or at
+    least ``map()`` (e.g. a :class:`multiprocessing.pool.Pool` or a
+    :class:`concurrent.futures.ProcessPoolExecutor`) and is not shut down
+    afterwards. ``func`` has to be a module level function so that it can be
+    sent to worker processes.
+
+    Only up to ``max_pending`` calls are handed out ahead of the results that
+    were already retrieved, so ``arguments`` can be a generator producing
+    large inputs one after the other. Exceptions raised by ``func`` are
+    raised again when the corresponding result is retrieved.
+
+    :type func: function
+    :param func: Module level function to call.
+    :type arguments: iterable of tuple
+    :param arguments: Positional arguments of all calls.
+    :type workers: int
+    :param workers: Number of worker processes of a temporary process pool.
+    :type executor: object
+    :param executor: Already running pool or executor to use instead.
+    :type kwargs: dict
+    :param kwargs: Keyword arguments passed to all calls.
+    :type max_pending: int
+    :param max_pending: Maximum number of calls handed out in advance.
+        Defaults to twice the number of workers or CPUs.
+    """
+    kwargs = kwargs or {}
+    if executor is None and hasattr(arguments, "__len__") and \
+            workers is not None:
+        workers = min(workers, len(arguments))
+    if executor is None and (workers is None or workers <= 1):
+        for args in arguments:
+            yield func(*args, **kwargs)
+        return
+    if max_pending is None:
+        max_pending = 2 * (workers or multiprocessing.cpu_count())
+    max_pending = max(1, max_pending)
+    pool = None
+    if executor is None:
+        executor = pool = multiprocessing.Pool(workers)
+    arguments = iter(arguments)
+    pending = collections.deque()
+    try:
+        if hasattr(executor, "submit") or hasattr(executor, "apply_async"):
+            for args in arguments:
+                if len(pending) >= max_pending:
+                    yield _get_result(pending.popleft())
+                if hasattr(executor, "submit"):
+                    pending.append(executor.submit(func, *args, **kwargs))
+                else:
+                    pending.append(executor.apply_async(func, args, kwargs))
+            while pending:
+                yield _get_result(pending.popleft())
+        else:
+            while True:
+                chunk = [(func, args, kwargs) for args in
+                         itertools.islice(arguments, max_pending)]
+                if not chunk:
+                    break
+                for result in executor.map(_call_star, chunk):
+                    yield result
+    finally:
+        if pool is not None:
+            # stop outstanding work if the results are not consumed to the
+            # end, e.g. due to an exception
+            if pending:
+                pool.terminate()
+            else:
+                pool.close()
+            pool.join()
+
+
+def _get_result(task):
+    """
+    Return the result of a :class:`concurrent.futures.Future` or a
+    :class:`multiprocessing.pool.AsyncResult`.
+    """
+    if hasattr(task, "result"):
+        return task.result()
+    return task.get()
+
+
 class MatplotlibBackend(object):
     """
     A helper class for switching the matplotlib backend.
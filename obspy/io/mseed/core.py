@@ -143,7 +143,8 @@ def __is_mseed(fp, file_size):  # NOQA
 
 def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
                 sourcename=None, reclen=None, details=False,
-                header_byteorder=None, verbose=None, **kwargs):
+                header_byteorder=None, verbose=None, record_index=None,
+                **kwargs):
     """
     Reads a Mini-SEED file and returns a Stream object.
 
@@ -189,6 +190,16 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
         little-endian, ``1`` or ``'>'`` for MBF or big-endian. ``'='`` is the
         native byte order. Used to enforce the header byte order. Useful in
         some rare cases where the automatic byte order detection fails.
+    :type record_index: bool or :class:`numpy.ndarray`, optional
+    :param record_index: Only used when reading from a file name with
+        ``starttime`` and/or ``endtime`` set. If ``True``, an index of all
+        records in the file is built (or an up-to-date stored index is used,
+        see :func:`~obspy.io.mseed.util.get_record_index`) and only the
+        records overlapping the requested time window are passed on for
+        decoding. An index returned by
+        :func:`~obspy.io.mseed.util.get_record_index` can also be passed
+        directly, which is fastest for repeated short window extractions from
+        the same file.
 
     .. rubric:: Example
 
@@ -225,7 +236,31 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
 
     >>> print(len(st))
     101
+
+    Repeatedly extracting short time windows from large files is much
+    faster using a record index, as only the records overlapping the time
+    window are decoded.
+
+    >>> from obspy.core.util import get_example_file
+    >>> from obspy.io.mseed.util import get_record_index
+    >>> filename = get_example_file("test.mseed")
+    >>> index = get_record_index(filename)
+    >>> st = read(filename, format="MSEED", record_index=index,
+    ...           starttime=UTCDateTime("2003-05-29T02:15:00"),
+    ...           endtime=UTCDateTime("2003-05-29T02:15:10"))
+    >>> print(st)  # doctest: +ELLIPSIS
+    1 Trace(s) in Stream:
+    NL.HGN.00.BHZ | 2003-05-29T02:14:59.993400Z - ... | 40.0 Hz, 401 samples
     """
+    if record_index is not None and record_index is not False and \
+            (starttime is not None or endtime is not None) and \
+            isinstance(mseed_object, (str, native_str)):
+        return _read_mseed_records_in_window(
+            mseed_object, record_index, starttime=starttime, endtime=endtime,
+            headonly=headonly, sourcename=sourcename, reclen=reclen,
+            details=details, header_byteorder=header_byteorder,
+            verbose=verbose, **kwargs)
+
     # Parse the headonly and reclen flags.
     if headonly is True:
         unpack_data = 0
@@ -484,6 +519,29 @@ def _read_mseed(mseed_object, starttime=None, endtime=None, headonly=False,
     return Stream(traces=traces)
 
 
+def _read_mseed_records_in_window(filename, record_index, starttime=None,
+                                  endtime=None, **kwargs):
+    """
+    Reads only the records of a MiniSEED file overlapping the given time
+    window with the help of a record index.
+    """
+    if record_index is True:
+        record_index = util.get_record_index(filename)
+    buffer_ = util._get_records_in_window(filename, record_index,
+                                          starttime=starttime, endtime=endtime)
+    if not buffer_:
+        return Stream()
+    st = _read_mseed(io.BytesIO(buffer_), starttime=starttime,
+                     endtime=endtime, **kwargs)
+    # file wide information should refer to the actual file
+    filesize = os.path.getsize(filename)
+    for tr in st:
+        tr.stats.mseed.filesize = filesize
+        tr.stats.mseed.number_of_records = \
+            int(filesize // tr.stats.mseed.record_length)
+    return st
+
+
 def _write_mseed(stream, filename, encoding=None, reclen=None, byteorder=None,
                  sequence_number=None, flush=True, verbose=0, **_kwargs):
     """
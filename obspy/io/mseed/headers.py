@@ -50,6 +50,24 @@ DATATYPES = {b"a": C.c_char, b"i": C.c_int32, b"f": C.c_float,
              b"d": C.c_double}
 SAMPLESIZES = {'a': 1, 'i': 4, 'f': 4, 'd': 8}
 
+# Fields of a MiniSEED record index, times are in nanoseconds since
+# 1970-01-01T00:00:00Z.
+RECORD_INDEX_DTYPE = np.dtype([
+    (native_str('offset'), np.int64),
+    (native_str('record_length'), np.int32),
+    (native_str('network'), native_str('S2')),
+    (native_str('station'), native_str('S5')),
+    (native_str('location'), native_str('S2')),
+    (native_str('channel'), native_str('S3')),
+    (native_str('starttime'), np.int64),
+    (native_str('endtime'), np.int64),
+    (native_str('sampling_rate'), np.float64),
+    (native_str('npts'), np.int32),
+    (native_str('encoding'), np.int8)])
+# Appended to the name of a MiniSEED file to get the name of its stored
+# record index.
+RECORD_INDEX_SUFFIX = '.index.npz'
+
 # Valid record lengths for Mini-SEED files.
 VALID_RECORD_LENGTHS = [256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536,
                         131072, 262144, 524288, 1048576]
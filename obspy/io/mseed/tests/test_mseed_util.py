@@ -19,6 +19,7 @@ import numpy as np
 
 from obspy import UTCDateTime
 from obspy.core import Stream, Trace
+from obspy.core.compatibility import mock
 from obspy.core.util import NamedTemporaryFile
 from obspy.io.mseed import util
 from obspy.io.mseed.core import _read_mseed
@@ -1180,6 +1181,71 @@ class MSEEDUtilTestCase(unittest.TestCase):
         # Move the file_bfr to where it was before
         file_bfr.seek(prev_pos, os.SEEK_SET)
 
+    def test_get_record_index(self):
+        """
+        Tests the record index and reading only the records overlapping a
+        time window with it.
+        """
+        np.random.seed(42)
+        starttime = UTCDateTime(2012, 1, 1, 23, 59, 30)
+        st = Stream()
+        for channel in ("HHZ", "HHN"):
+            for offset in (0, 50):
+                tr = Trace(data=np.random.randint(-1000, 1000, 2000).astype(
+                    np.int32))
+                tr.stats.network = "XX"
+                tr.stats.station = "TEST"
+                tr.stats.channel = channel
+                tr.stats.sampling_rate = 100.0
+                tr.stats.starttime = starttime + offset
+                st.append(tr)
+        with NamedTemporaryFile() as tf:
+            st.write(tf.name, format="MSEED", reclen=512, encoding="STEIM2")
+            index = util.get_record_index(tf.name)
+            self.assertEqual(len(index), util.get_record_information(
+                tf.name)["number_of_records"])
+            self.assertEqual(index["npts"].sum(), 8000)
+            self.assertTrue(np.all(index["record_length"] == 512))
+            self.assertTrue(np.all(index["encoding"] == 11))
+            self.assertEqual(sorted(set(index["channel"])), [b"HHN", b"HHZ"])
+            self.assertEqual(index["starttime"].min(), starttime._ns)
+            self.assertEqual(index["endtime"].max(),
+                             (starttime + 50 + 19.99)._ns)
+            # windows within a record, across records and within a gap
+            for t1, t2 in ((5, 6.5), (2, 17), (28, 52), (21, 49), (0, 80),
+                           (-10, 2)):
+                t1, t2 = starttime + t1, starttime + t2
+                expected = _read_mseed(tf.name, starttime=t1, endtime=t2)
+                got = _read_mseed(tf.name, starttime=t1, endtime=t2,
+                                  record_index=index)
+                expected.trim(t1, t2)
+                got.trim(t1, t2)
+                self.assertEqual(got, expected)
+            # build index on the fly
+            got = _read_mseed(tf.name, starttime=starttime + 5,
+                              endtime=starttime + 10, record_index=True)
+            expected = _read_mseed(tf.name, starttime=starttime + 5,
+                                   endtime=starttime + 10)
+            self.assertEqual(got, expected)
+            # stored index next to the data file
+            index_filename = tf.name + ".index.npz"
+            try:
+                index2 = util.get_record_index(tf.name, sidecar=True)
+                self.assertTrue(os.path.exists(index_filename))
+                np.testing.assert_array_equal(index, index2)
+                with mock.patch("obspy.io.mseed.util._build_record_index") \
+                        as p:
+                    index3 = util.get_record_index(tf.name, sidecar=True)
+                    self.assertEqual(p.call_count, 0)
+                np.testing.assert_array_equal(index, index3)
+                # outdated index is rebuilt
+                st[:1].write(tf.name, format="MSEED", reclen=512)
+                index4 = util.get_record_index(tf.name, sidecar=True)
+                self.assertEqual(index4["npts"].sum(), 2000)
+            finally:
+                if os.path.exists(index_filename):
+                    os.remove(index_filename)
+
 
 def suite():
     return unittest.makeSuite(MSEEDUtilTestCase, 'test')
@@ -9,12 +9,14 @@ from future.utils import native_str
 
 import collections
 import ctypes as C
+import io
 import math
+import mmap
 import os
 import sys
 import warnings
-from datetime import datetime
-from struct import pack, unpack
+from datetime import date, datetime
+from struct import pack, unpack, unpack_from
 
 import numpy as np
 
@@ -23,8 +25,9 @@ from obspy.core.util.decorator import ObsPyDeprecationWarning
 from .headers import (ENCODINGS, ENDIAN, FIXED_HEADER_ACTIVITY_FLAGS,
                       FIXED_HEADER_DATA_QUAL_FLAGS,
                       FIXED_HEADER_IO_CLOCK_FLAGS, HPTMODULUS,
-                      SAMPLESIZES, UNSUPPORTED_ENCODINGS, MSRecord,
-                      MS_NOERROR, clibmseed)
+                      MINI_SEED_CONTROL_HEADERS, RECORD_INDEX_DTYPE,
+                      RECORD_INDEX_SUFFIX, SAMPLESIZES, UNSUPPORTED_ENCODINGS,
+                      MSRecord, MS_NOERROR, clibmseed)
 
 
 def get_start_and_end_time(file_or_file_object):
@@ -777,6 +780,217 @@ def _get_record_information(file_object, offset=0, endian=None):
     return info
 
 
+def get_record_index(filename, sidecar=False):
+    """
+    Returns an index of all data records in a MiniSEED file.
+
+    The index is built by only parsing the fixed section of the data header
+    and the blockettes 100, 1000 and 1001 of each record in a memory mapped
+    view of the file, no data is decoded. It can be passed as
+    ``record_index`` to :func:`~obspy.io.mseed.core._read_mseed` to only
+    decode the records overlapping a requested time window.
+
+    :type filename: str
+    :param filename: Name of the MiniSEED file.
+    :type sidecar: bool
+    :param sidecar: If ``True``, the index is stored next to the data file
+        (with ``".index.npz"`` appended to the file name) and reused by later
+        calls as long as size and modification time of the data file did not
+        change.
+    :rtype: :class:`numpy.ndarray`
+    :returns: Structured array with one row per data record containing the
+        fields ``offset``, ``record_length``, ``network``, ``station``,
+        ``location``, ``channel``, ``starttime`` and ``endtime`` (both in
+        nanoseconds since 1970-01-01, end time is the time of the last
+        sample), ``sampling_rate``, ``npts`` and ``encoding`` (``-1`` if
+        unknown).
+
+    .. rubric:: Example
+
+    >>> from obspy.core.util import get_example_file
+    >>> filename = get_example_file("test.mseed")
+    >>> index = get_record_index(filename)
+    >>> print(index["offset"])
+    [   0 4096]
+    >>> print(index["npts"])
+    [5980 5967]
+    >>> print(UTCDateTime(ns=int(index["starttime"][1])))
+    2003-05-29T02:15:51.543400Z
+    """
+    filesize = os.path.getsize(filename)
+    mtime = os.path.getmtime(filename)
+    index_filename = filename + RECORD_INDEX_SUFFIX
+    if sidecar and os.path.exists(index_filename):
+        index = _load_record_index(index_filename, filesize, mtime)
+        if index is not None:
+            return index
+    if filesize == 0:
+        index = np.empty(0, dtype=RECORD_INDEX_DTYPE)
+    else:
+        info = get_record_information(filename)
+        with io.open(filename, 'rb') as fh:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                index = _build_record_index(mm, filesize,
+                                            info["record_length"],
+                                            info["byteorder"])
+            finally:
+                mm.close()
+    if sidecar:
+        with io.open(index_filename, 'wb') as fh:
+            np.savez(fh, index=index, filesize=filesize, mtime=mtime)
+    return index
+
+
+def _load_record_index(index_filename, filesize, mtime):
+    """
+    Loads a stored record index if it still belongs to the current state of
+    the data file, otherwise returns ``None``.
+    """
+    try:
+        with np.load(index_filename) as npz:
+            if int(npz["filesize"]) != filesize or \
+                    float(npz["mtime"]) != mtime:
+                return None
+            return npz["index"]
+    except Exception:
+        return None
+
+
+def _build_record_index(buffer_, buffer_size, default_record_length,
+                        byteorder):
+    """
+    Scans the fixed data headers of all records in a buffer supporting the
+    buffer protocol (e.g. a :class:`mmap.mmap`).
+    """
+    fixed_header_fmt = native_str('%s6xc1x5s2s3s2sHHBBBxHHhhBBBxlHH' %
+                                  byteorder)
+    # ordinals of the first day of each year, cached as there are usually
+    # only one or two distinct years in a file
+    year_ordinals = {}
+    epoch_ordinal = date(1970, 1, 1).toordinal()
+    rows = []
+    offset = 0
+    while offset + 48 <= buffer_size:
+        (quality, station, location, channel, network, year, julday, hour,
+         minute, second, fract, npts, samp_rate_factor, samp_rate_mult,
+         activity_flags, _, _, time_correction, data_offset,
+         blkt_offset) = unpack_from(fixed_header_fmt, buffer_, offset)
+        if ord(quality) not in MINI_SEED_CONTROL_HEADERS:
+            # skip (full) SEED control headers and noise records
+            offset += default_record_length
+            continue
+        record_length = default_record_length
+        encoding = -1
+        samp_rate = None
+        # time in units of 0.0001 seconds
+        ticks = fract
+        if not activity_flags & 2:
+            ticks += time_correction
+        # time in microseconds from blockettes 500/1001
+        microseconds = 0
+        while blkt_offset and offset + blkt_offset + 4 <= buffer_size:
+            blkt_type, next_blkt = unpack_from(
+                native_str('%sHH' % byteorder), buffer_, offset + blkt_offset)
+            if blkt_type == 1000:
+                encoding, _, exponent = unpack_from(
+                    native_str('%sBBB' % byteorder), buffer_,
+                    offset + blkt_offset + 4)
+                record_length = 2 ** exponent
+            elif blkt_type == 1001:
+                microseconds = unpack_from(
+                    native_str('%sb' % byteorder), buffer_,
+                    offset + blkt_offset + 5)[0]
+            elif blkt_type == 100:
+                samp_rate = unpack_from(
+                    native_str('%sf' % byteorder), buffer_,
+                    offset + blkt_offset + 4)[0]
+            if next_blkt <= blkt_offset:
+                break
+            blkt_offset = next_blkt
+        if not samp_rate:
+            samp_rate = _get_sampling_rate(samp_rate_factor, samp_rate_mult)
+        if year not in year_ordinals:
+            year_ordinals[year] = date(year, 1, 1).toordinal()
+        days = year_ordinals[year] + julday - 1 - epoch_ordinal
+        seconds = ((days * 24 + hour) * 60 + minute) * 60 + second
+        starttime = seconds * 10 ** 9 + ticks * 10 ** 5 + \
+            microseconds * 10 ** 3
+        if samp_rate and npts:
+            endtime = starttime + int(round((npts - 1) / samp_rate * 1e9))
+        else:
+            endtime = starttime
+        rows.append((offset, record_length, network, station, location,
+                     channel, starttime, endtime, samp_rate, npts, encoding))
+        offset += record_length
+    index = np.array(rows, dtype=RECORD_INDEX_DTYPE)
+    for key in ("network", "station", "location", "channel"):
+        index[key] = np.char.strip(index[key])
+    return index
+
+
+def _get_sampling_rate(samp_rate_factor, samp_rate_mult):
+    """
+    Calculates the sampling rate from the sample rate factor and multiplier
+    of a fixed data header according to the SEED manual.
+    """
+    if (samp_rate_factor > 0) and (samp_rate_mult) > 0:
+        return float(samp_rate_factor * samp_rate_mult)
+    elif (samp_rate_factor > 0) and (samp_rate_mult) < 0:
+        return -1.0 * float(samp_rate_factor) / float(samp_rate_mult)
+    elif (samp_rate_factor < 0) and (samp_rate_mult) > 0:
+        return -1.0 * float(samp_rate_mult) / float(samp_rate_factor)
+    elif (samp_rate_factor < 0) and (samp_rate_mult) < 0:
+        return -1.0 / float(samp_rate_factor * samp_rate_mult)
+    return 0.0
+
+
+def _get_records_in_window(filename, index, starttime=None, endtime=None):
+    """
+    Returns the raw bytes of all data records of a MiniSEED file overlapping
+    the given time window, using a record index created by
+    :func:`get_record_index`.
+
+    Only the selected records are copied from a memory mapped view of the
+    file, contiguous records are copied in one go. Returns an empty bytes
+    object if no record overlaps the time window.
+    """
+    mask = np.ones(len(index), dtype=np.bool_)
+    if starttime is not None:
+        mask &= index["endtime"] >= starttime._ns - _get_half_sample_ns(index)
+    if endtime is not None:
+        mask &= index["starttime"] <= endtime._ns + _get_half_sample_ns(index)
+    selected = index[mask]
+    if not len(selected):
+        return b""
+    selected = np.sort(selected, order="offset")
+    starts = selected["offset"]
+    ends = starts + selected["record_length"]
+    # join contiguous records into runs that are copied at once
+    breaks = np.nonzero(starts[1:] != ends[:-1])[0] + 1
+    run_starts = starts[np.concatenate([[0], breaks])]
+    run_ends = ends[np.concatenate([breaks - 1, [len(selected) - 1]])]
+    with io.open(filename, 'rb') as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            chunks = [mm[int(a):int(b)] for a, b in zip(run_starts, run_ends)]
+        finally:
+            mm.close()
+    return b"".join(chunks)
+
+
+def _get_half_sample_ns(index):
+    """
+    Returns half a sample interval in nanoseconds for every row of a record
+    index (zero for records without sampling rate), used as a tolerance so
+    that ``nearest_sample`` trimming has all necessary data available.
+    """
+    sampling_rate = index["sampling_rate"]
+    with np.errstate(divide="ignore"):
+        half = np.where(sampling_rate > 0, 0.5e9 / sampling_rate, 0)
+    return half.astype(np.int64)
+
+
 def _ctypes_array_2_numpy_array(buffer_, buffer_elements, sampletype):
     """
     Takes a Ctypes array and its length and type and returns it as a
@@ -44,11 +44,18 @@ from obspy.core.event import (Amplitude, Arrival, Axis, Catalog, Comment,
                               WaveformStreamID)
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict
+from obspy.core.util.decorator import map_example_filename
 
 
 NSMAP_QUAKEML = {None: "http://quakeml.org/xmlns/bed/1.2",
                  'q': "http://quakeml.org/xmlns/quakeml/1.2"}
 
+# event components that can be selected when reading and their QuakeML tags
+EVENT_COMPONENT_TAGS = {
+    'origins': 'origin', 'arrivals': 'arrival', 'magnitudes': 'magnitude',
+    'station_magnitudes': 'stationMagnitude', 'picks': 'pick',
+    'amplitudes': 'amplitude', 'focal_mechanisms': 'focalMechanism'}
+
 
 def _get_first_child_namespace(element):
     """
@@ -61,6 +68,81 @@ def _get_first_child_namespace(element):
     return etree.QName(element.tag).namespace
 
 
+def _event_components(only=None):
+    """
+    Helper function checking a selection of event components to read.
+    """
+    if only is None:
+        return set(EVENT_COMPONENT_TAGS)
+    if isinstance(only, (str, bytes)):
+        only = [only]
+    components = set(only)
+    unknown = components.difference(EVENT_COMPONENT_TAGS)
+    if unknown:
+        msg = "Unknown event component(s): %s. Valid components: %s" % (
+            ", ".join(sorted(unknown)),
+            ", ".join(sorted(EVENT_COMPONENT_TAGS)))
+        raise ValueError(msg)
+    return components
+
+
+def _indent(element, level=0):
+    """
+    Helper function indenting the sub elements of an element like
+    lxml's pretty printing for an element at the given nesting level.
+    """
+    # lxml >= 4.5
+    if hasattr(etree, "indent"):
+        etree.indent(element, level=level)
+        return
+    indent = "\n" + (level + 1) * "  "
+    if len(element):
+        if not element.text or not element.text.strip():
+            element.text = indent
+        for child in element:
+            _indent(child, level + 1)
+            if not child.tail or not child.tail.strip():
+                child.tail = indent
+        child.tail = indent[:-2]
+
+
+def _extra_namespaces(extra, namespaces):
+    """
+    Helper function collecting the namespaces of (nested) custom tags.
+    """
+    for item in extra.values():
+        namespaces.add(item["namespace"])
+        if isinstance(item["value"], Mapping):
+            _extra_namespaces(item["value"], namespaces)
+    return namespaces
+
+
+def _custom_namespaces(obj, namespaces=None):
+    """
+    Helper function recursively collecting the namespaces of all custom tags
+    ("extra") of a Catalog or event type object and all objects it contains.
+    """
+    if namespaces is None:
+        namespaces = set()
+    # event type objects store all their attributes in the instance dict
+    extra = obj.__dict__.get("extra")
+    if extra:
+        _extra_namespaces(extra, namespaces)
+    if isinstance(obj, Catalog):
+        children = [obj.creation_info, obj.comments, obj.events]
+    else:
+        children = obj.__dict__.values()
+    for child in children:
+        # (avoid slow isinstance checks against abstract base classes)
+        if type(child) is list:
+            for item in child:
+                if hasattr(type(item), "_containers"):
+                    _custom_namespaces(item, namespaces)
+        elif hasattr(type(child), "_containers"):
+            _custom_namespaces(child, namespaces)
+    return namespaces
+
+
 def _xml_doc_from_anything(source):
     """
     Helper function attempting to create an xml etree element from either a
@@ -137,29 +219,33 @@ class Unpickler(object):
         except AttributeError:
             return self.xml_doc
 
-    def load(self, file):
+    def load(self, file, only=None):
         """
         Reads QuakeML file into ObsPy catalog object.
 
         :type file: str
         :param file: File name to read.
+        :type only: list of str, optional
+        :param only: Event components to read, see :meth:`iter_events`.
         :rtype: :class:`~obspy.core.event.Catalog`
         :returns: ObsPy Catalog object.
         """
         self.xml_doc = _xml_doc_from_anything(file)
-        return self._deserialize()
+        return self._deserialize(only=only)
 
-    def loads(self, string):
+    def loads(self, string, only=None):
         """
         Parses QuakeML string into ObsPy catalog object.
 
         :type string: str
         :param string: QuakeML string to parse.
+        :type only: list of str, optional
+        :param only: Event components to read, see :meth:`iter_events`.
         :rtype: :class:`~obspy.core.event.Catalog`
         :returns: ObsPy Catalog object.
         """
         self.xml_doc = etree.parse(io.BytesIO(string))
-        return self._deserialize()
+        return self._deserialize(only=only)
 
     def _xpath2obj(self, xpath, element=None, convert_to=str, namespace=None):
         q = self._xpath(xpath, element=element, namespace=namespace)
@@ -882,13 +968,14 @@ class Unpickler(object):
         self._extra(element, obj)
         return obj
 
-    def _deserialize(self):
+    def _deserialize(self, only=None):
         # check node "quakeml/eventParameters" for global namespace
         try:
             namespace = _get_first_child_namespace(self.xml_root)
             catalog_el = self._xpath('eventParameters', namespace=namespace)[0]
         except IndexError:
             raise Exception("Not a QuakeML compatible file or string")
+        components = _event_components(only)
         self._quakeml_namespaces = [
             ns for ns in self.xml_root.nsmap.values()
             if ns.startswith(r"http://quakeml.org/xmlns/")]
@@ -902,38 +989,111 @@ class Unpickler(object):
         catalog.creation_info = self._creation_info(catalog_el)
         # loop over all events
         for event_el in self._xpath('event', catalog_el):
-            # create new Event object
-            event = Event(force_resource_id=False)
-            # optional event attributes
-            event.preferred_origin_id = \
-                self._xpath2obj('preferredOriginID', event_el)
-            event.preferred_magnitude_id = \
-                self._xpath2obj('preferredMagnitudeID', event_el)
-            event.preferred_focal_mechanism_id = \
-                self._xpath2obj('preferredFocalMechanismID', event_el)
-            event_type = self._xpath2obj('type', event_el)
-            # Change for QuakeML 1.2RC4. 'null' is no longer acceptable as an
-            # event type. Will be replaced with 'not reported'.
-            if event_type == "null":
-                event_type = "not reported"
-            # USGS event types contain '_' which is not compliant with
-            # the QuakeML standard
-            if isinstance(event_type, str):
-                event_type = event_type.replace("_", " ")
-            try:
-                event.event_type = event_type
-            except ValueError:
-                msg = "Event type '%s' does not comply " % event_type
-                msg += "with QuakeML standard -- event will be ignored."
-                warnings.warn(msg, UserWarning)
+            event = self._event(event_el, components)
+            if event is not None:
+                catalog.append(event)
+        catalog.resource_id = catalog_el.get('publicID')
+        self._extra(catalog_el, catalog)
+        return catalog
+
+    def iter_events(self, file, only=None):
+        """
+        Reads the events of a QuakeML file one by one.
+
+        In contrast to :meth:`load` the document is never held in memory as a
+        whole. The XML elements of every event are discarded as soon as the
+        event has been created, and elements of event components that are
+        not requested are discarded right after they have been parsed.
+
+        :type file: str or file
+        :param file: File name or open file-like object to read.
+        :type only: list of str, optional
+        :param only: Event components to read, any of ``"origins"``,
+            ``"arrivals"``, ``"magnitudes"``, ``"station_magnitudes"``,
+            ``"picks"``, ``"amplitudes"`` and ``"focal_mechanisms"``. All
+            other components of the events are left empty. Defaults to
+            reading all components.
+        :rtype: generator of :class:`~obspy.core.event.event.Event`
+        """
+        return self._iter_events(file, _event_components(only))
+
+    def _iter_events(self, file, components):
+        skipped_tags = set(
+            tag for key, tag in EVENT_COMPONENT_TAGS.items()
+            if key not in components)
+        found_catalog = False
+        depth = 0
+        for action, element in etree.iterparse(
+                file, events=("start", "end"), huge_tree=True):
+            if action == "start":
+                depth += 1
+                if depth == 1:
+                    self.xml_doc = element
+                    self._quakeml_namespaces = [
+                        ns for ns in element.nsmap.values()
+                        if ns.startswith(r"http://quakeml.org/xmlns/")]
+                elif depth == 2 and \
+                        etree.QName(element).localname == 'eventParameters':
+                    found_catalog = True
+                continue
+            depth -= 1
+            if not found_catalog or depth < 2:
                 continue
-            event.event_type_certainty = self._xpath2obj(
-                'typeCertainty', event_el)
-            event.creation_info = self._creation_info(event_el)
-            event.event_descriptions = self._event_description(event_el)
-            event.comments = self._comments(event_el)
-            # origins
-            event.origins = []
+            name = etree.QName(element).localname
+            parent = element.getparent()
+            if depth == 2 and name == 'event':
+                event = self._event(element, components)
+                element.clear()
+                parent.remove(element)
+                if event is not None:
+                    yield event
+            elif (depth == 3 and name in skipped_tags) or \
+                    (depth == 4 and name == 'arrival' and
+                     'arrival' in skipped_tags):
+                # not needed, free memory right away
+                element.clear()
+                parent.remove(element)
+        if not found_catalog:
+            raise Exception("Not a QuakeML compatible file or string")
+
+    def _event(self, event_el, components):
+        """
+        Creates an Event object from an event element, only reading the given
+        event components. Returns None if the event has to be ignored.
+        """
+        # create new Event object
+        event = Event(force_resource_id=False)
+        # optional event attributes
+        event.preferred_origin_id = \
+            self._xpath2obj('preferredOriginID', event_el)
+        event.preferred_magnitude_id = \
+            self._xpath2obj('preferredMagnitudeID', event_el)
+        event.preferred_focal_mechanism_id = \
+            self._xpath2obj('preferredFocalMechanismID', event_el)
+        event_type = self._xpath2obj('type', event_el)
+        # Change for QuakeML 1.2RC4. 'null' is no longer acceptable as an
+        # event type. Will be replaced with 'not reported'.
+        if event_type == "null":
+            event_type = "not reported"
+        # USGS event types contain '_' which is not compliant with
+        # the QuakeML standard
+        if isinstance(event_type, str):
+            event_type = event_type.replace("_", " ")
+        try:
+            event.event_type = event_type
+        except ValueError:
+            msg = "Event type '%s' does not comply " % event_type
+            msg += "with QuakeML standard -- event will be ignored."
+            warnings.warn(msg, UserWarning)
+            return None
+        event.event_type_certainty = self._xpath2obj(
+            'typeCertainty', event_el)
+        event.creation_info = self._creation_info(event_el)
+        event.event_descriptions = self._event_description(event_el)
+        event.comments = self._comments(event_el)
+        # origins
+        event.origins = []
+        if 'origins' in components:
             for origin_el in self._xpath('origin', event_el):
                 # Have to be created before the origin is created to avoid a
                 # rare issue where a warning is read when the same event is
@@ -941,46 +1101,49 @@ class Unpickler(object):
                 # to objects compare equal - for this the arrivals have to
                 # be bound to the event before the resource id is assigned.
                 arrivals = []
-                for arrival_el in self._xpath('arrival', origin_el):
-                    arrival = self._arrival(arrival_el)
-                    arrivals.append(arrival)
+                if 'arrivals' in components:
+                    for arrival_el in self._xpath('arrival', origin_el):
+                        arrival = self._arrival(arrival_el)
+                        arrivals.append(arrival)
 
                 origin = self._origin(origin_el, arrivals=arrivals)
 
                 # append origin with arrivals
                 event.origins.append(origin)
-            # magnitudes
-            event.magnitudes = []
+        # magnitudes
+        event.magnitudes = []
+        if 'magnitudes' in components:
             for magnitude_el in self._xpath('magnitude', event_el):
                 magnitude = self._magnitude(magnitude_el)
                 event.magnitudes.append(magnitude)
-            # station magnitudes
-            event.station_magnitudes = []
+        # station magnitudes
+        event.station_magnitudes = []
+        if 'station_magnitudes' in components:
             for magnitude_el in self._xpath('stationMagnitude', event_el):
                 magnitude = self._station_magnitude(magnitude_el)
                 event.station_magnitudes.append(magnitude)
-            # picks
-            event.picks = []
+        # picks
+        event.picks = []
+        if 'picks' in components:
             for pick_el in self._xpath('pick', event_el):
                 pick = self._pick(pick_el)
                 event.picks.append(pick)
-            # amplitudes
-            event.amplitudes = []
+        # amplitudes
+        event.amplitudes = []
+        if 'amplitudes' in components:
             for el in self._xpath('amplitude', event_el):
                 amp = self._amplitude(el)
                 event.amplitudes.append(amp)
-            # focal mechanisms
-            event.focal_mechanisms = []
+        # focal mechanisms
+        event.focal_mechanisms = []
+        if 'focal_mechanisms' in components:
             for fm_el in self._xpath('focalMechanism', event_el):
                 fm = self._focal_mechanism(fm_el)
                 event.focal_mechanisms.append(fm)
-            # finally append newly created event to catalog
-            event.resource_id = event_el.get('publicID')
-            self._extra(event_el, event)
-            catalog.append(event)
-        catalog.resource_id = catalog_el.get('publicID')
-        self._extra(catalog_el, catalog)
-        return catalog
+        # finally set the resource id of the newly created event
+        event.resource_id = event_el.get('publicID')
+        self._extra(event_el, event)
+        return event
 
     def _extra(self, element, obj):
         """
@@ -1702,6 +1865,59 @@ class Pickler(object):
         self._extra(focal_mechanism, element)
         return element
 
+    def _event(self, event):
+        """
+        Converts an Event object into an event element.
+        """
+        # create event node
+        event_el = etree.Element(
+            'event', attrib={'publicID': self._id(event.resource_id)})
+        # optional event attributes
+        if hasattr(event, "preferred_origin_id"):
+            self._str(event.preferred_origin_id, event_el,
+                      'preferredOriginID')
+        if hasattr(event, "preferred_magnitude_id"):
+            self._str(event.preferred_magnitude_id, event_el,
+                      'preferredMagnitudeID')
+        if hasattr(event, "preferred_focal_mechanism_id"):
+            self._str(event.preferred_focal_mechanism_id, event_el,
+                      'preferredFocalMechanismID')
+        # event type and event type certainty also are optional attributes.
+        if hasattr(event, "event_type"):
+            self._str(event.event_type, event_el, 'type')
+        if hasattr(event, "event_type_certainty"):
+            self._str(event.event_type_certainty, event_el,
+                      'typeCertainty')
+        # event descriptions
+        for description in event.event_descriptions:
+            el = etree.Element('description')
+            self._str(description.text, el, 'text', True)
+            self._str(description.type, el, 'type')
+            self._extra(description, el)
+            event_el.append(el)
+        self._comments(event.comments, event_el)
+        self._creation_info(event.creation_info, event_el)
+        # origins
+        for origin in event.origins:
+            event_el.append(self._origin(origin))
+        # magnitudes
+        for magnitude in event.magnitudes:
+            event_el.append(self._magnitude(magnitude))
+        # station magnitudes
+        for magnitude in event.station_magnitudes:
+            event_el.append(self._station_magnitude(magnitude))
+        # picks
+        for pick in event.picks:
+            event_el.append(self._pick(pick))
+        # amplitudes
+        for amp in event.amplitudes:
+            event_el.append(self._amplitude(amp))
+        # focal mechanisms
+        for focal_mechanism in event.focal_mechanisms:
+            event_el.append(self._focal_mechanism(focal_mechanism))
+        self._extra(event, event_el)
+        return event_el
+
     def _serialize(self, catalog, pretty_print=True):
         """
         Converts a Catalog object into XML string.
@@ -1714,55 +1930,8 @@ class Pickler(object):
         self._comments(catalog.comments, catalog_el)
         self._creation_info(catalog.creation_info, catalog_el)
         for event in catalog:
-            # create event node
-            event_el = etree.Element(
-                'event', attrib={'publicID': self._id(event.resource_id)})
-            # optional event attributes
-            if hasattr(event, "preferred_origin_id"):
-                self._str(event.preferred_origin_id, event_el,
-                          'preferredOriginID')
-            if hasattr(event, "preferred_magnitude_id"):
-                self._str(event.preferred_magnitude_id, event_el,
-                          'preferredMagnitudeID')
-            if hasattr(event, "preferred_focal_mechanism_id"):
-                self._str(event.preferred_focal_mechanism_id, event_el,
-                          'preferredFocalMechanismID')
-            # event type and event type certainty also are optional attributes.
-            if hasattr(event, "event_type"):
-                self._str(event.event_type, event_el, 'type')
-            if hasattr(event, "event_type_certainty"):
-                self._str(event.event_type_certainty, event_el,
-                          'typeCertainty')
-            # event descriptions
-            for description in event.event_descriptions:
-                el = etree.Element('description')
-                self._str(description.text, el, 'text', True)
-                self._str(description.type, el, 'type')
-                self._extra(description, el)
-                event_el.append(el)
-            self._comments(event.comments, event_el)
-            self._creation_info(event.creation_info, event_el)
-            # origins
-            for origin in event.origins:
-                event_el.append(self._origin(origin))
-            # magnitudes
-            for magnitude in event.magnitudes:
-                event_el.append(self._magnitude(magnitude))
-            # station magnitudes
-            for magnitude in event.station_magnitudes:
-                event_el.append(self._station_magnitude(magnitude))
-            # picks
-            for pick in event.picks:
-                event_el.append(self._pick(pick))
-            # amplitudes
-            for amp in event.amplitudes:
-                event_el.append(self._amplitude(amp))
-            # focal mechanisms
-            for focal_mechanism in event.focal_mechanisms:
-                event_el.append(self._focal_mechanism(focal_mechanism))
-            self._extra(event, event_el)
             # add event node to catalog
-            catalog_el.append(event_el)
+            catalog_el.append(self._event(event))
         self._extra(catalog, catalog_el)
         nsmap = self._get_namespace_map()
         root_el = etree.Element('{%s}quakeml' % NSMAP_QUAKEML['q'],
@@ -1772,7 +1941,138 @@ class Pickler(object):
                               encoding="utf-8", xml_declaration=True)
 
 
-def _read_quakeml(filename):
+class QuakeMLWriter(object):
+    """
+    Writes events to a QuakeML file one by one.
+
+    Every event is converted to XML and written as soon as it is passed to
+    :meth:`write`, so arbitrarily many events (e.g. coming from a generator)
+    can be written without keeping them in memory. The file is completed
+    when the writer is closed, best use it as a context manager.
+
+    :type filename: str or file
+    :param filename: Filename to write or open (binary) file-like object.
+    :type catalog: :class:`~obspy.core.event.Catalog`, optional
+    :param catalog: Catalog providing the resource identifier, description,
+        comments, creation information and custom tags of the written
+        catalog. Its events are *not* written.
+    :type nsmap: dict, optional
+    :param nsmap: Custom namespace abbreviation mappings
+        (e.g. `{"edb": "http://erdbeben-in-bayern.de/xmlns/0.1"}`). Custom
+        tags in namespaces not given here are written with namespace
+        declarations local to their elements.
+    :type pretty_print: bool, optional
+    :param pretty_print: Indent the written XML.
+
+    .. rubric:: Example
+
+    >>> from obspy import read_events
+    >>> from obspy.io.quakeml.core import QuakeMLWriter
+    >>> with QuakeMLWriter("/tmp/events.xml") as writer:  # doctest: +SKIP
+    ...     for event in read_events():
+    ...         writer.write(event)
+    """
+    def __init__(self, filename, catalog=None, nsmap=None,
+                 pretty_print=True):
+        if catalog is None:
+            catalog = Catalog()
+        self.pretty_print = pretty_print
+        self._pickler = Pickler(nsmap=dict(nsmap or {}))
+        # serialize the document without events like Pickler._serialize()
+        # does, with a placeholder marking the position of the events
+        catalog_el = etree.Element('eventParameters', attrib={
+            'publicID': self._pickler._id(catalog.resource_id)})
+        if catalog.description:
+            self._pickler._str(catalog.description, catalog_el,
+                               'description')
+        self._pickler._comments(catalog.comments, catalog_el)
+        self._pickler._creation_info(catalog.creation_info, catalog_el)
+        self._placeholder = etree.Comment("events")
+        catalog_el.append(self._placeholder)
+        self._pickler._extra(catalog, catalog_el)
+        nsmap = self._pickler._get_namespace_map()
+        self._root_el = etree.Element('{%s}quakeml' % NSMAP_QUAKEML['q'],
+                                      nsmap=nsmap)
+        self._root_el.append(catalog_el)
+        self._head, self._tail = self._tostring(self._root_el).split(
+            etree.tostring(self._placeholder))
+        # whitespace in front of every event
+        self._separator = self._head[len(self._head.rstrip()):]
+        # events are serialized inside an element declaring the same
+        # namespaces as the root element, so that they are not declared
+        # again for every event
+        self._wrapper = etree.Element(self._root_el.tag, nsmap=nsmap)
+        etree.SubElement(self._wrapper, "x")
+        data = etree.tostring(self._wrapper, encoding="utf-8")
+        index = data.rindex(b"<x/>")
+        self._wrapper_start = len(data[:index])
+        self._wrapper_end = len(data) - index - len(b"<x/>")
+        self._wrapper.remove(self._wrapper[0])
+        self._count = 0
+
+        if hasattr(filename, "write"):
+            self._fh = filename
+            self._file_opened = False
+        else:
+            self._fh = open(filename, "wb")
+            self._file_opened = True
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _tostring(self, element):
+        return etree.tostring(element, pretty_print=self.pretty_print,
+                              encoding="utf-8", xml_declaration=True)
+
+    def write(self, event):
+        """
+        Writes an event.
+
+        :type event: :class:`~obspy.core.event.event.Event`
+        :param event: Event to write.
+        """
+        if self.closed:
+            raise ValueError("I/O operation on closed QuakeMLWriter.")
+        event_el = self._pickler._event(event)
+        if self.pretty_print:
+            _indent(event_el, level=2)
+        self._wrapper.append(event_el)
+        try:
+            data = etree.tostring(self._wrapper, encoding="utf-8")
+        finally:
+            self._wrapper.remove(event_el)
+        if self._count:
+            self._fh.write(self._separator)
+        else:
+            self._fh.write(self._head)
+        self._fh.write(data[self._wrapper_start:-self._wrapper_end])
+        self._count += 1
+
+    def close(self):
+        """
+        Completes the QuakeML document and closes the file (if it was opened
+        by the writer).
+        """
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            if self._count:
+                self._fh.write(self._tail)
+            else:
+                # same document as for an empty catalog
+                self._placeholder.getparent().remove(self._placeholder)
+                self._fh.write(self._tostring(self._root_el))
+        finally:
+            if self._file_opened:
+                self._fh.close()
+
+
+def _read_quakeml(filename, only=None):
     """
     Reads a QuakeML file and returns an ObsPy Catalog object.
 
@@ -1783,6 +2083,11 @@ def _read_quakeml(filename):
 
     :type filename: str
     :param filename: QuakeML file to be read.
+    :type only: list of str, optional
+    :param only: Event components to read, any of ``"origins"``,
+        ``"arrivals"``, ``"magnitudes"``, ``"station_magnitudes"``,
+        ``"picks"``, ``"amplitudes"`` and ``"focal_mechanisms"``. Defaults to
+        reading all components.
     :rtype: :class:`~obspy.core.event.Catalog`
     :return: An ObsPy Catalog object.
 
@@ -1795,7 +2100,40 @@ def _read_quakeml(filename):
     2011-03-11T05:46:24.120000Z | +38.297, +142.373 | 9.1 MW
     2006-09-10T04:26:33.610000Z |  +9.614, +121.961 | 9.8 MS
     """
-    return Unpickler().load(filename)
+    return Unpickler().load(filename, only=only)
+
+
+@map_example_filename("filename")
+def iter_events(filename, only=None):
+    """
+    Reads the events of a QuakeML file one by one.
+
+    Use this for files too large to be read into a
+    :class:`~obspy.core.event.Catalog` at once, the memory used does not
+    depend on the number of events in the file. Catalog level information
+    (description, comments, creation info) is not read.
+
+    :type filename: str or file
+    :param filename: QuakeML file to be read (file name or open file-like
+        object).
+    :type only: list of str, optional
+    :param only: Event components to read, any of ``"origins"``,
+        ``"arrivals"``, ``"magnitudes"``, ``"station_magnitudes"``,
+        ``"picks"``, ``"amplitudes"`` and ``"focal_mechanisms"``. All other
+        components of the events are skipped without creating any objects
+        for them. Defaults to reading all components.
+    :rtype: generator of :class:`~obspy.core.event.event.Event`
+
+    .. rubric:: Example
+
+    >>> from obspy.io.quakeml.core import iter_events
+    >>> for event in iter_events('/path/to/iris_events.xml',
+    ...                          only=['origins', 'magnitudes']):
+    ...     print(event.short_str())
+    2011-03-11T05:46:24.120000Z | +38.297, +142.373 | 9.1 MW
+    2006-09-10T04:26:33.610000Z |  +9.614, +121.961 | 9.8 MS
+    """
+    return Unpickler().iter_events(filename, only=only)
 
 
 def _write_quakeml(catalog, filename, validate=False, nsmap=None,
@@ -1823,9 +2161,21 @@ def _write_quakeml(catalog, filename, validate=False, nsmap=None,
     nsmap_ = getattr(catalog, "nsmap", {})
     if nsmap:
         nsmap_.update(nsmap)
+
+    if validate is not True:
+        # declare all custom namespaces in the root element like for a fully
+        # serialized document and write the events one by one
+        pickler = Pickler(nsmap=nsmap_.copy())
+        pickler.ns_set.update(_custom_namespaces(catalog))
+        with QuakeMLWriter(filename, catalog=catalog,
+                           nsmap=pickler._get_namespace_map()) as writer:
+            for event in catalog:
+                writer.write(event)
+        return
+
     xml_doc = Pickler(nsmap=nsmap_).dumps(catalog)
 
-    if validate is True and not _validate(io.BytesIO(xml_doc)):
+    if not _validate(io.BytesIO(xml_doc)):
         raise AssertionError(
             "The final QuakeML file did not pass validation.")
 
@@ -11,14 +11,17 @@ import warnings
 
 from lxml import etree
 
-from obspy.core.event import (Catalog, Event, FocalMechanism, Magnitude,
-                              MomentTensor, Origin, Pick, ResourceIdentifier,
-                              Tensor, WaveformStreamID, read_events)
+from obspy.core.event import (Catalog, Comment, Event, FocalMechanism,
+                              Magnitude, MomentTensor, Origin, Pick,
+                              ResourceIdentifier, Tensor, WaveformStreamID,
+                              read_events)
 from obspy.core.utcdatetime import UTCDateTime
 from obspy.core.util import AttribDict
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.testing import compare_xml_strings
-from obspy.io.quakeml.core import Pickler, _read_quakeml, _write_quakeml
+from obspy.io.quakeml.core import (Pickler, QuakeMLWriter, Unpickler,
+                                   _read_quakeml, _validate, _write_quakeml,
+                                   iter_events)
 
 
 # lxml < 2.3 seems not to ship with RelaxNG schema parser and namespace support
@@ -1009,6 +1012,158 @@ class QuakeMLTestCase(unittest.TestCase):
         # No warning should have been raised.
         self.assertEqual(len(w), 0)
 
+    def test_iter_events(self):
+        """
+        Tests reading events one by one gives the same events as reading the
+        whole file.
+        """
+        for name in ('neries_events.xml', 'qml-example-1.2-RC3.xml',
+                     'quakeml_1.2_origin.xml', 'quakeml_1.2_pick.xml'):
+            filename = os.path.join(self.path, name)
+            catalog = _read_quakeml(filename)
+            self.assertEqual(list(iter_events(filename)), catalog.events)
+            with open(filename, 'rb') as fh:
+                self.assertEqual(list(iter_events(fh)), catalog.events)
+        # events are returned before the rest of the file is parsed and the
+        # elements of already read events are freed
+        unpickler = Unpickler()
+        events = unpickler.iter_events(self.neries_filename)
+        for i, event in enumerate(events):
+            self.assertEqual(event, self.neries_catalog[i])
+            catalog_el = unpickler.xml_root[0]
+            self.assertLessEqual(len(catalog_el.findall('{*}event')), 2 - i)
+        self.assertEqual(i, 2)
+        self.assertEqual(len(catalog_el.findall('{*}event')), 0)
+        # not a QuakeML file
+        self.assertRaises(Exception, list, iter_events(io.BytesIO(
+            b'<?xml version="1.0"?><foo><bar/></foo>')))
+
+    def test_read_selected_event_components(self):
+        """
+        Tests reading only some of the components of the events.
+        """
+        filename = os.path.join(self.path, 'quakeml_1.2_arrival.xml')
+        full = _read_quakeml(filename)[0]
+        self.assertTrue(full.origins[0].arrivals)
+        for event in (_read_quakeml(filename,
+                                    only=['origins', 'magnitudes'])[0],
+                      list(iter_events(filename,
+                                       only=['origins', 'magnitudes']))[0]):
+            self.assertEqual(len(event.origins), len(full.origins))
+            self.assertEqual(event.origins[0].arrivals, [])
+            self.assertEqual(event.origins[0].latitude,
+                             full.origins[0].latitude)
+            self.assertEqual(event.magnitudes, full.magnitudes)
+            self.assertEqual(event.picks, [])
+            self.assertEqual(event.amplitudes, [])
+            self.assertEqual(event.station_magnitudes, [])
+            self.assertEqual(event.focal_mechanisms, [])
+            self.assertEqual(event.resource_id, full.resource_id)
+            self.assertEqual(event.comments, full.comments)
+        event = list(iter_events(filename, only=['origins', 'arrivals']))[0]
+        self.assertEqual(event.origins, full.origins)
+        self.assertEqual(event.magnitudes, [])
+        filename = os.path.join(self.path, 'quakeml_1.2_pick.xml')
+        full = _read_quakeml(filename)[0]
+        self.assertTrue(full.picks)
+        event = read_events(filename, format='QUAKEML', only='picks')[0]
+        self.assertEqual(event.picks, full.picks)
+        event = read_events(filename, format='QUAKEML', only='origins')[0]
+        self.assertEqual(event.picks, [])
+        self.assertRaises(ValueError, _read_quakeml, filename,
+                          only=['origins', 'foo'])
+        self.assertRaises(ValueError, iter_events, filename, only=['foo'])
+
+    def test_streaming_writer(self):
+        """
+        Tests writing events one by one with QuakeMLWriter.
+        """
+        catalog = self.neries_catalog
+        catalog.resource_id = 'smi:local/neries'
+        catalog.description = 'some description'
+        catalog.comments = [Comment(text='some comment',
+                                    resource_id='smi:local/comment')]
+        # Catalog.write() streams the events and gives the same document as
+        # the serialization of the full catalog
+        buf = io.BytesIO()
+        _write_quakeml(catalog, buf)
+        self.assertEqual(buf.getvalue(), Pickler().dumps(catalog))
+        # events from a generator, with the catalog only providing the
+        # catalog level information
+        for target in (io.BytesIO(), NamedTemporaryFile()):
+            with target:
+                header = Catalog(resource_id='smi:local/catalog',
+                                 description='header only')
+                with QuakeMLWriter(target, catalog=header) as writer:
+                    for event in (ev for ev in catalog):
+                        writer.write(event)
+                self.assertTrue(writer.closed)
+                if isinstance(target, io.BytesIO):
+                    data = target.getvalue()
+                else:
+                    with open(target.name, 'rb') as fh:
+                        data = fh.read()
+            self.assertTrue(_validate(io.BytesIO(data)))
+            result = _read_quakeml(io.BytesIO(data))
+            self.assertEqual(result.events, catalog.events)
+            self.assertEqual(result.description, 'header only')
+            self.assertEqual(str(result.resource_id), 'smi:local/catalog')
+        self.assertRaises(ValueError, writer.write, catalog[0])
+        # no events at all
+        buf = io.BytesIO()
+        QuakeMLWriter(buf, catalog=header).close()
+        self.assertEqual(buf.getvalue(), Pickler().dumps(header))
+
+    def test_streaming_writer_matches_pickler(self):
+        """
+        Writing a catalog gives byte for byte the same document as the
+        serialization of the whole catalog for all test files.
+        """
+        filenames = sorted(fn for fn in os.listdir(self.path)
+                           if fn.endswith(".xml"))
+        count = 0
+        for filename in filenames:
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter("ignore")
+                try:
+                    catalog = _read_quakeml(os.path.join(self.path,
+                                                         filename))
+                except Exception:
+                    continue
+                catalog.resource_id = "smi:local/catalog"
+                try:
+                    expected = Pickler(nsmap=dict(catalog.nsmap)).dumps(
+                        catalog)
+                except ValueError:
+                    continue
+                buf = io.BytesIO()
+                _write_quakeml(catalog, buf)
+            self.assertEqual(buf.getvalue(), expected, filename)
+            count += 1
+        self.assertGreater(count, 10)
+
+    def test_streaming_writer_extra_tags(self):
+        """
+        Tests custom tags written by QuakeMLWriter use the namespace
+        abbreviations declared in the root element.
+        """
+        catalog = self.neries_catalog
+        catalog[1].extra = {'custom': {
+            'value': 'abc', 'namespace': 'http://test.org/xmlns/0.1'}}
+        buf = io.BytesIO()
+        with QuakeMLWriter(buf, nsmap={'t': 'http://test.org/xmlns/0.1'}) \
+                as writer:
+            for event in catalog:
+                writer.write(event)
+        data = buf.getvalue()
+        self.assertIn(b'xmlns:t="http://test.org/xmlns/0.1"', data)
+        self.assertIn(b'<t:custom>abc</t:custom>', data)
+        # namespaces are only declared in the root element
+        self.assertEqual(data.count(b'xmlns:t='), 1)
+        result = _read_quakeml(io.BytesIO(data))
+        self.assertEqual(result[1].extra.custom.value, 'abc')
+        self.assertEqual(result.nsmap['t'], 'http://test.org/xmlns/0.1')
+
 
 def suite():
     return unittest.makeSuite(QuakeMLTestCase, 'test')
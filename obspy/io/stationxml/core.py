@@ -14,6 +14,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import copy
+import functools
 import inspect
 import io
 import math
@@ -125,14 +126,23 @@ def validate_stationxml(path_or_object):
     return (True, ())
 
 
-def _read_stationxml(path_or_file_object):
+def _read_stationxml(path_or_file_object, level="response", lazy=False):
     """
     Function reading a StationXML file.
 
     :param path_or_file_object: File name or file like object.
+    :type level: str, optional
+    :param level: Level of detail to read, one of ``"network"``,
+        ``"station"``, ``"channel"`` and ``"response"``. Elements below the
+        given level are discarded while parsing the file without creating
+        any objects for them, e.g. ``level="station"`` only reads networks
+        and stations (including their coordinates) but no channels.
+    :type lazy: bool, optional
+    :param lazy: If ``True``, the responses of the channels are only parsed
+        when they are accessed for the first time. Until then only the raw
+        XML of each response is kept, which makes reading large inventories
+        much faster if only some (or none) of the responses are needed.
     """
-    root = etree.parse(path_or_file_object).getroot()
-
     # Fix the namespace as its not always the default namespace. Will need
     # to be adjusted if the StationXML format gets another revision!
     namespace = "http://www.fdsn.org/xml/station/1"
@@ -140,6 +150,35 @@ def _read_stationxml(path_or_file_object):
     def _ns(tagname):
         return "{%s}%s" % (namespace, tagname)
 
+    try:
+        pruned_tag = {"network": "Station", "station": "Channel",
+                      "channel": "Response", "response": None}[level]
+    except KeyError:
+        msg = ("Invalid level '%s'. Valid levels: 'network', 'station', "
+               "'channel', 'response'.") % level
+        raise ValueError(msg)
+
+    # serialized responses of all channels by channel element
+    lazy_responses = None
+    if pruned_tag is None and lazy:
+        pruned_tag = "Response"
+        lazy_responses = {}
+
+    if pruned_tag is None:
+        root = etree.parse(path_or_file_object).getroot()
+    else:
+        # drop all elements below the requested level (or the responses to
+        # be read lazily) as soon as they have been parsed
+        context = etree.iterparse(path_or_file_object, tag=_ns(pruned_tag))
+        for _, element in context:
+            parent = element.getparent()
+            if lazy_responses is not None:
+                lazy_responses[parent] = etree.tostring(element,
+                                                        with_tail=False)
+            element.clear()
+            parent.remove(element)
+        root = context.root
+
     # Source and Created field must exist in a StationXML.
     source = root.find(_ns("Source")).text
     created = obspy.UTCDateTime(root.find(_ns("Created")).text)
@@ -151,7 +190,8 @@ def _read_stationxml(path_or_file_object):
 
     networks = []
     for network in root.findall(_ns("Network")):
-        networks.append(_read_network(network, _ns))
+        networks.append(_read_network(network, _ns,
+                                      lazy_responses=lazy_responses))
 
     inv = obspy.core.inventory.Inventory(networks=networks, source=source,
                                          sender=sender, created=created,
@@ -190,7 +230,7 @@ def _read_base_node(element, object_to_write_to, _ns):
     _read_extra(element, object_to_write_to)
 
 
-def _read_network(net_element, _ns):
+def _read_network(net_element, _ns, lazy_responses=None):
     network = obspy.core.inventory.Network(net_element.get("code"))
     _read_base_node(net_element, network, _ns)
     network.total_number_of_stations = \
@@ -199,12 +239,13 @@ def _read_network(net_element, _ns):
         _tag2obj(net_element, _ns("SelectedNumberStations"), int)
     stations = []
     for station in net_element.findall(_ns("Station")):
-        stations.append(_read_station(station, _ns))
+        stations.append(_read_station(station, _ns,
+                                      lazy_responses=lazy_responses))
     network.stations = stations
     return network
 
 
-def _read_station(sta_element, _ns):
+def _read_station(sta_element, _ns, lazy_responses=None):
     longitude = _read_floattype(sta_element, _ns("Longitude"), Longitude,
                                 datum=True)
     latitude = _read_floattype(sta_element, _ns("Latitude"), Latitude,
@@ -235,7 +276,8 @@ def _read_station(sta_element, _ns):
         station.external_references.append(_read_external_reference(ref, _ns))
     channels = []
     for channel in sta_element.findall(_ns("Channel")):
-        channels.append(_read_channel(channel, _ns))
+        channels.append(_read_channel(channel, _ns,
+                                      lazy_responses=lazy_responses))
     station.channels = channels
     return station
 
@@ -292,7 +334,7 @@ def _read_floattype_list(parent, tag, cls, unit=False, datum=False,
     return objs
 
 
-def _read_channel(cha_element, _ns):
+def _read_channel(cha_element, _ns, lazy_responses=None):
     longitude = _read_floattype(cha_element, _ns("Longitude"), Longitude,
                                 datum=True)
     latitude = _read_floattype(cha_element, _ns("Latitude"), Latitude,
@@ -356,9 +398,23 @@ def _read_channel(cha_element, _ns):
     response = cha_element.find(_ns("Response"))
     if response is not None:
         channel.response = _read_response(response, _ns)
+    elif lazy_responses and cha_element in lazy_responses:
+        channel._set_response_loader(functools.partial(
+            _read_response_from_string, lazy_responses[cha_element],
+            etree.QName(cha_element).namespace))
     return channel
 
 
+def _read_response_from_string(string, namespace):
+    """
+    Reads a response from the serialized Response element of a channel.
+    """
+    def _ns(tagname):
+        return "{%s}%s" % (namespace, tagname)
+
+    return _read_response(etree.fromstring(string), _ns)
+
+
 def _read_response(resp_element, _ns):
     response = obspy.core.inventory.response.Response()
     response.resource_id = resp_element.attrib.get('resourceId')
@@ -995,6 +995,71 @@ class StationXMLTestCase(unittest.TestCase):
             # now, read again to test if it's parsed correctly..
             inv = obspy.read_inventory(tmpfile)
 
+    def test_read_level(self):
+        """
+        Tests reading StationXML files only down to a given level.
+        """
+        filename = os.path.join(self.data_dir, "full_random_stationxml.xml")
+        full = obspy.read_inventory(filename)
+        inv = obspy.read_inventory(filename, level="response")
+        self.assertEqual(inv, full)
+        inv = obspy.read_inventory(filename, format="STATIONXML",
+                                   level="channel")
+        channels = [cha for net in inv for sta in net for cha in sta]
+        full_channels = [cha for net in full for sta in net for cha in sta]
+        self.assertEqual(len(channels), len(full_channels))
+        for cha, full_cha in zip(channels, full_channels):
+            self.assertIsNone(cha.response)
+            self.assertEqual(cha.latitude, full_cha.latitude)
+            self.assertEqual(cha.sample_rate, full_cha.sample_rate)
+            self.assertEqual(cha.sensor, full_cha.sensor)
+        inv = obspy.read_inventory(filename, level="station")
+        self.assertEqual(
+            [(sta.code, sta.latitude, sta.longitude, sta.elevation,
+              sta.total_number_of_channels) for net in inv for sta in net],
+            [(sta.code, sta.latitude, sta.longitude, sta.elevation,
+              sta.total_number_of_channels) for net in full for sta in net])
+        self.assertEqual(inv.get_contents()["channels"], [])
+        inv = obspy.read_inventory(filename, level="network")
+        self.assertEqual([net.code for net in inv],
+                         [net.code for net in full])
+        self.assertEqual(inv.get_contents()["stations"], [])
+        self.assertEqual(inv.networks[0].total_number_of_stations,
+                         full.networks[0].total_number_of_stations)
+        with open(filename, "rb") as fh:
+            inv = obspy.read_inventory(fh, level="station")
+        self.assertEqual(len(inv[0]), len(full[0]))
+        self.assertRaises(ValueError, obspy.read_inventory, filename,
+                          level="foo")
+
+    def test_read_responses_lazily(self):
+        """
+        Tests reading the responses of the channels only when they are
+        accessed.
+        """
+        for name in ("full_random_stationxml.xml",
+                     "IRIS_single_channel_with_response_custom_tags.xml"):
+            filename = os.path.join(self.data_dir, name)
+            full = obspy.read_inventory(filename)
+            inv = obspy.read_inventory(filename, lazy=True)
+            channel = inv[0][0][0]
+            full_channel = full[0][0][0]
+            self.assertIsNotNone(channel._response_loader)
+            self.assertEqual(channel.code, full_channel.code)
+            self.assertEqual(channel.response, full_channel.response)
+            self.assertIsNone(channel._response_loader)
+            # unread responses are read for comparisons and when writing
+            self.assertEqual(inv, full)
+            inv = obspy.read_inventory(filename, lazy=True)
+            buf, full_buf = io.BytesIO(), io.BytesIO()
+            inv.write(buf, format="STATIONXML")
+            full.write(full_buf, format="STATIONXML")
+            self.assertEqual(buf.getvalue(), full_buf.getvalue())
+        # setting a response replaces the unread one
+        inv = obspy.read_inventory(filename, lazy=True)
+        inv[0][0][0].response = None
+        self.assertIsNone(inv[0][0][0].response)
+
 
 def suite():
     return unittest.makeSuite(StationXMLTestCase, "test")
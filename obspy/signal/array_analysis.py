@@ -28,6 +28,7 @@ import numpy as np
 from scipy.integrate import cumtrapz
 
 from obspy.core import Stream
+from obspy.core.util.misc import _parallel_map
 from obspy.signal.headers import clibsignal
 from obspy.signal.invsim import cosine_taper
 from obspy.signal.util import next_pow_2, util_geo_km
@@ -843,10 +844,102 @@ def dump(pow_map, apow_map, i):
     np.savez('apow_map_%d.npz' % i, apow_map)
 
 
+# steering vectors used by worker processes of array_processing(), kept
+# for subsequent blocks of windows with the same setup
+_STEER_CACHE = {}
+
+
+def _steering_vectors(geometry, sll_x, sll_y, sl_s, grdpts_x, grdpts_y,
+                      nlow, nf, deltaf):
+    """
+    Returns the steering vectors for all frequencies and slowness grid
+    points, shape ``(nf, grdpts_x * grdpts_y, nstat)``.
+    """
+    geometry = np.asarray(geometry)
+    nstat = len(geometry)
+    time_shift_table = get_timeshift(geometry, sll_x, sll_y, sl_s, grdpts_x,
+                                     grdpts_y)
+    steer = np.empty((nf, grdpts_x, grdpts_y, nstat), dtype=np.complex128)
+    clibsignal.calcSteer(nstat, grdpts_x, grdpts_y, nf, nlow, deltaf,
+                         time_shift_table, steer)
+    return steer.reshape(nf, grdpts_x * grdpts_y, nstat)
+
+
+def _array_processing_block(data, steer, steer_args, nfft, prewhiten,
+                            method):
+    """
+    Beamforming of a block of sliding windows, see :func:`array_processing`.
+
+    Equivalent to the ``generalizedBeamformer`` C routine applied to each
+    window, but all windows of the block are processed at once and the
+    steering is done with matrix products for all grid points of a
+    frequency. For plain beamforming the rank one covariance matrices are
+    not formed at all.
+
+    :type data: :class:`numpy.ndarray`
+    :param data: Data of the windows, shape ``(nwin, nstat, nsamp)``.
+    :param steer: Steering vectors as returned by :func:`_steering_vectors`
+        or ``None`` to compute them from ``steer_args`` (and cache them for
+        further calls in a worker process).
+    :returns: Relative and absolute power maps of all windows, shape
+        ``(nwin, grdpts_x, grdpts_y)`` each.
+    """
+    grdpts_x, grdpts_y, nlow, nf = steer_args[4:8]
+    if steer is None:
+        steer = _STEER_CACHE.get(steer_args)
+        if steer is None:
+            _STEER_CACHE.clear()
+            steer = _steering_vectors(*steer_args)
+            _STEER_CACHE[steer_args] = steer
+    nwin, nstat, nsamp = data.shape
+    # 0.22 matches 0.2 of historical C bbfk.c
+    tap = cosine_taper(nsamp, p=0.22)
+    data = (data - data.mean(axis=-1)[..., np.newaxis]) * tap
+    ft = np.fft.rfft(data, nfft, axis=-1)[..., nlow:nlow + nf]
+    ft = ft.transpose(0, 2, 1)
+    if method == 1:
+        # computing the covariances of the signal at different receivers for
+        # each window and frequency, shape (nwin, nf, nstat, nstat)
+        _r = ft[..., :, np.newaxis] * ft[..., np.newaxis, :].conj()
+        _r /= np.abs(_r.sum(axis=1))[:, np.newaxis]
+        # P(f) = 1/(e.H R(f)^-1 e)
+        for w in range(nwin):
+            for n in range(nf):
+                _r[w, n] = np.linalg.pinv(_r[w, n], rcond=1e-6)
+        # optimized way of abspow normalization
+        dpow = np.ones(nwin)
+    else:
+        # trace of the covariance matrices summed over frequencies
+        dpow = nstat * (ft.real ** 2 + ft.imag ** 2).sum(axis=-1).sum(axis=-1)
+    relpow = np.zeros((nwin, grdpts_x * grdpts_y))
+    abspow = np.zeros((nwin, grdpts_x * grdpts_y))
+    for n in range(nf):
+        e = steer[n]
+        if method == 1:
+            # e.H R(f)^-1 e for all grid points and windows
+            _rn = _r[:, n].transpose(1, 0, 2).reshape(nstat, nwin * nstat)
+            e_hr = np.dot(e.conj(), _rn).reshape(len(e), nwin, nstat)
+            pow_ = 1. / np.abs(np.einsum('gwj,gj->wg', e_hr, e))
+        else:
+            # BF: P(f) = e.H R(f) e = |e.H ft|^2 as R(f) = ft ft.H
+            beam = np.dot(e.conj(), ft[:, n].T).T
+            pow_ = beam.real ** 2 + beam.imag ** 2
+        abspow += pow_
+        # scale for each frequency individually
+        if prewhiten == 1:
+            white = pow_.max(axis=1)
+            relpow += pow_ / (white * nf * nstat)[:, np.newaxis]
+        else:
+            relpow += pow_ / dpow[:, np.newaxis]
+    return (relpow.reshape(nwin, grdpts_x, grdpts_y),
+            abspow.reshape(nwin, grdpts_x, grdpts_y))
+
+
 def array_processing(stream, win_len, win_frac, sll_x, slm_x, sll_y, slm_y,
                      sl_s, semb_thres, vel_thres, frqlow, frqhigh, stime,
                      etime, prewhiten, verbose=False, coordsys='lonlat',
-                     timestamp='mlabday', method=0, store=None):
+                     timestamp='mlabday', method=0, store=None,
+                     block_size=None, workers=None, executor=None):
     """
     Method for Seismic-Array-Beamforming/FK-Analysis/Capon
 
@@ -898,8 +991,30 @@ def array_processing(stream, win_len, win_frac, sll_x, slm_x, sll_y, slm_y,
         second arguments and the iteration number as third argument. Useful for
         storing or plotting the map for each iteration. For this purpose the
         dump function of this module can be used.
+    :type block_size: int
+    :param block_size: Number of sliding windows that are processed
+        together. By default it is chosen so that the largest temporary
+        array needs about 64 MB.
+    :type workers: int
+    :param workers: Number of worker processes used to process blocks of
+        windows in parallel. By default all windows are processed in the
+        current process.
+    :type executor: object
+    :param executor: Running pool or executor to process the blocks of
+        windows with instead of ``workers``, e.g. a
+        :class:`concurrent.futures.ProcessPoolExecutor`.
     :return: :class:`numpy.ndarray` of timestamp, relative relpow, absolute
         relpow, backazimuth, slowness
+
+    .. note::
+
+        The steering vectors are computed once for all windows (once per
+        worker process when processing in parallel). The windows are
+        processed in blocks, with the beamforming of all grid points of a
+        frequency done as one matrix product. Blocks are finished in
+        chronological order, ``store`` is called as soon as the block of a
+        window is done. When processing in parallel, the data of only two
+        blocks per worker (or CPU) is extracted ahead of the stored results.
     """
     res = []
     eotr = True
@@ -922,17 +1037,24 @@ def array_processing(stream, win_len, win_frac, sll_x, slm_x, sll_y, slm_y,
         print(stream)
         print("stime = " + str(stime) + ", etime = " + str(etime))
 
-    time_shift_table = get_timeshift(geometry, sll_x, sll_y,
-                                     sl_s, grdpts_x, grdpts_y)
     # offset of arrays
     spoint, _epoint = get_spoint(stream, stime, etime)
     #
-    # loop with a sliding window over the dat trace array and apply bbfk
+    # sliding windows over the data, with their offsets and start times
     #
     nstat = len(stream)
     fs = stream[0].stats.sampling_rate
     nsamp = int(win_len * fs)
     nstep = int(nsamp * win_frac)
+    windows = []
+    offset = 0
+    newstart = stime
+    while eotr:
+        windows.append((offset, newstart))
+        if (newstart + (nsamp + nstep) / fs) > etime:
+            eotr = False
+        offset += nstep
+        newstart += nstep / fs
 
     # generate plan for rfftr
     nfft = next_pow_2(nsamp)
@@ -942,76 +1064,58 @@ def array_processing(stream, win_len, win_frac, sll_x, slm_x, sll_y, slm_y,
     nlow = max(1, nlow)  # avoid using the offset
     nhigh = min(nfft // 2 - 1, nhigh)  # avoid using nyquist
     nf = nhigh - nlow + 1  # include upper and lower frequency
-    # to speed up the routine a bit we estimate all steering vectors in advance
-    steer = np.empty((nf, grdpts_x, grdpts_y, nstat), dtype=np.complex128)
-    clibsignal.calcSteer(nstat, grdpts_x, grdpts_y, nf, nlow,
-                         deltaf, time_shift_table, steer)
-    _r = np.empty((nf, nstat, nstat), dtype=np.complex128)
-    ft = np.empty((nstat, nf), dtype=np.complex128)
-    newstart = stime
-    # 0.22 matches 0.2 of historical C bbfk.c
-    tap = cosine_taper(nsamp, p=0.22)
-    offset = 0
-    relpow_map = np.empty((grdpts_x, grdpts_y), dtype=np.float64)
-    abspow_map = np.empty((grdpts_x, grdpts_y), dtype=np.float64)
-    while eotr:
-        try:
-            for i, tr in enumerate(stream):
-                dat = tr.data[spoint[i] + offset:
-                              spoint[i] + offset + nsamp]
-                dat = (dat - dat.mean()) * tap
-                ft[i, :] = np.fft.rfft(dat, nfft)[nlow:nlow + nf]
-        except IndexError:
-            break
-        ft = np.ascontiguousarray(ft, np.complex128)
-        relpow_map.fill(0.)
-        abspow_map.fill(0.)
-        # computing the covariances of the signal at different receivers
-        dpow = 0.
-        for i in range(nstat):
-            for j in range(i, nstat):
-                _r[:, i, j] = ft[i, :] * ft[j, :].conj()
-                if method == 1:
-                    _r[:, i, j] /= np.abs(_r[:, i, j].sum())
-                if i != j:
-                    _r[:, j, i] = _r[:, i, j].conjugate()
-                else:
-                    dpow += np.abs(_r[:, i, j].sum())
-        dpow *= nstat
-        if method == 1:
-            # P(f) = 1/(e.H R(f)^-1 e)
-            for n in range(nf):
-                _r[n, :, :] = np.linalg.pinv(_r[n, :, :], rcond=1e-6)
-
-        errcode = clibsignal.generalizedBeamformer(
-            relpow_map, abspow_map, steer, _r, nstat, prewhiten,
-            grdpts_x, grdpts_y, nf, dpow, method)
-        if errcode != 0:
-            msg = 'generalizedBeamforming exited with error %d'
-            raise Exception(msg % errcode)
-        ix, iy = np.unravel_index(relpow_map.argmax(), relpow_map.shape)
-        relpow, abspow = relpow_map[ix, iy], abspow_map[ix, iy]
-        if store is not None:
-            store(relpow_map, abspow_map, offset)
-        # here we compute baz, slow
-        slow_x = sll_x + ix * sl_s
-        slow_y = sll_y + iy * sl_s
-
-        slow = np.sqrt(slow_x ** 2 + slow_y ** 2)
-        if slow < 1e-8:
-            slow = 1e-8
-        azimut = 180 * math.atan2(slow_x, slow_y) / math.pi
-        baz = azimut % -360 + 180
-        if relpow > semb_thres and 1. / slow > vel_thres:
-            res.append(np.array([newstart.timestamp, relpow, abspow, baz,
-                                 slow]))
-            if verbose:
-                print(newstart, (newstart + (nsamp / fs)), res[-1][1:])
-        if (newstart + (nsamp + nstep) / fs) > etime:
-            eotr = False
-        offset += nstep
-
-        newstart += nstep / fs
+    # to speed up the routine a bit we estimate all steering vectors in
+    # advance, worker processes compute them once from these arguments
+    steer_args = (tuple(map(tuple, geometry.tolist())), sll_x, sll_y, sl_s,
+                  grdpts_x, grdpts_y, nlow, nf, deltaf)
+    parallel = executor is not None or (workers is not None and
+                                        workers > 1)
+    steer = None if parallel else _steering_vectors(*steer_args)
+    if block_size is None:
+        # limit the size of the largest temporary array to about 64 MB
+        block_size = max(1, 2 ** 22 // (grdpts_x * grdpts_y * nstat))
+
+    def _blocks():
+        for i in range(0, len(windows), block_size):
+            block = windows[i:i + block_size]
+            data = np.empty((len(block), nstat, nsamp), dtype=np.float64)
+            for j, (offset, _) in enumerate(block):
+                for k, tr in enumerate(stream):
+                    data[j, k] = tr.data[spoint[k] + offset:
+                                         spoint[k] + offset + nsamp]
+            yield data, steer, steer_args, nfft, prewhiten, method
+
+    # blocks of windows are processed in order, so results can be stored as
+    # soon as a block is finished
+    results = _parallel_map(_array_processing_block, _blocks(),
+                            workers=workers, executor=executor)
+    try:
+        windows_ = iter(windows)
+        for relpow_maps, abspow_maps in results:
+            for relpow_map, abspow_map in zip(relpow_maps, abspow_maps):
+                offset, newstart = next(windows_)
+                ix, iy = np.unravel_index(relpow_map.argmax(),
+                                          relpow_map.shape)
+                relpow, abspow = relpow_map[ix, iy], abspow_map[ix, iy]
+                if store is not None:
+                    store(relpow_map, abspow_map, offset)
+                # here we compute baz, slow
+                slow_x = sll_x + ix * sl_s
+                slow_y = sll_y + iy * sl_s
+
+                slow = np.sqrt(slow_x ** 2 + slow_y ** 2)
+                if slow < 1e-8:
+                    slow = 1e-8
+                azimut = 180 * math.atan2(slow_x, slow_y) / math.pi
+                baz = azimut % -360 + 180
+                if relpow > semb_thres and 1. / slow > vel_thres:
+                    res.append(np.array([newstart.timestamp, relpow, abspow,
+                                         baz, slow]))
+                    if verbose:
+                        print(newstart, (newstart + (nsamp / fs)),
+                              res[-1][1:])
+    finally:
+        results.close()
     res = np.array(res)
     if timestamp == 'julsec':
         pass
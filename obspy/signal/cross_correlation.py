@@ -28,11 +28,272 @@ import numpy as np
 import scipy
 
 from obspy import Stream, Trace
-from obspy.core.util.misc import MatplotlibBackend
+from obspy.core.util.misc import MatplotlibBackend, _parallel_map
 from obspy.signal.headers import clibsignal
 from obspy.signal.invsim import cosine_taper
 
 
+def _next_fast_len(n):
+    """
+    Return a fast FFT length that is not smaller than ``n``.
+
+    Uses :func:`scipy.fftpack.next_fast_len` (5-smooth numbers) if available
+    and falls back to the next power of two on older SciPy versions.
+    """
+    try:
+        from scipy.fftpack import next_fast_len
+    except ImportError:
+        from obspy.signal.util import next_pow_2
+        return next_pow_2(n)
+    return next_fast_len(int(n))
+
+
+def _prepare_signal(x, name):
+    """
+    Return the data of a Trace or an array-like as 1-D or 2-D float array.
+    """
+    if isinstance(x, Trace):
+        x = x.data
+    x = np.asarray(x, dtype=np.float64)
+    if x.ndim not in (1, 2):
+        msg = "%s must be a 1-D or 2-D array, got %d dimensions." % (
+            name, x.ndim)
+        raise ValueError(msg)
+    if x.shape[-1] == 0:
+        msg = "%s must not be empty." % name
+        raise ValueError(msg)
+    return x
+
+
+def _correlate_full(a, b):
+    """
+    Full cross correlation of ``a`` and ``b`` along the last axis via FFT.
+
+    Returns all ``len(a) + len(b) - 1`` lags, index ``j`` corresponds to a
+    shift of ``j - (len(b) - 1)`` samples. The spectrum of a 1-D input is
+    computed only once and broadcast against all rows of a 2-D partner.
+    """
+    na = a.shape[-1]
+    nb = b.shape[-1]
+    nfft = _next_fast_len(na + nb - 1)
+    spec = np.fft.rfft(a, nfft, axis=-1)
+    spec = spec * np.fft.rfft(b, nfft, axis=-1).conj()
+    cc = np.fft.irfft(spec, nfft, axis=-1)
+    # negative lags wrapped around to the end of the circular correlation
+    return np.concatenate((cc[..., nfft - nb + 1:], cc[..., :na]), axis=-1)
+
+
+def _select_lags(cc, na, nb, mode=None, shift=None):
+    """
+    Cut the lags requested by ``mode`` or ``shift`` from a full correlation.
+    """
+    if shift is not None:
+        shift = int(shift)
+        if shift < 0:
+            raise ValueError("shift must not be negative.")
+        # zero shift aligns the middle samples of both signals
+        mid = nb - 1 + (na - nb) // 2
+        start = mid - shift
+        end = mid + shift + 1
+        pad_left = max(0, -start)
+        pad_right = max(0, end - cc.shape[-1])
+        if pad_left or pad_right:
+            # beyond the full overlap the correlation is zero
+            cc = np.concatenate((np.zeros(cc.shape[:-1] + (pad_left,)), cc,
+                                 np.zeros(cc.shape[:-1] + (pad_right,))),
+                                axis=-1)
+            start += pad_left
+            end += pad_left
+        return cc[..., start:end]
+    if mode == "full":
+        return cc
+    elif mode == "same":
+        start = (cc.shape[-1] - na) // 2
+        return cc[..., start:start + na]
+    elif mode == "valid":
+        return cc[..., min(na, nb) - 1:max(na, nb)]
+    msg = "mode must be one of 'full', 'same' or 'valid'."
+    raise ValueError(msg)
+
+
+def correlate(a, b, shift=None, mode="full", demean=True, normalize=True):
+    """
+    Cross correlation of two signals computed in the frequency domain.
+
+    The cross correlation is defined as ``cc[k] = sum_n a[n + k] * b[n]``,
+    i.e. a negative shift means that ``b`` is delayed with respect to ``a``
+    (same convention as :func:`xcorr`). The computation is done with real
+    FFTs padded to a fast length, so its cost hardly depends on the number
+    of lags and it is well suited for long signals and large maximum shifts.
+
+    Both signals can be given as 1-D arrays or as 2-D arrays holding one
+    signal per row. Rows of two 2-D arrays are correlated pairwise and a 1-D
+    signal is correlated with every row of a 2-D partner. In the latter case
+    the spectrum of the shared signal is computed only once, which makes it
+    cheap to correlate one trace with many others.
+
+    :type a: :class:`~numpy.ndarray` or :class:`~obspy.core.trace.Trace`
+    :param a: First signal(s).
+    :type b: :class:`~numpy.ndarray` or :class:`~obspy.core.trace.Trace`
+    :param b: Second signal(s) to correlate with ``a``.
+    :type shift: int
+    :param shift: Maximal shift in samples. If given, ``2 * shift + 1`` lags
+        are returned centered around the shift aligning the middle samples
+        of both signals (like the output of :func:`xcorr`, so it can be
+        passed to :func:`xcorr_max`) and ``mode`` is ignored. Lags outside
+        of the full overlap are zero.
+    :type mode: str
+    :param mode: Lags to return if ``shift`` is not given. ``'full'`` returns
+        all ``len(a) + len(b) - 1`` lags with any overlap of the signals,
+        ``'same'`` the ``len(a)`` central lags and ``'valid'`` only the lags
+        for which the shorter signal lies completely within the longer one.
+        The conventions are the same as for :func:`scipy.signal.correlate`.
+    :type demean: bool
+    :param demean: Subtract the mean of each signal before correlating.
+    :type normalize: bool
+    :param normalize: Divide by the square root of the product of the signal
+        energies, so that the result is in the range ``[-1, 1]`` and the
+        autocorrelation at zero shift is one. Signals with zero energy
+        result in a correlation of zero. For a normalization of each window
+        of a long signal by its own energy see :func:`correlate_template`.
+    :rtype: :class:`~numpy.ndarray`
+    :return: Cross correlation function, one row for each pair of signals
+        for 2-D input.
+
+    .. rubric:: Example
+
+    >>> a = np.random.randn(10000)
+    >>> b = np.roll(a, 25)
+    >>> cc = correlate(a, b, 100)
+    >>> len(cc)
+    201
+    >>> shift, value = xcorr_max(cc)
+    >>> print(shift, round(value, 2))
+    -25.0 1.0
+
+    Correlating one signal with many others at once:
+
+    >>> others = np.array([np.roll(a, i) for i in (-10, 0, 10)])
+    >>> cc = correlate(a, others, 100)
+    >>> cc.shape
+    (3, 201)
+    >>> print([xcorr_max(c)[0] for c in cc])
+    [10.0, 0.0, -10.0]
+    """
+    a = _prepare_signal(a, "a")
+    b = _prepare_signal(b, "b")
+    if demean:
+        a = a - a.mean(axis=-1)[..., np.newaxis]
+        b = b - b.mean(axis=-1)[..., np.newaxis]
+    na = a.shape[-1]
+    nb = b.shape[-1]
+    cc = _correlate_full(a, b)
+    cc = _select_lags(cc, na, nb, mode=mode, shift=shift)
+    if normalize:
+        norm = np.sqrt((a ** 2).sum(axis=-1) * (b ** 2).sum(axis=-1))
+        norm = np.asarray(norm)[..., np.newaxis]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cc = np.where(norm > 0, cc / norm, 0.0)
+    return cc
+
+
+def correlate_template(data, template, mode="valid", demean=True,
+                       normalize="full"):
+    """
+    Normalized cross correlation of a template with sliding data windows.
+
+    The template is correlated with each window of ``data`` of the same
+    length (data is zero-padded for modes ``'same'`` and ``'full'``). With
+    the default ``normalize='full'`` every window is normalized by its own
+    energy, so that the result is the correlation coefficient of the
+    template and the respective data window and lies in ``[-1, 1]``. The
+    correlation is computed in the frequency domain and the window energies
+    with cumulative sums, so the cost does not depend on the template
+    length.
+
+    :type data: :class:`~numpy.ndarray` or :class:`~obspy.core.trace.Trace`
+    :param data: Continuous data, 1-D or 2-D with one signal per row.
+    :type template: :class:`~numpy.ndarray` or
+        :class:`~obspy.core.trace.Trace`
+    :param template: Template(s), 1-D or 2-D with one template per row, not
+        longer than ``data``. A 1-D template is correlated with every row of
+        2-D data (and vice versa) computing its spectrum only once.
+    :type mode: str
+    :param mode: ``'valid'`` returns ``len(data) - len(template) + 1``
+        values, one for each position of the template completely within the
+        data, ``'same'`` returns ``len(data)`` values and ``'full'``
+        ``len(data) + len(template) - 1`` values. Index ``i`` of the
+        ``'valid'`` output corresponds to the data window starting at sample
+        ``i``.
+    :type demean: bool
+    :param demean: Demean the template and every data window.
+    :type normalize: str or None
+    :param normalize: ``'full'`` normalizes by the energy of each data
+        window, ``'naive'`` by the energy of the complete data (fast, but
+        values are not correlation coefficients) and ``None`` returns the
+        raw correlation.
+    :rtype: :class:`~numpy.ndarray`
+    :return: Cross correlation function, one row for each pair of data and
+        template for 2-D input.
+
+    .. rubric:: Example
+
+    >>> data = np.random.randn(5000)
+    >>> template = 3.0 * data[1200:1300] + 1.0
+    >>> cc = correlate_template(data, template)
+    >>> len(cc)
+    4901
+    >>> print(int(np.argmax(cc)), round(cc.max(), 6))
+    1200 1.0
+    """
+    data = _prepare_signal(data, "data")
+    template = _prepare_signal(template, "template")
+    if normalize not in ("full", "naive", None):
+        msg = "normalize must be one of 'full', 'naive' or None."
+        raise ValueError(msg)
+    ndat = data.shape[-1]
+    ntem = template.shape[-1]
+    if ntem > ndat:
+        msg = "Template must not be longer than data."
+        raise ValueError(msg)
+    if demean:
+        # the correlation with a demeaned template is not affected by the
+        # mean of the data windows
+        template = template - template.mean(axis=-1)[..., np.newaxis]
+    cc = _select_lags(_correlate_full(data, template), ndat, ntem, mode=mode)
+    if normalize is None:
+        return cc
+    energy_template = (template ** 2).sum(axis=-1)
+    if normalize == "naive":
+        if demean:
+            data = data - data.mean(axis=-1)[..., np.newaxis]
+        energy_data = (data ** 2).sum(axis=-1)
+        norm = np.sqrt(energy_data * energy_template)
+        norm = np.asarray(norm)[..., np.newaxis]
+    else:
+        # energy of all data windows of template length, including the
+        # partial windows of the zero padded data in 'same' and 'full' mode
+        padded = np.concatenate((np.zeros(data.shape[:-1] + (ntem,)), data,
+                                 np.zeros(data.shape[:-1] + (ntem - 1,))),
+                                axis=-1)
+        cumsum = np.cumsum(padded ** 2, axis=-1)
+        energy_data = cumsum[..., ntem:] - cumsum[..., :-ntem]
+        if demean:
+            cumsum = np.cumsum(padded, axis=-1)
+            sums = cumsum[..., ntem:] - cumsum[..., :-ntem]
+            energy_data -= sums ** 2 / ntem
+        energy_data = _select_lags(energy_data, ndat, ntem, mode=mode)
+        # windows with (numerically) vanishing energy get a correlation of 0
+        scale = np.abs(data).max(axis=-1) ** 2 * ntem
+        threshold = (np.finfo(np.float64).eps * 1e3 *
+                     np.asarray(scale)[..., np.newaxis])
+        energy_data = np.where(energy_data > threshold, energy_data, 0.0)
+        norm = np.sqrt(energy_data * energy_template[..., np.newaxis])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cc = np.where(norm > 0, cc / norm, 0.0)
+    return cc
+
+
 def xcorr(tr1, tr2, shift_len, full_xcorr=False):
     """
     Cross correlation of tr1 and tr2 in the time domain using window_len.
@@ -539,6 +800,230 @@ def templates_max_similarity(st, time, streams_templates):
         return 0
 
 
+def _traces_by_id(stream, name):
+    """
+    Return a dictionary mapping trace ids to the traces of a stream.
+    """
+    traces = {}
+    for tr in stream:
+        if tr.id in traces:
+            msg = ("%s contains more than one trace with id %s, please merge "
+                   "it first.") % (name, tr.id)
+            raise ValueError(msg)
+        traces[tr.id] = tr
+    return traces
+
+
+def _find_peaks(data, height, distance):
+    """
+    Return the indices of local maxima of at least the given height that
+    are separated by at least ``distance`` samples. Of close peaks the
+    highest one is kept.
+    """
+    idx = np.nonzero(data >= height)[0]
+    if len(idx) == 0:
+        return idx
+    left = data[np.maximum(idx - 1, 0)]
+    right = data[np.minimum(idx + 1, len(data) - 1)]
+    idx = idx[(data[idx] >= left) & (data[idx] >= right)]
+    blocked = np.zeros(len(data), dtype=np.bool_)
+    peaks = []
+    for i in idx[np.argsort(data[idx], kind="mergesort")[::-1]]:
+        if blocked[i]:
+            continue
+        peaks.append(i)
+        blocked[max(0, i - distance + 1):i + distance] = True
+    return np.sort(peaks)
+
+
+def _correlation_detector(stream, templates, template_ids, threshold,
+                          distance):
+    """
+    Matched filter detection of a batch of templates, see
+    :func:`correlation_detector`.
+
+    :returns: List of detections of all templates.
+    """
+    data = _traces_by_id(stream, "Stream")
+    # time grid of the stacked similarity of each template, channels are
+    # aligned by the moveouts given by the start times of the template traces
+    grids = []
+    for st_tmpl in templates:
+        tmpl = _traces_by_id(st_tmpl, "Template")
+        ids = []
+        for id_ in sorted(tmpl):
+            if id_ not in data:
+                msg = ("Skipping trace %s in template correlation (not "
+                       "present in stream to check).")
+                warnings.warn(msg % id_)
+                continue
+            if data[id_].stats.sampling_rate != \
+                    tmpl[id_].stats.sampling_rate:
+                msg = ("Sampling rates of template and data differ for "
+                       "trace %s.") % id_
+                raise ValueError(msg)
+            if len(data[id_]) < len(tmpl[id_]):
+                msg = ("Skipping trace %s in template correlation (data "
+                       "shorter than template).")
+                warnings.warn(msg % id_)
+                continue
+            ids.append(id_)
+        if not ids:
+            grids.append(None)
+            continue
+        sampling_rate = tmpl[ids[0]].stats.sampling_rate
+        if any(tmpl[id_].stats.sampling_rate != sampling_rate
+               for id_ in ids):
+            msg = "All traces of a template need the same sampling rate."
+            raise ValueError(msg)
+        reftime = min(tmpl[id_].stats.starttime for id_ in ids)
+        # time of the first correlation value of each channel with respect
+        # to the template reference time
+        starts = [data[id_].stats.starttime -
+                  (tmpl[id_].stats.starttime - reftime) for id_ in ids]
+        starttime = max(starts)
+        offsets = [int(round((starttime - t) * sampling_rate))
+                   for t in starts]
+        npts = min(len(data[id_]) - len(tmpl[id_]) + 1 - offset
+                   for id_, offset in zip(ids, offsets))
+        if npts <= 0:
+            grids.append(None)
+            continue
+        grids.append((tmpl, dict(zip(ids, offsets)), starttime,
+                      sampling_rate, npts))
+    for grid, st_tmpl in zip(grids, templates):
+        if grid is None:
+            msg = ("Skipping template starting at %s (no overlapping data "
+                   "for any of its channels).")
+            warnings.warn(msg % min(tr.stats.starttime for tr in st_tmpl))
+    # correlate every channel with all templates at once, templates of the
+    # same length are processed together so that the data is transformed
+    # only once
+    stacks = [None if grid is None else np.zeros(grid[4]) for grid in grids]
+    for id_, tr in data.items():
+        groups = {}
+        for i, grid in enumerate(grids):
+            if grid is not None and id_ in grid[1]:
+                groups.setdefault(len(grid[0][id_]), []).append(i)
+        if not groups:
+            continue
+        data_ = np.ma.filled(tr.data.astype(np.float64), 0.0)
+        for indices in groups.values():
+            tmpls = np.array([grids[i][0][id_].data for i in indices],
+                             dtype=np.float64)
+            ccs = correlate_template(data_, tmpls)
+            for i, cc in zip(indices, ccs):
+                offset = grids[i][1][id_]
+                stacks[i] += cc[offset:offset + len(stacks[i])]
+    detections = []
+    for template_id, grid, stack in zip(template_ids, grids, stacks):
+        if grid is None:
+            continue
+        _, offsets, starttime, sampling_rate, _ = grid
+        stack /= len(offsets)
+        mad = np.median(np.abs(stack - np.median(stack)))
+        if mad == 0:
+            continue
+        height = threshold * mad
+        if distance is None:
+            distance_ = max(len(grid[0][id_]) for id_ in offsets)
+        else:
+            distance_ = max(1, int(round(distance * sampling_rate)))
+        for i in _find_peaks(stack, height, distance_):
+            detections.append({
+                "time": starttime + i / sampling_rate,
+                "similarity": float(stack[i]),
+                "template_id": template_id,
+                "threshold": float(height),
+                "channels": len(offsets)})
+    return detections
+
+
+def correlation_detector(stream, templates, threshold=8.0, distance=None,
+                         batch_size=10, workers=None, executor=None):
+    """
+    Matched filter detection of events similar to templates in continuous
+    data.
+
+    Each template is correlated with a sliding window over the continuous
+    data of all of its channels in the frequency domain using
+    :func:`correlate_template`. The normalized correlation functions are
+    shifted according to the moveouts of the template channels and averaged
+    across channels. Peaks of this network similarity exceeding
+    ``threshold`` times its median absolute deviation (MAD) are returned as
+    detections.
+
+    The moveouts are given by the start times of the template traces, e.g.
+    templates cut around the phase arrivals of a reference event at each
+    station. The time of a detection corresponds to the earliest start time
+    of the template traces, i.e. a template cut from the data itself is
+    detected at the start time of its first trace.
+
+    :type stream: :class:`~obspy.core.stream.Stream`
+    :param stream: Continuous data to scan, one trace per channel (merge
+        gappy data first, masked values are treated as zeros). All channels
+        should be preprocessed like the templates.
+    :type templates: list of :class:`~obspy.core.stream.Stream`
+    :param templates: Template events, one stream per template with one
+        trace per channel with the same sampling rate as the data. Channels
+        missing in ``stream`` are skipped with a warning.
+    :type threshold: float
+    :param threshold: Detection threshold as multiple of the median absolute
+        deviation of the network similarity of each template.
+    :type distance: float
+    :param distance: Minimum time in seconds between two detections of the
+        same template, of several peaks closer than that only the highest
+        is kept. Defaults to the length of the longest template trace.
+    :type batch_size: int
+    :param batch_size: Number of templates that are correlated together
+        with a single transform of the data. The memory needed is roughly
+        ``3 * batch_size * npts * 8`` bytes for data traces with ``npts``
+        samples, so long data should be scanned in chunks of e.g. one day.
+    :type workers: int
+    :param workers: Number of worker processes used to process the template
+        batches in parallel. By default all batches are processed one after
+        the other in the current process.
+    :type executor: object
+    :param executor: Pool or executor (e.g. a
+        :class:`concurrent.futures.ProcessPoolExecutor`) that is used for the
+        template batches instead of starting new worker processes.
+    :rtype: list of dict
+    :returns: Detections sorted by time. Each detection is a dictionary with
+        the keys ``'time'`` (:class:`~obspy.core.utcdatetime.UTCDateTime`),
+        ``'similarity'`` (mean correlation coefficient across channels),
+        ``'template_id'`` (index of the template in ``templates``),
+        ``'threshold'`` (the absolute threshold of the template) and
+        ``'channels'`` (number of channels used).
+
+    .. rubric:: Example
+
+    >>> from obspy import read, UTCDateTime
+    >>> st = read()
+    >>> st.filter("highpass", freq=1.0)  # doctest: +ELLIPSIS
+    <obspy.core.stream.Stream object at ...>
+    >>> t = UTCDateTime(2009, 8, 24, 0, 20, 7, 700000)
+    >>> template = st.slice(t, t + 2.5)
+    >>> detections = correlation_detector(st, [template])
+    >>> for detection in detections:
+    ...     print(detection["time"], round(detection["similarity"], 3))
+    2009-08-24T00:20:07.700000Z 1.0
+    """
+    # only send the channels needed by a batch of templates to the workers
+    batches = []
+    for i in range(0, len(templates), batch_size):
+        batch = templates[i:i + batch_size]
+        ids = set(tr.id for st_tmpl in batch for tr in st_tmpl)
+        stream_ = Stream([tr for tr in stream if tr.id in ids])
+        batches.append((stream_, batch, list(range(i, i + len(batch))),
+                        threshold, distance))
+    results = _parallel_map(_correlation_detector, batches, workers=workers,
+                            executor=executor)
+    detections = [detection for results_ in results for detection in results_]
+    detections.sort(key=lambda detection: (detection["time"],
+                                           detection["template_id"]))
+    return detections
+
+
 if __name__ == '__main__':
     import doctest
     doctest.testmod(exclude_empty=True)
@@ -46,7 +46,8 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multidimensional arrays are filtered along
+        the last axis.
     :param freqmin: Pass band low corner frequency.
     :param freqmax: Pass band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -75,7 +76,7 @@ def bandpass(data, freqmin, freqmax, df, corners=4, zerophase=False):
     sos = zpk2sos(z, p, k)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -90,7 +91,8 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multidimensional arrays are filtered along
+        the last axis.
     :param freqmin: Stop band low corner frequency.
     :param freqmax: Stop band high corner frequency.
     :param df: Sampling rate in Hz.
@@ -117,7 +119,7 @@ def bandstop(data, freqmin, freqmax, df, corners=4, zerophase=False):
     sos = zpk2sos(z, p, k)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -132,7 +134,8 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multidimensional arrays are filtered along
+        the last axis.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
@@ -154,7 +157,7 @@ def lowpass(data, freq, df, corners=4, zerophase=False):
     sos = zpk2sos(z, p, k)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -169,7 +172,8 @@ def highpass(data, freq, df, corners=4, zerophase=False):
     and :func:`scipy.signal.sosfilt` (for applying the filter).
 
     :type data: numpy.ndarray
-    :param data: Data to filter.
+    :param data: Data to filter. Multidimensional arrays are filtered along
+        the last axis.
     :param freq: Filter corner frequency.
     :param df: Sampling rate in Hz.
     :param corners: Filter corners / order.
@@ -189,7 +193,7 @@ def highpass(data, freq, df, corners=4, zerophase=False):
     sos = zpk2sos(z, p, k)
     if zerophase:
         firstpass = sosfilt(sos, data)
-        return sosfilt(sos, firstpass[::-1])[::-1]
+        return sosfilt(sos, firstpass[..., ::-1])[..., ::-1]
     else:
         return sosfilt(sos, data)
 
@@ -23,12 +23,15 @@ from future.builtins import *  # NOQA
 from future.utils import native_str
 
 import bisect
+import copy
 import glob
 import math
+import multiprocessing
 import os
 import warnings
 
 import numpy as np
+import scipy.sparse
 from matplotlib import mlab
 from matplotlib.colors import LinearSegmentedColormap
 from matplotlib.dates import date2num
@@ -39,6 +42,7 @@ from obspy.core import Stats
 from obspy.imaging.scripts.scan import compress_start_end
 from obspy.core.inventory import Inventory
 from obspy.core.util import get_matplotlib_version, AttribDict
+from obspy.core.util.misc import _parallel_map
 from obspy.imaging.cm import obspy_sequential
 from obspy.io.xseed import Parser
 from obspy.signal.invsim import cosine_taper
@@ -52,6 +56,9 @@ dtiny = np.finfo(0.0).tiny
 
 NOISE_MODEL_FILE = os.path.join(os.path.dirname(__file__),
                                 "data", "noise_models.npz")
+# maximum number of samples of all fft windows processed together in one
+# batch by PPSD (2 ** 23 samples, i.e. 64 MB of float64 data)
+PSD_BATCH_NPTS = 2 ** 23
 
 
 def fft_taper(data):
@@ -119,6 +126,64 @@ def welch_window(n):
     return taper
 
 
+def _psd_batch(data, nfft, sampling_rate, noverlap):
+    """
+    Compute the psd of multiple segments of data at once.
+
+    Vectorized equivalent of :func:`matplotlib.mlab.psd` with linear
+    detrending of every fft window, :func:`fft_taper` window and one-sided,
+    frequency scaled output (as used by :class:`PPSD`) applied to every
+    row of a 2-D array. All fft windows of all segments are set up as one
+    strided view on the data and transformed with a single fft call.
+
+    :type data: :class:`~numpy.ndarray`
+    :param data: 2-D array with one segment of data per row.
+    :type nfft: int
+    :param nfft: Number of samples of the fft windows.
+    :type sampling_rate: float
+    :param sampling_rate: Sampling rate of the data.
+    :type noverlap: int
+    :param noverlap: Number of samples of overlap of the fft windows.
+    :rtype: :class:`~numpy.ndarray`
+    :returns: 2-D array with the psd of every segment per row, including
+        the zero frequency.
+    """
+    data = np.require(data, dtype=np.float64, requirements=["C"])
+    num_segments, npts = data.shape
+    step = nfft - noverlap
+    num_windows = (npts - nfft) // step + 1
+    # view of all windows of all segments, no data is copied
+    windows = np.lib.stride_tricks.as_strided(
+        data, shape=(num_segments, num_windows, nfft),
+        strides=(data.strides[0], step * data.strides[1], data.strides[1]))
+    # linear detrend of every window, least squares fit of a line
+    x = np.arange(nfft, dtype=np.float64)
+    x -= x.mean()
+    slope = np.dot(windows, x) / np.dot(x, x)
+    result = windows - windows.mean(axis=-1)[..., np.newaxis]
+    result -= slope[..., np.newaxis] * x
+    # apply taper
+    taper = fft_taper(np.ones(nfft, dtype=np.float64))
+    result *= taper
+    result = np.fft.rfft(result, axis=-1)
+    result = result.real ** 2 + result.imag ** 2
+    # one-sided spectrum, only zero (and nyquist) frequency are not doubled
+    if nfft % 2:
+        result[..., 1:] *= 2.0
+    else:
+        result[..., 1:-1] *= 2.0
+    result /= sampling_rate * (taper ** 2).sum()
+    # average over all windows of every segment
+    return result.mean(axis=1)
+
+
+def _process_segments(ppsd, traces):
+    """
+    Process segments of data in a worker, see :meth:`PPSD._process_parallel`.
+    """
+    return ppsd._process_segments(traces)
+
+
 class PPSD(object):
     """
     Class to compile probabilistic power spectral densities for one combination
@@ -225,7 +290,8 @@ class PPSD(object):
     def __init__(self, stats, metadata, skip_on_gaps=False,
                  db_bins=(-200, -50, 1.), ppsd_length=3600.0, overlap=0.5,
                  special_handling=None, period_smoothing_width_octaves=1.0,
-                 period_step_octaves=0.125, period_limits=None, **kwargs):
+                 period_step_octaves=0.125, period_limits=None,
+                 response_cache=None, **kwargs):
         """
         Initialize the PPSD object setting all fixed information on the station
         that should not change afterwards to guarantee consistent spectral
@@ -307,11 +373,19 @@ class PPSD(object):
             specified period range, no more additional bins will be added after
             the bin whose center frequency exceeds the given upper end for the
             first time.
+        :type response_cache:
+            :class:`~obspy.core.inventory.response.ResponseCache`
+        :param response_cache: Cache of evaluated response spectra used with
+            :class:`~obspy.core.inventory.inventory.Inventory` metadata, e.g.
+            shared by PPSDs of many channels with identical responses. Worker
+            processes in parallel processing (see :meth:`PPSD.add`) use their
+            own copy of the cache.
         """
         # save things related to args
         self.id = "%(network)s.%(station)s.%(location)s.%(channel)s" % stats
         self.sampling_rate = stats.sampling_rate
         self.metadata = metadata
+        self.response_cache = response_cache
 
         # save things related to kwargs
         self.skip_on_gaps = skip_on_gaps
@@ -512,6 +586,7 @@ class PPSD(object):
         """
         Set up period binning.
         """
+        self._smoothing_matrix = None
         # we step through the period range at step width controlled by
         # period_step_octaves (default 1/8 octave)
         period_step_factor = 2 ** period_step_octaves
@@ -613,7 +688,7 @@ class PPSD(object):
             [[tr.stats.starttime.timestamp, tr.stats.endtime.timestamp]
              for tr in stream]
 
-    def __check_time_present(self, utcdatetime):
+    def __check_time_present(self, utcdatetime, times=None):
         """
         Checks if the given UTCDateTime is already part of the current PPSD
         instance. That is, checks if from utcdatetime to utcdatetime plus
@@ -621,10 +696,14 @@ class PPSD(object):
         Returns True if adding ppsd_length starting at the given time
         would result in an overlap of the ppsd data base, False if it is OK to
         insert this piece of data.
+
+        Optionally checks against the given sorted list of start times
+        instead of the processed times of the PPSD.
         """
-        index1 = bisect.bisect_left(self._times_processed,
-                                    utcdatetime.timestamp)
-        index2 = bisect.bisect_right(self._times_processed,
+        if times is None:
+            times = self._times_processed
+        index1 = bisect.bisect_left(times, utcdatetime.timestamp)
+        index2 = bisect.bisect_right(times,
                                      utcdatetime.timestamp + self.ppsd_length)
         if index1 != index2:
             return True
@@ -646,7 +725,7 @@ class PPSD(object):
         self._current_times_used = []
         self._current_times_all_details = []
 
-    def add(self, stream, verbose=False):
+    def add(self, stream, verbose=False, workers=None, executor=None):
         """
         Process all traces with compatible information and add their spectral
         estimates to the histogram containing the probabilistic psd.
@@ -656,8 +735,23 @@ class PPSD(object):
                 :class:`~obspy.core.trace.Trace`
         :param stream: Stream or trace with data that should be added to the
                 probabilistic psd histogram.
+        :type workers: int, optional
+        :param workers: Number of worker processes used to process the psd
+            segments in parallel. By default all segments are processed one
+            after the other in the current process.
+        :type executor: object, optional
+        :param executor: Alternatively to ``workers``, any already running
+            :class:`multiprocessing.pool.Pool` or
+            :class:`concurrent.futures.Executor` to process the psd segments
+            with, it is not shut down afterwards.
         :returns: True if appropriate data were found and the ppsd statistics
                 were changed, False otherwise.
+
+        .. note::
+
+            When processing in parallel, the PPSD (including its metadata) is
+            pickled and sent to the worker processes together with the data.
+            The results are identical to processing the segments serially.
         """
         if self.metadata is None:
             msg = ("PPSD instance has no metadata attached, which are needed "
@@ -677,6 +771,11 @@ class PPSD(object):
         self.__insert_gap_times(stream)
         # merge depending on skip_on_gaps set during __init__
         stream.merge(self.merge_method, fill_value=0)
+        parallel = executor is not None or (workers is not None and
+                                            workers > 1)
+        # segments to be processed and their start times
+        segments = []
+        times_pending = []
 
         for tr in stream:
             # the following check should not be necessary due to the select()..
@@ -687,7 +786,8 @@ class PPSD(object):
             t1 = tr.stats.starttime
             t2 = tr.stats.endtime
             while t1 + self.ppsd_length <= t2:
-                if self.__check_time_present(t1):
+                if self.__check_time_present(t1) or \
+                        self.__check_time_present(t1, times_pending):
                     msg = "Already covered time spans detected (e.g. %s), " + \
                           "skipping these slices."
                     msg = msg % t1
@@ -698,48 +798,83 @@ class PPSD(object):
                     slice = tr.slice(t1, t1 + self.ppsd_length)
                     # XXX not good, should be working in place somehow
                     # XXX how to do it with the padding, though?
-                    success = self.__process(slice)
-                    if success:
-                        if verbose:
-                            print(t1)
-                        changed = True
+                    segments.append(slice)
+                    bisect.insort(times_pending, t1.timestamp)
                 t1 += (1 - self.overlap) * self.ppsd_length  # advance
 
             # enforce time limits, pad zeros if gaps
             # tr.trim(t, t+PPSD_LENGTH, pad=True)
+        if parallel and segments:
+            results = self._process_parallel(segments, workers=workers,
+                                             executor=executor)
+        else:
+            results = self.__process(segments)
+        for t, spectrum in results:
+            self.__insert_processed_data(UTCDateTime(t), spectrum)
+            if verbose:
+                print(UTCDateTime(t))
+            changed = True
         if changed:
             self.__invalidate_histogram()
         return changed
 
-    def __process(self, tr):
+    def __process(self, traces):
+        """
+        Processes segments of data and returns the psd information.
+        Whether the `Trace` objects are compatible (station, channel, ...)
+        has to checked beforehand.
+
+        Segments are processed in batches, computing the psds of all
+        segments in a batch at once (see :func:`_psd_batch`) and evaluating
+        the instrument response only once for all segments with the same
+        response.
+
+        :type traces: list of :class:`~obspy.core.trace.Trace`
+        :param traces: Compatible Traces with data of one PPSD segment each
+        :returns: List of tuples of start time (as POSIX timestamp) and
+            binned psd of all successfully processed segments.
         """
-        Processes a segment of data and save the psd information.
-        Whether `Trace` is compatible (station, channel, ...) has to
-        checked beforehand.
+        segments = []
+        for tr in traces:
+            # XXX DIRTY HACK!!
+            if len(tr) == self.len + 1:
+                tr.data = tr.data[:-1]
+            # one last check..
+            if len(tr) != self.len:
+                msg = "Got a piece of data with wrong length. Skipping"
+                warnings.warn(msg)
+                print(len(tr), self.len)
+                continue
+            segments.append(tr)
+        # number of segments processed together, limits memory usage
+        num_windows = (self.len - self.nfft) // (self.nfft - self.nlap) + 1
+        batch_size = max(1, PSD_BATCH_NPTS // (num_windows * self.nfft))
+        results = []
+        responses = {}
+        for i in range(0, len(segments), batch_size):
+            batch = segments[i:i + batch_size]
+            results.extend(self.__process_batch(batch, responses))
+        return results
+
+    def __process_batch(self, traces, responses):
+        """
+        Processes a batch of segments of data with correct length, see
+        :meth:`PPSD.__process`.
 
-        :type tr: :class:`~obspy.core.trace.Trace`
-        :param tr: Compatible Trace with data of one PPSD segment
-        :returns: `True` if segment was successfully processed,
-            `False` otherwise.
+        :type responses: dict
+        :param responses: Already evaluated responses, see
+            :meth:`PPSD._get_response_key`. Updated in place.
         """
-        # XXX DIRTY HACK!!
-        if len(tr) == self.len + 1:
-            tr.data = tr.data[:-1]
-        # one last check..
-        if len(tr) != self.len:
-            msg = "Got a piece of data with wrong length. Skipping"
-            warnings.warn(msg)
-            print(len(tr), self.len)
-            return False
-        # being paranoid, only necessary if in-place operations would follow
-        tr.data = tr.data.astype(np.float64)
-        # if trace has a masked array we fill in zeros
-        try:
-            tr.data[tr.data.mask] = 0.0
-        # if it is no masked array, we get an AttributeError
-        # and have nothing to do
-        except AttributeError:
-            pass
+        data = np.empty((len(traces), self.len), dtype=np.float64)
+        for tr, data_ in zip(traces, data):
+            data_[:] = tr.data
+            # if trace has a masked array we fill in zeros
+            try:
+                data_[tr.data.mask] = 0.0
+            # if it is no masked array, we get an AttributeError
+            # and have nothing to do
+            except AttributeError:
+                pass
 
         # restitution:
         # mcnamara apply the correction at the end in freq-domain,
@@ -748,50 +883,53 @@ class PPSD(object):
         # Yes, you should avoid removing the response until after you
         # have estimated the spectra to avoid elevated lp noise
 
-        spec, _freq = mlab.psd(tr.data, self.nfft, self.sampling_rate,
-                               detrend=mlab.detrend_linear, window=fft_taper,
-                               noverlap=self.nlap, sides='onesided',
-                               scale_by_freq=True)
+        spec = _psd_batch(data, self.nfft, self.sampling_rate, self.nlap)
+        del data
 
         # leave out first entry (offset)
-        spec = spec[1:]
-
         # working with the periods not frequencies later so reverse spectrum
-        spec = spec[::-1]
+        spec = spec[:, :0:-1]
 
         # Here we remove the response using the same conventions
         # since the power is squared we want to square the sensitivity
         # we can also convert to acceleration if we have non-rotational data
+        valid = np.ones(len(traces), dtype=np.bool_)
         if self.special_handling == "ringlaser":
             # in case of rotational data just remove sensitivity
             spec /= self.metadata['sensitivity'] ** 2
         # special_handling "hydrophone" does instrument correction same as
         # "normal" data
         else:
-            # determine instrument response from metadata
-            try:
-                resp = self._get_response(tr)
-            except Exception as e:
-                msg = ("Error getting response from provided metadata:\n"
-                       "%s: %s\n"
-                       "Skipping time segment(s).")
-                msg = msg % (e.__class__.__name__, str(e))
-                warnings.warn(msg)
-                return False
-
-            resp = resp[1:]
-            resp = resp[::-1]
-            # Now get the amplitude response (squared)
-            respamp = np.absolute(resp * np.conjugate(resp))
             # Make omega with the same conventions as spec
-            w = 2.0 * math.pi * _freq[1:]
+            _freq = np.fft.fftfreq(self.nfft, 1.0 / self.sampling_rate)
+            w = 2.0 * math.pi * _freq[1:self.nfft // 2 + 1]
             w = w[::-1]
-            # Here we do the response removal
-            # Do not differentiate when `special_handling="hydrophone"`
-            if self.special_handling == "hydrophone":
-                spec = spec / respamp
-            else:
-                spec = (w ** 2) * spec / respamp
+            for i, tr in enumerate(traces):
+                # determine instrument response from metadata, only once
+                # for all segments with the same response
+                try:
+                    key = self._get_response_key(tr)
+                    if key not in responses:
+                        resp = self._get_response(tr)
+                        resp = resp[1:]
+                        resp = resp[::-1]
+                        # Now get the amplitude response (squared)
+                        respamp = np.absolute(resp * np.conjugate(resp))
+                        # Do not differentiate when
+                        # `special_handling="hydrophone"`
+                        if self.special_handling != "hydrophone":
+                            respamp /= w ** 2
+                        responses[key] = respamp
+                except Exception as e:
+                    msg = ("Error getting response from provided metadata:\n"
+                           "%s: %s\n"
+                           "Skipping time segment(s).")
+                    msg = msg % (e.__class__.__name__, str(e))
+                    warnings.warn(msg)
+                    valid[i] = False
+                    continue
+                # Here we do the response removal
+                spec[i] /= responses[key]
         # avoid calculating log of zero
         idx = spec < dtiny
         spec[idx] = dtiny
@@ -800,16 +938,103 @@ class PPSD(object):
         spec = np.log10(spec)
         spec *= 10
 
-        smoothed_psd = []
-        # do this for the whole period range and append the values to our lists
-        for per_left, per_right in zip(self.period_bin_left_edges,
-                                       self.period_bin_right_edges):
-            specs = spec[(per_left <= self.psd_periods) &
-                         (self.psd_periods <= per_right)]
-            smoothed_psd.append(specs.mean())
-        smoothed_psd = np.array(smoothed_psd, dtype=np.float32)
-        self.__insert_processed_data(tr.stats.starttime, smoothed_psd)
-        return True
+        # smoothing over all period bins at once, as a product with a sparse
+        # matrix averaging all psd values in each period bin
+        smoothed_psds = self._get_smoothing_matrix().dot(spec.T).T
+        smoothed_psds = smoothed_psds.astype(np.float32)
+        # no psd values in period bin
+        smoothed_psds[:, self._get_smoothing_matrix().getnnz(axis=1) == 0] = \
+            np.nan
+        return [(tr.stats.starttime.timestamp, smoothed_psd)
+                for tr, smoothed_psd, valid_ in zip(
+                    traces, smoothed_psds, valid) if valid_]
+
+    def _get_response_key(self, tr):
+        """
+        Key identifying the response for the given segment of data, used to
+        evaluate the response only once for all segments with the same
+        response.
+        """
+        # single response for all times
+        if isinstance(self.metadata, dict):
+            return None
+        # look up response object for given time
+        elif isinstance(self.metadata, Inventory):
+            return id(self.metadata.get_response(self.id,
+                                                 tr.stats.starttime))
+        # evaluate response for every segment
+        return tr.stats.starttime.timestamp
+
+    def _get_smoothing_matrix(self):
+        """
+        Sparse matrix to average the psd values (ordered by period) in every
+        period bin.
+
+        :rtype: :class:`scipy.sparse.csr_matrix`
+        :returns: Matrix of shape (number of period bins, number of psd
+            periods).
+        """
+        if getattr(self, "_smoothing_matrix", None) is None:
+            rows = []
+            columns = []
+            weights = []
+            for i, (per_left, per_right) in enumerate(zip(
+                    self.period_bin_left_edges, self.period_bin_right_edges)):
+                columns_ = np.flatnonzero((per_left <= self.psd_periods) &
+                                          (self.psd_periods <= per_right))
+                rows.append(np.full(len(columns_), i, dtype=np.int64))
+                columns.append(columns_)
+                weights.append(np.full(len(columns_), 1.0 / max(
+                    len(columns_), 1)))
+            shape = (len(self.period_bin_left_edges), len(self.psd_periods))
+            self._smoothing_matrix = scipy.sparse.csr_matrix(
+                (np.concatenate(weights),
+                 (np.concatenate(rows), np.concatenate(columns))),
+                shape=shape)
+        return self._smoothing_matrix
+
+    def _process_segments(self, traces):
+        """
+        Process the given segments of data and return the start times and
+        binned psds of all successfully processed segments.
+
+        Used by workers for :meth:`PPSD.add` in parallel mode, the PPSD
+        itself is not modified.
+        """
+        return self.__process(traces)
+
+    def _empty_copy(self):
+        """
+        Return a copy of the PPSD with the same settings and metadata but
+        without any processed data.
+        """
+        ppsd = copy.copy(self)
+        ppsd._times_processed = []
+        ppsd._times_data = []
+        ppsd._times_gaps = []
+        ppsd._binned_psds = []
+        ppsd.__invalidate_histogram()
+        return ppsd
+
+    def _process_parallel(self, traces, workers=None, executor=None):
+        """
+        Process segments of data in parallel, see :meth:`PPSD.add` and
+        :func:`~obspy.core.util.misc._parallel_map`.
+
+        :returns: List of tuples of start time (as POSIX timestamp) and
+            binned psd of all successfully processed segments, in order of
+            the given segments.
+        """
+        # split into a few chunks per worker, every chunk is sent to the
+        # worker together with an empty copy of the PPSD
+        chunks = (workers or multiprocessing.cpu_count()) * 4
+        chunk_size = max(1, int(math.ceil(len(traces) / float(chunks))))
+        ppsd = self._empty_copy()
+        arguments = [(ppsd, traces[i:i + chunk_size])
+                     for i in range(0, len(traces), chunk_size)]
+        results = _parallel_map(_process_segments, arguments,
+                                workers=workers, executor=executor)
+        return [result for results_ in results for result in results_]
 
     def _get_times_all_details(self):
         # check if we can reuse a previously cached array of all times as
@@ -1076,8 +1301,12 @@ class PPSD(object):
     def _get_response_from_inventory(self, tr):
         inventory = self.metadata
         response = inventory.get_response(self.id, tr.stats.starttime)
-        resp, _ = response.get_evalresp_response(
-            t_samp=self.delta, nfft=self.nfft, output="VEL")
+        if self.response_cache is not None:
+            resp, _ = self.response_cache.get_evalresp_response(
+                response, t_samp=self.delta, nfft=self.nfft, output="VEL")
+        else:
+            resp, _ = response.get_evalresp_response(
+                t_samp=self.delta, nfft=self.nfft, output="VEL")
         return resp
 
     def _get_response_from_parser(self, tr):
@@ -1265,20 +1494,92 @@ class PPSD(object):
         _times_processed = [d_ for d_ in data["_times_processed"]]
         _binned_psds = [d_ for d_ in data["_binned_psds"]]
         # add new data
-        self._times_data.extend(_times_data)
-        self._times_gaps.extend(_times_gaps)
+        duplicates = self._add_processed_data(
+            _times_data, _times_gaps, _times_processed, _binned_psds)
+        # warn if some segments were omitted
+        if duplicates:
+            msg = ("%d/%d segments omitted in file '%s' "
+                   "(time ranges already covered).")
+            msg = msg % (duplicates, len(_times_processed), filename)
+            warnings.warn(msg)
+
+    def _add_processed_data(self, times_data, times_gaps, times_processed,
+                            binned_psds):
+        """
+        Add processed data of another PPSD with the same settings, skipping
+        segments with time ranges already covered.
+
+        :returns: Number of omitted segments.
+        """
+        self._times_data.extend(times_data)
+        self._times_gaps.extend(times_gaps)
         duplicates = 0
-        for t, psd in zip(_times_processed, _binned_psds):
+        for t, psd in zip(times_processed, binned_psds):
             t = UTCDateTime(t)
             if self.__check_time_present(t):
                 duplicates += 1
                 continue
             self.__insert_processed_data(t, psd)
+        if len(times_processed) > duplicates:
+            self.__invalidate_histogram()
+        return duplicates
+
+    def merge(self, other):
+        """
+        Add the processed data of another PPSD to the current PPSD instance.
+
+        Both PPSDs have to be set up with the same settings, e.g. to combine
+        PPSDs that were computed for different time spans of the same
+        station in separate processes. Segments with time ranges already
+        covered by the current PPSD are omitted with a warning (using the
+        same check as :meth:`PPSD.add`), so PPSDs should be merged in
+        chronological order.
+
+        :type other: :class:`PPSD`
+        :param other: PPSD with processed data to add to current PPSD.
+
+        .. rubric:: Example
+
+        >>> from obspy import read
+        >>> from obspy.signal import PPSD
+        >>> st = read()
+        >>> paz = {'gain': 60077000.0,
+        ...        'poles': [-0.037004+0.037016j, -0.037004-0.037016j,
+        ...                  -251.33+0j, -131.04-467.29j, -131.04+467.29j],
+        ...        'sensitivity': 2516778400.0,
+        ...        'zeros': [0j, 0j]}
+        >>> tr = st.select(channel="EHZ")[0]
+        >>> ppsd1 = PPSD(tr.stats, paz, ppsd_length=10)
+        >>> ppsd1.add(tr.slice(endtime=tr.stats.starttime + 15))
+        True
+        >>> ppsd2 = PPSD(tr.stats, paz, ppsd_length=10)
+        >>> ppsd2.add(tr.slice(starttime=tr.stats.starttime + 15))
+        True
+        >>> ppsd1.merge(ppsd2)
+        >>> print(len(ppsd1.times_processed))
+        3
+        """
+        for key in self.NPZ_STORE_KEYS_SIMPLE_TYPES:
+            if getattr(self, key) != getattr(other, key):
+                msg = ("Mismatch in '%s' attribute.\n\tCurrent:\n\t%s\n\t"
+                       "Other:\n\t%s")
+                msg = msg % (key, getattr(self, key), getattr(other, key))
+                raise AssertionError(msg)
+        for key in self.NPZ_STORE_KEYS_ARRAY_TYPES:
+            try:
+                np.testing.assert_array_equal(getattr(self, key),
+                                              getattr(other, key))
+            except AssertionError as e:
+                msg = ("Mismatch in '%s' attribute.\n") % key
+                raise AssertionError(msg + str(e))
+        duplicates = self._add_processed_data(
+            other._times_data, other._times_gaps, other._times_processed,
+            other._binned_psds)
         # warn if some segments were omitted
         if duplicates:
-            msg = ("%d/%d segments omitted in file '%s' "
+            msg = ("%d/%d segments of other PPSD omitted "
                    "(time ranges already covered).")
-            msg = msg % (duplicates, len(_times_processed), filename)
+            msg = msg % (duplicates, len(other._times_processed))
             warnings.warn(msg)
 
     def plot(self, filename=None, show_coverage=True, show_histogram=True,
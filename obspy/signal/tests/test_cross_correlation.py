@@ -8,10 +8,15 @@ from future.builtins import *  # NOQA
 
 import os
 import unittest
+import warnings
 
-from obspy import UTCDateTime, read
+import numpy as np
+
+from obspy import Stream, Trace, UTCDateTime, read
 from obspy.core.util.testing import ImageComparison
-from obspy.signal.cross_correlation import xcorr_pick_correction
+from obspy.signal.cross_correlation import (correlate, correlate_template,
+                                            correlation_detector, xcorr,
+                                            xcorr_max, xcorr_pick_correction)
 
 
 class CrossCorrelationTestCase(unittest.TestCase):
@@ -73,6 +78,201 @@ class CrossCorrelationTestCase(unittest.TestCase):
             dt, coeff = xcorr_pick_correction(
                 t1, tr1, t2, tr2, 0.05, 0.2, 0.1, plot=True, filename=ic.name)
 
+    def test_correlate(self):
+        """
+        Compare the frequency domain correlation against numpy for all modes,
+        with and without demeaning and normalization.
+        """
+        np.random.seed(42)
+        a = np.random.randn(500) + 3.0
+        b = np.random.randn(200) - 1.0
+        for demean in (True, False):
+            a_ = a - a.mean() if demean else a
+            b_ = b - b.mean() if demean else b
+            norm = np.sqrt((a_ ** 2).sum() * (b_ ** 2).sum())
+            for mode in ("full", "same", "valid"):
+                expected = np.correlate(a_, b_, "full")
+                # numpy's 'same' returns max(len(a), len(b)) values and
+                # 'valid' is symmetric, so cut the full correlation here
+                if mode == "same":
+                    start = (len(expected) - len(a)) // 2
+                    expected = expected[start:start + len(a)]
+                elif mode == "valid":
+                    expected = np.correlate(a_, b_, "valid")
+                cc = correlate(a, b, mode=mode, demean=demean,
+                               normalize=False)
+                np.testing.assert_allclose(cc, expected, atol=1e-8)
+                cc = correlate(a, b, mode=mode, demean=demean)
+                np.testing.assert_allclose(cc, expected / norm, atol=1e-10)
+        # swapped signals give the reversed correlation
+        np.testing.assert_allclose(correlate(a, b)[::-1], correlate(b, a),
+                                   atol=1e-10)
+        # zero energy and invalid mode
+        np.testing.assert_array_equal(correlate(np.ones(10), a, 5),
+                                      np.zeros(11))
+        self.assertRaises(ValueError, correlate, a, b, mode="spam")
+        self.assertRaises(ValueError, correlate, a, np.ones((2, 2, 2)))
+
+    def test_correlate_shift(self):
+        """
+        The shift convention has to be the same as for xcorr, also for large
+        shifts beyond the signal lengths.
+        """
+        np.random.seed(42)
+        a = np.random.randn(1000)
+        for lag in (-30, 0, 17):
+            b = np.roll(a, lag)
+            shift, _ = xcorr(a.astype(np.float32), b.astype(np.float32), 100)
+            cc = correlate(a, b, 100)
+            self.assertEqual(len(cc), 201)
+            self.assertEqual(xcorr_max(cc)[0], shift)
+            self.assertEqual(shift, -lag)
+        # signals of different length are aligned at their middle samples
+        cc = correlate(a, a[400:600], 50)
+        self.assertEqual(xcorr_max(cc)[0], 0.0)
+        # lags without overlap are zero, the 29 lags of the full correlation
+        # are centered around the aligned middle samples (shift -5)
+        cc = correlate(a[:10], a[:20], 50)
+        self.assertEqual(len(cc), 101)
+        np.testing.assert_array_equal(cc[:36], 0.0)
+        np.testing.assert_array_equal(cc[65:], 0.0)
+        np.testing.assert_allclose(
+            cc[36:65], correlate(a[:10], a[:20], mode="full"), atol=1e-12)
+
+    def test_correlate_2d(self):
+        """
+        Rows of 2-D input are correlated pairwise or against a 1-D signal.
+        """
+        np.random.seed(42)
+        a = np.random.randn(3, 300)
+        b = np.random.randn(3, 250)
+        cc = correlate(a, b, 20)
+        self.assertEqual(cc.shape, (3, 41))
+        for i in range(3):
+            np.testing.assert_allclose(cc[i], correlate(a[i], b[i], 20),
+                                       atol=1e-12)
+        cc = correlate(a[0], b, mode="valid")
+        self.assertEqual(cc.shape, (3, 51))
+        for i in range(3):
+            np.testing.assert_allclose(
+                cc[i], correlate(a[0], b[i], mode="valid"), atol=1e-12)
+
+    def test_correlate_template(self):
+        """
+        Compare the sliding window normalization against a loop over all
+        windows.
+        """
+        np.random.seed(42)
+        data = np.random.randn(400) * 1000.0 + 50.0
+        data[200:230] = 0.0
+        template = np.random.randn(20) + 2.0
+        cc = correlate_template(data, template)
+        self.assertEqual(len(cc), 381)
+        t = template - template.mean()
+        for i in range(len(cc)):
+            window = data[i:i + 20] - data[i:i + 20].mean()
+            expected = (window * t).sum() / np.sqrt(
+                (window ** 2).sum() * (t ** 2).sum())
+            if np.all(data[i:i + 20] == 0):
+                expected = 0.0
+            self.assertAlmostEqual(cc[i], expected, 6)
+        # zero padded modes
+        full = correlate_template(data, template, mode="full")
+        same = correlate_template(data, template, mode="same")
+        self.assertEqual(len(full), 419)
+        self.assertEqual(len(same), 400)
+        np.testing.assert_allclose(full[19:-19], cc)
+        np.testing.assert_allclose(same[10:-9], cc)
+        self.assertTrue(np.all(np.abs(full) <= 1.0 + 1e-10))
+        # 2-D data against one template
+        cc = correlate_template(np.array([data, data[::-1]]), template)
+        np.testing.assert_allclose(cc[1], correlate_template(data[::-1],
+                                                             template))
+        # an exact copy of the template is found with a coefficient of 1
+        cc = correlate_template(data, 2.0 * data[100:150] + 7.0)
+        self.assertEqual(np.argmax(cc), 100)
+        self.assertAlmostEqual(cc.max(), 1.0, 10)
+        self.assertRaises(ValueError, correlate_template, template, data)
+        self.assertRaises(ValueError, correlate_template, data, template,
+                          normalize="spam")
+
+    def _synthetic_network(self):
+        """
+        Return noise on three channels with two events of different
+        waveforms and moveouts, and templates of both events.
+        """
+        np.random.seed(42)
+        starttime = UTCDateTime(2017, 1, 1)
+        sampling_rate = 50.0
+        stream = Stream()
+        templates = [Stream(), Stream()]
+        wavelets = [np.random.randn(3, 100), np.random.randn(3, 100)]
+        # event times (in samples) and moveouts of the channels
+        events = [(1000, 0), (6000, 0), (9000, 1)]
+        moveouts = [[0, 40, 75], [30, 0, 10]]
+        for i, station in enumerate(("A", "B", "C")):
+            data = np.random.randn(12000) * 0.5
+            for onset, template_id in events:
+                j = onset + moveouts[template_id][i]
+                data[j:j + 100] += wavelets[template_id][i] * 3.0
+            header = {"station": station, "sampling_rate": sampling_rate,
+                      "starttime": starttime}
+            stream.append(Trace(data=data, header=header))
+            for template_id, template in enumerate(templates):
+                tr = Trace(data=wavelets[template_id][i].copy(),
+                           header=dict(header))
+                tr.stats.starttime += (
+                    20000 + moveouts[template_id][i]) / sampling_rate
+                template.append(tr)
+        times = [starttime + onset / sampling_rate for onset, _ in events]
+        return stream, templates, times
+
+    def test_correlation_detector(self):
+        """
+        Detect events with moveouts using several templates.
+        """
+        stream, templates, times = self._synthetic_network()
+        detections = correlation_detector(stream, templates)
+        self.assertEqual(len(detections), 3)
+        for detection, time, template_id in zip(detections, times,
+                                                (0, 0, 1)):
+            self.assertEqual(detection["time"], time)
+            self.assertEqual(detection["template_id"], template_id)
+            self.assertEqual(detection["channels"], 3)
+            self.assertGreater(detection["similarity"], 0.9)
+            self.assertGreater(detection["similarity"],
+                               detection["threshold"])
+        # same results when processing batches of templates in parallel
+        for kwargs in ({"batch_size": 1}, {"batch_size": 1, "workers": 2}):
+            self.assertEqual(
+                correlation_detector(stream, templates, **kwargs),
+                detections)
+        # a high threshold removes all detections
+        self.assertEqual(
+            correlation_detector(stream, templates, threshold=1e3), [])
+
+    def test_correlation_detector_missing_channels(self):
+        """
+        Channels missing in the data are skipped with a warning.
+        """
+        stream, templates, times = self._synthetic_network()
+        stream.remove(stream.select(station="C")[0])
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter("always")
+            detections = correlation_detector(stream, templates[:1])
+        self.assertEqual(len(w), 1)
+        self.assertIn("not present in stream", str(w[0].message))
+        self.assertEqual([d["time"] for d in detections], times[:2])
+        self.assertEqual(detections[0]["channels"], 2)
+        # incompatible sampling rates and unmerged data
+        stream[0].stats.sampling_rate = 100.0
+        self.assertRaises(ValueError, correlation_detector, stream,
+                          templates)
+        stream[0].stats.sampling_rate = 50.0
+        stream.append(stream[0].copy())
+        self.assertRaises(ValueError, correlation_detector, stream,
+                          templates)
+
 
 def suite():
     return unittest.makeSuite(CrossCorrelationTestCase, 'test')
@@ -10,6 +10,7 @@ import unittest
 import numpy as np
 
 from obspy import Stream, Trace, UTCDateTime
+from obspy.core.compatibility import mock
 from obspy.core.util import AttribDict
 from obspy.signal.array_analysis import (array_processing,
                                          array_transff_freqslowness,
@@ -22,7 +23,7 @@ class SonicTestCase(unittest.TestCase):
     Test fk analysis, main function is sonic() in array_analysis.py
     """
 
-    def array_processing(self, prewhiten, method):
+    def array_processing(self, prewhiten, method, **extra_kwargs):
         np.random.seed(2348)
 
         geometry = np.array([[0.0, 0.0, 0.0],
@@ -90,6 +91,7 @@ class SonicTestCase(unittest.TestCase):
                 semb_thres, vel_thres, frqlow, frqhigh, stime, etime)
         kwargs = dict(prewhiten=prewhiten, coordsys='xy', verbose=False,
                       method=method)
+        kwargs.update(extra_kwargs)
         out = array_processing(*args, **kwargs)
         if False:  # 1 for debugging
             print('\n', out[:, 1:])
@@ -149,6 +151,67 @@ class SonicTestCase(unittest.TestCase):
         # XXX relative tolerance should be lower!
         self.assertTrue(np.allclose(ref, out[:, 1:], rtol=4e-5))
 
+    def test_array_processing_blocks(self):
+        """
+        Block size, parallel workers and the store callback must not change
+        the result of array_processing().
+        """
+        for method in (0, 1):
+            for prewhiten in (0, 1):
+                expected = self.array_processing(prewhiten=prewhiten,
+                                                 method=method)
+                stored = []
+
+                def store(pow_map, apow_map, offset):
+                    stored.append((offset, apow_map.shape))
+
+                out = self.array_processing(prewhiten=prewhiten,
+                                            method=method, block_size=1,
+                                            store=store)
+                np.testing.assert_allclose(out, expected, rtol=1e-10)
+                # one call per window, in order, with the window offset
+                self.assertEqual([s[0] for s in stored],
+                                 list(range(0, 40 * len(expected), 40)))
+                self.assertTrue(all(s[1] == (61, 61) for s in stored))
+                out = self.array_processing(prewhiten=prewhiten,
+                                            method=method, block_size=2,
+                                            workers=2)
+                np.testing.assert_allclose(out, expected, rtol=1e-10)
+
+    def test_array_processing_bounded_blocks(self):
+        """
+        Blocks of windows are handed out to an executor only a few at a time
+        instead of all at once.
+        """
+        class Future(object):
+            def __init__(self, func, args):
+                self.func, self.args = func, args
+
+            def result(self):
+                return self.func(*self.args)
+
+        class Executor(object):
+            submitted = 0
+
+            def submit(self, func, *args):
+                self.submitted += 1
+                return Future(func, args)
+
+        executor = Executor()
+        in_flight = []
+
+        def store(pow_map, apow_map, offset):
+            in_flight.append(executor.submitted - len(in_flight))
+
+        expected = self.array_processing(prewhiten=0, method=0)
+        with mock.patch("multiprocessing.cpu_count", return_value=1):
+            out = self.array_processing(prewhiten=0, method=0, block_size=1,
+                                        executor=executor, store=store)
+        np.testing.assert_allclose(out, expected, rtol=1e-10)
+        self.assertEqual(executor.submitted, len(expected))
+        self.assertEqual(len(in_flight), len(expected))
+        self.assertLessEqual(max(in_flight), 2)
+
     def test_get_spoint(self):
         stime = UTCDateTime(1970, 1, 1, 0, 0)
         etime = UTCDateTime(1970, 1, 1, 0, 0) + 10
@@ -13,16 +13,19 @@ import os
 import unittest
 import warnings
 from copy import deepcopy
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
 from obspy import Stream, Trace, UTCDateTime, read, read_inventory
 from obspy.core import Stats
+from obspy.core.inventory import ResponseCache
 from obspy.core.util.base import NamedTemporaryFile
 from obspy.core.util.testing import (
     ImageComparison, ImageComparisonException, MATPLOTLIB_VERSION)
 from obspy.io.xseed import Parser
-from obspy.signal.spectral_estimation import (PPSD, welch_taper, welch_window)
+from obspy.signal.spectral_estimation import (PPSD, welch_taper, welch_window,
+                                              fft_taper, _psd_batch)
 
 
 PATH = os.path.join(os.path.dirname(__file__), 'data')
@@ -162,6 +165,25 @@ class PsdTestCase(unittest.TestCase):
             window_obspy = welch_window(N)
             np.testing.assert_array_almost_equal(window_pitsa, window_obspy)
 
+    def test_psd_batch(self):
+        """
+        Test that the vectorized psd computation for multiple segments used by
+        PPSD gives the same results as matplotlib's psd for every segment.
+        """
+        from matplotlib import mlab
+        np.random.seed(815)
+        data = np.random.randn(3, 20000)
+        # even and odd fft length
+        for nfft, noverlap in ((4096, 3072), (1001, 750)):
+            got = _psd_batch(data, nfft, 20.0, noverlap)
+            self.assertEqual(got.shape, (3, nfft // 2 + 1))
+            for data_, got_ in zip(data, got):
+                expected, _ = mlab.psd(
+                    data_, nfft, 20.0, detrend=mlab.detrend_linear,
+                    window=fft_taper, noverlap=noverlap, sides='onesided',
+                    scale_by_freq=True)
+                np.testing.assert_allclose(got_, expected, rtol=1e-10)
+
     def test_ppsd(self):
         """
         Test PPSD routine with some real data.
@@ -352,6 +374,28 @@ class PsdTestCase(unittest.TestCase):
                 self.assertEqual(getattr(ppsd, key),
                                  getattr(results_full, key))
 
+    def test_ppsd_response_cache(self):
+        """
+        Test PPSD with a cache of response spectra, results have to be the
+        same as without.
+        """
+        st = read(os.path.join(self.path, 'IUANMO.seed'))
+        inv = read_inventory(os.path.join(self.path, 'IUANMO.xml'))
+        expected = PPSD(st[0].stats, inv)
+        expected.add(st)
+        cache = ResponseCache()
+        # PPSDs sharing a cache
+        for _ in range(2):
+            ppsd = PPSD(st[0].stats, inv, response_cache=cache)
+            ppsd.add(st)
+            np.testing.assert_array_equal(ppsd._times_processed,
+                                          expected._times_processed)
+            np.testing.assert_array_equal(ppsd._binned_psds,
+                                          expected._binned_psds)
+        # response only evaluated once for both PPSDs
+        self.assertEqual(cache.statistics["misses"], 1)
+        self.assertEqual(cache.statistics["hits"], 1)
+
     def test_ppsd_save_and_load_npz(self):
         """
         Test PPSD.load_npz() and PPSD.save_npz()
@@ -538,6 +582,73 @@ class PsdTestCase(unittest.TestCase):
             np.testing.assert_array_equal(_times_processed,
                                           ppsd._times_processed)
 
+    def test_ppsd_add_parallel(self):
+        """
+        Test processing the psd segments in parallel, results have to be the
+        same as with serial processing.
+        """
+        tr, paz = _get_sample_data()
+        st = Stream([tr])
+        expected = _get_ppsd()
+        # process pool
+        ppsd = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        self.assertTrue(ppsd.add(st, workers=2))
+        np.testing.assert_array_equal(ppsd._times_processed,
+                                      expected._times_processed)
+        np.testing.assert_array_equal(ppsd._binned_psds,
+                                      expected._binned_psds)
+        # any executor with a map() method
+        ppsd = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        pool = ThreadPool(3)
+        try:
+            self.assertTrue(ppsd.add(st, executor=pool))
+            # data already present is skipped
+            with warnings.catch_warnings(record=True):
+                warnings.simplefilter('always')
+                self.assertFalse(ppsd.add(st, executor=pool))
+        finally:
+            pool.close()
+        np.testing.assert_array_equal(ppsd._times_processed,
+                                      expected._times_processed)
+        np.testing.assert_array_equal(ppsd._binned_psds,
+                                      expected._binned_psds)
+
+    def test_ppsd_merge(self):
+        """
+        Test merging PPSDs computed on different parts of the data.
+        """
+        tr, paz = _get_sample_data()
+        expected = _get_ppsd()
+        t = tr.stats.starttime + 1.5 * 3600
+        ppsd1 = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        ppsd1.add(tr.slice(endtime=t))
+        ppsd2 = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5))
+        ppsd2.add(tr.slice(starttime=t - 1800))
+        self.assertEqual(len(ppsd1._times_processed), 2)
+        self.assertEqual(len(ppsd2._times_processed), 2)
+        ppsd = deepcopy(ppsd1)
+        ppsd.merge(ppsd2)
+        np.testing.assert_array_equal(ppsd._times_processed,
+                                      expected._times_processed)
+        np.testing.assert_array_equal(ppsd._binned_psds,
+                                      expected._binned_psds)
+        np.testing.assert_array_equal(ppsd.current_histogram,
+                                      expected.current_histogram)
+        # merging again only emits a warning
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            ppsd.merge(ppsd2)
+        self.assertEqual(len(w), 1)
+        self.assertIn('2/2 segments', str(w[0].message))
+        np.testing.assert_array_equal(ppsd._times_processed,
+                                      expected._times_processed)
+        # PPSDs with different settings can not be merged
+        ppsd3 = PPSD(tr.stats, paz, db_bins=(-200, -50, 0.5),
+                     ppsd_length=1800)
+        self.assertRaises(AssertionError, ppsd1.merge, ppsd3)
+        ppsd3 = PPSD(tr.stats, paz, db_bins=(-200, -50, 1.0))
+        self.assertRaises(AssertionError, ppsd1.merge, ppsd3)
+
     def test_issue1216(self):
         tr, paz = _get_sample_data()
         st = Stream([tr])
@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, print_function,
 from future.builtins import *  # NOQA
 
 import gzip
+import heapq
 import os
 import unittest
 import warnings
@@ -14,13 +15,45 @@ from ctypes import ArgumentError
 
 import numpy as np
 
-from obspy import Stream, UTCDateTime, read
+from obspy import Stream, Trace, UTCDateTime, read
 from obspy.signal.trigger import (
-    ar_pick, classic_sta_lta, classic_sta_lta_py, coincidence_trigger, pk_baer,
-    recursive_sta_lta, recursive_sta_lta_py, trigger_onset)
+    ar_pick, classic_sta_lta, classic_sta_lta_py, coincidence_sweep,
+    coincidence_trigger, delayed_sta_lta, pk_baer, recursive_sta_lta,
+    recursive_sta_lta_py, trigger_onset, z_detect)
 from obspy.signal.util import clibsignal
 
 
+def _coincidence_reference(triggers, trace_ids, thr_coincidence_sum,
+                           trigger_off_extension=0):
+    """
+    Reference implementation of the coincidence triggering as used by
+    coincidence_trigger() before coincidence_sweep(), returning on time, off
+    time and trace ids of all coincidence triggers.
+    """
+    triggers = sorted(triggers)
+    events = []
+    last_off_time = 0.0
+    while triggers != []:
+        on, off, tr_id = triggers.pop(0)[:3]
+        ids = [tr_id]
+        coincidence_sum = float(trace_ids[tr_id])
+        for tmp_on, tmp_off, tmp_tr_id in (t[:3] for t in triggers):
+            if tmp_tr_id in ids:
+                continue
+            if tmp_on > off + trigger_off_extension:
+                break
+            ids.append(tmp_tr_id)
+            coincidence_sum += trace_ids[tmp_tr_id]
+            off = max(off, tmp_off)
+        if coincidence_sum < thr_coincidence_sum:
+            continue
+        if off <= last_off_time:
+            continue
+        events.append((on, off, ids))
+        last_off_time = off
+    return events
+
+
 class TriggerTestCase(unittest.TestCase):
     """
     Test cases for obspy.trigger
@@ -65,6 +98,42 @@ class TriggerTestCase(unittest.TestCase):
         self.assertRaises(ArgumentError, clibsignal.recstalta,
                           np.array([1], dtype=np.int32), charfct, ndat, 5, 10)
 
+    def test_characteristic_functions_2d(self):
+        """
+        Characteristic functions of 2-D input, with output buffers of
+        different types and threads.
+        """
+        data = self.data.reshape(10, -1)
+        funcs = [(recursive_sta_lta, (50, 500)),
+                 (classic_sta_lta, (50, 500)),
+                 (delayed_sta_lta, (50, 500)),
+                 (z_detect, (50,))]
+        for func, args in funcs:
+            expected = np.array([func(row, *args) for row in data])
+            charfct = func(data, *args)
+            self.assertEqual(charfct.dtype, np.float64)
+            # first sample of the recursive STA/LTA is not initialized
+            np.testing.assert_allclose(charfct[:, 1:], expected[:, 1:],
+                                       rtol=1e-10, atol=1e-10)
+            # float32 input and output
+            out = np.empty(data.shape, dtype=np.float32)
+            charfct = func(data.astype(np.float32), *args, out=out)
+            self.assertIs(charfct, out)
+            np.testing.assert_allclose(charfct[:, 1:], expected[:, 1:],
+                                       rtol=1e-4, atol=1e-4)
+            # non contiguous input and output
+            out = np.empty((data.shape[1], data.shape[0])).T
+            charfct = func(data[:, ::-1][:, ::-1], *args, out=out)
+            np.testing.assert_allclose(charfct[:, 1:], expected[:, 1:],
+                                       rtol=1e-10, atol=1e-10)
+            self.assertRaises(ValueError, func, data, *args,
+                              out=np.empty(10))
+        for func in (recursive_sta_lta, classic_sta_lta):
+            np.testing.assert_array_equal(
+                func(data, 50, 500, threads=4)[:, 1:],
+                func(data, 50, 500)[:, 1:])
+        self.assertRaises(Exception, classic_sta_lta, data, 5, 20000)
+
     def test_pk_baer(self):
         """
         Test pk_baer against implementation for UNESCO short course
@@ -133,6 +202,152 @@ class TriggerTestCase(unittest.TestCase):
             plt.legend()
             plt.show()
 
+    def test_coincidence_sweep(self):
+        """
+        Incremental coincidence triggering of streamed single station
+        triggers.
+        """
+        station_triggers = [
+            [(0.0, 2.0, "BW.A..Z", 5.0), (2.5, 5.0, "BW.A..Z", 3.0),
+             (20.0, 21.0, "BW.A..Z", 4.0)],
+            [(1.0, 2.6, "BW.B..Z", 6.0), (30.0, 31.0, "BW.B..Z", 4.0)],
+            [(2.55, 4.0, "BW.C..Z", 7.0), (20.5, 22.0, "BW.C..Z", 4.0)]]
+        consumed = []
+
+        def sweep(*args, **kwargs):
+            def triggers():
+                # merge the chronological triggers of all stations
+                for trigger in heapq.merge(*station_triggers):
+                    consumed.append(trigger[0])
+                    yield trigger
+            return coincidence_sweep(triggers(), *args, **kwargs)
+
+        events = sweep(thr_coincidence_sum=2)
+        # first coincidence trigger is returned as soon as the next trigger
+        # not overlapping with it is seen
+        event = next(events)
+        self.assertEqual(consumed, [0.0, 1.0, 2.5, 2.55, 20.0])
+        self.assertEqual(event['time'], UTCDateTime(0))
+        self.assertEqual(event['duration'], 4.0)
+        # retriggering of A is skipped and does not extend the coincidence
+        # trigger
+        self.assertEqual(event['trace_ids'], ["BW.A..Z", "BW.B..Z",
+                                              "BW.C..Z"])
+        self.assertEqual(event['stations'], ["A", "B", "C"])
+        self.assertEqual(event['coincidence_sum'], 3.0)
+        self.assertEqual([t[3] for t in event['triggers']], [5.0, 6.0, 7.0])
+        # the retrigger of A extends the coincidence trigger started by B
+        event = next(events)
+        self.assertEqual(event['time'], UTCDateTime(1))
+        self.assertEqual(event['trace_ids'], ["BW.B..Z", "BW.A..Z",
+                                              "BW.C..Z"])
+        self.assertEqual(event['duration'], 4.0)
+        self.assertEqual([t[0] for t in event['triggers']], [1.0, 2.5, 2.55])
+        event = next(events)
+        self.assertEqual(event['time'], UTCDateTime(20))
+        self.assertEqual(event['trace_ids'], ["BW.A..Z", "BW.C..Z"])
+        self.assertRaises(StopIteration, next, events)
+        # all coincidence triggers, weights and off time extension
+        events = list(sweep())
+        self.assertEqual([e['coincidence_sum'] for e in events],
+                         [3.0, 3.0, 2.0, 1.0])
+        events = list(sweep(trace_ids={"BW.A..Z": 0.5, "BW.B..Z": 2.0}))
+        self.assertEqual([e['coincidence_sum'] for e in events],
+                         [2.5, 2.5, 0.5, 2.0])
+        events = list(sweep(trigger_off_extension=10))
+        self.assertEqual(len(events), 3)
+        self.assertEqual(events[2]['trace_ids'], ["BW.A..Z", "BW.C..Z",
+                                                  "BW.B..Z"])
+        self.assertEqual(events[2]['duration'], 11.0)
+        # custom selection of coincidence triggers
+        events = list(sweep(select=lambda event: "BW.C..Z" in
+                            event['trace_ids']))
+        self.assertEqual([e['time'] for e in events],
+                         [UTCDateTime(0), UTCDateTime(1), UTCDateTime(20)])
+        # input has to be sorted
+        triggers = [(1.0, 2.0, "BW.A..Z"), (0.0, 2.0, "BW.B..Z")]
+        self.assertRaises(ValueError, list, coincidence_sweep(triggers))
+
+    def test_coincidence_sweep_retriggers(self):
+        """
+        Coincidence triggers with stations retriggering inside a coincidence
+        trigger are the same as with the original algorithm.
+        """
+        # A triggers over samples 0-2 and 4-10, B over 1-5 and C over 9-11
+        st = Stream()
+        for station, ranges in (("A", [(0, 3), (4, 11)]), ("B", [(1, 6)]),
+                                ("C", [(9, 12)])):
+            data = np.zeros(20)
+            for i, j in ranges:
+                data[i:j] = 10
+            st += Trace(data, header={"station": station})
+        for thr, expected in (
+                (3, [(1, 11, ["B", "A", "C"])]),
+                (2, [(0, 5, ["A", "B"]), (1, 11, ["B", "A", "C"])])):
+            events = coincidence_trigger(None, 5, 5, st.copy(), thr)
+            self.assertEqual(
+                [(e['time'].timestamp, e['time'].timestamp + e['duration'],
+                  e['stations']) for e in events], expected)
+        # randomized comparison with the original algorithm, lots of
+        # overlapping triggers and retriggers of few stations
+        np.random.seed(42)
+        ids = ["XX.%s..Z" % sta for sta in "ABCDE"]
+        weights = dict(zip(ids, [1, 1, 2, 1, 0.5]))
+        for _ in range(50):
+            triggers = []
+            for id_ in ids:
+                on = 0.0
+                for _ in range(np.random.randint(0, 30)):
+                    on += np.random.exponential(3.0)
+                    off = on + np.random.exponential(2.0)
+                    triggers.append((on, off, id_))
+                    on = off
+            triggers.sort()
+            for thr in (1, 2, 3, 4.5):
+                for ext in (0, 2.0):
+                    expected = _coincidence_reference(triggers, weights, thr,
+                                                      ext)
+                    got = [(e['time'].timestamp,
+                            e['time'].timestamp + e['duration'],
+                            e['trace_ids']) for e in coincidence_sweep(
+                                iter(triggers), thr, weights, ext)]
+                    self.assertEqual(len(got), len(expected))
+                    for event, event_expected in zip(got, expected):
+                        self.assertAlmostEqual(event[0], event_expected[0], 5)
+                        self.assertAlmostEqual(event[1], event_expected[1], 5)
+                        self.assertEqual(event[2], event_expected[2])
+
+    def test_coincidence_sweep_many_triggers(self):
+        """
+        Coincidence triggers of many densely overlapping triggers, forgetting
+        old triggers while sweeping, are the same as with the original
+        algorithm.
+        """
+        np.random.seed(815)
+        ids = ["XX.S%02d..Z" % i for i in range(30)]
+        weights = dict(zip(ids, np.random.choice([0.5, 1, 2], len(ids))))
+        on = np.sort(np.random.uniform(0, 1500, 3000))
+        triggers = [(on_, on_ + np.random.exponential(3.0),
+                     ids[np.random.randint(len(ids))]) for on_ in on]
+        for thr, ext in ((1, 0), (4, 0), (4, 1.0)):
+            expected = _coincidence_reference(triggers, weights, thr, ext)
+            got = [(e['time'].timestamp,
+                    e['time'].timestamp + e['duration'],
+                    e['trace_ids']) for e in coincidence_sweep(
+                        iter(triggers), thr, weights, ext)]
+            self.assertEqual(len(got), len(expected))
+            for event, event_expected in zip(got, expected):
+                self.assertAlmostEqual(event[0], event_expected[0], 5)
+                self.assertAlmostEqual(event[1], event_expected[1], 5)
+                self.assertEqual(event[2], event_expected[2])
+        # on and off times as UTCDateTime
+        triggers = [(UTCDateTime(on_), UTCDateTime(off), id_)
+                    for on_, off, id_ in triggers[:300]]
+        expected = _coincidence_reference(triggers, weights, 4)
+        got = [(e['time'], e['time'] + e['duration'], e['trace_ids'])
+               for e in coincidence_sweep(triggers, 4, weights)]
+        self.assertEqual(got, expected)
+
     def test_coincidence_trigger(self):
         """
         Test network coincidence trigger.
@@ -152,6 +367,14 @@ class TriggerTestCase(unittest.TestCase):
         # for the first test we make some additional tests regarding types
         res = coincidence_trigger("recstalta", 3.5, 1, st.copy(), 3, sta=0.5,
                                   lta=10)
+        # characteristic functions are computed in batches with threads and
+        # the same way as in Trace.trigger() for other types
+        self.assertEqual(
+            coincidence_trigger("recstalta", 3.5, 1, st.copy(), 3, sta=0.5,
+                                lta=10, threads=2), res)
+        self.assertEqual(
+            coincidence_trigger("recstaltapy", 3.5, 1, st.copy(), 3,
+                                sta=0.5, lta=10), res)
         self.assertTrue(isinstance(res, list))
         self.assertEqual(len(res), 3)
         expected_keys = ['time', 'coincidence_sum', 'duration', 'stations',
@@ -29,8 +29,9 @@ from __future__ import (absolute_import, division, print_function,
                         unicode_literals)
 from future.builtins import *  # NOQA
 
-from collections import deque
+from collections import OrderedDict, deque
 import ctypes as C
+from multiprocessing.pool import ThreadPool
 import warnings
 
 import numpy as np
@@ -40,31 +41,97 @@ from obspy.signal.cross_correlation import templates_max_similarity
 from obspy.signal.headers import clibsignal, head_stalta_t
 
 
-def recursive_sta_lta(a, nsta, nlta):
+def _prepare_charfct(a, out):
+    """
+    Check the input of a characteristic function and set up its output.
+
+    :returns: Input as 1-D or 2-D array, float32 and float64 input is used
+        as is and other types are converted to float64, and the output array
+        of the same shape (a new float64 array if ``out`` is ``None``).
+    """
+    a = np.asanyarray(a)
+    if a.ndim not in (1, 2):
+        msg = "Input must be a 1-D or 2-D array (one trace per row)."
+        raise ValueError(msg)
+    if a.dtype not in (np.float32, np.float64):
+        a = a.astype(np.float64)
+    if out is None:
+        out = np.empty(a.shape, dtype=np.float64)
+    elif out.shape != a.shape:
+        msg = "Output array must have the same shape as the input."
+        raise ValueError(msg)
+    return a, out
+
+
+def _apply_rowwise(func, a, out, threads=None):
+    """
+    Apply ``func(data, charfct)`` to a 1-D array or each row of a 2-D array.
+
+    ``func`` is a wrapped C routine working on C contiguous float64 arrays.
+    Rows of other types or memory layouts are converted one at a time, so
+    no converted copy of the whole input is made. As ctypes releases the GIL
+    during the foreign function call, rows are processed truly in parallel
+    with ``threads`` threads.
+    """
+    a2 = a if a.ndim == 2 else a[np.newaxis]
+    out2 = out if out.ndim == 2 else out[np.newaxis]
+
+    def _process_row(i):
+        data = np.ascontiguousarray(a2[i], dtype=np.float64)
+        charfct = out2[i]
+        if charfct.dtype == np.float64 and charfct.flags.c_contiguous:
+            func(data, charfct)
+        else:
+            buf = np.empty(len(data), dtype=np.float64)
+            func(data, buf)
+            charfct[:] = buf
+
+    if threads is not None and threads > 1 and len(a2) > 1:
+        pool = ThreadPool(min(threads, len(a2)))
+        try:
+            pool.map(_process_row, range(len(a2)))
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for i in range(len(a2)):
+            _process_row(i)
+    return out
+
+
+def recursive_sta_lta(a, nsta, nlta, out=None, threads=None):
     """
     Recursive STA/LTA.
 
     Fast version written in C.
 
     :note: This version directly uses a C version via CTypes
-    :type a: :class:`numpy.ndarray`, dtype=float64
-    :param a: Seismic Trace, numpy.ndarray dtype float64
+    :type a: :class:`numpy.ndarray`
+    :param a: Seismic Trace, or 2-D array with one trace per row to compute
+        the characteristic functions of many traces at once.
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
     :param nlta: Length of long time average window in samples
+    :type out: :class:`numpy.ndarray`, optional
+    :param out: Array of the same shape as ``a`` (float64 or float32) that
+        the characteristic function is written to, e.g. to reuse buffers.
+    :type threads: int, optional
+    :param threads: Number of threads used to process the rows of 2-D
+        input in parallel.
     :rtype: :class:`numpy.ndarray`, dtype=float64
-    :return: Characteristic function of recursive STA/LTA
+    :return: Characteristic function of recursive STA/LTA (``out`` if
+        given)
 
     .. seealso:: [Withers1998]_ (p. 98) and [Trnkoczy2012]_
     """
-    # be nice and adapt type if necessary
-    a = np.ascontiguousarray(a, np.float64)
-    ndat = len(a)
-    charfct = np.empty(ndat, dtype=np.float64)
-    # do not use pointer here:
-    clibsignal.recstalta(a, charfct, ndat, nsta, nlta)
-    return charfct
+    a, out = _prepare_charfct(a, out)
+
+    def _recstalta(data, charfct):
+        # do not use pointer here:
+        clibsignal.recstalta(data, charfct, len(data), nsta, nlta)
+
+    return _apply_rowwise(_recstalta, a, out, threads)
 
 
 def recursive_sta_lta_py(a, nsta, nlta):
@@ -166,7 +233,7 @@ def carl_sta_trig(a, nsta, nlta, ratio, quiet):
     return eta
 
 
-def classic_sta_lta(a, nsta, nlta):
+def classic_sta_lta(a, nsta, nlta, out=None, threads=None):
     """
     Computes the standard STA/LTA from a given input array a. The length of
     the STA is given by nsta in samples, respectively is the length of the
@@ -175,27 +242,35 @@ def classic_sta_lta(a, nsta, nlta):
     Fast version written in C.
 
     :type a: NumPy :class:`~numpy.ndarray`
-    :param a: Seismic Trace
+    :param a: Seismic Trace, or 2-D array with one trace per row to compute
+        the characteristic functions of many traces at once.
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
     :param nlta: Length of long time average window in samples
+    :type out: :class:`numpy.ndarray`, optional
+    :param out: Array of the same shape as ``a`` (float64 or float32) that
+        the characteristic function is written to, e.g. to reuse buffers.
+    :type threads: int, optional
+    :param threads: Number of threads used to process the rows of 2-D
+        input in parallel.
     :rtype: NumPy :class:`~numpy.ndarray`
-    :return: Characteristic function of classic STA/LTA
+    :return: Characteristic function of classic STA/LTA (``out`` if given)
     """
-    data = a
-    # initialize C struct / NumPy structured array
-    head = np.empty(1, dtype=head_stalta_t)
-    head[:] = (len(data), nsta, nlta)
-    # ensure correct type and contiguous of data
-    data = np.ascontiguousarray(data, dtype=np.float64)
-    # all memory should be allocated by python
-    charfct = np.empty(len(data), dtype=np.float64)
-    # run and check the error-code
-    errcode = clibsignal.stalta(head, data, charfct)
-    if errcode != 0:
-        raise Exception('ERROR %d stalta: len(data) < nlta' % errcode)
-    return charfct
+    a, out = _prepare_charfct(a, out)
+    if a.shape[-1] < nlta:
+        raise Exception('ERROR 1 stalta: len(data) < nlta')
+
+    def _stalta(data, charfct):
+        # initialize C struct / NumPy structured array
+        head = np.empty(1, dtype=head_stalta_t)
+        head[:] = (len(data), nsta, nlta)
+        # run and check the error-code
+        errcode = clibsignal.stalta(head, data, charfct)
+        if errcode != 0:
+            raise Exception('ERROR %d stalta: len(data) < nlta' % errcode)
+
+    return _apply_rowwise(_stalta, a, out, threads)
 
 
 def classic_sta_lta_py(a, nsta, nlta):
@@ -245,56 +320,67 @@ def classic_sta_lta_py(a, nsta, nlta):
     return sta / lta
 
 
-def delayed_sta_lta(a, nsta, nlta):
+def delayed_sta_lta(a, nsta, nlta, out=None):
     """
     Delayed STA/LTA.
 
     :type a: NumPy :class:`~numpy.ndarray`
-    :param a: Seismic Trace
+    :param a: Seismic Trace, or 2-D array with one trace per row to compute
+        the characteristic functions of many traces at once.
     :type nsta: int
     :param nsta: Length of short time average window in samples
     :type nlta: int
     :param nlta: Length of long time average window in samples
+    :type out: :class:`numpy.ndarray`, optional
+    :param out: Array of the same shape as ``a`` (float64 or float32) that
+        the characteristic function is written to, e.g. to reuse buffers.
     :rtype: NumPy :class:`~numpy.ndarray`
-    :return: Characteristic function of delayed STA/LTA
+    :return: Characteristic function of delayed STA/LTA (``out`` if given)
 
     .. seealso:: [Withers1998]_ (p. 98) and [Trnkoczy2012]_
     """
-    m = len(a)
+    a, out = _prepare_charfct(a, out)
+    sq = a.astype(np.float64) ** 2
     #
-    # compute the short time average (STA) and long time average (LTA)
-    # don't start for STA at nsta because it's muted later anyway
-    sta = np.zeros(m, dtype=np.float64)
-    lta = np.zeros(m, dtype=np.float64)
-    for i in range(m):
-        sta[i] = (a[i] ** 2 + a[i - nsta] ** 2) / nsta + sta[i - 1]
-        lta[i] = (a[i - nsta - 1] ** 2 + a[i - nsta - nlta - 1] ** 2) / \
-            nlta + lta[i - 1]
-    sta[0:nlta + nsta + 50] = 0
-    lta[0:nlta + nsta + 50] = 1  # avoid division by zero
-    return sta / lta
-
-
-def z_detect(a, nsta):
+    # compute the short time average (STA) and long time average (LTA) as
+    # running sums, samples before the start of the trace wrap around to its
+    # end (they are muted later anyway)
+    sta = np.cumsum((sq + np.roll(sq, nsta, axis=-1)) / nsta, axis=-1)
+    lta = np.cumsum((np.roll(sq, nsta + 1, axis=-1) +
+                     np.roll(sq, nsta + nlta + 1, axis=-1)) / nlta, axis=-1)
+    sta[..., 0:nlta + nsta + 50] = 0
+    lta[..., 0:nlta + nsta + 50] = 1  # avoid division by zero
+    np.divide(sta, lta, out=out)
+    return out
+
+
+def z_detect(a, nsta, out=None):
     """
     Z-detector.
 
+    :type a: NumPy :class:`~numpy.ndarray`
+    :param a: Seismic Trace, or 2-D array with one trace per row to compute
+        the characteristic functions of many traces at once.
     :param nsta: Window length in Samples.
+    :type out: :class:`numpy.ndarray`, optional
+    :param out: Array of the same shape as ``a`` (float64 or float32) that
+        the characteristic function is written to, e.g. to reuse buffers.
 
     .. seealso:: [Withers1998]_, p. 99
     """
-    m = len(a)
+    a, out = _prepare_charfct(a, out)
+    m = a.shape[-1]
     #
     # Z-detector given by Swindell and Snell (1977)
-    sta = np.zeros(len(a), dtype=np.float64)
-    # Standard Sta
-    pad_sta = np.zeros(nsta)
-    for i in range(nsta):  # window size to smooth over
-        sta = sta + np.concatenate((pad_sta, a[i:m - nsta + i] ** 2))
-    a_mean = np.mean(sta)
-    a_std = np.std(sta)
-    _z = (sta - a_mean) / a_std
-    return _z
+    # Standard Sta as moving sum over the preceding nsta samples
+    cumsum = np.cumsum(a.astype(np.float64) ** 2, axis=-1)
+    sta = np.zeros(a.shape, dtype=np.float64)
+    sta[..., nsta] = cumsum[..., nsta - 1]
+    sta[..., nsta + 1:] = cumsum[..., nsta:m - 1] - cumsum[..., :m - nsta - 1]
+    a_mean = np.mean(sta, axis=-1)[..., np.newaxis]
+    a_std = np.std(sta, axis=-1)[..., np.newaxis]
+    np.divide(sta - a_mean, a_std, out=out)
+    return out
 
 
 def trigger_onset(charfct, thres1, thres2, max_len=9e99, max_len_delete=False):
@@ -532,6 +618,377 @@ def plot_trigger(trace, cft, thr_on, thr_off, show=True):
         plt.show()
 
 
+# trigger types of :meth:`obspy.core.trace.Trace.trigger` that can process
+# many traces at once
+_BATCH_TRIGGER_FUNCTIONS = {
+    'recstalta': recursive_sta_lta,
+    'classicstalta': classic_sta_lta,
+    'delayedstalta': delayed_sta_lta,
+    'zdetect': z_detect,
+}
+
+
+def _batch_trigger(traces, trigger_type, options):
+    """
+    Replace the data of the given traces by their characteristic function
+    like :meth:`obspy.core.trace.Trace.trigger`, but computing it for all
+    traces with the same sampling rate and number of samples in one call.
+    """
+    func = _BATCH_TRIGGER_FUNCTIONS[trigger_type.lower()]
+    groups = {}
+    for tr in traces:
+        key = (tr.stats.sampling_rate, tr.stats.npts)
+        groups.setdefault(key, []).append(tr)
+    for (spr, _), group in groups.items():
+        # convert sta and lta from seconds to samples
+        kwargs = dict(options)
+        for key in ['sta', 'lta']:
+            if key in kwargs:
+                kwargs['n%s' % (key)] = int(kwargs.pop(key) * spr)
+        charfcts = func(np.array([tr.data for tr in group]), **kwargs)
+        for tr, charfct in zip(group, charfcts):
+            tr.data = charfct
+
+
+def coincidence_sweep(triggers, thr_coincidence_sum=None, trace_ids=None,
+                      trigger_off_extension=0, select=None):
+    """
+    Incrementally combine single station triggers to network coincidence
+    triggers.
+
+    Single station triggers are swept in order of their on times. Every
+    single station trigger starts a coincidence trigger, that includes all
+    following triggers starting before the latest off time of all triggers
+    in it (plus ``trigger_off_extension``), i.e. chains of overlapping
+    triggers are combined (A overlaps with B and B overlaps with C => ABC).
+    Retriggering of a trace id already present in a coincidence trigger is
+    skipped. The coincidence sum is the sum of the weights of its trace ids.
+    A coincidence trigger sharing the off time of the previously returned
+    one is considered to be a subset of it and is skipped.
+
+    Each coincidence trigger is returned as soon as a trigger starting after
+    its end is seen, so single station triggers can be streamed in, e.g. by
+    combining the sorted triggers of each station with
+    :func:`heapq.merge`. Only the triggers overlapping with the current
+    coincidence trigger are kept in memory. The end of each coincidence
+    trigger is found in logarithmic time, so ``n`` single station triggers
+    are swept in ``O(n log n)`` time plus the time to assemble the returned
+    coincidence triggers.
+
+    :type triggers: iterable of tuples
+    :param triggers: Single station triggers sorted by on time, as tuples
+        ``(on, off, trace_id, ...)`` with on and off times as POSIX
+        timestamps or :class:`~obspy.core.utcdatetime.UTCDateTime`. Further
+        items of the tuples (e.g. characteristic function peak values) are
+        passed through.
+    :type thr_coincidence_sum: int or float, optional
+    :param thr_coincidence_sum: Threshold for coincidence sum, coincidence
+        triggers with a lower coincidence sum are not returned. By default
+        all coincidence triggers (including single station triggers) are
+        returned.
+    :type trace_ids: list or dict, optional
+    :param trace_ids: Trace ids to use, either as a list or as a dictionary
+        mapping trace ids to their weights in the coincidence sum. Triggers
+        of other trace ids are disregarded. By default all trace ids are
+        used with a weight of one.
+    :type trigger_off_extension: int or float, optional
+    :param trigger_off_extension: Extends search window for next trigger
+        on-time after last trigger off-time in coincidence sum computation.
+    :type select: function, optional
+    :param select: Function deciding whether a coincidence trigger is
+        returned instead of checking ``thr_coincidence_sum``. It is called
+        with the coincidence trigger dictionary (that it may modify) and
+        has to return ``True`` or ``False``.
+    :rtype: generator of dict
+    :returns: Coincidence triggers in chronological order with keys
+        ``'time'`` (:class:`~obspy.core.utcdatetime.UTCDateTime`),
+        ``'duration'``, ``'stations'``, ``'trace_ids'``,
+        ``'coincidence_sum'`` and ``'triggers'`` (the first single station
+        trigger tuple of each trace id).
+
+    .. rubric:: Example
+
+    >>> triggers = [(0.0, 2.0, "BW.UH1..EHZ"), (1.0, 3.0, "BW.UH2..EHZ"),
+    ...             (2.5, 4.0, "BW.UH3..EHZ"), (10.0, 11.0, "BW.UH1..EHZ")]
+    >>> for event in coincidence_sweep(triggers, thr_coincidence_sum=2):
+    ...     print(event['time'], event['duration'], event['stations'])
+    1970-01-01T00:00:00.000000Z 4.0 ['UH1', 'UH2', 'UH3']
+    """
+    if trace_ids is not None and not isinstance(trace_ids, dict):
+        trace_ids = dict.fromkeys(trace_ids, 1)
+    last_off = None
+    for on, off, weight, current in _coincidence_candidates(
+            triggers, trace_ids, trigger_off_extension):
+        # skip coincidence trigger if it is just a subset of the previous
+        # (determined by a shared off-time, this is a bit sloppy)
+        if last_off is not None and off <= last_off:
+            continue
+        # weights are summed up in a different order than in the returned
+        # coincidence sum, only skip here if clearly below the threshold
+        if select is None and thr_coincidence_sum is not None and \
+                weight < thr_coincidence_sum - 1e-9 * max(
+                    1.0, abs(thr_coincidence_sum)):
+            continue
+        event = _coincidence_event(on, off, current(), trace_ids)
+        if select is not None:
+            if not select(event):
+                continue
+        elif thr_coincidence_sum is not None and \
+                event['coincidence_sum'] < thr_coincidence_sum:
+            continue
+        last_off = off
+        yield event
+
+
+class _CoincidenceTree(object):
+    """
+    Segment tree over the pending single station triggers of
+    :func:`_coincidence_candidates`.
+
+    Every node stores the latest off time and the summed weight of the
+    triggers of its range that are not retriggers of the coincidence trigger
+    currently started (``None`` and zero if there are none) and the latest
+    on time of a trigger in its range that ends a coincidence trigger
+    reaching up to the node, considering only the off times inside the node
+    (``None`` if there is none). As on times are sorted, these values can be
+    combined for two neighboring nodes in constant time, so that the end of
+    a coincidence trigger is found in logarithmic time.
+    """
+    def __init__(self, ons, offs, weights, active, trigger_off_extension):
+        self.ons = ons
+        self.offs = offs
+        self.weights = weights
+        self.active = active
+        self.ext = trigger_off_extension
+        self.rebuild()
+
+    def rebuild(self):
+        """
+        Build the tree for all pending triggers.
+        """
+        size = 1
+        while size < len(self.ons) + 1:
+            size *= 2
+        self.size = size
+        self.max_off = [None] * (2 * size)
+        self.weight = [0] * (2 * size)
+        self.end_on = [None] * (2 * size)
+        for i in range(len(self.ons)):
+            self._set_leaf(i)
+        for node in range(size - 1, 0, -1):
+            self._combine(node)
+
+    def _set_leaf(self, i):
+        node = self.size + i
+        if self.active[i]:
+            self.max_off[node] = self.offs[i]
+            self.weight[node] = self.weights[i]
+        else:
+            self.max_off[node] = None
+            self.weight[node] = 0
+        # a single trigger ends every coincidence trigger not reaching it
+        self.end_on[node] = self.ons[i]
+
+    def _combine(self, node):
+        left, right = 2 * node, 2 * node + 1
+        max_left, max_right = self.max_off[left], self.max_off[right]
+        if max_left is None or (max_right is not None and
+                                max_right > max_left):
+            self.max_off[node] = max_right
+        else:
+            self.max_off[node] = max_left
+        self.weight[node] = self.weight[left] + self.weight[right]
+        end_on = self.end_on[right]
+        # the off times of the left node might already reach the triggers
+        # ending a coincidence trigger inside the right node
+        if end_on is not None and max_left is not None and \
+                end_on <= max_left + self.ext:
+            end_on = None
+        self.end_on[node] = self.end_on[left] if end_on is None else end_on
+
+    def update(self, i):
+        """
+        Update the tree after appending or (de)activating trigger ``i``.
+        """
+        if i >= self.size:
+            self.rebuild()
+            return
+        self._set_leaf(i)
+        node = (self.size + i) // 2
+        while node:
+            self._combine(node)
+            node //= 2
+
+    def _nodes(self, start, end=None):
+        """
+        Nodes covering the triggers from index ``start`` (inclusive) to
+        ``end`` (exclusive, by default all following triggers), in order.
+        """
+        if end is None:
+            end = self.size
+        lo, hi = self.size + start, self.size + end
+        left, right = [], []
+        while lo < hi:
+            if lo & 1:
+                left.append(lo)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right.append(hi)
+            lo //= 2
+            hi //= 2
+        return left + right[::-1]
+
+    def find_end(self, start):
+        """
+        Returns the index of the first trigger not belonging to the
+        coincidence trigger started by trigger ``start`` (``None`` if all
+        pending triggers belong to it), its off time and its summed weight.
+        """
+        off = self.offs[start]
+        weight = self.weights[start]
+        for node in self._nodes(start + 1):
+            end_on = self.end_on[node]
+            if end_on is not None and end_on > off + self.ext:
+                # the coincidence trigger ends inside this node
+                while node < self.size:
+                    node *= 2
+                    end_on = self.end_on[node]
+                    if end_on is None or end_on <= off + self.ext:
+                        if self.max_off[node] is not None and \
+                                self.max_off[node] > off:
+                            off = self.max_off[node]
+                        weight += self.weight[node]
+                        node += 1
+                return node - self.size, off, weight
+            if self.max_off[node] is not None and self.max_off[node] > off:
+                off = self.max_off[node]
+            weight += self.weight[node]
+        return None, off, weight
+
+    def active_indices(self, start, end):
+        """
+        Returns the indices of all triggers between ``start`` (inclusive) and
+        ``end`` (exclusive) that are not retriggers.
+        """
+        indices = []
+        for node in self._nodes(start, end):
+            stack = [node]
+            while stack:
+                node = stack.pop()
+                if self.max_off[node] is None:
+                    continue
+                if node >= self.size:
+                    indices.append(node - self.size)
+                else:
+                    stack.extend((2 * node + 1, 2 * node))
+        return indices
+
+
+def _coincidence_candidates(triggers, trace_ids, trigger_off_extension):
+    """
+    Yield the coincidence trigger started by every single station trigger as
+    tuple of on time, off time, summed weight of its trace ids and a function
+    returning the first single station trigger of every trace id (only valid
+    until the next coincidence trigger is requested), see
+    :func:`coincidence_sweep`.
+
+    Each coincidence trigger is found in logarithmic time with a
+    :class:`_CoincidenceTree` instead of scanning all triggers overlapping
+    with it.
+    """
+    # pending single station triggers, triggers from index ``first`` on still
+    # have to start a coincidence trigger
+    pending, ons, offs, weights, active, next_same = [], [], [], [], [], []
+    # index of the latest pending trigger of each trace id
+    last_index = {}
+    tree = _CoincidenceTree(ons, offs, weights, active, trigger_off_extension)
+    first = 0
+    last_on = None
+    triggers = iter(triggers)
+    exhausted = False
+    while True:
+        end = None
+        if first < len(pending):
+            end, off, weight = tree.find_end(first)
+        if end is None and not exhausted:
+            # the next trigger might still overlap
+            for trigger in triggers:
+                if trace_ids is None or trigger[2] in trace_ids:
+                    break
+            else:
+                exhausted = True
+                continue
+            tmp_on, tmp_off, tmp_tr_id = trigger[:3]
+            if last_on is not None and tmp_on < last_on:
+                msg = "Triggers have to be sorted by their on times."
+                raise ValueError(msg)
+            last_on = tmp_on
+            i = len(pending)
+            pending.append(trigger)
+            ons.append(tmp_on)
+            offs.append(tmp_off)
+            weights.append(1 if trace_ids is None else trace_ids[tmp_tr_id])
+            next_same.append(None)
+            # retriggering of a trace id is skipped, unless the earlier
+            # trigger has already started its coincidence trigger
+            previous = last_index.get(tmp_tr_id)
+            active.append(previous is None or previous < first)
+            if not active[i]:
+                next_same[previous] = i
+            last_index[tmp_tr_id] = i
+            tree.update(i)
+            continue
+        if first == len(pending):
+            return
+        if end is None:
+            end = len(pending)
+
+        def current(start=first, end=end):
+            return OrderedDict(
+                (pending[i][2], pending[i])
+                for i in [start] + tree.active_indices(start + 1, end))
+
+        yield ons[first], off, weight, current
+        # the next trigger of the trace id is no retrigger in the
+        # coincidence trigger started by the next trigger
+        if next_same[first] is not None:
+            active[next_same[first]] = True
+            tree.update(next_same[first])
+        first += 1
+        # forget triggers that have started their coincidence trigger
+        if first > 1000 and 2 * first > len(pending):
+            for values in (pending, ons, offs, weights, active, next_same):
+                del values[:first]
+            next_same[:] = [None if i is None else i - first
+                            for i in next_same]
+            for key in list(last_index.keys()):
+                if last_index[key] < first:
+                    del last_index[key]
+                else:
+                    last_index[key] -= first
+            first = 0
+            tree.rebuild()
+
+
+def _coincidence_event(on, off, triggers, trace_ids):
+    """
+    Assemble a coincidence trigger from the first single station trigger of
+    each trace id, see :func:`coincidence_sweep`.
+    """
+    ids = list(triggers.keys())
+    if trace_ids is None:
+        coincidence_sum = float(len(ids))
+    else:
+        coincidence_sum = float(sum(trace_ids[id_] for id_ in ids))
+    return {'time': UTCDateTime(on),
+            'duration': off - on,
+            'stations': [id_.split(".")[1] for id_ in ids],
+            'trace_ids': ids,
+            'coincidence_sum': coincidence_sum,
+            'triggers': list(triggers.values())}
+
+
 def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
                         thr_coincidence_sum, trace_ids=None,
                         max_trigger_length=1e6, delete_long_trigger=False,
@@ -547,7 +1004,8 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
         precomputed custom characteristic functions)
       * evaluate all single station triggering results
       * compile chronological overall list of all single station triggers
-      * find overlapping single station triggers
+      * find overlapping single station triggers (in a single sweep, see
+        :func:`coincidence_sweep`)
       * calculate coincidence sum of every individual overlapping trigger
       * add to coincidence trigger list if it exceeds the given threshold
       * optional: if master event templates are provided, also check single
@@ -620,6 +1078,10 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
         and ``nlta`` (samples) by multiplying with sampling rate of trace.
         (e.g. ``sta=3``, ``lta=10`` would call the trigger with 3 and 10
         seconds average, respectively)
+        For ``'recstalta'``, ``'classicstalta'``, ``'delayedstalta'`` and
+        ``'zdetect'`` the characteristic functions of all traces with the
+        same sampling rate and length are computed in one call, for the
+        first two ``threads`` can be given to use several threads.
     :param event_templates: Event templates to use in checking similarity of
         single station triggers against known events. Expected are streams with
         three traces for Z, N, E component. A dictionary is expected where for
@@ -650,6 +1112,13 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
 
     # the single station triggering
     triggers = []
+    # compute the characteristic functions of all traces at once if possible
+    batched = set()
+    if trigger_type is not None and \
+            trigger_type.lower() in _BATCH_TRIGGER_FUNCTIONS:
+        traces = [tr for tr in st if tr.id in trace_ids and len(tr)]
+        _batch_trigger(traces, trigger_type, options)
+        batched = set(id(tr) for tr in traces)
     # prepare kwargs for trigger_onset
     kwargs = {'max_len_delete': delete_long_trigger}
     for tr in st:
@@ -658,7 +1127,7 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
                   "trace ID list and was disregarded (%s)" % tr.id
             warnings.warn(msg, UserWarning)
             continue
-        if trigger_type is not None:
+        if trigger_type is not None and id(tr) not in batched:
             tr.trigger(trigger_type, **options)
         kwargs['max_len'] = int(
             max_trigger_length * tr.stats.sampling_rate + 0.5)
@@ -677,75 +1146,40 @@ def coincidence_trigger(trigger_type, thr_on, thr_off, stream,
     triggers.sort()
 
     # the coincidence triggering and coincidence sum computation
-    coincidence_triggers = []
-    last_off_time = 0.0
-    while triggers != []:
-        # remove first trigger from list and look for overlaps
-        on, off, tr_id, cft_peak, cft_std = triggers.pop(0)
-        sta = tr_id.split(".")[1]
-        event = {}
-        event['time'] = UTCDateTime(on)
-        event['stations'] = [tr_id.split(".")[1]]
-        event['trace_ids'] = [tr_id]
-        event['coincidence_sum'] = float(trace_ids[tr_id])
-        event['similarity'] = {}
-        if details:
-            event['cft_peaks'] = [cft_peak]
-            event['cft_stds'] = [cft_std]
-        # evaluate maximum similarity for station if event templates were
+    def select(event):
+        # evaluate maximum similarity for stations if event templates were
         # provided
-        templates = event_templates.get(sta)
-        if templates:
-            event['similarity'][sta] = \
-                templates_max_similarity(stream, event['time'], templates)
-        # compile the list of stations that overlap with the current trigger
-        for trigger in triggers:
-            tmp_on, tmp_off, tmp_tr_id, tmp_cft_peak, tmp_cft_std = trigger
-            tmp_sta = tmp_tr_id.split(".")[1]
-            # skip retriggering of already present station in current
-            # coincidence trigger
-            if tmp_tr_id in event['trace_ids']:
-                continue
-            # check for overlapping trigger,
-            # break if there is a gap in between the two triggers
-            if tmp_on > off + trigger_off_extension:
-                break
-            event['stations'].append(tmp_sta)
-            event['trace_ids'].append(tmp_tr_id)
-            event['coincidence_sum'] += trace_ids[tmp_tr_id]
-            if details:
-                event['cft_peaks'].append(tmp_cft_peak)
-                event['cft_stds'].append(tmp_cft_std)
-            # allow sets of triggers that overlap only on subsets of all
-            # stations (e.g. A overlaps with B and B overlaps w/ C => ABC)
-            off = max(off, tmp_off)
-            # evaluate maximum similarity for station if event templates were
-            # provided
-            templates = event_templates.get(tmp_sta)
+        event['similarity'] = {}
+        for sta in event['stations']:
+            templates = event_templates.get(sta)
             if templates:
-                event['similarity'][tmp_sta] = \
+                event['similarity'][sta] = \
                     templates_max_similarity(stream, event['time'], templates)
         # skip if both coincidence sum and similarity thresholds are not met
         if event['coincidence_sum'] < thr_coincidence_sum:
             if not event['similarity']:
-                continue
+                return False
             elif not any([val > similarity_threshold[_s]
                           for _s, val in event['similarity'].items()]):
-                continue
-        # skip coincidence trigger if it is just a subset of the previous
-        # (determined by a shared off-time, this is a bit sloppy)
-        if off <= last_off_time:
-            continue
-        event['duration'] = off - on
+                return False
+        return True
+
+    coincidence_triggers = []
+    for event in coincidence_sweep(
+            triggers, thr_coincidence_sum=thr_coincidence_sum,
+            trace_ids=trace_ids, trigger_off_extension=trigger_off_extension,
+            select=select if event_templates else None):
+        event.setdefault('similarity', {})
+        single_triggers = event.pop('triggers')
         if details:
+            event['cft_peaks'] = [trigger[3] for trigger in single_triggers]
+            event['cft_stds'] = [trigger[4] for trigger in single_triggers]
             weights = np.array([trace_ids[i] for i in event['trace_ids']])
             weighted_values = np.array(event['cft_peaks']) * weights
             event['cft_peak_wmean'] = weighted_values.sum() / weights.sum()
             weighted_values = np.array(event['cft_stds']) * weights
-            event['cft_std_wmean'] = \
-                (np.array(event['cft_stds']) * weights).sum() / weights.sum()
+            event['cft_std_wmean'] = weighted_values.sum() / weights.sum()
         coincidence_triggers.append(event)
-        last_off_time = off
     return coincidence_triggers
 
 